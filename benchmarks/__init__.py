@@ -0,0 +1,73 @@
+"""
+Performance benchmarks for the integrations stack.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.async_views``.
+Benchmarks are not collected by ``manage.py test``.
+"""
+
+import os
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+
+def setup_django() -> None:
+    """
+    Configure Django for a standalone benchmark run.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+    import django
+    from django.test.utils import override_settings
+
+    django.setup()
+    override_settings(ALLOWED_HOSTS=["*"]).enable()
+
+
+@contextmanager
+def timer():
+    """
+    Yield a dict whose ``seconds`` key is set to the elapsed wall time on exit.
+    """
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def make_bookings(count: int) -> list:
+    """
+    Return `count` raw PMS bookings spread over a year and 400 rooms.
+    """
+    statuses = ["pending", "confirmed", "cancelled"]
+    first_day = date(2025, 1, 1)
+    bookings = []
+    for index in range(count):
+        check_in = first_day + timedelta(days=index % 365)
+        bookings.append(
+            {
+                "id": str(100000 + index),
+                "guest": f"Guest {index}",
+                "check_in_date": check_in.isoformat(),
+                "check_out_date": (check_in + timedelta(days=3)).isoformat(),
+                "room": str(100 + index % 400),
+                "booking_status": random.choice(statuses),
+                "total_price": round(random.uniform(80, 900), 2),
+            }
+        )
+    return bookings
+
+
+def best_of(repeat: int, fn, *args) -> float:
+    """
+    Return the fastest of `repeat` timed calls of `fn(*args)`, in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        with timer() as elapsed:
+            fn(*args)
+        timings.append(elapsed["seconds"])
+    return min(timings)
@@ -0,0 +1,102 @@
+"""
+Compare booking analytics computed per dict with the vectorized NumPy path.
+
+Builds ``--bookings`` mapped bookings and computes nightly revenue and room
+nights, plus revenue per room and booking counts per status, two ways, and
+checks that both agree:
+
+* loop: a plain Python loop over the booking dicts, night by night.
+* numpy: ``BookingColumns`` aggregates, timed separately for building the
+  columnar snapshot (once per refresh) and for answering all four groupings
+  from it (once per request).
+
+    python -m benchmarks.analytics --bookings 1000000 --repeat 3
+"""
+
+import argparse
+import math
+from collections import defaultdict
+from datetime import date, timedelta
+
+from benchmarks import best_of, make_bookings, setup_django
+
+
+def loop_path(bookings: list, start: date, end: date) -> dict:
+    revenue, room_nights = defaultdict(float), defaultdict(int)
+    room_revenue, status_counts = defaultdict(float), defaultdict(int)
+    for b in bookings:
+        check_in = date.fromisoformat(b["check_in"])
+        check_out = date.fromisoformat(b["check_out"])
+        nights = (check_out - check_in).days
+        inside = (min(check_out, end) - max(check_in, start)).days
+        if nights <= 0 or inside <= 0:
+            continue
+        status_counts[b["status"]] += 1
+        if b["status"] == "cancelled":
+            continue
+        rate = b.get("amount", 0) / nights
+        for offset in range(nights):
+            night = check_in + timedelta(days=offset)
+            if start <= night < end:
+                revenue[night] += rate
+                room_nights[night] += 1
+        if "room_number" in b:
+            room_revenue[b["room_number"]] += rate * inside
+    return {
+        "revenue": sum(revenue.values()),
+        "room_nights": sum(room_nights.values()),
+        "room_revenue": sum(room_revenue.values()),
+        "bookings": sum(status_counts.values()),
+    }
+
+
+def numpy_path(columns, start: date, end: date) -> dict:
+    days = columns.aggregate("day", start, end)
+    columns.aggregate("week", start, end)
+    rooms = columns.aggregate("room", start, end)
+    statuses = columns.aggregate("status", start, end)
+    return {
+        "revenue": sum(row["revenue"] for row in days),
+        "room_nights": sum(row["room_nights"] for row in days),
+        "room_revenue": sum(row["revenue"] for row in rooms),
+        "bookings": sum(row["bookings"] for row in statuses),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from integrations.pms.analytics import BookingColumns
+    from integrations.pms.serializers import map_bookings
+
+    bookings = map_bookings(make_bookings(args.bookings))
+    start, end = date(2025, 1, 1), date(2026, 1, 1)
+
+    columns = BookingColumns.from_bookings(bookings)
+    expected, found = loop_path(bookings, start, end), numpy_path(columns, start, end)
+    agree = all(
+        math.isclose(expected[key], found[key], rel_tol=1e-6) for key in expected
+    )
+
+    loop_seconds = best_of(args.repeat, loop_path, bookings, start, end)
+    build_seconds = best_of(args.repeat, BookingColumns.from_bookings, bookings)
+    query_seconds = best_of(args.repeat, numpy_path, columns, start, end)
+
+    print(f"bookings:        {args.bookings}")
+    print(f"loop:            {loop_seconds * 1000:>9.1f} ms")
+    print(f"numpy build:     {build_seconds * 1000:>9.1f} ms")
+    print(f"numpy query:     {query_seconds * 1000:>9.1f} ms")
+    print(f"speedup (query): {loop_seconds / query_seconds:.1f}x")
+    print(
+        f"speedup (build + query): {loop_seconds / (build_seconds + query_seconds):.1f}x"
+    )
+    print(f"results agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare sync and async PMS booking views under concurrent load.
+
+Sends ``concurrency`` simultaneous requests to the booking list endpoint twice,
+in-process, with PMS latency simulated as usual (100-300 ms) and simulated
+failures disabled so both runs do the same work:
+
+* sync: the current ``BookingListAPIView`` served by the WSGI application from
+  a pool of ``--threads`` worker threads, like a threaded gunicorn worker. Each
+  in-flight PMS call holds one of those threads.
+* async: ``AsyncBookingListAPIView`` served by the ASGI application on a single
+  event loop, where in-flight PMS calls only hold a coroutine.
+
+    python -m benchmarks.async_views --concurrency 200 --threads 8
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from benchmarks import setup_django, timer
+
+SYNC_PATH = "/api/integrations/pms/bookings/"
+ASYNC_PATH = "/api/integrations/pms/async/bookings/"
+
+
+def summarize(label: str, statuses: list, seconds: float) -> dict:
+    return {
+        "label": label,
+        "requests": len(statuses),
+        "ok": statuses.count(200),
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(len(statuses) / seconds, 1),
+    }
+
+
+def run_sync(concurrency: int, threads: int) -> dict:
+    import httpx
+
+    from core.wsgi import application
+
+    with httpx.Client(
+        transport=httpx.WSGITransport(app=application), base_url="http://benchmark"
+    ) as client:
+        client.get(SYNC_PATH)  # warm up
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            with timer() as elapsed:
+                responses = list(
+                    executor.map(lambda _: client.get(SYNC_PATH), range(concurrency))
+                )
+
+    statuses = [response.status_code for response in responses]
+    return summarize(f"sync  ({threads} threads)", statuses, elapsed["seconds"])
+
+
+async def run_async(concurrency: int) -> dict:
+    import httpx
+
+    from core.asgi import application
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=application), base_url="http://benchmark"
+    ) as client:
+        await client.get(ASYNC_PATH)  # warm up
+        with timer() as elapsed:
+            responses = await asyncio.gather(
+                *(client.get(ASYNC_PATH) for _ in range(concurrency))
+            )
+
+    statuses = [response.status_code for response in responses]
+    return summarize("async (1 event loop)", statuses, elapsed["seconds"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    setup_django()
+
+    # Disable simulated failures only; latency stays realistic.
+    with patch("integrations.pms.clients.random.random", return_value=0.5):
+        sync_result = run_sync(args.concurrency, args.threads)
+        async_result = asyncio.run(run_async(args.concurrency))
+
+    for result in (sync_result, async_result):
+        print(
+            f"{result['label']:<22} {result['ok']}/{result['requests']} ok "
+            f"in {result['seconds']:>7.3f}s ({result['requests_per_second']} req/s)"
+        )
+    speedup = sync_result["seconds"] / async_result["seconds"]
+    print(f"async speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compare the memory and read speed of bookings held as dicts and in a
+CompactBookingStore.
+
+Builds ``--bookings`` raw PMS bookings and measures, with tracemalloc, the
+memory they take as a list of dicts and as a store built from that list.
+Then times the reads the simulated PMS and the views make both ways, and
+checks that both map to the same bookings:
+
+* get: 1000 detail lookups by id.
+* query: the bookings of one room.
+* map: mapping every booking to the API representation.
+* range: filtering the bookings checking in during one week, by mapping
+  and scanning the dicts and by the store's sorted indexes.
+
+    python -m benchmarks.booking_store --bookings 1000000 --repeat 3
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+from benchmarks import best_of, make_bookings, setup_django
+
+
+def traced(fn, *args):
+    """
+    Return `fn(*args)` and the bytes it left allocated.
+    """
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(*args)
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from integrations.pms.datasource import BookingDataSource
+    from integrations.pms.filters import BookingFilter
+    from integrations.pms.serializers import map_booking_store, map_bookings
+    from integrations.pms.store import CompactBookingStore
+
+    tracemalloc.start()
+    bookings, dict_bytes = traced(make_bookings, args.bookings)
+    store, store_bytes = traced(CompactBookingStore.from_bookings, bookings)
+    tracemalloc.stop()
+
+    datasource = BookingDataSource(bookings)
+    ids = random.sample([b["id"] for b in bookings], min(1000, len(bookings)))
+    booking_filter = BookingFilter(
+        {"check_in_after": "2025-06-01", "check_in_before": "2025-06-07"}
+    )
+
+    def scan_range():
+        return booking_filter.apply(map_bookings(bookings))
+
+    def store_range():
+        return map_booking_store(store, booking_filter.store_rows(store))
+
+    agree = (
+        map_bookings(store) == map_bookings(bookings)
+        and all(
+            store.get(booking_id) == datasource.get(booking_id) for booking_id in ids
+        )
+        and store_range() == scan_range()
+    )
+
+    def lookups(get):
+        for booking_id in ids:
+            get(booking_id)
+
+    timings = {
+        "get": (
+            best_of(args.repeat, lookups, datasource.get),
+            best_of(args.repeat, lookups, store.get),
+        ),
+        "query": (
+            best_of(args.repeat, datasource.query, "107"),
+            best_of(args.repeat, store.query, "107"),
+        ),
+        "map": (
+            best_of(args.repeat, map_bookings, bookings),
+            best_of(args.repeat, map_bookings, store),
+        ),
+        "range": (
+            best_of(args.repeat, scan_range),
+            best_of(args.repeat, store_range),
+        ),
+    }
+
+    count = args.bookings
+    print(f"bookings:        {count}")
+    print(
+        f"dicts:           {dict_bytes / 2**20:>9.1f} MiB ({dict_bytes / count:.0f} B each)"
+    )
+    print(
+        f"store:           {store_bytes / 2**20:>9.1f} MiB ({store_bytes / count:.0f} B each)"
+    )
+    print(f"memory saved:    {dict_bytes / store_bytes:.1f}x")
+    for name, (dicts, compact) in timings.items():
+        print(
+            f"{name + ':':<16} {dicts * 1000:>9.1f} ms dicts, "
+            f"{compact * 1000:>9.1f} ms store"
+        )
+    print(f"results agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare booking serialization paths on a large PMS payload.
+
+Maps ``--bookings`` raw PMS bookings into API response data two ways, and
+checks that both render to byte-identical JSON:
+
+* serializer: the original double pass, ``BookingSerializer(raw, many=True)``
+  followed by ``BookingSerializer(data=..., many=True).is_valid()``.
+* map_bookings: the one-pass compiled mapping used by the booking views.
+
+    python -m benchmarks.serializer_mapping --bookings 10000 --repeat 5
+"""
+
+import argparse
+
+from benchmarks import best_of, make_bookings, setup_django
+
+
+def serializer_path(raw_bookings: list) -> list:
+    from integrations.pms.serializers import BookingSerializer
+
+    mapped_serializer = BookingSerializer(raw_bookings, many=True)
+    serializer = BookingSerializer(data=mapped_serializer.data, many=True)
+    assert serializer.is_valid()
+    return serializer.data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from integrations.pms.serializers import map_bookings
+
+    raw_bookings = make_bookings(args.bookings)
+    renderer = JSONRenderer()
+    identical = renderer.render(serializer_path(raw_bookings)) == renderer.render(
+        map_bookings(raw_bookings)
+    )
+
+    serializer_seconds = best_of(args.repeat, serializer_path, raw_bookings)
+    mapping_seconds = best_of(args.repeat, map_bookings, raw_bookings)
+
+    print(f"bookings:      {args.bookings}")
+    print(f"serializer:    {serializer_seconds * 1000:>8.1f} ms")
+    print(f"map_bookings:  {mapping_seconds * 1000:>8.1f} ms")
+    print(f"speedup:       {serializer_seconds / mapping_seconds:.1f}x")
+    print(f"byte-identical JSON: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare how fast a cold worker gets its booking dataset ready, and the
+private memory it then holds, three ways:
+
+* fixture: parse an NDJSON fixture into BookingDataSource dicts.
+* compact: parse the same fixture into a CompactBookingDataSource.
+* snapshot: memory-map a snapshot written by ``snapshot_pms_bookings``.
+
+Each load is followed by 1000 lookups by id, so the snapshot pays for the
+pages it touches. Mapped pages live in the OS page cache, shared by every
+worker mapping the file, and are not counted as private memory.
+
+    python -m benchmarks.snapshot --bookings 1000000 --repeat 3
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks import best_of, make_bookings, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from integrations.pms.datasource import BookingDataSource, CompactBookingDataSource
+    from integrations.pms.snapshot import write_snapshot
+    from integrations.pms.store import CompactBookingStore
+
+    bookings = make_bookings(args.bookings)
+    ids = random.sample([b["id"] for b in bookings], min(1000, len(bookings)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        fixture = Path(directory) / "bookings.ndjson"
+        with fixture.open("w") as out:
+            for booking in bookings:
+                out.write(json.dumps(booking) + "\n")
+        snapshot = Path(directory) / "bookings.snapshot"
+        size = write_snapshot(CompactBookingStore.from_bookings(bookings), snapshot)
+        del bookings
+
+        loaders = {
+            "fixture": lambda: BookingDataSource.from_fixture(fixture),
+            "compact": lambda: CompactBookingDataSource.from_fixture(fixture),
+            "snapshot": lambda: CompactBookingDataSource.from_snapshot(snapshot),
+        }
+
+        def warm_up(load):
+            datasource = load()
+            for booking_id in ids:
+                datasource.get(booking_id)
+            return datasource
+
+        print(f"bookings:        {args.bookings}")
+        print(f"snapshot file:   {size / 2**20:>9.1f} MiB")
+        for name, load in loaders.items():
+            seconds = best_of(args.repeat, warm_up, load)
+            tracemalloc.start()
+            datasource = warm_up(load)
+            private = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del datasource
+            print(
+                f"{name + ':':<16} {seconds * 1000:>9.1f} ms, "
+                f"{private / 2**20:>7.1f} MiB private"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""
+Run the PMS integration micro-benchmarks and load tests and record the results.
+
+Micro-benchmarks time one operation in a loop and report the best of
+``--repeat`` runs per operation:
+
+* serializer: ``map_bookings`` and the ``BookingSerializer`` mapping and
+  validation pass over ``--bookings`` raw bookings.
+* codec: encoding and decoding the mapped bookings with each available JSON
+  codec. The run fails when the orjson codec is not faster than the stdlib
+  one at either.
+* pms_client: ``PMSClient`` list and detail lookups through the full client
+  pipeline, with simulated latency and failures switched off.
+* base_client: ``BaseAPIClient.get`` against a ``FakePMSServer`` on a local
+  port, so the real httpx transport and JSON parsing are measured.
+
+Load tests send ``--requests`` requests per endpoint to the real ASGI
+application in-process, at most ``--concurrency`` at a time, and report
+throughput, p50/p95/p99 latency and peak RSS. Simulated PMS latency is off
+unless ``--pms-latency`` is given, so the numbers measure this stack. With
+``--pms-http`` the app calls a ``FakePMSServer`` over HTTP instead of the
+in-memory simulation.
+
+Results are written as JSON to ``--output``. With ``--compare`` the run is
+checked against an earlier results file, and the exit status is 1 when any
+benchmark got more than ``--threshold`` percent worse.
+
+    python -m benchmarks.suite --output benchmark-results.json
+    python -m benchmarks.suite --compare benchmark-results.json --output new.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import sys
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+from benchmarks import best_of, make_bookings, setup_django
+
+LOAD_PATHS = {
+    "load.sync_list": "/api/integrations/pms/bookings/",
+    "load.async_list": "/api/integrations/pms/async/bookings/",
+    "load.sync_detail": "/api/integrations/pms/bookings/{booking_id}/",
+    "load.async_detail": "/api/integrations/pms/async/bookings/{booking_id}/",
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Return the nearest-rank percentile of already sorted values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def peak_rss_mb() -> float:
+    """
+    Return the peak resident set size of this process in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def micro_result(name: str, operations: int, seconds: float) -> Dict:
+    return {
+        "name": name,
+        "kind": "micro",
+        "operations": operations,
+        "seconds": round(seconds, 6),
+        "us_per_op": round(seconds / operations * 1e6, 3),
+        "ops_per_second": round(operations / seconds, 1),
+    }
+
+
+def quiet_pms(latency: bool = False) -> ExitStack:
+    """
+    Switch off simulated PMS failures, and latency unless `latency` is set.
+    """
+    from integrations.pms.clients import AsyncPMSClient, PMSClient
+
+    async def no_async_latency(self) -> None:
+        pass
+
+    stack = ExitStack()
+    stack.enter_context(
+        patch("integrations.pms.clients.random.random", return_value=0.5)
+    )
+    if not latency:
+        stack.enter_context(
+            patch.object(PMSClient, "_simulate_network_latency", lambda self: None)
+        )
+        stack.enter_context(
+            patch.object(AsyncPMSClient, "_simulate_network_latency", no_async_latency)
+        )
+    return stack
+
+
+def http_pms(latency: bool = False) -> ExitStack:
+    """
+    Serve the PMS from a FakePMSServer and send the app's PMS requests to it
+    over HTTP, with simulated-like latency if `latency` is set.
+    """
+    from django.test import override_settings
+
+    from integrations.pms.fake_server import FakePMSServer, FaultProfile
+
+    profile = FaultProfile(latency_ms=200, latency_sigma=0.3) if latency else None
+    stack = ExitStack()
+    server = stack.enter_context(FakePMSServer(profile=profile))
+    stack.enter_context(override_settings(PMS_USE_HTTP=True, PMS_API_URL=server.url))
+    return stack
+
+
+def run_micro(bookings: int, lookups: int, repeat: int) -> List[Dict]:
+    from integrations.base.clients import BaseAPIClient
+    from integrations.base.codecs import CODECS, build_json_codec, orjson
+    from integrations.pms.clients import PMSClient
+    from integrations.pms.datasource import get_booking_datasource
+    from integrations.pms.fake_server import FakePMSServer
+    from integrations.pms.serializers import BookingSerializer, map_bookings
+
+    raw = make_bookings(bookings)
+
+    def validate() -> None:
+        serializer = BookingSerializer(
+            data=BookingSerializer(raw, many=True).data, many=True
+        )
+        serializer.is_valid(raise_exception=True)
+
+    results = [
+        micro_result(
+            "serializer.map_bookings", bookings, best_of(repeat, map_bookings, raw)
+        ),
+        micro_result("serializer.validate", bookings, best_of(repeat, validate)),
+    ]
+
+    mapped = map_bookings(raw)
+    for name in CODECS:
+        if name == "orjson" and orjson is None:
+            continue
+        codec = build_json_codec(name)
+        encoded = codec.dumps(mapped)
+        results.append(
+            micro_result(
+                f"codec.{name}.dumps", bookings, best_of(repeat, codec.dumps, mapped)
+            )
+        )
+        results.append(
+            micro_result(
+                f"codec.{name}.loads", bookings, best_of(repeat, codec.loads, encoded)
+            )
+        )
+
+    booking_ids = [booking["id"] for booking in get_booking_datasource().all()]
+    client = PMSClient()
+
+    def pms_details() -> None:
+        for index in range(lookups):
+            client.fetch_booking_by_id(booking_ids[index % len(booking_ids)])
+
+    def pms_lists() -> None:
+        for _ in range(lookups):
+            client.fetch_bookings()
+
+    with quiet_pms():
+        results.append(
+            micro_result(
+                "pms_client.fetch_booking_by_id", lookups, best_of(repeat, pms_details)
+            )
+        )
+        results.append(
+            micro_result(
+                "pms_client.fetch_bookings", lookups, best_of(repeat, pms_lists)
+            )
+        )
+
+    served = raw[:lookups]
+    # Without ETags every call transfers and parses the full body.
+    with FakePMSServer(served, etags=False) as server:
+        http_client = BaseAPIClient(server.url)
+
+        def http_details() -> None:
+            for booking in served:
+                http_client.get(f"/bookings/{booking['id']}/")
+
+        def http_lists() -> None:
+            for _ in range(lookups):
+                http_client.get("/bookings/")
+
+        http_details()  # open the pooled connection
+        results.append(
+            micro_result(
+                "base_client.get_detail", len(served), best_of(repeat, http_details)
+            )
+        )
+        results.append(
+            micro_result(
+                f"base_client.get_list[{len(served)}]",
+                lookups,
+                best_of(repeat, http_lists),
+            )
+        )
+    return results
+
+
+async def load_endpoint(
+    client, name: str, paths: Callable[[int], str], requests: int, concurrency: int
+) -> Dict:
+    """
+    Send `requests` GETs to `paths(n)`, at most `concurrency` in flight, and
+    summarize throughput, latency and memory.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(paths(index))
+            latencies.append(time.perf_counter() - started)
+            statuses.append(response.status_code)
+
+    await client.get(paths(0))  # warm up
+    started = time.perf_counter()
+    await asyncio.gather(*map(one, range(requests)))
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "name": name,
+        "kind": "load",
+        "requests": requests,
+        "concurrency": concurrency,
+        "ok": statuses.count(200),
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(requests / seconds, 1),
+        "latency_ms": {
+            label: round(percentile(latencies, fraction) * 1000, 2)
+            for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def run_load(requests: int, concurrency: int) -> List[Dict]:
+    import httpx
+
+    from core.asgi import application
+    from integrations.pms.datasource import get_booking_datasource
+
+    booking_ids = [booking["id"] for booking in get_booking_datasource().all()]
+    results = []
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=application), base_url="http://benchmark"
+    ) as client:
+        for name, template in LOAD_PATHS.items():
+            results.append(
+                await load_endpoint(
+                    client,
+                    f"{name}[c={concurrency}]",
+                    lambda n, template=template: template.format(
+                        booking_id=booking_ids[n % len(booking_ids)]
+                    ),
+                    requests,
+                    concurrency,
+                )
+            )
+    return results
+
+
+def score(result: Dict) -> float:
+    """
+    Return the figure a result is compared on, where lower is better.
+    """
+    if result["kind"] == "micro":
+        return result["us_per_op"]
+    return result["latency_ms"]["p99"]
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """
+    Print how each benchmark changed against `baseline` and return the names
+    of those that got more than `threshold` percent worse.
+    """
+    previous = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get(result["name"])
+        if before is None or not score(before):
+            continue
+        change = (score(result) - score(before)) / score(before) * 100
+        regressed = change > threshold
+        if result["kind"] == "load":
+            throughput = before["requests_per_second"]
+            regressed |= (
+                throughput - result["requests_per_second"]
+            ) / throughput * 100 > threshold
+        if regressed:
+            regressions.append(result["name"])
+        flag = "REGRESSION" if regressed else ""
+        print(f"{result['name']:<42} {change:>+7.1f}% {flag}")
+    return regressions
+
+
+def slower_codecs(results: List[Dict]) -> List[str]:
+    """
+    Return the orjson codec benchmarks that are not faster than their stdlib
+    counterpart; the orjson codec is only worth its fallbacks when it is.
+    """
+    timings = {result["name"]: result["us_per_op"] for result in results}
+    return [
+        f"codec.orjson.{operation}"
+        for operation in ("dumps", "loads")
+        if f"codec.orjson.{operation}" in timings
+        and timings[f"codec.orjson.{operation}"] >= timings[f"codec.stdlib.{operation}"]
+    ]
+
+
+def print_result(result: Dict) -> None:
+    if result["kind"] == "micro":
+        print(
+            f"{result['name']:<42} {result['us_per_op']:>10.1f} us/op "
+            f"({result['ops_per_second']:.0f} ops/s)"
+        )
+        return
+    latency = result["latency_ms"]
+    print(
+        f"{result['name']:<42} {result['requests_per_second']:>8.1f} req/s "
+        f"p50 {latency['p50']:.1f} p95 {latency['p95']:.1f} "
+        f"p99 {latency['p99']:.1f} ms, {result['ok']}/{result['requests']} ok, "
+        f"rss {result['peak_rss_mb']} MiB"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare with.")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    parser.add_argument("--only", choices=["micro", "load"])
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pms-latency", action="store_true")
+    parser.add_argument("--pms-http", action="store_true")
+    args = parser.parse_args(argv)
+
+    setup_django()
+
+    results = []
+    if args.only != "load":
+        results += run_micro(args.bookings, args.lookups, args.repeat)
+    if args.only != "micro":
+        backend = http_pms if args.pms_http else quiet_pms
+        with backend(latency=args.pms_latency):
+            results += asyncio.run(run_load(args.requests, args.concurrency))
+
+    for result in results:
+        print_result(result)
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "arguments": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+
+    slower = slower_codecs(results)
+    if slower:
+        print(f"orjson codec not faster than stdlib: {', '.join(slower)}")
+        return 1
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"compared with {args.compare} (threshold {args.threshold}%):")
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,4 +13,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from integrations.base.asgi import LifespanMiddleware  # noqa: E402
+from integrations.pms.datasource import get_booking_snapshot  # noqa: E402
+
+# Map the booking snapshot before serving, so no request pays for it.
+application = LifespanMiddleware(django_application, startup=[get_booking_snapshot])
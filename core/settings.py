@@ -73,6 +73,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "integrations.base.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -121,6 +122,32 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+CACHES = {
+    "default": {
+        "BACKEND": env(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": env("CACHE_LOCATION", ""),
+    },
+    # Per-process memory tier in front of `default`, e.g. for
+    # PMS_CACHE_ALIAS=tiered when `default` is a shared network cache
+    "tiered": {
+        "BACKEND": "integrations.base.tiered_cache.TwoTierCache",
+        "LOCATION": "tiered",
+        "OPTIONS": {
+            "L2": "default",
+            # Bytes of pickled values held per process
+            "MAX_BYTES": int(env("CACHE_L1_MAX_BYTES", 64 * 1024 * 1024)),
+            # Seconds a value is served from memory before L2 is asked again
+            "L1_TTL": float(env("CACHE_L1_TTL", 5.0)),
+            # Seconds between checks for writes made by other workers
+            "CHECK_INTERVAL": float(env("CACHE_L1_CHECK_INTERVAL", 0.5)),
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -170,6 +197,15 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Django Rest Framework
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "integrations.base.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "integrations.base.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
@@ -239,3 +275,142 @@ SPECTACULAR_SETTINGS = {
 
 # Integrations
 PMS_API_URL = env("PMS_API_URL", "https://dummy-pms.com/api")
+
+# Named PMS connections, one per hotel property, as "id=url,id=url". Without
+# any, the single PMS_API_URL is the "default" property. Entries set here can
+# also override "TIMEOUT" (seconds) per property
+PMS_PROPERTIES = {
+    property_id: {"URL": url}
+    for property_id, url in (
+        item.split("=", 1) for item in str(env("PMS_PROPERTIES", "")).split(",") if item
+    )
+} or {"default": {"URL": PMS_API_URL}}
+PMS_PROPERTY_TIMEOUT = float(env("PMS_PROPERTY_TIMEOUT", 5.0))
+# Properties queried at once by the multi-property endpoints
+PMS_FANOUT_CONCURRENCY = int(env("PMS_FANOUT_CONCURRENCY", 10))
+
+# Optional JSON/NDJSON file of raw PMS bookings served by the simulated PMS
+# instead of the bundled mock data
+PMS_FIXTURE_PATH = env("PMS_FIXTURE_PATH")
+
+# Hold the simulated PMS bookings as compact columns (see
+# integrations.pms.store) instead of one dict per booking, for large fixtures
+PMS_COMPACT_STORE = env("PMS_COMPACT_STORE", "False") == "True"
+
+# Booking snapshot written by `python manage.py snapshot_pms_bookings`. When
+# set, workers memory-map it instead of loading the fixture, sharing one copy
+# of the bookings through the OS page cache, and cold booking caches read it
+PMS_SNAPSHOT_PATH = env("PMS_SNAPSHOT_PATH")
+
+# Send PMS requests over HTTP to PMS_API_URL instead of answering them from
+# the in-memory simulation, e.g. against `python manage.py run_fake_pms`
+PMS_USE_HTTP = env("PMS_USE_HTTP", "False") == "True"
+
+# Pagination of the booking list endpoints, e.g.
+# "integrations.pms.pagination.BookingCursorPagination" for cursor pagination
+PMS_PAGINATION_CLASS = env(
+    "PMS_PAGINATION_CLASS", REST_FRAMEWORK["DEFAULT_PAGINATION_CLASS"]
+)
+
+# Local Booking mirror: rows per bulk upsert when syncing, and whether the
+# booking read endpoints serve from the mirror instead of the PMS
+PMS_SYNC_BATCH_SIZE = int(env("PMS_SYNC_BATCH_SIZE", 1000))
+PMS_READ_FROM_MIRROR = env("PMS_READ_FROM_MIRROR", "False") == "True"
+
+# Batch booking lookups: IDs accepted per request, and PMS requests in
+# flight at once for IDs that are not cached
+PMS_BATCH_MAX_IDS = int(env("PMS_BATCH_MAX_IDS", 100))
+PMS_BATCH_CONCURRENCY = int(env("PMS_BATCH_CONCURRENCY", 10))
+
+# Booking webhooks pushed by the PMS: the shared HMAC secret (webhooks are
+# refused while unset), seconds an event ID is remembered to drop
+# redeliveries, and events accepted per delivery
+PMS_WEBHOOK_SECRET = env("PMS_WEBHOOK_SECRET", "")
+PMS_WEBHOOK_DEDUPE_TTL = int(env("PMS_WEBHOOK_DEDUPE_TTL", 86400))
+PMS_WEBHOOK_MAX_EVENTS = int(env("PMS_WEBHOOK_MAX_EVENTS", 500))
+
+# Seconds before the room availability index is re-synced with the bookings
+PMS_AVAILABILITY_MAX_AGE = float(env("PMS_AVAILABILITY_MAX_AGE", 30))
+
+# Seconds before the columnar analytics snapshot is rebuilt from the bookings
+PMS_ANALYTICS_MAX_AGE = float(env("PMS_ANALYTICS_MAX_AGE", 60))
+
+# Read-through booking cache in front of the PMS (seconds)
+PMS_CACHE = {
+    "ALIAS": env("PMS_CACHE_ALIAS", "default"),
+    "TTL": {
+        "bookings": int(env("PMS_CACHE_BOOKINGS_TTL", 30)),
+        "booking": int(env("PMS_CACHE_BOOKING_TTL", 60)),
+    },
+    # How long past expiry a cached payload may be served when the PMS fails
+    "STALE_TTL": int(env("PMS_CACHE_STALE_TTL", 300)),
+    # Fraction of the TTL after which hits trigger a background refresh
+    "REFRESH_AHEAD": float(env("PMS_CACHE_REFRESH_AHEAD", 0.8)),
+}
+
+# Prefetch scheduler keeping the booking list and the most requested
+# bookings cached ahead of requests. Run it with `./manage.py run_pms_prefetch`,
+# or on a thread of each web worker with PMS_PREFETCH_IN_PROCESS
+PMS_PREFETCH = {
+    "IN_PROCESS": env("PMS_PREFETCH_IN_PROCESS", "False") == "True",
+    # Seconds between ticks, spread by +/- JITTER of it
+    "INTERVAL": float(env("PMS_PREFETCH_INTERVAL", 10.0)),
+    "JITTER": float(env("PMS_PREFETCH_JITTER", 0.2)),
+    # Most requested bookings kept warm, and PMS requests in flight at once
+    "HOT_BOOKINGS": int(env("PMS_PREFETCH_HOT_BOOKINGS", 50)),
+    "CONCURRENCY": int(env("PMS_PREFETCH_CONCURRENCY", 4)),
+    # Longest delay between ticks while the PMS is failing
+    "BACKOFF_MAX": float(env("PMS_PREFETCH_BACKOFF_MAX", 300.0)),
+}
+
+# Shared HTTP connection pools, one per upstream base URL
+HTTP_TRANSPORT = {
+    "MAX_CONNECTIONS": int(env("HTTP_MAX_CONNECTIONS", 100)),
+    "MAX_KEEPALIVE_CONNECTIONS": int(env("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)),
+    "KEEPALIVE_EXPIRY": float(env("HTTP_KEEPALIVE_EXPIRY", 5.0)),
+}
+
+# JSON codec of API responses, request bodies and upstream responses: "auto"
+# uses orjson when installed, otherwise the stdlib; "orjson" or "stdlib" force one
+JSON_CODEC = env("JSON_CODEC", "auto")
+
+# Upstream ETags and parsed bodies kept for If-None-Match revalidation
+HTTP_ETAG_CACHE_SIZE = int(env("HTTP_ETAG_CACHE_SIZE", 256))
+
+# Upstream retries: exponential backoff with full jitter, a per-request
+# deadline that also caps each attempt's timeout, and a per-upstream token
+# bucket that caps retry volume
+HTTP_RETRY = {
+    "MAX_ATTEMPTS": int(env("HTTP_RETRY_MAX_ATTEMPTS", 3)),
+    "RETRY_ON_STATUS": [429, 500, 502, 503, 504],
+    "RETRY_ON_EXCEPTIONS": [
+        "integrations.base.exceptions.ExternalAPITimeoutError",
+        "integrations.base.exceptions.ExternalAPIConnectionError",
+    ],
+    "BACKOFF_BASE": float(env("HTTP_RETRY_BACKOFF_BASE", 0.1)),
+    "BACKOFF_MAX": float(env("HTTP_RETRY_BACKOFF_MAX", 2.0)),
+    "DEADLINE": float(env("HTTP_RETRY_DEADLINE", 10.0)),
+    "BUDGET_CAPACITY": int(env("HTTP_RETRY_BUDGET_CAPACITY", 10)),
+    "BUDGET_REFILL_RATE": float(env("HTTP_RETRY_BUDGET_REFILL_RATE", 1.0)),
+}
+
+# Per-upstream circuit breakers over a sliding window of recent calls
+HTTP_CIRCUIT_BREAKER = {
+    "WINDOW_SIZE": int(env("HTTP_CIRCUIT_WINDOW_SIZE", 20)),
+    "MINIMUM_CALLS": int(env("HTTP_CIRCUIT_MINIMUM_CALLS", 10)),
+    "FAILURE_RATE_THRESHOLD": float(env("HTTP_CIRCUIT_FAILURE_RATE", 0.5)),
+    "SLOW_CALL_DURATION": float(env("HTTP_CIRCUIT_SLOW_CALL_DURATION", 2.0)),
+    "SLOW_CALL_RATE_THRESHOLD": float(env("HTTP_CIRCUIT_SLOW_CALL_RATE", 0.8)),
+    "OPEN_DURATION": float(env("HTTP_CIRCUIT_OPEN_DURATION", 30.0)),
+    "HALF_OPEN_MAX_CALLS": int(env("HTTP_CIRCUIT_HALF_OPEN_MAX_CALLS", 3)),
+    # Share the open state across worker processes through the cache
+    "SHARED": env("HTTP_CIRCUIT_SHARED", "False") == "True",
+    "CACHE_ALIAS": env("HTTP_CIRCUIT_CACHE_ALIAS", "default"),
+}
+
+# Request instrumentation: per-phase durations in a Server-Timing header and
+# a log line per request, plus the histograms at /api/integrations/metrics/
+INSTRUMENTATION = {
+    "SERVER_TIMING": env("INSTRUMENTATION_SERVER_TIMING", "True") == "True",
+    "LOG_REQUESTS": env("INSTRUMENTATION_LOG_REQUESTS", "True") == "True",
+}
@@ -33,6 +33,7 @@ urlpatterns = (
     [
         path("", lambda request: redirect("swagger-ui")),  # Redirect root to Swagger UI
         path("admin/", admin.site.urls),
+        path(f"{integrations_base_url}/", include("integrations.base.urls")),
         path(f"{integrations_base_url}/pms/", include("integrations.pms.urls")),
     ]
     + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
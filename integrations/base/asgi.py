@@ -0,0 +1,52 @@
+from typing import Callable, Iterable
+
+from integrations.base.transports import transport_registry
+
+
+class LifespanMiddleware:
+    """
+    ASGI middleware that answers lifespan events for the Django application.
+
+    Django's ASGI handler only speaks HTTP, so without this wrapper servers
+    such as uvicorn skip lifespan entirely and pooled upstream connections are
+    never closed on shutdown.
+    """
+
+    def __init__(self, app, startup: Iterable[Callable[[], object]] = ()) -> None:
+        """
+        Args:
+            app: The ASGI application to wrap.
+            startup (Iterable[Callable[[], object]]): Functions run once on
+                lifespan startup, before the server accepts requests, to load
+                process-wide resources.
+        """
+        self.app = app
+        self.startup_hooks = tuple(startup)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "lifespan":
+            await self.app(scope, receive, send)
+            return
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def startup(self) -> None:
+        """
+        Run the startup hooks, before the worker serves requests.
+        """
+        for hook in self.startup_hooks:
+            hook()
+
+    async def shutdown(self) -> None:
+        """
+        Release process-wide resources before the worker exits.
+        """
+        await transport_registry.aclose_all()
@@ -0,0 +1,316 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from integrations.base.exceptions import (
+    ExternalAPICircuitOpenError,
+    ExternalAPIConnectionError,
+    ExternalAPIResponseError,
+    ExternalAPITimeoutError,
+)
+
+DEFAULT_CIRCUIT_BREAKER_SETTINGS = {
+    "WINDOW_SIZE": 20,
+    "MINIMUM_CALLS": 10,
+    "FAILURE_RATE_THRESHOLD": 0.5,
+    "SLOW_CALL_DURATION": 2.0,
+    "SLOW_CALL_RATE_THRESHOLD": 0.8,
+    "OPEN_DURATION": 30.0,
+    "HALF_OPEN_MAX_CALLS": 3,
+    "SHARED": False,
+    "CACHE_ALIAS": "default",
+}
+
+
+def get_circuit_breaker_settings() -> dict:
+    """
+    Return the circuit breaker settings, with `settings.HTTP_CIRCUIT_BREAKER`
+    overriding the defaults.
+    """
+    return {
+        **DEFAULT_CIRCUIT_BREAKER_SETTINGS,
+        **getattr(settings, "HTTP_CIRCUIT_BREAKER", {}),
+    }
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    """
+    Thresholds for a circuit breaker.
+
+    Attributes:
+        window_size (int): Number of most recent calls the rates are computed over.
+        minimum_calls (int): Calls required in the window before the breaker can trip.
+        failure_rate_threshold (float): Failure share that opens the circuit.
+        slow_call_duration (float): Seconds after which a call counts as slow.
+        slow_call_rate_threshold (float): Slow-call share that opens the circuit.
+        open_duration (float): Seconds to fail fast before allowing trial calls.
+        half_open_max_calls (int): Successful trial calls required to close again.
+        shared (bool): Share the open state with other processes through the cache.
+        cache_alias (str): Django cache alias used when `shared` is set.
+    """
+
+    window_size: int = 20
+    minimum_calls: int = 10
+    failure_rate_threshold: float = 0.5
+    slow_call_duration: float = 2.0
+    slow_call_rate_threshold: float = 0.8
+    open_duration: float = 30.0
+    half_open_max_calls: int = 3
+    shared: bool = False
+    cache_alias: str = "default"
+
+    @classmethod
+    def from_settings(cls) -> "CircuitBreakerConfig":
+        breaker_settings = get_circuit_breaker_settings()
+        return cls(
+            **{field.lower(): value for field, value in breaker_settings.items()}
+        )
+
+
+def is_failure(error: Exception) -> bool:
+    """
+    Return whether an error says something about the upstream's health.
+
+    Client errors such as 404 are the caller's problem and do not count.
+    """
+    if isinstance(error, ExternalAPIResponseError):
+        return error.status_code >= 500 or error.status_code == 429
+    return isinstance(error, (ExternalAPITimeoutError, ExternalAPIConnectionError))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream, with closed, open and half-open states.
+
+    While closed, the outcome and duration of the last `window_size` calls
+    are recorded; once the window holds `minimum_calls` calls and either the
+    failure rate or the slow-call rate reaches its threshold, the circuit
+    opens. An open circuit rejects calls with ExternalAPICircuitOpenError
+    until `open_duration` has passed, then lets up to `half_open_max_calls`
+    trial calls through: any failure reopens it, enough successes close it.
+
+    With `shared` enabled the open state is also written to the Django cache,
+    so every worker process fails fast as soon as one of them trips.
+    """
+
+    def __init__(self, name: str, config: CircuitBreakerConfig) -> None:
+        self.name = name
+        self.config = config
+        self.state = CircuitState.CLOSED
+        self._window: deque = deque(maxlen=config.window_size)
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache_key(self) -> str:
+        return f"circuit-breaker:{self.name}"
+
+    def _shared_opened_at(self) -> Optional[float]:
+        if not self.config.shared:
+            return None
+        return caches[self.config.cache_alias].get(self.cache_key)
+
+    def _publish_open(self) -> None:
+        if self.config.shared:
+            caches[self.config.cache_alias].set(
+                self.cache_key, self._opened_at, self.config.open_duration
+            )
+
+    def _publish_closed(self) -> None:
+        if self.config.shared:
+            caches[self.config.cache_alias].delete(self.cache_key)
+
+    def _open(self, opened_at: Optional[float] = None) -> None:
+        self.state = CircuitState.OPEN
+        self._opened_at = opened_at or time.time()
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+
+    def _close(self) -> None:
+        self.state = CircuitState.CLOSED
+        self._window.clear()
+
+    def rates(self) -> tuple:
+        """
+        Return the (failure rate, slow-call rate) over the current window.
+        """
+        calls = len(self._window)
+        if not calls:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, was_slow in self._window if was_slow)
+        return failures / calls, slow / calls
+
+    def before_call(self) -> Optional[float]:
+        """
+        Admit a call or raise ExternalAPICircuitOpenError.
+
+        Returns:
+            Optional[float]: For a half-open trial call, when the circuit it
+            probes was opened, to pass to `release` if the call ends without
+            an outcome; None otherwise.
+        """
+        shared_opened_at = self._shared_opened_at()
+        with self._lock:
+            if shared_opened_at and shared_opened_at > self._opened_at:
+                self._open(shared_opened_at)
+
+            if self.state == CircuitState.OPEN:
+                if time.time() - self._opened_at < self.config.open_duration:
+                    raise ExternalAPICircuitOpenError(
+                        f"Circuit breaker for {self.name} is open."
+                    )
+                self.state = CircuitState.HALF_OPEN
+
+            if self.state == CircuitState.HALF_OPEN:
+                if self._half_open_calls >= self.config.half_open_max_calls:
+                    raise ExternalAPICircuitOpenError(
+                        f"Circuit breaker for {self.name} is half-open."
+                    )
+                self._half_open_calls += 1
+                return self._opened_at
+        return None
+
+    def release(self, trial: Optional[float]) -> None:
+        """
+        Give back the half-open slot of an admitted call that ended without
+        an outcome, e.g. because it was cancelled, so it neither counts as a
+        failure nor keeps the circuit from being probed again.
+        """
+        if trial is None:
+            return
+        with self._lock:
+            if (
+                self.state == CircuitState.HALF_OPEN
+                and self._opened_at == trial
+                and self._half_open_calls
+            ):
+                self._half_open_calls -= 1
+
+    def record(self, failed: bool, duration: float) -> None:
+        """
+        Record the outcome of an admitted call and update the state.
+        """
+        slow = duration >= self.config.slow_call_duration
+        publish = None
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                    publish = self._publish_open
+                else:
+                    self._half_open_successes += 1
+                    if self._half_open_successes >= self.config.half_open_max_calls:
+                        self._close()
+                        publish = self._publish_closed
+            elif self.state == CircuitState.CLOSED:
+                self._window.append((failed, slow))
+                if len(self._window) >= self.config.minimum_calls:
+                    failure_rate, slow_rate = self.rates()
+                    if (
+                        failure_rate >= self.config.failure_rate_threshold
+                        or slow_rate >= self.config.slow_call_rate_threshold
+                    ):
+                        self._open()
+                        publish = self._publish_open
+        if publish is not None:
+            publish()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Call `fn` through the breaker.
+        """
+        trial = self.before_call()
+        started_at = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            self.record(is_failure(e), time.monotonic() - started_at)
+            raise
+        except BaseException:
+            # Interrupted, e.g. KeyboardInterrupt: there is no outcome.
+            self.release(trial)
+            raise
+        self.record(False, time.monotonic() - started_at)
+        return result
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn` through the breaker.
+        """
+        trial = self.before_call()
+        started_at = time.monotonic()
+        try:
+            result = await fn()
+        except Exception as e:
+            self.record(is_failure(e), time.monotonic() - started_at)
+            raise
+        except BaseException:
+            # Cancelled: there is no outcome.
+            self.release(trial)
+            raise
+        self.record(False, time.monotonic() - started_at)
+        return result
+
+    def stats(self) -> dict:
+        """
+        Return the current state and window rates.
+        """
+        with self._lock:
+            failure_rate, slow_rate = self.rates()
+            return {
+                "name": self.name,
+                "state": str(self.state),
+                "calls": len(self._window),
+                "failure_rate": round(failure_rate, 3),
+                "slow_call_rate": round(slow_rate, 3),
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker:
+    """
+    Return the process-wide circuit breaker for an upstream base URL.
+    """
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(upstream)
+            if breaker is None:
+                breaker = _breakers[upstream] = CircuitBreaker(
+                    upstream, CircuitBreakerConfig.from_settings()
+                )
+    return breaker
+
+
+def circuit_breaker_stats() -> list:
+    """
+    Return the stats of every circuit breaker in this process.
+    """
+    return [breaker.stats() for breaker in list(_breakers.values())]
+
+
+def reset_circuit_breakers() -> None:
+    """
+    Forget every circuit breaker, e.g. after changing settings.
+    """
+    with _breakers_lock:
+        _breakers.clear()
@@ -1,12 +1,213 @@
-from typing import Any, Optional
+import asyncio
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional
 
 import httpx
 
+from integrations.base.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from integrations.base.codecs import get_json_codec
+from integrations.base.conditional import StoredResponse, upstream_etags
 from integrations.base.exceptions import (
     ExternalAPIConnectionError,
     ExternalAPIResponseError,
     ExternalAPITimeoutError,
 )
+from integrations.base.instrumentation import phase
+from integrations.base.retry import Retrier, RetryPolicy, get_retry_budget
+from integrations.base.transports import transport_registry
+
+
+@contextmanager
+def translate_http_errors() -> Iterator[None]:
+    """
+    Translate httpx errors raised inside the block into ExternalAPIException
+    subclasses. Shared by the sync and async clients.
+    """
+    try:
+        yield
+    except httpx.HTTPStatusError as e:
+        raise ExternalAPIResponseError(
+            status_code=e.response.status_code, message=str(e)
+        )
+    except httpx.ConnectTimeout:
+        raise ExternalAPITimeoutError("API request timed out")
+    except httpx.ReadTimeout:
+        raise ExternalAPITimeoutError("API read timed out")
+    except httpx.RequestError as e:
+        raise ExternalAPIConnectionError(f"API request failed: {str(e)}")
+
+
+def conditional_kwargs(stored: Optional[StoredResponse]) -> dict:
+    """
+    Return the request kwargs revalidating a stored upstream response with
+    `If-None-Match`, or none when nothing is stored.
+    """
+    if stored is None:
+        return {}
+    return {"headers": {"If-None-Match": stored.etag}}
+
+
+def conditional_result(
+    key: str, response: httpx.Response, stored: Optional[StoredResponse]
+) -> Any:
+    """
+    Return the body of `response` decoded by the JSON codec, or the stored
+    body when the upstream answered 304, and remember the response's ETag.
+
+    Raises:
+        httpx.HTTPStatusError: If the response is an error.
+    """
+    if response.status_code == 304 and stored is not None:
+        upstream_etags.record_hit()
+        return stored.value
+    response.raise_for_status()
+    value = get_json_codec().loads(response.content)
+    upstream_etags.put(key, response.headers.get("ETag"), value)
+    return value
+
+
+def request_key(method: str, url: str, params: Optional[dict] = None) -> str:
+    """
+    Build a canonical key for a request from its method, URL and query params.
+
+    Params are sorted so that logically identical requests share a key.
+    """
+    if not params:
+        return f"{method} {url}"
+    query = httpx.QueryParams(sorted(httpx.QueryParams(params).multi_items()))
+    return f"{method} {url}?{query}"
+
+
+class _Call:
+    """
+    A single in-flight call shared by its leader and any waiting followers.
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one execution (threaded mode).
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block until it finishes and receive the same result or
+    exception. Nothing is cached once the call completes.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` for `key`, or wait for the in-flight call with the same key.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """
+        Return the number of calls seen and how many were collapsed.
+        """
+        return {"calls": self.calls, "collapsed": self.collapsed}
+
+
+class _LeaderCancelled(Exception):
+    """
+    Handed to the followers of an async call whose leader was cancelled.
+    """
+
+
+class AsyncSingleFlight:
+    """
+    Collapse concurrent identical calls into one execution (asyncio mode).
+
+    Calls are shared only between coroutines on the same event loop. When
+    the leading coroutine is cancelled (e.g. its client disconnected), a
+    waiting follower takes over the call instead of being cancelled too.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn` for `key`, or wait for the in-flight call with the same key.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (loop, key)
+        self.calls += 1
+
+        future = self._calls.get(loop_key)
+        while future is not None:
+            self.collapsed += 1
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # The leader's caller went away, not ours: take over the call.
+                self.collapsed -= 1
+                future = self._calls.get(loop_key)
+
+        future = self._calls[loop_key] = loop.create_future()
+        # Mark the outcome as retrieved even when no follower awaits it.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._calls[loop_key]
+
+    def stats(self) -> dict:
+        """
+        Return the number of calls seen and how many were collapsed.
+        """
+        return {"calls": self.calls, "collapsed": self.collapsed}
+
+
+single_flight = SingleFlight()
+async_single_flight = AsyncSingleFlight()
 
 
 class BaseAPIClient:
@@ -16,18 +217,43 @@ class BaseAPIClient:
     Handles base URL composition, HTTP GET requests, and standardized
     error handling. Subclasses can use or extend this client to integrate
     with external systems.
+
+    The underlying `httpx.Client` is taken from the process-wide transport
+    registry, so clients built per request reuse pooled keep-alive connections.
+    Upstream ETags are stored and sent back as `If-None-Match`, so unchanged
+    responses come back as 304 and reuse the parsed body. Concurrent
+    identical GET requests are coalesced into one upstream call,
+    retryable failures are retried under the client's RetryPolicy, and every
+    attempt passes through the upstream's circuit breaker.
     """
 
-    def __init__(self, base_url: str, timeout: float = 5.0) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 5.0,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
         """
         Initialize the API client.
 
         Args:
             base_url (str): Base URL of the external API (e.g., https://api.example.com).
             timeout (float): Request timeout in seconds.
+            retry_policy (Optional[RetryPolicy]): Retry policy, defaults to
+                `settings.HTTP_RETRY`.
         """
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.Client(timeout=timeout)
+        self.timeout = timeout
+        self.client = transport_registry.get_client(self.base_url, timeout=timeout)
+        self.retrier = self._build_retrier(retry_policy)
+        self.circuit_breaker: CircuitBreaker = get_circuit_breaker(self.base_url)
+
+    def _build_retrier(self, retry_policy: Optional[RetryPolicy]) -> Retrier:
+        return Retrier(
+            upstream=self.base_url,
+            policy=retry_policy or RetryPolicy.from_settings(),
+            budget=get_retry_budget(self.base_url),
+        )
 
     def _build_url(self, path: str) -> str:
         """
@@ -55,18 +281,160 @@ class BaseAPIClient:
         Raises:
             ExternalAPIException: If the request fails or returns an error status.
         """
+        return self._execute(path, params, partial(self._send, path, params))
+
+    def _execute(
+        self,
+        path: str,
+        params: Optional[dict],
+        request: Callable[[Optional[float]], Any],
+    ) -> Any:
+        """
+        Run `request` with retries through the circuit breaker, coalesced with
+        identical concurrent requests, timed as the `upstream` phase. Each
+        attempt is called with the time left before the retry deadline.
+        """
+        with phase("upstream"):
+            return self._coalesced(
+                path,
+                params,
+                lambda: self.retrier.call(
+                    lambda timeout: self.circuit_breaker.call(partial(request, timeout))
+                ),
+            )
+
+    def _coalesced(
+        self, path: str, params: Optional[dict], request: Callable[[], Any]
+    ) -> Any:
+        """
+        Run `request`, sharing its outcome with identical concurrent requests.
+        """
+        key = request_key("GET", self._build_url(path), params)
+        return single_flight.do(key, request)
+
+    def _timeout_kwargs(self, timeout: Optional[float]) -> dict:
+        """
+        Return the httpx arguments capping an attempt at `timeout` seconds,
+        the time left before the retry deadline, when that is shorter than
+        the client timeout.
+        """
+        if timeout is None or timeout >= self.timeout:
+            return {}
+        return {"timeout": timeout}
+
+    def _send(
+        self, path: str, params: Optional[dict] = None, timeout: Optional[float] = None
+    ) -> Any:
         url = self._build_url(path)
-        try:
-            response = self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise ExternalAPIResponseError(
-                status_code=e.response.status_code, message=str(e)
+        key = request_key("GET", url, params)
+        stored = upstream_etags.get(key)
+        with translate_http_errors():
+            response = self.client.get(
+                url,
+                params=params,
+                **conditional_kwargs(stored),
+                **self._timeout_kwargs(timeout),
+            )
+            return conditional_result(key, response, stored)
+
+
+class AsyncBaseAPIClient(BaseAPIClient):
+    """
+    Asyncio counterpart of BaseAPIClient built on `httpx.AsyncClient`.
+
+    Awaiting a request releases the event loop instead of blocking a worker
+    thread, so a single ASGI worker can keep many slow upstream calls in
+    flight at once.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 5.0,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        """
+        Initialize the API client.
+
+        Args:
+            base_url (str): Base URL of the external API (e.g., https://api.example.com).
+            timeout (float): Request timeout in seconds.
+            retry_policy (Optional[RetryPolicy]): Retry policy, defaults to
+                `settings.HTTP_RETRY`.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retrier = self._build_retrier(retry_policy)
+        self.circuit_breaker: CircuitBreaker = get_circuit_breaker(self.base_url)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Pooled async client bound to the running event loop.
+        """
+        return transport_registry.get_async_client(self.base_url, timeout=self.timeout)
+
+    async def get(self, path: str, params: Optional[dict] = None) -> Any:
+        """
+        Send a GET request to the given API path and return the parsed JSON response.
+
+        Args:
+            path (str): Relative API path (e.g., '/bookings/').
+            params (Optional[dict]): Optional query parameters.
+
+        Returns:
+            Any: Parsed JSON response (usually a dict or list).
+
+        Raises:
+            ExternalAPIException: If the request fails or returns an error status.
+        """
+        return await self._execute(path, params, partial(self._send, path, params))
+
+    async def _execute(
+        self,
+        path: str,
+        params: Optional[dict],
+        request: Callable[[Optional[float]], Awaitable[Any]],
+    ) -> Any:
+        """
+        Await `request` with retries through the circuit breaker, coalesced
+        with identical concurrent requests, timed as the `upstream` phase.
+        Each attempt is called with the time left before the retry deadline.
+        """
+        with phase("upstream"):
+            return await self._coalesced(
+                path,
+                params,
+                lambda: self.retrier.acall(
+                    lambda timeout: self.circuit_breaker.acall(
+                        partial(request, timeout)
+                    )
+                ),
+            )
+
+    async def _coalesced(
+        self,
+        path: str,
+        params: Optional[dict],
+        request: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Await `request`, sharing its outcome with identical concurrent requests.
+        """
+        key = request_key("GET", self._build_url(path), params)
+        return await async_single_flight.do(key, request)
+
+    async def _send(
+        self, path: str, params: Optional[dict] = None, timeout: Optional[float] = None
+    ) -> Any:
+        url = self._build_url(path)
+        key = request_key("GET", url, params)
+        stored = upstream_etags.get(key)
+        with translate_http_errors():
+            response = await self.client.get(
+                url,
+                params=params,
+                **conditional_kwargs(stored),
+                **self._timeout_kwargs(timeout),
             )
-        except httpx.ConnectTimeout:
-            raise ExternalAPITimeoutError("API request timed out")
-        except httpx.ReadTimeout:
-            raise ExternalAPITimeoutError("API read timed out")
-        except httpx.RequestError as e:
-            raise ExternalAPIConnectionError(f"API request failed: {str(e)}")
+            return conditional_result(key, response, stored)
@@ -0,0 +1,186 @@
+import json
+import math
+import threading
+from typing import Any, Optional, Union
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Escaped by DRF's JSONRenderer so output is a strict JavaScript subset.
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+def escape_line_separators(content: bytes) -> bytes:
+    for raw, escaped in LINE_SEPARATORS:
+        if raw in content:
+            content = content.replace(raw, escaped)
+    return content
+
+
+class StdlibJSONCodec:
+    """
+    JSON codec on the stdlib `json` module, encoding like DRF's JSONRenderer
+    with its default settings: compact, unescaped UTF-8, NaN rejected.
+    """
+
+    name = "stdlib"
+
+    def __init__(self) -> None:
+        self._encoder = JSONEncoder(
+            ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        return escape_line_separators(self._encoder.encode(value).encode())
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        return json.loads(content)
+
+
+def _has_non_finite_floats(value: Any) -> bool:
+    """
+    Return whether `value` holds a NaN or an infinity, which orjson writes
+    as `null` and the stdlib rejects.
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+# Maps every digit to 0, so a single search finds any digit followed by `e`.
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_NUMBER_CHARS = frozenset(b"0123456789.-")
+_NUMBER_PRECEDERS = frozenset(b":,[")
+
+
+def _in_number(content: bytes, index: int) -> bool:
+    # A number follows a separator; in a string the same bytes follow text.
+    while index > 0 and content[index - 1] in _NUMBER_CHARS:
+        index -= 1
+    return index == 0 or content[index - 1] in _NUMBER_PRECEDERS
+
+
+def _has_unportable_numbers(content: bytes) -> bool:
+    """
+    Return whether orjson output holds a number the stdlib formats
+    differently: exponent forms (`1e16` and `1e-7` vs `1e+16` and `1e-07`)
+    and floats below 1e-4, which orjson may write in full (`0.000099` vs
+    `9.9e-05`). Searched with C-level byte scans; strings that look like
+    such a number only cost a stdlib fallback.
+    """
+    for searched, marker in (
+        (content, b"0.0000"),
+        (content.translate(_DIGITS_TO_ZERO), b"0e"),
+    ):
+        found = searched.find(marker)
+        while found != -1:
+            if _in_number(content, found):
+                return True
+            found = searched.find(marker, found + 1)
+    return False
+
+
+class _UnportableFloat(Exception):
+    pass
+
+
+class OrjsonJSONCodec(StdlibJSONCodec):
+    """
+    JSON codec on orjson, byte-compatible with StdlibJSONCodec.
+
+    Dates, times and datetimes are passed to DRF's encoder so they keep its
+    formatting (e.g. `Z` for UTC), and non-string keys are stringified like
+    the stdlib does. Values orjson cannot encode, such as integers beyond 64
+    bits, and floats it formats differently (exponent form, tiny values, NaN
+    and infinities) fall back to the stdlib codec. They are detected in the
+    encoded bytes, so payloads without them are never walked in Python.
+    Decoding reads the bytes directly, without decoding them to a str first.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def _default(self, value: Any) -> Any:
+        encoded = self._encoder.default(value)
+        # e.g. Decimals, which DRF's encoder may turn into floats.
+        if _has_non_finite_floats(encoded):
+            raise _UnportableFloat
+        return encoded
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            content = orjson.dumps(value, default=self._default, option=self._options)
+        except orjson.JSONEncodeError:
+            return super().dumps(value)
+        # Checked on the output, so the common case never walks the payload
+        # in Python: only payloads with a `null` can hold a non-finite float.
+        if _has_unportable_numbers(content) or (
+            b"null" in content and _has_non_finite_floats(value)
+        ):
+            return super().dumps(value)
+        return escape_line_separators(content)
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        return orjson.loads(content)
+
+
+CODECS = {"stdlib": StdlibJSONCodec, "orjson": OrjsonJSONCodec}
+
+_codec: Optional[StdlibJSONCodec] = None
+_codec_lock = threading.Lock()
+
+
+def build_json_codec(name: str) -> StdlibJSONCodec:
+    """
+    Build the codec called `name`; `auto` picks orjson when it is installed.
+
+    Raises:
+        ImproperlyConfigured: For unknown codecs, or orjson when missing.
+    """
+    if name == "auto":
+        name = "orjson" if orjson is not None else "stdlib"
+    if name not in CODECS:
+        raise ImproperlyConfigured(
+            f"Unknown JSON_CODEC {name!r}, expected auto, {', '.join(CODECS)}."
+        )
+    if name == "orjson" and orjson is None:
+        raise ImproperlyConfigured("JSON_CODEC is 'orjson' but it is not installed.")
+    return CODECS[name]()
+
+
+def get_json_codec() -> StdlibJSONCodec:
+    """
+    Return the process-wide codec chosen by `settings.JSON_CODEC`.
+    """
+    global _codec
+    if _codec is None:
+        with _codec_lock:
+            if _codec is None:
+                _codec = build_json_codec(getattr(settings, "JSON_CODEC", "auto"))
+    return _codec
+
+
+def reset_json_codec() -> None:
+    """
+    Drop the process-wide codec so it is rebuilt from settings on next use.
+    """
+    global _codec
+    with _codec_lock:
+        _codec = None
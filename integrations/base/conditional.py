@@ -0,0 +1,197 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from django.conf import settings
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+
+def content_etag(value: Any) -> str:
+    """
+    Return a strong validator for a JSON-compatible payload: a hash of its
+    canonical JSON encoding, so equal payloads always share a validator.
+
+    Payloads with a `content_digest()` method, such as CompactBookingStore,
+    supply their own hash instead. Other mappings and sequences are encoded
+    like dicts and lists.
+    """
+    content_digest = getattr(value, "content_digest", None)
+    if content_digest is not None:
+        return content_digest()
+    encoded = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=_json_default
+    )
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+        return list(value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class Validators:
+    """
+    Validators of an upstream dataset, used to build response ETags.
+
+    Attributes:
+        etag (str): Opaque version of the data, changing whenever it does.
+        last_modified (Optional[float]): Epoch seconds of the last change.
+    """
+
+    etag: str
+    last_modified: Optional[float] = None
+
+
+def representation_etag(request, validators: Validators) -> str:
+    """
+    Return the quoted strong ETag of a response built from data with
+    `validators`. It covers the full path and negotiated media type, since
+    query params and renderers change the representation.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        validators.etag,
+        request.get_full_path(),
+        getattr(request, "accepted_media_type", "") or "",
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return quote_etag(digest.hexdigest())
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    # If-None-Match uses the weak comparison function.
+    tags = parse_etags(if_none_match)
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def not_modified_response(request, validators: Validators) -> Optional[Response]:
+    """
+    Return a 304 response when the request's `If-None-Match` (or, without
+    it, `If-Modified-Since`) shows the client already holds this
+    representation, otherwise None.
+    """
+    etag = representation_etag(request, validators)
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        fresh = _etag_matches(etag, if_none_match)
+    else:
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+        fresh = (
+            since is not None
+            and validators.last_modified is not None
+            and int(validators.last_modified) <= since
+        )
+    if not fresh:
+        return None
+    return set_validators(Response(status=HTTP_304_NOT_MODIFIED), request, validators)
+
+
+def set_validators(response, request, validators: Validators):
+    """
+    Set the `ETag` and `Last-Modified` headers of a response built from data
+    with `validators`, and return it.
+    """
+    response["ETag"] = representation_etag(request, validators)
+    if validators.last_modified is not None:
+        response["Last-Modified"] = http_date(validators.last_modified)
+    return response
+
+
+def conditional_response(
+    request, validators: Validators, build: Callable[[], Response]
+) -> Response:
+    """
+    Answer a conditional GET: 304 when the client already holds the current
+    representation, so nothing is mapped or rendered, otherwise the response
+    from `build` with its validators set when it is a 200.
+    """
+    response = not_modified_response(request, validators)
+    if response is not None:
+        return response
+    response = build()
+    if response.status_code == HTTP_200_OK:
+        set_validators(response, request, validators)
+    return response
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """
+    An upstream ETag and the parsed body it validates.
+    """
+
+    etag: str
+    value: Any
+
+
+class UpstreamETagStore:
+    """
+    Bounded LRU of upstream ETags and parsed bodies, keyed by request.
+
+    Clients send the stored ETag as `If-None-Match` and reuse the stored
+    body on 304, so unchanged upstream responses are neither transferred
+    nor parsed again. Holds `settings.HTTP_ETAG_CACHE_SIZE` entries.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self._entries: "OrderedDict[Hashable, StoredResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self.hits = 0
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, "HTTP_ETAG_CACHE_SIZE", 256)
+
+    def get(self, key: Hashable) -> Optional[StoredResponse]:
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is not None:
+                self._entries.move_to_end(key)
+            return stored
+
+    def put(self, key: Hashable, etag: Optional[str], value: Any) -> None:
+        """
+        Store `value` under `key` if the upstream sent an ETag, otherwise
+        forget any previous entry.
+        """
+        with self._lock:
+            if not etag or self.max_entries <= 0:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = StoredResponse(etag, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of stored entries and of 304 answers served.
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits}
+
+
+upstream_etags = UpstreamETagStore()
@@ -43,3 +43,12 @@ class ExternalAPITimeoutError(ExternalAPIException):
     """
 
     pass
+
+
+class ExternalAPICircuitOpenError(ExternalAPIException):
+    """
+    Raised without contacting the external API because its circuit breaker
+    is open after too many recent failures or slow calls.
+    """
+
+    pass
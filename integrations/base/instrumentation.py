@@ -0,0 +1,219 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+DEFAULT_INSTRUMENTATION_SETTINGS = {
+    "SERVER_TIMING": True,
+    "LOG_REQUESTS": True,
+    "BUCKETS": [
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    ],
+}
+
+
+def get_instrumentation_settings() -> dict:
+    """
+    Return the instrumentation settings, with `settings.INSTRUMENTATION`
+    overriding the defaults.
+    """
+    return {
+        **DEFAULT_INSTRUMENTATION_SETTINGS,
+        **getattr(settings, "INSTRUMENTATION", {}),
+    }
+
+
+class RequestTimings:
+    """
+    Seconds spent per phase while serving one request.
+
+    Phases repeated within a request, e.g. several upstream calls, add up.
+    """
+
+    __slots__ = ("phases",)
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """
+    Return the timings of the request being served, if any.
+    """
+    return _current_timings.get()
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bounds, in the Prometheus sense.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(sorted(bounds))
+        # One count per bound, plus +Inf.
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[Tuple[str, int]], float, int]:
+        """
+        Return the cumulative `(le, count)` buckets, the sum and the count.
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        buckets, running = [], 0
+        for bound, bucket_count in zip((*self.bounds, float("inf")), counts):
+            running += bucket_count
+            buckets.append(("+Inf" if bound == float("inf") else repr(bound), running))
+        return buckets, total, count
+
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """
+    In-process histograms keyed by metric name and labels, rendered in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        """
+        Return the histogram of `name` with `labels`, creating it on first use.
+        """
+        key = tuple(sorted(labels.items()))
+        series = self._histograms.get(name)
+        histogram = series.get(key) if series is not None else None
+        if histogram is None:
+            with self._lock:
+                series = self._histograms.setdefault(name, {})
+                histogram = series.get(key)
+                if histogram is None:
+                    histogram = Histogram(get_instrumentation_settings()["BUCKETS"])
+                    series[key] = histogram
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        self.histogram(name, **labels).observe(seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        Return every histogram in the Prometheus text format.
+        """
+        with self._lock:
+            metrics = {name: dict(series) for name, series in self._histograms.items()}
+        lines = []
+        for name in sorted(metrics):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(metrics[name].items()):
+                buckets, total, count = histogram.snapshot()
+                for le, bucket_count in buckets:
+                    lines.append(
+                        f"{name}_bucket{_labels(labels + (('le', le),))} {bucket_count}"
+                    )
+                lines.append(f"{name}_sum{_labels(labels)} {total}")
+                lines.append(f"{name}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+metrics = MetricsRegistry()
+metrics.describe(
+    "http_request_duration_seconds", "Time to serve a request, by route and status."
+)
+metrics.describe("request_phase_duration_seconds", "Time spent per request phase.")
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """
+    Add `seconds` to phase `name` of the current request and its histogram.
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+    metrics.observe("request_phase_duration_seconds", seconds, phase=name)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Time the block as phase `name`, e.g. `upstream`, `serialize` or
+    `render`. Cheap enough to leave on: two clock reads and a histogram
+    update.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """
+    Collect the phases timed while the block runs, including on threads and
+    tasks that inherit the current context.
+    """
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
@@ -0,0 +1,98 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from integrations.base.instrumentation import (
+    get_instrumentation_settings,
+    metrics,
+    record_phase,
+    request_timings,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    Time every request and the phases it went through.
+
+    Phases timed inside the request (upstream calls, serialization) and the
+    response render are reported in a `Server-Timing` header and a
+    `key=value` log line, and observed in the histograms served by the
+    metrics endpoint. Works under WSGI and ASGI without switching modes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with request_timings() as timings:
+            response = self.get_response(request)
+        return self.finish(request, response, timings, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with request_timings() as timings:
+            response = await self.get_response(request)
+        return self.finish(request, response, timings, started)
+
+    def process_template_response(self, request, response):
+        # Called right before a DRF response is rendered, in the request's
+        # context; the callback runs once rendering is done.
+        render_started = time.perf_counter()
+
+        def rendered(response):
+            record_phase("render", time.perf_counter() - render_started)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, timings, started):
+        total = time.perf_counter() - started
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+        metrics.observe(
+            "http_request_duration_seconds",
+            total,
+            route=route,
+            method=request.method,
+            status=str(response.status_code),
+        )
+
+        instrumentation = get_instrumentation_settings()
+        phases = {**timings.phases, "total": total}
+        if instrumentation["SERVER_TIMING"]:
+            response["Server-Timing"] = ", ".join(
+                f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.items()
+            )
+        if instrumentation["LOG_REQUESTS"] and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "method=%s route=%s status=%s %s",
+                request.method,
+                route,
+                response.status_code,
+                " ".join(
+                    f"{name}_ms={seconds * 1000:.2f}"
+                    for name, seconds in phases.items()
+                ),
+                extra={
+                    "method": request.method,
+                    "route": route,
+                    "status": response.status_code,
+                    "timings_ms": {
+                        name: round(seconds * 1000, 2)
+                        for name, seconds in phases.items()
+                    },
+                },
+            )
+        return response
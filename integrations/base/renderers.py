@@ -0,0 +1,21 @@
+from rest_framework.renderers import JSONRenderer
+
+from integrations.base.codecs import get_json_codec
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding through the configured JSON codec.
+
+    Output is byte-identical to JSONRenderer with the default compact,
+    unicode, strict settings. Indented output (`; indent=N`, the browsable
+    API) and non-default JSON settings are left to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        return get_json_codec().dumps(data)
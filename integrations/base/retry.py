@@ -0,0 +1,298 @@
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from integrations.base.exceptions import (
+    ExternalAPIConnectionError,
+    ExternalAPIResponseError,
+    ExternalAPITimeoutError,
+)
+
+DEFAULT_RETRY_SETTINGS = {
+    "MAX_ATTEMPTS": 3,
+    "RETRY_ON_STATUS": [429, 500, 502, 503, 504],
+    "RETRY_ON_EXCEPTIONS": [
+        "integrations.base.exceptions.ExternalAPITimeoutError",
+        "integrations.base.exceptions.ExternalAPIConnectionError",
+    ],
+    "BACKOFF_BASE": 0.1,
+    "BACKOFF_MAX": 2.0,
+    "DEADLINE": 10.0,
+    "BUDGET_CAPACITY": 10,
+    "BUDGET_REFILL_RATE": 1.0,
+}
+
+
+def get_retry_settings() -> dict:
+    """
+    Return the retry settings, with `settings.HTTP_RETRY` overriding the
+    defaults.
+    """
+    return {**DEFAULT_RETRY_SETTINGS, **getattr(settings, "HTTP_RETRY", {})}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Describes which failures are retried and how long to wait between attempts.
+
+    Attributes:
+        max_attempts (int): Total attempts including the first one.
+        retry_on_status (FrozenSet[int]): Upstream status codes worth retrying.
+        retry_on_exceptions (Tuple[type, ...]): Exception classes worth retrying.
+        backoff_base (float): Delay cap before the first retry, doubled per attempt.
+        backoff_max (float): Upper bound on any single delay.
+        deadline (Optional[float]): Seconds the whole request may take: no
+            attempt starts past it, and each attempt's timeout is capped at
+            the time left.
+    """
+
+    max_attempts: int = 3
+    retry_on_status: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    retry_on_exceptions: Tuple[type, ...] = (
+        ExternalAPITimeoutError,
+        ExternalAPIConnectionError,
+    )
+    backoff_base: float = 0.1
+    backoff_max: float = 2.0
+    deadline: Optional[float] = 10.0
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        retry_settings = get_retry_settings()
+        return cls(
+            max_attempts=retry_settings["MAX_ATTEMPTS"],
+            retry_on_status=frozenset(retry_settings["RETRY_ON_STATUS"]),
+            retry_on_exceptions=tuple(
+                import_string(path) for path in retry_settings["RETRY_ON_EXCEPTIONS"]
+            ),
+            backoff_base=retry_settings["BACKOFF_BASE"],
+            backoff_max=retry_settings["BACKOFF_MAX"],
+            deadline=retry_settings["DEADLINE"],
+        )
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, ExternalAPIResponseError):
+            return error.status_code in self.retry_on_status
+        return isinstance(error, self.retry_on_exceptions)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the delay before retrying after `attempt` failed attempts,
+        using exponential backoff with full jitter.
+        """
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+
+class RetryBudget:
+    """
+    Token bucket that limits how many retries an upstream may receive.
+
+    Every retry spends one token; tokens refill at a fixed rate up to the
+    bucket capacity. When the bucket is empty, failures are returned to the
+    caller instead of being retried, so retries cannot multiply load on an
+    upstream that is already failing.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float) -> None:
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._updated_at = now
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self) -> bool:
+        """
+        Spend one token if available.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryMetrics:
+    """
+    Per-upstream counters for individual attempts and for retry give-ups.
+
+    Attempts are counted by attempt number and outcome (`success`,
+    `retryable_error` or `error`), so the share of requests that only
+    succeeded on a later attempt is visible.
+    """
+
+    def __init__(self) -> None:
+        self._attempts: Counter = Counter()
+        self._give_ups: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record_attempt(self, upstream: str, attempt: int, outcome: str) -> None:
+        with self._lock:
+            self._attempts[(upstream, attempt, outcome)] += 1
+
+    def record_give_up(self, upstream: str, reason: str) -> None:
+        with self._lock:
+            self._give_ups[(upstream, reason)] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Return the counters grouped by upstream.
+        """
+        with self._lock:
+            attempts = dict(self._attempts)
+            give_ups = dict(self._give_ups)
+
+        snapshot: Dict[str, Dict] = {}
+        for (upstream, attempt, outcome), count in attempts.items():
+            upstream_stats = snapshot.setdefault(
+                upstream, {"attempts": {}, "give_ups": {}}
+            )
+            upstream_stats["attempts"].setdefault(str(attempt), {})[outcome] = count
+        for (upstream, reason), count in give_ups.items():
+            upstream_stats = snapshot.setdefault(
+                upstream, {"attempts": {}, "give_ups": {}}
+            )
+            upstream_stats["give_ups"][reason] = count
+        return snapshot
+
+
+retry_metrics = RetryMetrics()
+
+_budgets: Dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(upstream: str) -> RetryBudget:
+    """
+    Return the process-wide retry budget for an upstream base URL.
+    """
+    budget = _budgets.get(upstream)
+    if budget is None:
+        with _budgets_lock:
+            budget = _budgets.get(upstream)
+            if budget is None:
+                retry_settings = get_retry_settings()
+                budget = _budgets[upstream] = RetryBudget(
+                    capacity=retry_settings["BUDGET_CAPACITY"],
+                    refill_rate=retry_settings["BUDGET_REFILL_RATE"],
+                )
+    return budget
+
+
+def reset_retry_budgets() -> None:
+    """
+    Forget every retry budget, e.g. after changing settings.
+    """
+    with _budgets_lock:
+        _budgets.clear()
+
+
+@dataclass
+class Retrier:
+    """
+    Runs a request under a RetryPolicy, spending tokens from a RetryBudget and
+    recording every attempt in RetryMetrics.
+
+    Each attempt is called with the seconds left before the policy deadline,
+    or None without one, so it can cap its own timeout and the request ends
+    near the deadline even when an attempt hangs.
+    """
+
+    upstream: str
+    policy: RetryPolicy
+    budget: RetryBudget
+    metrics: RetryMetrics = field(default=retry_metrics)
+
+    def _next_delay(self, error: Exception, attempt: int, started_at: float):
+        """
+        Return the delay before the next attempt, or None to give up.
+        """
+        if not self.policy.is_retryable(error):
+            self.metrics.record_attempt(self.upstream, attempt, "error")
+            return None
+
+        self.metrics.record_attempt(self.upstream, attempt, "retryable_error")
+        if attempt >= self.policy.max_attempts:
+            self.metrics.record_give_up(self.upstream, "max_attempts")
+            return None
+
+        delay = self.policy.backoff(attempt)
+        if self.policy.deadline is not None:
+            elapsed = time.monotonic() - started_at
+            if elapsed + delay >= self.policy.deadline:
+                self.metrics.record_give_up(self.upstream, "deadline")
+                return None
+
+        if not self.budget.try_acquire():
+            self.metrics.record_give_up(self.upstream, "budget")
+            return None
+        return delay
+
+    def _remaining(self, started_at: float) -> Optional[float]:
+        """
+        Return the seconds left before the deadline, or None without one.
+        """
+        if self.policy.deadline is None:
+            return None
+        return max(self.policy.deadline - (time.monotonic() - started_at), 0.0)
+
+    def call(self, fn: Callable[[Optional[float]], Any]) -> Any:
+        """
+        Call `fn` with the time left before the deadline, retrying retryable
+        failures.
+        """
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = fn(self._remaining(started_at))
+            except Exception as e:
+                delay = self._next_delay(e, attempt, started_at)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            else:
+                self.metrics.record_attempt(self.upstream, attempt, "success")
+                return result
+
+    async def acall(self, fn: Callable[[Optional[float]], Awaitable[Any]]) -> Any:
+        """
+        Await `fn` with the time left before the deadline, retrying retryable
+        failures.
+        """
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await fn(self._remaining(started_at))
+            except Exception as e:
+                delay = self._next_delay(e, attempt, started_at)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+            else:
+                self.metrics.record_attempt(self.upstream, attempt, "success")
+                return result
@@ -0,0 +1,62 @@
+import threading
+from typing import Hashable, List
+
+
+class CountMinSketch:
+    """
+    Approximate per-key counters in fixed memory.
+
+    Each key maps to one counter per row; its estimate is the smallest of
+    them, which never undercounts and overcounts by a bounded amount for a
+    given width. Counters are only raised when they are the key's minimum
+    (conservative update), which tightens estimates for rare keys. Once
+    `reset_after` keys have been added, every counter is halved, so the
+    estimates follow recent popularity rather than all-time totals.
+
+    Keys are hashed with `hash()`, so sketches are only comparable within
+    one process.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, reset_after: int = 0):
+        """
+        Args:
+            width (int): Counters per row; more means fewer collisions.
+            depth (int): Rows; more means collisions are less likely to add up.
+            reset_after (int): Additions between halvings, 0 to never age.
+        """
+        self.width = width
+        self.depth = depth
+        self.reset_after = reset_after
+        self.additions = 0
+        self.halvings = 0
+        self._rows: List[List[int]] = [[0] * width for _ in range(depth)]
+        self._lock = threading.Lock()
+
+    def _columns(self, key: Hashable) -> List[int]:
+        return [hash((row, key)) % self.width for row in range(self.depth)]
+
+    def add(self, key: Hashable) -> int:
+        """
+        Count one occurrence of `key` and return its new estimate.
+        """
+        columns = self._columns(key)
+        with self._lock:
+            estimate = min(row[column] for row, column in zip(self._rows, columns)) + 1
+            for row, column in zip(self._rows, columns):
+                if row[column] < estimate:
+                    row[column] = estimate
+            self.additions += 1
+            if self.reset_after and self.additions >= self.reset_after:
+                self._halve()
+        return estimate
+
+    def estimate(self, key: Hashable) -> int:
+        columns = self._columns(key)
+        with self._lock:
+            return min(row[column] for row, column in zip(self._rows, columns))
+
+    def _halve(self) -> None:
+        for row in self._rows:
+            row[:] = [count >> 1 for count in row]
+        self.additions = 0
+        self.halvings += 1
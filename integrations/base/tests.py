@@ -1,15 +1,82 @@
-from unittest.mock import Mock, patch
+import asyncio
+import io
+import json
+import threading
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import skipIf
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
-from django.test import TestCase
-from rest_framework.status import HTTP_404_NOT_FOUND
+from asgiref.sync import async_to_sync
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+from rest_framework.test import APIRequestFactory, APITestCase
 
-from integrations.base.clients import BaseAPIClient
+from integrations.base.asgi import LifespanMiddleware
+from integrations.base.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitState,
+    reset_circuit_breakers,
+)
+from integrations.base.clients import (
+    AsyncBaseAPIClient,
+    AsyncSingleFlight,
+    BaseAPIClient,
+    SingleFlight,
+    request_key,
+)
+from integrations.base.codecs import (
+    CODECS,
+    build_json_codec,
+    orjson,
+    reset_json_codec,
+)
+from integrations.base.conditional import UpstreamETagStore, upstream_etags
 from integrations.base.exceptions import (
+    ExternalAPICircuitOpenError,
     ExternalAPIConnectionError,
     ExternalAPIResponseError,
     ExternalAPITimeoutError,
 )
+from integrations.base.instrumentation import (
+    Histogram,
+    metrics,
+    phase,
+    request_timings,
+)
+from integrations.base.parsers import FastJSONParser
+from integrations.base.renderers import FastJSONRenderer
+from integrations.base.retry import (
+    Retrier,
+    RetryBudget,
+    RetryMetrics,
+    RetryPolicy,
+    reset_retry_budgets,
+)
+from integrations.base.sketch import CountMinSketch
+from integrations.base.tiered_cache import MemoryTier, TwoTierCache, _tiers
+from integrations.base.transports import TransportRegistry, transport_registry
+from integrations.base.views import AsyncAPIView
+
+
+def json_response(data, status_code=HTTP_200_OK, etag=None):
+    """Build a mock httpx response with a JSON body and optional ETag."""
+    response = Mock(spec=httpx.Response)
+    response.status_code = status_code
+    response.headers = httpx.Headers({"ETag": etag} if etag else {})
+    response.content = json.dumps(data).encode()
+    response.raise_for_status.return_value = None
+    return response
 
 
 class BaseAPIClientTests(TestCase):
@@ -25,6 +92,9 @@ class BaseAPIClientTests(TestCase):
 
     def setUp(self):
         """Initialize test client with base URL."""
+        reset_circuit_breakers()
+        reset_retry_budgets()
+        upstream_etags.clear()
         self.api_client = BaseAPIClient(base_url=self.BASE_URL)
 
     def test_build_url(self):
@@ -47,9 +117,7 @@ class BaseAPIClientTests(TestCase):
 
     def test_get_success(self):
         """Test successful GET request with mock response."""
-        mock_response = Mock(spec=httpx.Response)
-        mock_response.json.return_value = {"data": "test"}
-        mock_response.raise_for_status.return_value = None
+        mock_response = json_response({"data": "test"})
 
         with patch.object(self.api_client.client, "get", return_value=mock_response):
             result = self.api_client.get(self.TEST_ENDPOINT)
@@ -88,9 +156,7 @@ class BaseAPIClientTests(TestCase):
 
     def test_get_with_params(self):
         """Test GET request with query parameters."""
-        mock_response = Mock(spec=httpx.Response)
-        mock_response.json.return_value = {"data": "test"}
-        mock_response.raise_for_status.return_value = None
+        mock_response = json_response({"data": "test"})
 
         with patch.object(
             self.api_client.client, "get", return_value=mock_response
@@ -99,3 +165,1031 @@ class BaseAPIClientTests(TestCase):
             mock_get.assert_called_once_with(
                 f"{self.BASE_URL}/test", params={"key": "value"}
             )
+
+    @patch("integrations.base.retry.time.sleep")
+    def test_get_retries_retryable_status(self, mock_sleep):
+        """Test that a retryable upstream status is retried until success."""
+        failed_response = Mock(spec=httpx.Response)
+        failed_response.status_code = 503
+        failed_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "503 Service Unavailable", request=Mock(), response=failed_response
+        )
+        ok_response = json_response({"data": "test"})
+
+        with patch.object(
+            self.api_client.client, "get", side_effect=[failed_response, ok_response]
+        ) as mock_get:
+            result = self.api_client.get(self.TEST_ENDPOINT)
+
+        self.assertEqual(result, {"data": "test"})
+        self.assertEqual(mock_get.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    def test_get_revalidates_with_upstream_etag(self):
+        """Test that a 304 reuses the stored body without parsing."""
+        first = json_response({"data": "test"}, etag='"v1"')
+        not_modified = json_response(None, status_code=304)
+
+        with patch.object(
+            self.api_client.client, "get", side_effect=[first, not_modified]
+        ) as mock_get:
+            self.api_client.get(self.TEST_ENDPOINT)
+            result = self.api_client.get(self.TEST_ENDPOINT)
+
+        self.assertEqual(result, {"data": "test"})
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'}
+        )
+        not_modified.json.assert_not_called()
+        self.assertEqual(upstream_etags.stats(), {"entries": 1, "hits": 1})
+
+    def test_etag_store_is_bounded(self):
+        """Test LRU eviction and that responses without an ETag are dropped."""
+        store = UpstreamETagStore(max_entries=2)
+        store.put("a", '"1"', 1)
+        store.put("b", '"2"', 2)
+        store.get("a")
+        store.put("c", '"3"', 3)
+
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("a").value, 1)
+
+        store.put("a", None, 4)
+        self.assertIsNone(store.get("a"))
+
+
+class AsyncBaseAPIClientTests(TestCase):
+    """
+    Test suite for the AsyncBaseAPIClient class.
+    """
+
+    BASE_URL = "https://api.example.com"
+    TEST_ENDPOINT = "/test"
+
+    def setUp(self):
+        """Initialize test client with base URL."""
+        upstream_etags.clear()
+        self.api_client = AsyncBaseAPIClient(base_url=self.BASE_URL)
+        self.mock_client = Mock(spec=httpx.AsyncClient)
+        patcher = patch.object(
+            transport_registry, "get_async_client", return_value=self.mock_client
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_success(self):
+        """Test successful GET request with mock response."""
+        mock_response = json_response({"data": "test"})
+        self.mock_client.get = AsyncMock(return_value=mock_response)
+
+        result = async_to_sync(self.api_client.get)(
+            self.TEST_ENDPOINT, params={"key": "value"}
+        )
+
+        self.assertEqual(result, {"data": "test"})
+        self.mock_client.get.assert_awaited_once_with(
+            f"{self.BASE_URL}/test", params={"key": "value"}
+        )
+
+    def test_get_revalidates_with_upstream_etag(self):
+        """Test that a 304 reuses the stored body."""
+        self.mock_client.get = AsyncMock(
+            side_effect=[
+                json_response({"data": "test"}, etag='W/"v1"'),
+                json_response(None, status_code=304),
+            ]
+        )
+
+        async_to_sync(self.api_client.get)(self.TEST_ENDPOINT)
+        result = async_to_sync(self.api_client.get)(self.TEST_ENDPOINT)
+
+        self.assertEqual(result, {"data": "test"})
+        self.mock_client.get.assert_awaited_with(
+            f"{self.BASE_URL}/test", params=None, headers={"If-None-Match": 'W/"v1"'}
+        )
+
+    def test_get_http_error(self):
+        """Test GET request with 404 error response."""
+        mock_response = Mock(spec=httpx.Response)
+        mock_response.status_code = HTTP_404_NOT_FOUND
+        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "404 Not Found", request=Mock(), response=mock_response
+        )
+        self.mock_client.get = AsyncMock(return_value=mock_response)
+
+        with self.assertRaises(ExternalAPIResponseError) as cm:
+            async_to_sync(self.api_client.get)(self.TEST_ENDPOINT)
+        self.assertEqual(cm.exception.status_code, HTTP_404_NOT_FOUND)
+
+    def test_get_timeout(self):
+        """Test GET request timeout handling."""
+        self.mock_client.get = AsyncMock(side_effect=httpx.ReadTimeout("Timeout"))
+
+        with self.assertRaises(ExternalAPITimeoutError):
+            async_to_sync(self.api_client.get)(self.TEST_ENDPOINT)
+
+
+class RetryTests(TestCase):
+    """
+    Test suite for the retry policy, retry budget and retrier.
+    """
+
+    UPSTREAM = "https://api.example.com"
+
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, backoff_base=0.1, backoff_max=0.3)
+        self.budget = RetryBudget(capacity=10, refill_rate=0)
+        self.metrics = RetryMetrics()
+        self.retrier = Retrier(self.UPSTREAM, self.policy, self.budget, self.metrics)
+        patcher = patch("integrations.base.retry.time.sleep")
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_is_retryable(self):
+        """Test retryable status codes and exception classes."""
+        self.assertTrue(self.policy.is_retryable(ExternalAPIResponseError(502)))
+        self.assertFalse(self.policy.is_retryable(ExternalAPIResponseError(404)))
+        self.assertTrue(self.policy.is_retryable(ExternalAPITimeoutError()))
+        self.assertTrue(self.policy.is_retryable(ExternalAPIConnectionError()))
+        self.assertFalse(self.policy.is_retryable(ValueError()))
+
+    def test_backoff_is_capped_with_jitter(self):
+        """Test exponential backoff bounds with full jitter."""
+        with patch("integrations.base.retry.random.uniform") as mock_uniform:
+            for attempt in range(1, 5):
+                self.policy.backoff(attempt)
+        caps = [call.args[1] for call in mock_uniform.call_args_list]
+        self.assertEqual(caps, [0.1, 0.2, 0.3, 0.3])
+
+    def test_retries_until_success(self):
+        """Test that retryable failures are retried and attempts recorded."""
+        fn = Mock(side_effect=[ExternalAPIResponseError(502), {"data": "test"}])
+
+        self.assertEqual(self.retrier.call(fn), {"data": "test"})
+
+        self.assertEqual(fn.call_count, 2)
+        self.assertEqual(self.budget.tokens, 9)
+        self.assertEqual(
+            self.metrics.snapshot()[self.UPSTREAM]["attempts"],
+            {"1": {"retryable_error": 1}, "2": {"success": 1}},
+        )
+
+    def test_non_retryable_error_raised_immediately(self):
+        """Test that non-retryable failures are not retried."""
+        fn = Mock(side_effect=ExternalAPIResponseError(404))
+
+        with self.assertRaises(ExternalAPIResponseError):
+            self.retrier.call(fn)
+
+        fn.assert_called_once()
+        self.mock_sleep.assert_not_called()
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that the last failure is raised once attempts are exhausted."""
+        fn = Mock(side_effect=ExternalAPITimeoutError("API read timed out"))
+
+        with self.assertRaises(ExternalAPITimeoutError):
+            self.retrier.call(fn)
+
+        self.assertEqual(fn.call_count, 3)
+        self.assertEqual(
+            self.metrics.snapshot()[self.UPSTREAM]["give_ups"], {"max_attempts": 1}
+        )
+
+    def test_empty_budget_stops_retries(self):
+        """Test that retries stop when the retry budget is spent."""
+        retrier = Retrier(
+            self.UPSTREAM, self.policy, RetryBudget(capacity=1, refill_rate=0)
+        )
+        fn = Mock(side_effect=ExternalAPIResponseError(503))
+
+        with self.assertRaises(ExternalAPIResponseError):
+            retrier.call(fn)
+
+        self.assertEqual(fn.call_count, 2)
+
+    def test_deadline_stops_retries(self):
+        """Test that no attempt starts past the request deadline."""
+        policy = RetryPolicy(max_attempts=5, deadline=0)
+        retrier = Retrier(self.UPSTREAM, policy, self.budget, self.metrics)
+        fn = Mock(side_effect=ExternalAPIConnectionError("refused"))
+
+        with self.assertRaises(ExternalAPIConnectionError):
+            retrier.call(fn)
+
+        fn.assert_called_once()
+        self.assertEqual(
+            self.metrics.snapshot()[self.UPSTREAM]["give_ups"], {"deadline": 1}
+        )
+
+    @patch("integrations.base.retry.time.monotonic")
+    def test_attempts_get_the_time_left(self, mock_monotonic):
+        """Test that each attempt is passed the time left before the deadline."""
+        mock_monotonic.side_effect = [100.0, 100.0, 102.5, 102.5, 106.0]
+        policy = RetryPolicy(max_attempts=3, deadline=10)
+        retrier = Retrier(self.UPSTREAM, policy, self.budget, self.metrics)
+        fn = Mock(side_effect=[ExternalAPITimeoutError(), {"data": "test"}])
+
+        self.assertEqual(retrier.call(fn), {"data": "test"})
+
+        self.assertEqual([call.args for call in fn.call_args_list], [(10.0,), (4.0,)])
+
+    def test_attempts_without_deadline_get_no_time_left(self):
+        """Test that attempts are passed None when the policy has no deadline."""
+        retrier = Retrier(self.UPSTREAM, RetryPolicy(deadline=None), self.budget)
+        fn = Mock(return_value={"data": "test"})
+
+        retrier.call(fn)
+
+        fn.assert_called_once_with(None)
+
+    def test_async_retries_until_success(self):
+        """Test that async calls are retried the same way."""
+        fn = AsyncMock(side_effect=[ExternalAPITimeoutError(), {"data": "test"}])
+
+        with patch("integrations.base.retry.asyncio.sleep") as mock_sleep:
+            result = async_to_sync(self.retrier.acall)(fn)
+
+        self.assertEqual(result, {"data": "test"})
+        mock_sleep.assert_awaited_once()
+
+    @patch("integrations.base.retry.time.monotonic")
+    def test_budget_refills_over_time(self, mock_monotonic):
+        """Test that spent tokens are refilled at the configured rate."""
+        mock_monotonic.return_value = 100.0
+        budget = RetryBudget(capacity=1, refill_rate=2)
+
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+        mock_monotonic.return_value = 100.5
+        self.assertTrue(budget.try_acquire())
+
+    def test_retry_stats_endpoint(self):
+        """Test that retry metrics are exposed."""
+        response = self.client.get(reverse("retry_stats"))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+
+class CircuitBreakerTests(TestCase):
+    """
+    Test suite for the per-upstream circuit breaker.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.config = CircuitBreakerConfig(
+            window_size=4,
+            minimum_calls=4,
+            failure_rate_threshold=0.5,
+            slow_call_duration=1.0,
+            slow_call_rate_threshold=1.0,
+            open_duration=30.0,
+            half_open_max_calls=2,
+        )
+        self.breaker = CircuitBreaker("https://api.example.com", self.config)
+
+    def fail(self, breaker=None):
+        with self.assertRaises(ExternalAPIResponseError):
+            (breaker or self.breaker).call(
+                Mock(side_effect=ExternalAPIResponseError(502))
+            )
+
+    def test_opens_on_failure_rate(self):
+        """Test that the circuit opens once the failure rate threshold is hit."""
+        self.breaker.call(Mock())
+        self.breaker.call(Mock())
+        self.fail()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+        self.fail()
+
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        upstream = Mock()
+        with self.assertRaises(ExternalAPICircuitOpenError):
+            self.breaker.call(upstream)
+        upstream.assert_not_called()
+
+    def test_client_errors_do_not_count(self):
+        """Test that 4xx responses do not trip the breaker."""
+        for _ in range(4):
+            with self.assertRaises(ExternalAPIResponseError):
+                self.breaker.call(Mock(side_effect=ExternalAPIResponseError(404)))
+
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    @patch("integrations.base.circuit_breaker.time.monotonic")
+    def test_opens_on_slow_calls(self, mock_monotonic):
+        """Test that the circuit opens when every call in the window is slow."""
+        mock_monotonic.side_effect = [0.0, 2.0] * 4
+
+        for _ in range(4):
+            self.breaker.call(Mock())
+
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+    @patch("integrations.base.circuit_breaker.time.time")
+    def test_half_open_closes_after_successful_trials(self, mock_time):
+        """Test the open -> half-open -> closed transition."""
+        mock_time.return_value = 1000.0
+        for _ in range(4):
+            self.fail()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        mock_time.return_value = 1031.0
+        self.breaker.call(Mock())
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.breaker.call(Mock())
+
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    @patch("integrations.base.circuit_breaker.time.time")
+    def test_half_open_failure_reopens(self, mock_time):
+        """Test that a failed trial call reopens the circuit."""
+        mock_time.return_value = 1000.0
+        for _ in range(4):
+            self.fail()
+
+        mock_time.return_value = 1031.0
+        self.fail()
+
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+    @patch("integrations.base.circuit_breaker.time.time")
+    def test_cancelled_trials_release_their_slots(self, mock_time):
+        """Test that cancelled or interrupted trials do not block later ones."""
+        mock_time.return_value = 1000.0
+        for _ in range(4):
+            self.fail()
+        mock_time.return_value = 1031.0
+
+        async def cancel_trial():
+            started = asyncio.Event()
+
+            async def hang():
+                started.set()
+                await asyncio.Event().wait()
+
+            task = asyncio.ensure_future(self.breaker.acall(hang))
+            await started.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        for _ in range(self.config.half_open_max_calls):
+            async_to_sync(cancel_trial)()
+        with self.assertRaises(KeyboardInterrupt):
+            self.breaker.call(Mock(side_effect=KeyboardInterrupt))
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+
+        self.breaker.call(Mock())
+        self.breaker.call(Mock())
+
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_shared_state_trips_other_workers(self):
+        """Test that an open circuit is shared through the cache."""
+        config = CircuitBreakerConfig(**{**self.config.__dict__, "shared": True})
+        worker_a = CircuitBreaker("https://shared.example.com", config)
+        worker_b = CircuitBreaker("https://shared.example.com", config)
+
+        for _ in range(4):
+            self.fail(worker_a)
+
+        with self.assertRaises(ExternalAPICircuitOpenError):
+            worker_b.call(Mock())
+        self.assertEqual(worker_b.state, CircuitState.OPEN)
+
+    def test_open_circuit_is_not_retried(self):
+        """Test that the client fails fast without retrying an open circuit."""
+        reset_circuit_breakers()
+        api_client = BaseAPIClient(base_url="https://open.example.com")
+        api_client.circuit_breaker.state = CircuitState.OPEN
+        api_client.circuit_breaker._opened_at = time.time()
+
+        with patch.object(api_client.client, "get") as mock_get:
+            with self.assertRaises(ExternalAPICircuitOpenError):
+                api_client.get("/test")
+
+        mock_get.assert_not_called()
+
+    def test_async_client_goes_through_breaker(self):
+        """Test that async requests trip the circuit, then fail fast."""
+        api_client = AsyncBaseAPIClient(
+            base_url="https://async-open.example.com",
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        api_client.circuit_breaker = CircuitBreaker(api_client.base_url, self.config)
+        mock_client = Mock(spec=httpx.AsyncClient)
+        mock_client.get = AsyncMock(side_effect=httpx.ConnectError("refused"))
+
+        with patch.object(
+            transport_registry, "get_async_client", return_value=mock_client
+        ):
+            for _ in range(4):
+                with self.assertRaises(ExternalAPIConnectionError):
+                    async_to_sync(api_client.get)("/test")
+            self.assertEqual(api_client.circuit_breaker.state, CircuitState.OPEN)
+
+            with self.assertRaises(ExternalAPICircuitOpenError):
+                async_to_sync(api_client.get)("/test")
+
+        self.assertEqual(mock_client.get.await_count, 4)
+
+    def test_circuit_stats_endpoint(self):
+        """Test that circuit breaker states are exposed."""
+        response = self.client.get(reverse("circuit_stats"))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+
+class SingleFlightTests(TestCase):
+    """
+    Test suite for request coalescing in threaded and asyncio modes.
+    """
+
+    def test_request_key_ignores_param_order(self):
+        """Test that identical requests share a key regardless of param order."""
+        url = "https://api.example.com/test"
+
+        self.assertEqual(
+            request_key("GET", url, {"a": 1, "b": 2}),
+            request_key("GET", url, {"b": 2, "a": 1}),
+        )
+        self.assertNotEqual(request_key("GET", url), request_key("GET", url, {"a": 1}))
+
+    def test_threaded_calls_collapsed(self):
+        """Test that concurrent threads share one execution and its result."""
+        flight = SingleFlight()
+        release = threading.Event()
+        executions = []
+        results = []
+
+        def upstream():
+            executions.append(1)
+            release.wait(timeout=5)
+            return {"data": "test"}
+
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("key", upstream)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while flight.calls < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(results, [{"data": "test"}] * 5)
+        self.assertEqual(flight.stats(), {"calls": 5, "collapsed": 4})
+
+    def test_threaded_exception_shared(self):
+        """Test that waiting threads receive the leader's exception."""
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def upstream():
+            release.wait(timeout=5)
+            raise ExternalAPITimeoutError("API read timed out")
+
+        def call():
+            try:
+                flight.do("key", upstream)
+            except ExternalAPITimeoutError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while flight.calls < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(flight.collapsed, 2)
+
+    def test_asyncio_calls_collapsed(self):
+        """Test that concurrent coroutines share one execution."""
+        flight = AsyncSingleFlight()
+        upstream = AsyncMock(return_value={"data": "test"})
+
+        async def slow_upstream():
+            await asyncio.sleep(0.01)
+            return await upstream()
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.do("key", slow_upstream) for _ in range(5))
+            )
+
+        results = async_to_sync(run)()
+
+        self.assertEqual(results, [{"data": "test"}] * 5)
+        upstream.assert_awaited_once()
+        self.assertEqual(flight.stats(), {"calls": 5, "collapsed": 4})
+
+    def test_asyncio_leader_cancelled(self):
+        """Test that a cancelled leader hands the call to its followers."""
+        flight = AsyncSingleFlight()
+        upstream = AsyncMock(return_value={"data": "test"})
+
+        async def slow_upstream():
+            await asyncio.sleep(0.01)
+            return await upstream()
+
+        async def run():
+            leader = asyncio.create_task(flight.do("key", slow_upstream))
+            await asyncio.sleep(0)
+            followers = [
+                asyncio.create_task(flight.do("key", slow_upstream)) for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return await asyncio.gather(*followers)
+
+        results = async_to_sync(run)()
+
+        self.assertEqual(results, [{"data": "test"}] * 2)
+        upstream.assert_awaited_once()
+        self.assertEqual(flight.stats(), {"calls": 3, "collapsed": 1})
+
+    def test_sequential_calls_not_collapsed(self):
+        """Test that completed calls are not reused."""
+        flight = SingleFlight()
+        upstream = Mock(return_value=1)
+
+        flight.do("key", upstream)
+        flight.do("key", upstream)
+
+        self.assertEqual(upstream.call_count, 2)
+        self.assertEqual(flight.collapsed, 0)
+
+    def test_coalescing_stats_endpoint(self):
+        """Test that coalescing counters are exposed."""
+        response = self.client.get(reverse("coalescing_stats"))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(set(response.json()), {"threaded", "asyncio"})
+
+
+class TransportRegistryTests(TestCase):
+    """
+    Test suite for the process-wide pooled transport registry.
+    """
+
+    BASE_URL = "https://api.example.com"
+
+    def setUp(self):
+        self.registry = TransportRegistry()
+
+    def tearDown(self):
+        self.registry.close_all()
+
+    def test_client_shared_per_base_url(self):
+        """Test that the same pooled client is returned for the same base URL."""
+        first = self.registry.get_client(self.BASE_URL)
+        second = self.registry.get_client(f"{self.BASE_URL}/")
+        other = self.registry.get_client("https://other.example.com")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_api_clients_reuse_pool(self):
+        """Test that BaseAPIClient instances share the registry client."""
+        first = BaseAPIClient(base_url=self.BASE_URL)
+        second = BaseAPIClient(base_url=self.BASE_URL)
+
+        self.assertIs(first.client, second.client)
+        self.assertIs(first.client, transport_registry.get_client(self.BASE_URL))
+
+    @override_settings(
+        HTTP_TRANSPORT={"MAX_CONNECTIONS": 7, "MAX_KEEPALIVE_CONNECTIONS": 3}
+    )
+    def test_pool_limits_from_settings(self):
+        """Test that pool limits are read from settings."""
+        self.registry.get_client(self.BASE_URL)
+
+        [stats] = self.registry.stats()
+        self.assertEqual(stats.base_url, self.BASE_URL)
+        self.assertEqual(stats.max_connections, 7)
+        self.assertEqual((stats.active, stats.idle), (0, 0))
+        self.assertEqual((stats.requests, stats.waits), (0, 0))
+
+    def test_close_all_recreates_client(self):
+        """Test that closed pools are dropped and rebuilt on next use."""
+        client = self.registry.get_client(self.BASE_URL)
+
+        self.registry.close_all()
+
+        self.assertTrue(client.is_closed)
+        self.assertEqual(self.registry.stats(), [])
+        self.assertIsNot(self.registry.get_client(self.BASE_URL), client)
+
+    def test_async_client_pooled_per_loop(self):
+        """Test that async clients are shared within a loop and closed with it."""
+
+        async def get_clients():
+            first = self.registry.get_async_client(self.BASE_URL)
+            second = self.registry.get_async_client(self.BASE_URL)
+            pools = len(self.registry.stats())
+            await self.registry.aclose_all()
+            return first, second, pools
+
+        first, second, pools = async_to_sync(get_clients)()
+
+        self.assertIs(first, second)
+        self.assertEqual(pools, 1)
+        self.assertTrue(first.is_closed)
+
+    def test_lifespan_shutdown_closes_pools(self):
+        """Test that the ASGI lifespan shutdown event closes pooled clients."""
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        client = self.registry.get_client(self.BASE_URL)
+        with patch("integrations.base.asgi.transport_registry", self.registry):
+            async_to_sync(LifespanMiddleware(app=None))(
+                {"type": "lifespan"}, receive, send
+            )
+
+        self.assertEqual(
+            sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        )
+        self.assertTrue(client.is_closed)
+
+
+class AsyncAPIViewTests(TestCase):
+    """
+    Test suite for the coroutine APIView base class.
+    """
+
+    def test_checks_run_on_the_request_thread(self):
+        """Test that authentication and permission checks are thread-sensitive."""
+        threads = []
+
+        class View(AsyncAPIView):
+            permission_classes = [AllowAny]
+
+            def initial(self, request, *args, **kwargs):
+                threads.append(threading.get_ident())
+                super().initial(request, *args, **kwargs)
+
+            async def get(self, request):
+                return Response({"ok": True})
+
+        response = async_to_sync(View.as_view())(APIRequestFactory().get("/"))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(threads, [threading.get_ident()])
+
+
+class TransportStatsAPIViewTests(APITestCase):
+    """
+    Test suite for the transport stats endpoint.
+    """
+
+    def test_get_transport_stats(self):
+        """Test that pool statistics are exposed per base URL."""
+        BaseAPIClient(base_url="https://stats.example.com")
+
+        response = self.client.get(reverse("transport_stats"))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        base_urls = [pool["base_url"] for pool in response.data]
+        self.assertIn("https://stats.example.com", base_urls)
+
+
+class InstrumentationTests(APITestCase):
+    """
+    Test suite for request phase timing and the metrics endpoint.
+    """
+
+    def setUp(self):
+        metrics.clear()
+
+    def test_histogram_buckets(self):
+        """Test that buckets are cumulative and end with +Inf."""
+        histogram = Histogram([0.1, 1.0])
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        buckets, total, count = histogram.snapshot()
+
+        self.assertEqual(buckets, [("0.1", 2), ("1.0", 3), ("+Inf", 4)])
+        self.assertAlmostEqual(total, 3.65)
+        self.assertEqual(count, 4)
+
+    def test_phases_add_up_per_request(self):
+        """Test that repeated phases accumulate in the current request."""
+        with request_timings() as timings:
+            for _ in range(2):
+                with phase("upstream"):
+                    time.sleep(0.01)
+
+        self.assertGreaterEqual(timings.phases["upstream"], 0.02)
+        self.assertIn(
+            'request_phase_duration_seconds_count{phase="upstream"} 2', metrics.render()
+        )
+
+    def test_server_timing_and_metrics(self):
+        """Test the Server-Timing header, log line and Prometheus output."""
+        with self.assertLogs("integrations.base.middleware", level="INFO") as logs:
+            response = self.client.get(reverse("transport_stats"))
+
+        phases = [part.split(";")[0] for part in response["Server-Timing"].split(", ")]
+        self.assertEqual(phases, ["render", "total"])
+        self.assertIn("route=api/integrations/transports/ status=200", logs.output[0])
+
+        metrics_response = self.client.get(reverse("metrics"))
+
+        self.assertTrue(metrics_response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",'
+            'route="api/integrations/transports/",status="200"} 1',
+            metrics_response.content.decode(),
+        )
+
+    @override_settings(INSTRUMENTATION={"SERVER_TIMING": False})
+    def test_server_timing_disabled(self):
+        """Test that the header can be turned off."""
+        response = self.client.get(reverse("transport_stats"))
+
+        self.assertNotIn("Server-Timing", response)
+
+
+class JSONCodecTests(TestCase):
+    """
+    Test suite for the JSON codecs and the DRF renderer and parser on them.
+    """
+
+    PAYLOAD = {
+        "booking_id": "1001",
+        "guest_name": "Zoë \u2028 Ünal",
+        "check_in": date(2025, 6, 1),
+        "created": datetime(2025, 6, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        "naive": datetime(2025, 6, 1, 12, 30),
+        "amount": Decimal("850.10"),
+        "rates": [0.1, 1 / 3, 850.0, 1e16, 1e-7, -0.0],
+        "counts": {1: 2},
+        "huge": 2**70,
+        "missing": None,
+    }
+
+    # orjson is optional.
+    CODECS = [name for name in CODECS if name != "orjson" or orjson is not None]
+
+    def tearDown(self):
+        reset_json_codec()
+
+    def test_codecs_match_json_renderer(self):
+        """Test byte-compatible output with DRF's JSONRenderer."""
+        expected = JSONRenderer().render(self.PAYLOAD)
+
+        for name in self.CODECS:
+            with self.subTest(codec=name):
+                self.assertEqual(build_json_codec(name).dumps(self.PAYLOAD), expected)
+
+    def test_floats_match_json_renderer(self):
+        """Test floats in exponent form, and that non-finite floats fail."""
+        for value in (
+            1e16,
+            1.2345e17,
+            1e22,
+            1e-7,
+            9.9e-5,
+            -3.2e-5,
+            -1.5e300,
+            5e-324,
+            1e-4,
+            0.0,
+        ):
+            expected = JSONRenderer().render({"amount": value, "rates": [value]})
+            for name in self.CODECS:
+                with self.subTest(codec=name, value=value):
+                    codec = build_json_codec(name)
+                    self.assertEqual(
+                        codec.dumps({"amount": value, "rates": [value]}), expected
+                    )
+
+        for value in (float("nan"), float("inf"), -float("inf")):
+            for name in self.CODECS:
+                with self.subTest(codec=name, value=value):
+                    with self.assertRaises(ValueError):
+                        build_json_codec(name).dumps({"amount": value})
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_checks_output_not_payload(self):
+        """Test that portable payloads are not walked, and look-alike strings."""
+        codec = build_json_codec("orjson")
+        payload = {"guest": "Room 1e5, [2e3", "rates": [0.5, 12.25], "room": "107"}
+
+        with patch("integrations.base.codecs._has_non_finite_floats") as scan:
+            self.assertEqual(codec.dumps(payload), JSONRenderer().render(payload))
+            self.assertEqual(
+                codec.dumps({**payload, "guest": "a,1e5"}),
+                JSONRenderer().render({**payload, "guest": "a,1e5"}),
+            )
+        scan.assert_not_called()
+
+    def test_renderer_and_parser(self):
+        """Test the renderer's compact and indented output and the parser."""
+        for codec in self.CODECS:
+            reset_json_codec()
+            with self.subTest(codec=codec), override_settings(JSON_CODEC=codec):
+                content = FastJSONRenderer().render(self.PAYLOAD)
+                indented = FastJSONRenderer().render(
+                    self.PAYLOAD, "application/json; indent=2"
+                )
+                parsed = FastJSONParser().parse(io.BytesIO(content))
+
+                self.assertEqual(content, JSONRenderer().render(self.PAYLOAD))
+                self.assertEqual(
+                    indented,
+                    JSONRenderer().render(self.PAYLOAD, "application/json; indent=2"),
+                )
+                self.assertEqual(parsed["check_in"], "2025-06-01")
+                self.assertEqual(parsed["created"], "2025-06-01T12:30:15.123456Z")
+                with self.assertRaises(ParseError):
+                    FastJSONParser().parse(io.BytesIO(b"{bad"))
+
+    def test_unknown_codec(self):
+        """Test that unknown codecs are rejected."""
+        expected = "stdlib" if orjson is None else "orjson"
+        self.assertEqual(build_json_codec("auto").name, expected)
+        with self.assertRaises(ImproperlyConfigured):
+            build_json_codec("simdjson")
+
+
+class CountMinSketchTests(TestCase):
+    """
+    Test suite for the count-min sketch.
+    """
+
+    def test_estimates_never_undercount(self):
+        """Test estimates against exact counts in a crowded sketch."""
+        sketch = CountMinSketch(width=64, depth=4)
+        counts = {f"key-{n}": n % 7 + 1 for n in range(200)}
+        for key, count in counts.items():
+            for _ in range(count):
+                sketch.add(key)
+
+        errors = [sketch.estimate(key) - count for key, count in counts.items()]
+
+        self.assertGreaterEqual(min(errors), 0)
+        self.assertEqual(CountMinSketch().estimate("unseen"), 0)
+        # Below the expected collisions per counter of a single row.
+        self.assertLess(sum(errors) / len(errors), sum(counts.values()) / 64)
+
+    def test_heavy_hitters_stand_out(self):
+        """Test that frequent keys get estimates close to their counts."""
+        sketch = CountMinSketch(width=1024, depth=4)
+        for n in range(5000):
+            sketch.add(f"cold-{n}")
+            if n % 10 == 0:
+                sketch.add("hot")
+
+        self.assertGreaterEqual(sketch.estimate("hot"), 500)
+        self.assertLess(sketch.estimate("hot"), 520)
+
+    def test_counts_halve_after_reset(self):
+        """Test that counters age after `reset_after` additions."""
+        sketch = CountMinSketch(width=64, depth=2, reset_after=10)
+        for _ in range(9):
+            sketch.add("key")
+
+        self.assertEqual(sketch.add("key"), 10)
+        self.assertEqual(sketch.estimate("key"), 5)
+        self.assertEqual(sketch.halvings, 1)
+
+
+class TwoTierCacheTests(APITestCase):
+    """
+    Test suite for the two-tier cache, with locmem standing in for L2.
+    """
+
+    def setUp(self):
+        cache.clear()
+        _tiers.clear()
+        self.addCleanup(_tiers.clear)
+
+    def worker(self, **options):
+        """Return a cache whose memory tier belongs to a separate worker."""
+        tiered = TwoTierCache(
+            "test-tiered", {"OPTIONS": {"CHECK_INTERVAL": 0, **options}}
+        )
+        tiered.tier = MemoryTier(tiered.tier.max_bytes)
+        return tiered
+
+    def test_reads_fill_memory_tier(self):
+        """Test that L2 is only asked once per key while L1 holds it."""
+        tiered = self.worker()
+        cache.set("booking", {"id": "1001"})
+
+        for _ in range(3):
+            self.assertEqual(tiered.get("booking"), {"id": "1001"})
+        self.assertIsNone(tiered.get("missing"))
+
+        stats = tiered.stats()
+        self.assertEqual((stats["l1"]["hits"], stats["l1"]["misses"]), (2, 2))
+        self.assertEqual((stats["l2"]["hits"], stats["l2"]["misses"]), (1, 1))
+
+    def test_values_are_copies(self):
+        """Test that callers cannot mutate cached values."""
+        tiered = self.worker()
+        tiered.set("bookings", [{"id": "1001"}])
+
+        tiered.get("bookings").append({"id": "1002"})
+
+        self.assertEqual(tiered.get("bookings"), [{"id": "1001"}])
+
+    def test_evicts_by_size(self):
+        """Test that the memory tier is bounded in bytes, least recent first."""
+        tiered = self.worker(MAX_BYTES=2200)
+        for name in "abcde":
+            tiered.set(name, "x" * 400)
+        tiered.get("a")
+        tiered.set("f", "x" * 400)
+        tiered.set("g", "x" * 400)
+        tiered.set("huge", "x" * 1000)
+
+        self.assertLessEqual(tiered.stats()["l1"]["bytes"], 2200)
+        self.assertEqual(
+            [key[3:] for key in tiered.tier.entries], ["d", "e", "a", "f", "g"]
+        )
+        self.assertEqual(tiered.stats()["l1"]["evictions"], 2)
+        # Evicted values are still served from L2.
+        self.assertEqual(tiered.get("b"), "x" * 400)
+
+    def test_memory_ttl(self):
+        """Test that memory entries expire after L1_TTL."""
+        tiered = self.worker(L1_TTL=0.05)
+        tiered.set("booking", 1)
+        cache.set("booking", 2)
+
+        self.assertEqual(tiered.get("booking"), 1)
+        time.sleep(0.06)
+        self.assertEqual(tiered.get("booking"), 2)
+        self.assertEqual(tiered.stats()["l1"]["expirations"], 1)
+
+    def test_writes_invalidate_other_workers(self):
+        """Test that writes and deletes propagate through version stamps."""
+        first, second = self.worker(), self.worker()
+        first.set("booking", "v1")
+        self.assertEqual(second.get("booking"), "v1")
+
+        first.set("booking", "v2")
+        self.assertEqual(second.get("booking"), "v2")
+        first.delete("booking")
+        self.assertIsNone(second.get("booking"))
+        self.assertEqual(second.stats()["l1"]["invalidations"], 2)
+        # A worker's own writes do not evict its memory entries.
+        self.assertEqual(first.stats()["l1"]["hits"], 0)
+        self.assertEqual(first.stats()["l1"]["invalidations"], 1)
+
+    def test_gaps_in_the_log_clear_memory(self):
+        """Test that lost invalidations clear the memory tier."""
+        first, second = self.worker(), self.worker()
+        first.set_many({"a": 1, "b": 2})
+        self.assertEqual(second.get_many(["a", "b"]), {"a": 1, "b": 2})
+
+        first.set("a", 3)
+        cache.delete(f"test-tiered:log:{cache.get('test-tiered:stamp')}")
+
+        self.assertEqual(second.get("b"), 2)
+        self.assertEqual(second.stats()["l1"]["invalidations"], 2)
+
+    def test_atomic_operations_go_to_l2(self):
+        """Test that add and incr are decided by L2."""
+        first, second = self.worker(), self.worker()
+
+        self.assertTrue(first.add("lock", 1))
+        self.assertFalse(second.add("lock", 1))
+        first.set("count", 1)
+        second.get("count")
+        self.assertEqual(first.incr("count"), 2)
+        self.assertEqual(second.get("count"), 2)
+
+    def test_stats_endpoint(self):
+        """Test that tier counters are exposed per two-tier cache."""
+        caches["tiered"].get("unknown")
+
+        response = self.client.get(reverse("cache_stats"))
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data[0]["name"], "tiered")
+        self.assertEqual(response.data[0]["l2"]["alias"], "default")
+        self.assertGreaterEqual(response.data[0]["l1"]["misses"], 1)
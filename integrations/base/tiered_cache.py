@@ -0,0 +1,360 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+DEFAULT_TIER_OPTIONS = {
+    "L2": "default",
+    "MAX_BYTES": 64 * 1024 * 1024,
+    "L1_TTL": 5.0,
+    "CHECK_INTERVAL": 0.5,
+    "LOG_TTL": 300,
+    "MAX_LOG": 1000,
+}
+
+_MISSING = object()
+
+
+class MemoryTier:
+    """
+    The in-process tier of a TwoTierCache: pickled values in LRU order,
+    bounded by their total size in bytes.
+
+    Shared by every thread of a process, as Django builds one cache backend
+    instance per thread. Also tracks the last invalidation stamp applied
+    and the stamps this process published itself.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self.size = 0
+        self.seen: Optional[int] = None
+        self.own: set = set()
+        self.next_check = 0.0
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+        self.l2_counters = {"hits": 0, "misses": 0, "writes": 0}
+        self.lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._pop(key)
+                self.counters["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry[0]
+
+    def put(self, key: str, pickled: bytes, ttl: float) -> None:
+        with self.lock:
+            self._pop(key)
+            # Values that would flush most of the tier are left to L2.
+            if ttl <= 0 or len(pickled) > self.max_bytes // 4:
+                return
+            self.entries[key] = (pickled, time.monotonic() + ttl)
+            self.size += len(pickled)
+            while self.size > self.max_bytes:
+                self._pop(next(iter(self.entries)))
+                self.counters["evictions"] += 1
+
+    def discard(self, keys: Iterable[str]) -> None:
+        with self.lock:
+            for key in keys:
+                if self._pop(key):
+                    self.counters["invalidations"] += 1
+
+    def count_l2(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.l2_counters[name] += amount
+
+    def clear(self) -> None:
+        with self.lock:
+            self.counters["invalidations"] += len(self.entries)
+            self.entries.clear()
+            self.size = 0
+
+    def _pop(self, key: str) -> bool:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size -= len(entry[0])
+        return True
+
+
+_tiers: Dict[str, MemoryTier] = {}
+_tiers_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    """
+    Django cache backend with a per-process memory tier (L1) in front of
+    another configured cache (L2), typically Redis or Memcached.
+
+    Reads are answered from L1 when possible, and fill it from L2 otherwise.
+    Writes go to both. L1 holds values for at most `L1_TTL` seconds, and at
+    most `MAX_BYTES` of pickled values, evicting the least recently used.
+
+    Writes and deletes are announced to other processes through version
+    stamps kept in L2: every changed key gets the next value of a shared
+    counter, recorded in a log entry. Every `CHECK_INTERVAL` seconds at most,
+    a read compares the counter with the last stamp it applied and drops the
+    logged keys from L1, so other workers serve a changed value for at most
+    that long. When the changes cannot be accounted for (gaps in the log, or
+    a counter reset by clearing L2), L1 is cleared instead.
+
+    Configured like any backend, with `LOCATION` naming the memory tier:
+
+        "tiered": {
+            "BACKEND": "integrations.base.tiered_cache.TwoTierCache",
+            "LOCATION": "tiered",
+            "OPTIONS": {"L2": "default", "MAX_BYTES": 64 * 1024 * 1024},
+        }
+
+    Atomic operations (`add`, `incr`) and locks are always decided by L2.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, name: str, params: dict) -> None:
+        params = dict(params)
+        options = {**DEFAULT_TIER_OPTIONS, **params.pop("OPTIONS", {})}
+        super().__init__(params)
+        self.name = name
+        self.l2_alias = options["L2"]
+        self.l1_ttl = options["L1_TTL"]
+        self.check_interval = options["CHECK_INTERVAL"]
+        self.log_ttl = options["LOG_TTL"]
+        self.max_log = options["MAX_LOG"]
+        with _tiers_lock:
+            self.tier = _tiers.setdefault(name, MemoryTier(options["MAX_BYTES"]))
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self.l2_alias]
+
+    def _stamp_key(self) -> str:
+        return f"{self.name}:stamp"
+
+    def _log_key(self, stamp: int) -> str:
+        return f"{self.name}:log:{stamp}"
+
+    def _l1_ttl(self, timeout) -> float:
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.l1_ttl
+        return min(timeout, self.l1_ttl)
+
+    def _fill(self, key: str, value: Any, timeout, seen: Optional[int] = None):
+        # A read that raced an invalidation must not repopulate L1.
+        if seen is not None and seen != self.tier.seen:
+            return
+        self.tier.put(key, pickle.dumps(value, self.pickle_protocol), timeout)
+
+    def _start_stamps(self) -> None:
+        # Start from the clock, so a reset counter never repeats stamps that
+        # workers have already applied.
+        self.l2.add(self._stamp_key(), time.time_ns(), None)
+
+    def _publish(self, keys: List[str]) -> None:
+        """
+        Announce changed keys to the other processes.
+        """
+        if not keys:
+            return
+        try:
+            last = self.l2.incr(self._stamp_key(), len(keys))
+        except ValueError:
+            self._start_stamps()
+            last = self.l2.incr(self._stamp_key(), len(keys))
+        stamps = range(last - len(keys) + 1, last + 1)
+        with self.tier.lock:
+            self.tier.own.update(stamps)
+        self.l2.set_many(
+            {self._log_key(stamp): key for stamp, key in zip(stamps, keys)},
+            self.log_ttl,
+        )
+
+    def _sync(self) -> None:
+        """
+        Apply the invalidations published since the last check.
+        """
+        tier = self.tier
+        now = time.monotonic()
+        if now < tier.next_check:
+            return
+        with tier.lock:
+            if now < tier.next_check:
+                return
+            # Claim this check; L2 is read without holding up L1 readers.
+            tier.next_check = now + self.check_interval
+            seen, own = tier.seen, set(tier.own)
+
+        current = self.l2.get(self._stamp_key())
+        if current is None:
+            # L2 was cleared or evicted the counter: start over.
+            self._start_stamps()
+            current = self.l2.get(self._stamp_key())
+        elif current == seen:
+            return
+        logged = None
+        if seen is not None and 0 < current - seen <= self.max_log:
+            pending = [s for s in range(seen + 1, current + 1) if s not in own]
+            logged = self.l2.get_many([self._log_key(s) for s in pending])
+            if len(logged) < len(pending):
+                logged = None  # Expired or lost entries: the log has gaps.
+
+        with tier.lock:
+            if tier.seen != seen:
+                return  # A later check got there first.
+            if logged is None:
+                tier.clear()
+            else:
+                tier.discard(logged.values())
+            tier.own = {stamp for stamp in tier.own if stamp > current}
+            tier.seen = current
+
+    def get(self, key, default=None, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        pickled = self.tier.get(l1_key)
+        if pickled is not None:
+            return pickle.loads(pickled)
+        seen = self.tier.seen
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.tier.count_l2("misses")
+            return default
+        self.tier.count_l2("hits")
+        self._fill(l1_key, value, self.l1_ttl, seen)
+        return value
+
+    def get_many(self, keys, version=None):
+        self._sync()
+        found, missing = {}, {}
+        for key in keys:
+            l1_key = self.make_and_validate_key(key, version=version)
+            pickled = self.tier.get(l1_key)
+            if pickled is not None:
+                found[key] = pickle.loads(pickled)
+            else:
+                missing[key] = l1_key
+        if missing:
+            seen = self.tier.seen
+            fetched = self.l2.get_many(list(missing), version=version)
+            self.tier.count_l2("hits", len(fetched))
+            self.tier.count_l2("misses", len(missing) - len(fetched))
+            for key, value in fetched.items():
+                self._fill(missing[key], value, self.l1_ttl, seen)
+            found.update(fetched)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        self.l2.set(key, value, timeout, version=version)
+        self.tier.count_l2("writes")
+        self._fill(l1_key, value, self._l1_ttl(timeout))
+        self._publish([l1_key])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        self._sync()
+        failed = self.l2.set_many(data, timeout, version=version)
+        self.tier.count_l2("writes", len(data))
+        l1_keys = []
+        for key, value in data.items():
+            l1_key = self.make_and_validate_key(key, version=version)
+            if key not in failed:
+                self._fill(l1_key, value, self._l1_ttl(timeout))
+            l1_keys.append(l1_key)
+        self._publish(l1_keys)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self.tier.count_l2("writes")
+            self._fill(l1_key, value, self._l1_ttl(timeout))
+            self._publish([l1_key])
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        value = self.l2.incr(key, delta, version=version)
+        self.tier.discard([l1_key])
+        self._publish([l1_key])
+        return value
+
+    def delete(self, key, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        self._sync()
+        self.tier.discard([l1_key])
+        deleted = self.l2.delete(key, version=version)
+        self._publish([l1_key])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        self._sync()
+        keys = list(keys)
+        l1_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        self.tier.discard(l1_keys)
+        self.l2.delete_many(keys, version=version)
+        self._publish(l1_keys)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def clear(self):
+        # Clearing L2 resets the stamp, which makes other processes clear L1.
+        self.tier.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+    def stats(self) -> dict:
+        """
+        Return the hit, miss and eviction counters of both tiers.
+        """
+        tier = self.tier
+        with tier.lock:
+            return {
+                "name": self.name,
+                "l1": {
+                    **tier.counters,
+                    "entries": len(tier.entries),
+                    "bytes": tier.size,
+                    "max_bytes": tier.max_bytes,
+                },
+                "l2": {"alias": self.l2_alias, **tier.l2_counters},
+            }
+
+
+def tiered_cache_stats() -> List[dict]:
+    """
+    Return the counters of every two-tier cache configured in settings.
+    """
+    return [
+        caches[alias].stats()
+        for alias in caches.settings
+        if isinstance(caches[alias], TwoTierCache)
+    ]
@@ -0,0 +1,269 @@
+import asyncio
+import atexit
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+from django.conf import settings
+
+DEFAULT_POOL_SETTINGS = {
+    "MAX_CONNECTIONS": 100,
+    "MAX_KEEPALIVE_CONNECTIONS": 20,
+    "KEEPALIVE_EXPIRY": 5.0,
+}
+
+
+def get_pool_settings() -> dict:
+    """
+    Return the connection pool settings, with `settings.HTTP_TRANSPORT`
+    overriding the defaults.
+    """
+    return {**DEFAULT_POOL_SETTINGS, **getattr(settings, "HTTP_TRANSPORT", {})}
+
+
+@dataclass
+class PoolStats:
+    """
+    Point-in-time statistics for a single pooled transport.
+
+    Attributes:
+        base_url (str): Base URL the pool is keyed by.
+        max_connections (int): Configured connection limit.
+        active (int): Connections currently serving a request.
+        idle (int): Open keep-alive connections waiting to be reused.
+        requests (int): Total requests sent through the pool.
+        waits (int): Requests that found every connection busy and had to queue.
+    """
+
+    base_url: str
+    max_connections: Optional[int]
+    active: int
+    idle: int
+    requests: int
+    waits: int
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """
+    HTTP transport that counts requests and pool waits.
+    """
+
+    def __init__(self, limits: httpx.Limits, **kwargs) -> None:
+        super().__init__(limits=limits, **kwargs)
+        self.max_connections = limits.max_connections
+        self.requests = 0
+        self.waits = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests += 1
+            if (
+                self.max_connections is not None
+                and self._in_flight >= self.max_connections
+            ):
+                self.waits += 1
+            self._in_flight += 1
+        try:
+            return super().handle_request(request)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def connection_counts(self) -> tuple:
+        """
+        Return the number of (active, idle) connections held by the pool.
+        """
+        connections = self._pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections) - idle, idle
+
+
+class InstrumentedAsyncTransport(httpx.AsyncHTTPTransport):
+    """
+    Async HTTP transport that counts requests and pool waits.
+
+    Only ever used from the event loop that created it, so the counters need
+    no locking.
+    """
+
+    def __init__(self, limits: httpx.Limits, **kwargs) -> None:
+        super().__init__(limits=limits, **kwargs)
+        self.max_connections = limits.max_connections
+        self.requests = 0
+        self.waits = 0
+        self._in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.max_connections is not None and self._in_flight >= self.max_connections:
+            self.waits += 1
+        self._in_flight += 1
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            self._in_flight -= 1
+
+    def connection_counts(self) -> tuple:
+        """
+        Return the number of (active, idle) connections held by the pool.
+        """
+        connections = self._pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections) - idle, idle
+
+
+class TransportRegistry:
+    """
+    Process-wide registry of long-lived pooled HTTP clients.
+
+    API clients are cheap to construct per request, but the underlying
+    `httpx.Client` (and its keep-alive connections) is shared by every client
+    talking to the same base URL. Pool limits and timeout are fixed when the
+    pool for a base URL is first created.
+
+    Async clients are bound to the event loop they were created on, so they
+    are pooled per running loop as well as per base URL.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, httpx.Client] = {}
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(base_url: str) -> str:
+        return base_url.rstrip("/")
+
+    @staticmethod
+    def _limits() -> httpx.Limits:
+        pool_settings = get_pool_settings()
+        return httpx.Limits(
+            max_connections=pool_settings["MAX_CONNECTIONS"],
+            max_keepalive_connections=pool_settings["MAX_KEEPALIVE_CONNECTIONS"],
+            keepalive_expiry=pool_settings["KEEPALIVE_EXPIRY"],
+        )
+
+    def _create_client(self, timeout: float) -> httpx.Client:
+        return httpx.Client(
+            timeout=timeout, transport=InstrumentedTransport(limits=self._limits())
+        )
+
+    def _create_async_client(self, timeout: float) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=timeout,
+            transport=InstrumentedAsyncTransport(limits=self._limits()),
+        )
+
+    def get_client(self, base_url: str, timeout: float = 5.0) -> httpx.Client:
+        """
+        Return the shared client for `base_url`, creating it on first use.
+
+        Args:
+            base_url (str): Base URL of the external API.
+            timeout (float): Request timeout used if a new pool is created.
+
+        Returns:
+            httpx.Client: Pooled client shared across the process.
+        """
+        key = self._key(base_url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None or client.is_closed:
+                    client = self._create_client(timeout)
+                    self._clients[key] = client
+        return client
+
+    def get_async_client(
+        self, base_url: str, timeout: float = 5.0
+    ) -> httpx.AsyncClient:
+        """
+        Return the shared async client for `base_url` on the running event loop.
+
+        Must be called from inside a coroutine.
+
+        Args:
+            base_url (str): Base URL of the external API.
+            timeout (float): Request timeout used if a new pool is created.
+
+        Returns:
+            httpx.AsyncClient: Pooled client shared by the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        key = self._key(base_url)
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = self._create_async_client(timeout)
+            clients[key] = client
+        return client
+
+    def _all_clients(self) -> list:
+        pools = list(self._clients.items())
+        for clients in list(self._async_clients.values()):
+            pools.extend(clients.items())
+        return pools
+
+    def stats(self) -> List[PoolStats]:
+        """
+        Return statistics for every open pool, sync and async.
+        """
+        stats = []
+        for base_url, client in self._all_clients():
+            transport = client._transport
+            if client.is_closed or not isinstance(
+                transport, (InstrumentedTransport, InstrumentedAsyncTransport)
+            ):
+                continue
+            active, idle = transport.connection_counts()
+            stats.append(
+                PoolStats(
+                    base_url=base_url,
+                    max_connections=transport.max_connections,
+                    active=active,
+                    idle=idle,
+                    requests=transport.requests,
+                    waits=transport.waits,
+                )
+            )
+        return stats
+
+    def close(self, base_url: str) -> None:
+        """
+        Close and forget the pool for a single base URL.
+        """
+        with self._lock:
+            client = self._clients.pop(self._key(base_url), None)
+        if client is not None:
+            client.close()
+
+    def close_all(self) -> None:
+        """
+        Close every pool. Safe to call more than once.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    async def aclose_all(self) -> None:
+        """
+        Close the sync pools and the async pools of the running event loop.
+        """
+        self.close_all()
+        clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.aclose()
+
+
+transport_registry = TransportRegistry()
+
+# Release pooled connections when a WSGI worker exits.
+atexit.register(transport_registry.close_all)
@@ -0,0 +1,19 @@
+from django.urls import path
+
+from .views import (
+    CacheStatsAPIView,
+    CircuitBreakerStatsAPIView,
+    CoalescingStatsAPIView,
+    MetricsAPIView,
+    RetryStatsAPIView,
+    TransportStatsAPIView,
+)
+
+urlpatterns = [
+    path("caches/", CacheStatsAPIView.as_view(), name="cache_stats"),
+    path("circuits/", CircuitBreakerStatsAPIView.as_view(), name="circuit_stats"),
+    path("coalescing/", CoalescingStatsAPIView.as_view(), name="coalescing_stats"),
+    path("metrics/", MetricsAPIView.as_view(), name="metrics"),
+    path("retries/", RetryStatsAPIView.as_view(), name="retry_stats"),
+    path("transports/", TransportStatsAPIView.as_view(), name="transport_stats"),
+]
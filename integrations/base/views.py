@@ -0,0 +1,173 @@
+import inspect
+from dataclasses import asdict
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK
+from rest_framework.views import APIView
+
+from integrations.base.circuit_breaker import circuit_breaker_stats
+from integrations.base.clients import async_single_flight, single_flight
+from integrations.base.instrumentation import metrics
+from integrations.base.retry import retry_metrics
+from integrations.base.tiered_cache import tiered_cache_stats
+from integrations.base.transports import transport_registry
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines.
+
+    Django serves the view natively on the ASGI event loop. Authentication,
+    permission and throttling checks may touch the database, so they run
+    through `sync_to_async` on Django's thread-sensitive executor, the same
+    thread as the rest of the request's sync code and its database
+    connections; the handler itself is awaited directly.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class TransportStatsAPIView(APIView):
+    """
+    GET /api/integrations/transports/
+
+    Report connection pool statistics for every upstream base URL.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Transport Pool Stats",
+        responses={HTTP_200_OK: "Per-pool connection statistics"},
+        tags=["Integrations"],
+    )
+    def get(self, request):
+        stats = [asdict(pool) for pool in transport_registry.stats()]
+        return Response(stats, status=HTTP_200_OK)
+
+
+class CoalescingStatsAPIView(APIView):
+    """
+    GET /api/integrations/coalescing/
+
+    Report how many upstream calls were collapsed by request coalescing.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Request Coalescing Stats",
+        responses={HTTP_200_OK: "Calls seen and collapsed per execution mode"},
+        tags=["Integrations"],
+    )
+    def get(self, request):
+        stats = {
+            "threaded": single_flight.stats(),
+            "asyncio": async_single_flight.stats(),
+        }
+        return Response(stats, status=HTTP_200_OK)
+
+
+class RetryStatsAPIView(APIView):
+    """
+    GET /api/integrations/retries/
+
+    Report per-attempt outcomes and retry give-ups for every upstream.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Retry Stats",
+        responses={HTTP_200_OK: "Attempt outcomes and give-ups per upstream"},
+        tags=["Integrations"],
+    )
+    def get(self, request):
+        return Response(retry_metrics.snapshot(), status=HTTP_200_OK)
+
+
+class CircuitBreakerStatsAPIView(APIView):
+    """
+    GET /api/integrations/circuits/
+
+    Report the state and window rates of every upstream circuit breaker.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Circuit Breaker Stats",
+        responses={HTTP_200_OK: "Circuit breaker state per upstream"},
+        tags=["Integrations"],
+    )
+    def get(self, request):
+        return Response(circuit_breaker_stats(), status=HTTP_200_OK)
+
+
+class CacheStatsAPIView(APIView):
+    """
+    GET /api/integrations/caches/
+
+    Report the hit, miss and eviction counters of both tiers of every
+    two-tier cache, for this process.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Cache Tier Stats",
+        responses={HTTP_200_OK: "Memory and shared tier counters per cache"},
+        tags=["Integrations"],
+    )
+    def get(self, request):
+        return Response(tiered_cache_stats(), status=HTTP_200_OK)
+
+
+class MetricsAPIView(APIView):
+    """
+    GET /api/integrations/metrics/
+
+    Expose the request and phase duration histograms in the Prometheus text
+    format, for scraping.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Prometheus Metrics",
+        responses={HTTP_200_OK: "Histograms in the Prometheus text format"},
+        tags=["Integrations"],
+    )
+    def get(self, request):
+        return HttpResponse(
+            metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
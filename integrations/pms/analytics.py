@@ -0,0 +1,291 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from integrations.base.exceptions import ExternalAPIException
+
+from .choices import BookingStatus
+from .serializers import map_booking
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BookingColumns:
+    """
+    Columnar snapshot of mapped bookings.
+
+    Dates are `datetime64[D]`, amounts `float64` (NaN when missing) and
+    status and room are categorical codes into `statuses` and `rooms`
+    (-1 for bookings without a room). Revenue is spread evenly over the
+    nights of a stay, so every aggregate can be restricted to a range of
+    nights with vectorized clipping.
+    """
+
+    check_in: np.ndarray
+    check_out: np.ndarray
+    amount: np.ndarray
+    status_codes: np.ndarray
+    statuses: Tuple[str, ...]
+    room_codes: np.ndarray
+    rooms: Tuple[str, ...]
+
+    @classmethod
+    def from_bookings(cls, bookings: Sequence[Dict]) -> "BookingColumns":
+        """
+        Build the columns from mapped bookings (see `map_booking`).
+        """
+        count = len(bookings)
+        check_in = np.array([b["check_in"] for b in bookings], dtype="datetime64[D]")
+        check_out = np.array([b["check_out"] for b in bookings], dtype="datetime64[D]")
+        amount = np.fromiter(
+            (b.get("amount", math.nan) for b in bookings), np.float64, count
+        )
+        statuses, status_codes = np.unique(
+            np.array([b["status"] for b in bookings], dtype=str), return_inverse=True
+        )
+        # "" sorts first, so rooms[0] stands for "no room" and is dropped.
+        rooms, room_codes = np.unique(
+            np.array([b.get("room_number", "") for b in bookings], dtype=str),
+            return_inverse=True,
+        )
+        room_codes = room_codes.astype(np.int32)
+        if len(rooms) and rooms[0] == "":
+            rooms = rooms[1:]
+            room_codes -= 1
+        return cls(
+            check_in=check_in,
+            check_out=check_out,
+            amount=amount,
+            status_codes=status_codes.astype(np.int8),
+            statuses=tuple(str(s) for s in statuses),
+            room_codes=room_codes,
+            rooms=tuple(str(r) for r in rooms),
+        )
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    @property
+    def span(self) -> Optional[Tuple[date, date]]:
+        """
+        The `[first night, last check-out)` range covered by the bookings.
+        """
+        if not len(self):
+            return None
+        return (
+            self.check_in.min().astype(date),
+            self.check_out.max().astype(date),
+        )
+
+    @cached_property
+    def _rate(self) -> np.ndarray:
+        """
+        Revenue per night of every booking; 0 without an amount or nights.
+        """
+        nights = (self.check_out - self.check_in).astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(nights > 0, np.nan_to_num(self.amount) / nights, 0.0)
+
+    @cached_property
+    def _active(self) -> np.ndarray:
+        if BookingStatus.CANCELLED in self.statuses:
+            return self.status_codes != self.statuses.index(BookingStatus.CANCELLED)
+        return np.ones(len(self), dtype=bool)
+
+    def _stays(self, start: np.datetime64, end: np.datetime64):
+        """
+        Return every booking's nights clipped to `[start, end)`, as first
+        night, check-out and night count.
+        """
+        first = np.maximum(self.check_in, start)
+        last = np.minimum(self.check_out, end)
+        clipped = np.clip((last - first).astype(np.int64), 0, None)
+        return first, last, clipped
+
+    def by_day(self, start: date, end: date) -> Dict[str, np.ndarray]:
+        """
+        Revenue, room nights, ADR and occupancy for every night in
+        `[start, end)`. Cancelled bookings are excluded.
+        """
+        start64, end64 = np.datetime64(start, "D"), np.datetime64(end, "D")
+        length = int((end64 - start64).astype(np.int64))
+        first, last, clipped = self._stays(start64, end64)
+        selected = self._active & (clipped > 0)
+
+        # Difference arrays: +rate on the first night, -rate after the last.
+        first_index = (first[selected] - start64).astype(np.int64)
+        last_index = (last[selected] - start64).astype(np.int64)
+        rate = self._rate[selected]
+        revenue = np.cumsum(
+            np.bincount(first_index, weights=rate, minlength=length + 1)
+            - np.bincount(last_index, weights=rate, minlength=length + 1)
+        )[:length]
+        room_nights = np.cumsum(
+            np.bincount(first_index, minlength=length + 1)
+            - np.bincount(last_index, minlength=length + 1)
+        )[:length]
+        return {
+            "date": start64 + np.arange(length),
+            "revenue": revenue,
+            "room_nights": room_nights,
+            "adr": _divide(revenue, room_nights),
+            "occupancy": _divide(room_nights, len(self.rooms)),
+        }
+
+    def by_week(self, start: date, end: date) -> Dict[str, np.ndarray]:
+        """
+        `by_day` totals grouped by ISO week (Monday start).
+        """
+        daily = self.by_day(start, end)
+        # 1970-01-01 was a Thursday, so (days + 3) % 7 is 0 on Mondays.
+        days = daily["date"].astype(np.int64)
+        week_start = (days - (days + 3) % 7).astype("datetime64[D]")
+        weeks, week_index = np.unique(week_start, return_inverse=True)
+        revenue = np.bincount(week_index, weights=daily["revenue"])
+        room_nights = np.bincount(week_index, weights=daily["room_nights"])
+        nights = np.bincount(week_index)
+        return {
+            "week": weeks,
+            "revenue": revenue,
+            "room_nights": room_nights.astype(np.int64),
+            "adr": _divide(revenue, room_nights),
+            "occupancy": _divide(room_nights, nights * len(self.rooms)),
+        }
+
+    def by_room(self, start: date, end: date) -> Dict[str, np.ndarray]:
+        """
+        Revenue, room nights and ADR per room over `[start, end)`. Cancelled
+        bookings and bookings without a room are excluded.
+        """
+        _, _, clipped = self._stays(np.datetime64(start, "D"), np.datetime64(end, "D"))
+        selected = self._active & (clipped > 0) & (self.room_codes >= 0)
+        codes = self.room_codes[selected]
+        room_count = len(self.rooms)
+        revenue = np.bincount(
+            codes,
+            weights=self._rate[selected] * clipped[selected],
+            minlength=room_count,
+        )
+        room_nights = np.bincount(
+            codes, weights=clipped[selected], minlength=room_count
+        )
+        return {
+            "room": np.array(self.rooms, dtype=object),
+            "revenue": revenue,
+            "room_nights": room_nights.astype(np.int64),
+            "adr": _divide(revenue, room_nights),
+        }
+
+    def by_status(self, start: date, end: date) -> Dict[str, np.ndarray]:
+        """
+        Booking count and revenue per status for bookings with nights in
+        `[start, end)`, including cancelled bookings.
+        """
+        _, _, clipped = self._stays(np.datetime64(start, "D"), np.datetime64(end, "D"))
+        selected = clipped > 0
+        codes = self.status_codes[selected]
+        status_count = len(self.statuses)
+        return {
+            "status": np.array(self.statuses, dtype=object),
+            "bookings": np.bincount(codes, minlength=status_count),
+            "revenue": np.bincount(
+                codes,
+                weights=self._rate[selected] * clipped[selected],
+                minlength=status_count,
+            ),
+        }
+
+    def aggregate(self, group_by: str, start: date, end: date) -> List[Dict]:
+        """
+        Return one of the aggregates as a list of JSON-friendly rows.
+        """
+        columns = getattr(self, f"by_{group_by}")(start, end)
+        return _rows(columns)
+
+
+def _divide(numerator, denominator) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.true_divide(numerator, denominator)
+    return np.nan_to_num(result, nan=0.0, posinf=0.0)
+
+
+def _rows(columns: Dict[str, np.ndarray]) -> List[Dict]:
+    converted = {}
+    for name, values in columns.items():
+        if np.issubdtype(values.dtype, np.datetime64):
+            converted[name] = [str(value) for value in values]
+        elif np.issubdtype(values.dtype, np.floating):
+            converted[name] = np.round(values, 4).tolist()
+        else:
+            converted[name] = values.tolist()
+    names = list(converted)
+    return [dict(zip(names, row)) for row in zip(*converted.values())]
+
+
+class ColumnarSnapshot:
+    """
+    Process-wide BookingColumns, rebuilt from the bookings at most every
+    `max_age` seconds so repeated analytics requests reuse the arrays.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.columns: Optional[BookingColumns] = None
+        self.built_at: Optional[float] = None
+
+    def get(self, fetch: Callable[[], List[Dict]], max_age: float) -> BookingColumns:
+        """
+        Return the snapshot, rebuilding it from `fetch` (raw PMS bookings)
+        when it is older than `max_age` seconds.
+
+        Invalid bookings are skipped. If the fetch fails, the previous
+        snapshot is served, unless there is none.
+
+        Raises:
+            ExternalAPIException: If no snapshot was built and the fetch fails.
+        """
+        with self._lock:
+            if self.built_at is None or time.monotonic() - self.built_at >= max_age:
+                try:
+                    raw_bookings = fetch()
+                except ExternalAPIException as e:
+                    if self.columns is None:
+                        raise
+                    logger.warning("Analytics snapshot refresh failed: %s", e)
+                    return self.columns
+                bookings = [
+                    booking
+                    for booking in map(map_booking, raw_bookings)
+                    if booking is not None
+                ]
+                self.columns = BookingColumns.from_bookings(bookings)
+                self.built_at = time.monotonic()
+            return self.columns
+
+
+_snapshot = ColumnarSnapshot()
+
+
+def get_booking_columns(fetch: Callable[[], List[Dict]]) -> BookingColumns:
+    """
+    Return the cached columnar snapshot, rebuilt from `fetch` when older than
+    `settings.PMS_ANALYTICS_MAX_AGE` seconds.
+    """
+    return _snapshot.get(fetch, settings.PMS_ANALYTICS_MAX_AGE)
+
+
+def reset_booking_columns() -> None:
+    """
+    Drop the cached columnar snapshot so it is rebuilt on next use.
+    """
+    global _snapshot
+    _snapshot = ColumnarSnapshot()
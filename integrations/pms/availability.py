@@ -0,0 +1,345 @@
+import bisect
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from integrations.base.exceptions import ExternalAPIException
+
+from .choices import BookingStatus
+from .serializers import map_booking
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Stay:
+    """
+    A booking as seen by the availability index.
+
+    Dates are day ordinals; `start` is the check-in night and `end` the
+    check-out day, so a stay occupies the nights `start <= night < end`.
+    `active` is False for cancelled bookings and for bookings without a room
+    or with an empty date range, which never occupy a room.
+    """
+
+    booking_id: str
+    room: Optional[str]
+    start: int
+    end: int
+    active: bool
+
+    @classmethod
+    def from_booking(cls, booking: Dict) -> "Stay":
+        """
+        Build a stay from a mapped booking (see `map_booking`).
+        """
+        room = booking.get("room_number")
+        start = date.fromisoformat(booking["check_in"]).toordinal()
+        end = date.fromisoformat(booking["check_out"]).toordinal()
+        active = (
+            booking["status"] != BookingStatus.CANCELLED
+            and room is not None
+            and start < end
+        )
+        return cls(booking["booking_id"], room, start, end, active)
+
+
+class RoomIntervals:
+    """
+    Sorted-endpoint arrays over the active stays of one room.
+
+    `stays` is ordered by check-in and `ends` holds the check-out days in
+    order. Counting the stays that overlap a range takes two binary
+    searches; listing them, or the nights they cover, scans only check-ins
+    within `max_length` nights before the range.
+    """
+
+    __slots__ = ("stays", "ends", "max_length")
+
+    def __init__(self) -> None:
+        self.stays: List[Tuple[int, int, str]] = []
+        self.ends: List[int] = []
+        # Upper bound on stay length; not lowered on removal.
+        self.max_length = 0
+
+    def __len__(self) -> int:
+        return len(self.stays)
+
+    def add(self, stay: Stay) -> None:
+        bisect.insort(self.stays, (stay.start, stay.end, stay.booking_id))
+        bisect.insort(self.ends, stay.end)
+        self.max_length = max(self.max_length, stay.end - stay.start)
+
+    def remove(self, stay: Stay) -> None:
+        entry = (stay.start, stay.end, stay.booking_id)
+        del self.stays[bisect.bisect_left(self.stays, entry)]
+        del self.ends[bisect.bisect_left(self.ends, stay.end)]
+
+    def count_overlapping(self, start: int, end: int) -> int:
+        # Stays ending on or before `start` also began before `end`.
+        starting_before_end = bisect.bisect_left(self.stays, (end,))
+        ended = bisect.bisect_right(self.ends, start)
+        return starting_before_end - ended
+
+    def _candidates(self, start: int, end: int) -> List[Tuple[int, int, str]]:
+        lo = bisect.bisect_left(self.stays, (start - self.max_length + 1,))
+        hi = bisect.bisect_left(self.stays, (end,))
+        return self.stays[lo:hi]
+
+    def overlapping(self, start: int, end: int) -> List[str]:
+        return [
+            booking_id
+            for _, stay_end, booking_id in self._candidates(start, end)
+            if stay_end > start
+        ]
+
+    def occupied(self, start: int, end: int) -> List[List[int]]:
+        """
+        Return the disjoint `[first, last)` night ranges within `[start, end)`
+        that at least one stay occupies, in order. Overlapping stays, e.g.
+        double bookings, are merged.
+        """
+        ranges: List[List[int]] = []
+        for stay_start, stay_end, _ in self._candidates(start, end):
+            if stay_end <= start:
+                continue
+            first, last = max(stay_start, start), min(stay_end, end)
+            if ranges and first <= ranges[-1][1]:
+                ranges[-1][1] = max(ranges[-1][1], last)
+            else:
+                ranges.append([first, last])
+        return ranges
+
+
+class AvailabilityIndex:
+    """
+    Interval index of bookings per room, for availability and occupancy
+    queries.
+
+    Every room seen in a booking is known, including rooms whose bookings
+    are all cancelled. Active stays are kept in a RoomIntervals per room.
+    Overlap counts and free-room checks cost O(log n) per room; listing the
+    k overlapping bookings of a room, or the nights they occupy, costs
+    O(log n + k) for stays no longer than the longest one in that room.
+
+    The index changes booking by booking: `upsert` and `remove` apply single
+    changes and `sync` diffs a full booking list against the current
+    contents, so only changed bookings touch the arrays.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._stays: Dict[str, Stay] = {}
+        self._rooms: Dict[str, RoomIntervals] = {}
+        self._room_refs: Dict[str, int] = {}
+        self.refreshed_at: Optional[float] = None
+
+    @property
+    def rooms(self) -> List[str]:
+        with self._lock:
+            return sorted(self._room_refs)
+
+    def __len__(self) -> int:
+        return len(self._stays)
+
+    def _add(self, stay: Stay) -> None:
+        self._stays[stay.booking_id] = stay
+        if stay.room is not None:
+            self._room_refs[stay.room] = self._room_refs.get(stay.room, 0) + 1
+        if stay.active:
+            self._rooms.setdefault(stay.room, RoomIntervals()).add(stay)
+
+    def _discard(self, booking_id: str) -> None:
+        stay = self._stays.pop(booking_id, None)
+        if stay is None:
+            return
+        if stay.room is not None:
+            self._room_refs[stay.room] -= 1
+            if not self._room_refs[stay.room]:
+                del self._room_refs[stay.room]
+        if stay.active:
+            intervals = self._rooms[stay.room]
+            intervals.remove(stay)
+            if not intervals:
+                del self._rooms[stay.room]
+
+    def upsert(self, booking: Dict) -> bool:
+        """
+        Insert or update a mapped booking. Returns whether anything changed.
+        """
+        stay = Stay.from_booking(booking)
+        with self._lock:
+            if self._stays.get(stay.booking_id) == stay:
+                return False
+            self._discard(stay.booking_id)
+            self._add(stay)
+            return True
+
+    def remove(self, booking_id: str) -> bool:
+        """
+        Remove a booking. Returns whether it was indexed.
+        """
+        with self._lock:
+            if booking_id not in self._stays:
+                return False
+            self._discard(booking_id)
+            return True
+
+    def sync(self, bookings: Iterable[Dict]) -> Dict[str, int]:
+        """
+        Make the index match a full list of mapped bookings, applying only
+        the differences.
+
+        Returns:
+            Dict[str, int]: Counts of `added`, `updated` and `removed`
+            bookings.
+        """
+        changes = {"added": 0, "updated": 0, "removed": 0}
+        stays = {}
+        for booking in bookings:
+            stay = Stay.from_booking(booking)
+            stays[stay.booking_id] = stay
+
+        with self._lock:
+            for booking_id in [b for b in self._stays if b not in stays]:
+                self._discard(booking_id)
+                changes["removed"] += 1
+            for booking_id, stay in stays.items():
+                previous = self._stays.get(booking_id)
+                if previous == stay:
+                    continue
+                changes["updated" if previous else "added"] += 1
+                self._discard(booking_id)
+                self._add(stay)
+            self.refreshed_at = time.monotonic()
+        return changes
+
+    def is_stale(self, max_age: float) -> bool:
+        return self.refreshed_at is None or (
+            time.monotonic() - self.refreshed_at >= max_age
+        )
+
+    def refresh(self, fetch: Callable[[], List[Dict]], max_age: float) -> None:
+        """
+        Sync the index from `fetch` (raw PMS bookings) if it is older than
+        `max_age` seconds.
+
+        Only one thread refreshes at a time; others keep reading the current
+        contents. Invalid bookings are skipped. If the fetch fails, the
+        previous contents are kept, unless the index was never loaded.
+
+        Raises:
+            ExternalAPIException: If the index was never loaded and the fetch
+                fails.
+        """
+        if not self.is_stale(max_age):
+            return
+        loaded = self.refreshed_at is not None
+        if not self._refresh_lock.acquire(blocking=not loaded):
+            return
+        try:
+            if not self.is_stale(max_age):
+                return
+            raw_bookings = fetch()
+            self.sync(
+                booking
+                for booking in map(map_booking, raw_bookings)
+                if booking is not None
+            )
+        except ExternalAPIException as e:
+            if not loaded:
+                raise
+            logger.warning("Availability index refresh failed: %s", e)
+        finally:
+            self._refresh_lock.release()
+
+    def overlapping(
+        self, check_in: date, check_out: date, room: Optional[str] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Return the active bookings overlapping `[check_in, check_out)` by room.
+        """
+        start, end = check_in.toordinal(), check_out.toordinal()
+        with self._lock:
+            rooms = [room] if room is not None else list(self._rooms)
+            result = {}
+            for name in rooms:
+                intervals = self._rooms.get(name)
+                if intervals and intervals.count_overlapping(start, end):
+                    result[name] = intervals.overlapping(start, end)
+            return result
+
+    def free_rooms(self, check_in: date, check_out: date) -> List[str]:
+        """
+        Return the known rooms with no active booking in `[check_in, check_out)`.
+        """
+        start, end = check_in.toordinal(), check_out.toordinal()
+        with self._lock:
+            return [
+                room
+                for room in sorted(self._room_refs)
+                if room not in self._rooms
+                or not self._rooms[room].count_overlapping(start, end)
+            ]
+
+    def occupancy(self, start: date, end: date) -> List[Tuple[date, int]]:
+        """
+        Return the number of occupied rooms for every night in `[start, end)`.
+
+        A room counts once per night however many active stays it has, so
+        double bookings never push occupancy above the number of rooms.
+        """
+        first, last = start.toordinal(), end.toordinal()
+        # +1 on the first night a room is occupied, -1 on the night it frees up.
+        changes = [0] * (max(last - first, 0) + 1)
+        with self._lock:
+            for intervals in self._rooms.values():
+                for night, until in intervals.occupied(first, last):
+                    changes[night - first] += 1
+                    changes[until - first] -= 1
+        return [
+            (date.fromordinal(first + offset), occupied)
+            for offset, occupied in enumerate(itertools.accumulate(changes[:-1]))
+        ]
+
+
+_index: Optional[AvailabilityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_availability_index() -> AvailabilityIndex:
+    """
+    Return the process-wide availability index.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AvailabilityIndex()
+    return _index
+
+
+def reset_availability_index() -> None:
+    """
+    Drop the process-wide availability index so it is rebuilt on next use.
+    """
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def refreshed_availability_index(fetch: Callable[[], List[Dict]]) -> AvailabilityIndex:
+    """
+    Return the process-wide availability index, synced from `fetch` when it
+    is older than `settings.PMS_AVAILABILITY_MAX_AGE` seconds.
+    """
+    index = get_availability_index()
+    index.refresh(fetch, settings.PMS_AVAILABILITY_MAX_AGE)
+    return index
@@ -0,0 +1,556 @@
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+from integrations.base.conditional import Validators, content_etag
+from integrations.base.exceptions import ExternalAPIException, ExternalAPINotFound
+
+from .datasource import get_booking_snapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SETTINGS = {
+    "ALIAS": "default",
+    "KEY_PREFIX": "pms",
+    "TTL": {"bookings": 30, "booking": 60},
+    "STALE_TTL": 300,
+    "REFRESH_AHEAD": 0.8,
+}
+
+# Background refreshes run off the request path on a small shared pool.
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="pms-cache-refresh"
+)
+# Strong references to in-flight async refresh tasks.
+_refresh_tasks = set()
+
+
+def get_cache_settings() -> dict:
+    """
+    Return the PMS cache settings, with `settings.PMS_CACHE` overriding the
+    defaults.
+    """
+    cache_settings = {**DEFAULT_CACHE_SETTINGS, **getattr(settings, "PMS_CACHE", {})}
+    cache_settings["TTL"] = {
+        **DEFAULT_CACHE_SETTINGS["TTL"],
+        **cache_settings["TTL"],
+    }
+    return cache_settings
+
+
+class BookingCachePolicy:
+    """
+    Key layout and freshness rules shared by the sync and async cached clients.
+
+    Each cache entry holds the upstream payload, the time it was fetched and
+    its validators: a content hash and the time the content last changed,
+    computed once per upstream fetch. Entries are fresh for the endpoint
+    TTL, refreshed in the background once `REFRESH_AHEAD` of the TTL has
+    elapsed, and kept for a further `STALE_TTL` seconds so they can be
+    served when the PMS fails.
+    """
+
+    def __init__(self, cache_alias: Optional[str] = None) -> None:
+        self.settings = get_cache_settings()
+        self.cache = caches[cache_alias or self.settings["ALIAS"]]
+
+    def key(self, endpoint: str, *parts: Any) -> str:
+        return ":".join([self.settings["KEY_PREFIX"], endpoint, *map(str, parts)])
+
+    def ttl(self, endpoint: str) -> float:
+        return self.settings["TTL"][endpoint]
+
+    def timeout(self, endpoint: str) -> float:
+        return self.ttl(endpoint) + self.settings["STALE_TTL"]
+
+    def entry(self, value: Any, previous: Optional[Dict] = None) -> Dict:
+        """
+        Build a cache entry for a fetched payload. The modification time is
+        carried over from `previous` when the content did not change.
+        """
+        now = time.time()
+        etag = content_etag(value)
+        if previous is not None and previous.get("etag") == etag:
+            modified_at = previous["modified_at"]
+        else:
+            modified_at = now
+        return {
+            "value": value,
+            "fetched_at": now,
+            "etag": etag,
+            "modified_at": modified_at,
+        }
+
+    def pack(self, entry: Dict) -> Dict:
+        """
+        Return `entry` as it is cached. Bookings served from the snapshot
+        mapping are left out and restored by `unpack`, so a worker never
+        pickles a private copy of them.
+        """
+        snapshot = get_booking_snapshot()
+        if snapshot is not None and entry["value"] is snapshot.datasource.all():
+            return {**entry, "value": None, "snapshot": snapshot.etag}
+        return entry
+
+    def unpack(self, entry: Optional[Dict]) -> Optional[Dict]:
+        """
+        Return a cached entry with its value, or None when it was packed
+        from a snapshot this process has not mapped.
+        """
+        if entry is None or "snapshot" not in entry:
+            return entry
+        snapshot = get_booking_snapshot()
+        if snapshot is None or snapshot.etag != entry["snapshot"]:
+            return None
+        return {**entry, "value": snapshot.datasource.all()}
+
+    def snapshot_entry(self) -> Optional[Dict]:
+        """
+        Return an uncached booking list entry over the snapshot, dated by
+        the file's modification time, while it is within the stale TTL.
+
+        Cold workers answer list reads from it, whether the PMS is simulated
+        or reached over HTTP, until it is older than the TTL, and fall back
+        to it while the PMS fails.
+        """
+        snapshot = get_booking_snapshot()
+        if snapshot is None or time.time() - snapshot.modified_at >= self.timeout(
+            "bookings"
+        ):
+            return None
+        return {
+            "value": snapshot.datasource.all(),
+            "fetched_at": snapshot.modified_at,
+            "etag": snapshot.etag,
+            "modified_at": snapshot.modified_at,
+        }
+
+    def validators(self, entry: Dict) -> Validators:
+        return Validators(
+            entry.get("etag") or content_etag(entry["value"]),
+            entry.get("modified_at", entry["fetched_at"]),
+        )
+
+    def age(self, entry: Dict) -> float:
+        return time.time() - entry["fetched_at"]
+
+    def is_fresh(self, endpoint: str, entry: Dict) -> bool:
+        return self.age(entry) < self.ttl(endpoint)
+
+    def needs_refresh(self, endpoint: str, entry: Dict, horizon: float = 0.0) -> bool:
+        """
+        Return whether the entry is due for a refresh, or will be within
+        `horizon` seconds.
+        """
+        due_at = self.ttl(endpoint) * self.settings["REFRESH_AHEAD"]
+        return self.age(entry) + horizon >= due_at
+
+    def lock_key(self, key: str) -> str:
+        return f"{key}:refreshing"
+
+    def generation_key(self) -> str:
+        return self.key("bookings", "generation")
+
+    def filtered_key(self, generation: int, params: Dict) -> str:
+        """
+        Key for a filtered booking list. Filtered lists are keyed by the
+        current list generation, so invalidating the list drops them all.
+        """
+        return self.key("bookings", generation, urlencode(sorted(params.items())))
+
+    def new_generation(self) -> int:
+        return time.time_ns()
+
+    def cached_bookings(
+        self,
+        booking_ids: Sequence[str],
+        booking_entries: Dict[str, Dict],
+        list_entry: Optional[Dict],
+    ) -> Dict[str, Dict]:
+        """
+        Return the bookings among `booking_ids` held in fresh cache entries.
+
+        Args:
+            booking_ids (Sequence[str]): Booking IDs to look up.
+            booking_entries (Dict[str, Dict]): Detail entries by cache key, as
+                returned by `get_many`.
+            list_entry (Optional[Dict]): The full booking list entry, used for
+                IDs without a fresh detail entry.
+        """
+        found = {}
+        for booking_id in booking_ids:
+            entry = booking_entries.get(self.key("booking", booking_id))
+            if entry is not None and self.is_fresh("booking", entry):
+                found[booking_id] = entry["value"]
+        list_entry = self.unpack(list_entry)
+        if (
+            len(found) < len(booking_ids)
+            and list_entry is not None
+            and self.is_fresh("bookings", list_entry)
+        ):
+            wanted = set(booking_ids) - set(found)
+            for booking in list_entry["value"]:
+                if isinstance(booking, Mapping) and str(booking.get("id")) in wanted:
+                    found[str(booking["id"])] = booking
+        return found
+
+
+class CachedPMSClient:
+    """
+    Read-through cache in front of a PMSClient, backed by Django's cache
+    framework.
+
+    Serves fresh entries straight from the cache, refreshes hot entries in
+    the background before they expire and falls back to the last known
+    payload when the PMS fails. Not-found responses are never cached.
+    Filtered booking lists are cached per upstream query. With a booking
+    snapshot, cold lists are read from its mapping (see
+    `BookingCachePolicy.snapshot_entry`).
+    """
+
+    def __init__(self, client, cache_alias: Optional[str] = None) -> None:
+        """
+        Args:
+            client (PMSClient): Client used to reach the PMS on cache misses.
+            cache_alias (Optional[str]): Django cache alias, defaults to
+                `settings.PMS_CACHE["ALIAS"]`.
+        """
+        self.client = client
+        self.policy = BookingCachePolicy(cache_alias)
+        self.cache = self.policy.cache
+
+    def fetch_bookings(self, params: Optional[Dict] = None) -> List[Dict]:
+        """
+        Return all bookings, or those matching the upstream `params`, from
+        cache when possible.
+        """
+        return self.fetch_bookings_versioned(params)[0]
+
+    def fetch_bookings_versioned(
+        self, params: Optional[Dict] = None
+    ) -> Tuple[List[Dict], Validators]:
+        """
+        Like `fetch_bookings`, also returning the validators of the payload.
+        """
+        if not params:
+            key, fetch = self.policy.key("bookings"), self.client.fetch_bookings
+        else:
+            generation = self.cache.get(self.policy.generation_key(), 0)
+            key = self.policy.filtered_key(generation, params)
+            fetch = functools.partial(self.client.fetch_bookings, params)
+        entry = self._read_through("bookings", key, fetch)
+        return entry["value"], self.policy.validators(entry)
+
+    def fetch_booking_by_id(self, booking_id: str) -> Dict:
+        """
+        Return a single booking, from cache when possible.
+        """
+        return self.fetch_booking_by_id_versioned(booking_id)[0]
+
+    def fetch_booking_by_id_versioned(self, booking_id: str) -> Tuple[Dict, Validators]:
+        """
+        Like `fetch_booking_by_id`, also returning the validators of the payload.
+        """
+        entry = self._read_through(
+            "booking",
+            self.policy.key("booking", booking_id),
+            lambda: self.client.fetch_booking_by_id(booking_id),
+        )
+        return entry["value"], self.policy.validators(entry)
+
+    def fetch_bookings_by_ids(
+        self, booking_ids: Sequence[str], max_concurrency: int
+    ) -> Dict[str, Union[Dict, ExternalAPIException]]:
+        """
+        Return many bookings by ID in one pass.
+
+        Bookings held in fresh detail entries or in the cached booking list
+        are served from cache; the rest are fetched concurrently, at most
+        `max_concurrency` at a time, and cached like single lookups.
+
+        Returns:
+            Dict[str, Union[Dict, ExternalAPIException]]: The booking, or the
+            exception raised while fetching it, by booking ID.
+        """
+        keys = [self.policy.key("booking", booking_id) for booking_id in booking_ids]
+        found = self.policy.cached_bookings(
+            booking_ids,
+            self.cache.get_many(keys),
+            self.cache.get(self.policy.key("bookings")),
+        )
+        missing = [booking_id for booking_id in booking_ids if booking_id not in found]
+        if missing:
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(missing)),
+                thread_name_prefix="pms-batch",
+            ) as executor:
+                found.update(zip(missing, executor.map(self._fetch_or_error, missing)))
+        return {booking_id: found[booking_id] for booking_id in booking_ids}
+
+    def _fetch_or_error(self, booking_id: str) -> Union[Dict, ExternalAPIException]:
+        try:
+            return self.fetch_booking_by_id(booking_id)
+        except ExternalAPIException as e:
+            return e
+
+    def invalidate_bookings(self) -> None:
+        """
+        Drop the cached booking list and every filtered list.
+        """
+        self.cache.set(self.policy.generation_key(), self.policy.new_generation(), None)
+        self.cache.delete(self.policy.key("bookings"))
+
+    def invalidate_booking(self, booking_id: str) -> None:
+        """
+        Drop a cached booking and the lists that contain it.
+        """
+        self.cache.delete(self.policy.key("booking", booking_id))
+        self.invalidate_bookings()
+
+    def prefetch_bookings(self, horizon: float = 0.0) -> bool:
+        """
+        Fetch the booking list ahead of requests if it is missing or due for
+        a refresh within `horizon` seconds.
+
+        Returns:
+            bool: Whether the PMS was called.
+
+        Raises:
+            ExternalAPIException: When the PMS fails.
+        """
+        return self._prefetch(
+            "bookings", self.policy.key("bookings"), self.client.fetch_bookings, horizon
+        )
+
+    def prefetch_booking(self, booking_id: str, horizon: float = 0.0) -> bool:
+        """
+        Like `prefetch_bookings`, for a single booking. Bookings the PMS no
+        longer knows are dropped from the cache.
+        """
+        return self._prefetch(
+            "booking",
+            self.policy.key("booking", booking_id),
+            lambda: self.client.fetch_booking_by_id(booking_id),
+            horizon,
+        )
+
+    def _prefetch(self, endpoint: str, key: str, fetch: Callable, horizon: float):
+        entry = self.cache.get(key)
+        if entry is not None and not self.policy.needs_refresh(
+            endpoint, entry, horizon
+        ):
+            return False
+        lock_key = self.policy.lock_key(key)
+        if not self.cache.add(lock_key, True, self.policy.ttl(endpoint)):
+            return False  # Another worker is already refreshing this entry.
+        try:
+            self._store(endpoint, key, fetch(), entry)
+        except ExternalAPINotFound:
+            self.cache.delete(key)
+        finally:
+            self.cache.delete(lock_key)
+        return True
+
+    def _read_through(self, endpoint: str, key: str, fetch: Callable) -> Dict:
+        entry = self.policy.unpack(self.cache.get(key))
+        if entry is None and key == self.policy.key("bookings"):
+            entry = self.policy.snapshot_entry()
+        if entry is not None and self.policy.is_fresh(endpoint, entry):
+            if self.policy.needs_refresh(endpoint, entry):
+                self._refresh_in_background(endpoint, key, fetch)
+            return entry
+
+        try:
+            return self._store(endpoint, key, fetch(), entry)
+        except ExternalAPINotFound:
+            self.cache.delete(key)
+            raise
+        except ExternalAPIException:
+            if entry is None:
+                raise
+            logger.warning("PMS request failed, serving stale %s", key)
+            return entry
+
+    def _store(
+        self, endpoint: str, key: str, value: Any, previous: Optional[Dict] = None
+    ) -> Dict:
+        entry = self.policy.entry(value, previous)
+        self.cache.set(key, self.policy.pack(entry), self.policy.timeout(endpoint))
+        return entry
+
+    def _refresh_in_background(self, endpoint: str, key: str, fetch: Callable) -> None:
+        lock_key = self.policy.lock_key(key)
+        if not self.cache.add(lock_key, True, self.policy.ttl(endpoint)):
+            return  # Another worker is already refreshing this entry.
+        _refresh_executor.submit(self._refresh, endpoint, key, fetch)
+
+    def _refresh(self, endpoint: str, key: str, fetch: Callable) -> None:
+        try:
+            self._store(endpoint, key, fetch(), self.cache.get(key))
+        except ExternalAPINotFound:
+            self.cache.delete(key)
+        except ExternalAPIException as e:
+            logger.warning("Background refresh of %s failed: %s", key, e)
+        finally:
+            self.cache.delete(self.policy.lock_key(key))
+
+
+class AsyncCachedPMSClient:
+    """
+    Asyncio counterpart of CachedPMSClient wrapping an AsyncPMSClient.
+
+    Uses Django's async cache API and refreshes entries in background tasks
+    on the running event loop.
+    """
+
+    def __init__(self, client, cache_alias: Optional[str] = None) -> None:
+        """
+        Args:
+            client (AsyncPMSClient): Client used to reach the PMS on cache misses.
+            cache_alias (Optional[str]): Django cache alias, defaults to
+                `settings.PMS_CACHE["ALIAS"]`.
+        """
+        self.client = client
+        self.policy = BookingCachePolicy(cache_alias)
+        self.cache = self.policy.cache
+
+    async def fetch_bookings(self, params: Optional[Dict] = None) -> List[Dict]:
+        """
+        Return all bookings, or those matching the upstream `params`, from
+        cache when possible.
+        """
+        return (await self.fetch_bookings_versioned(params))[0]
+
+    async def fetch_bookings_versioned(
+        self, params: Optional[Dict] = None
+    ) -> Tuple[List[Dict], Validators]:
+        """
+        Like `fetch_bookings`, also returning the validators of the payload.
+        """
+        if not params:
+            key, fetch = self.policy.key("bookings"), self.client.fetch_bookings
+        else:
+            generation = await self.cache.aget(self.policy.generation_key(), 0)
+            key = self.policy.filtered_key(generation, params)
+            fetch = functools.partial(self.client.fetch_bookings, params)
+        entry = await self._read_through("bookings", key, fetch)
+        return entry["value"], self.policy.validators(entry)
+
+    async def fetch_booking_by_id(self, booking_id: str) -> Dict:
+        """
+        Return a single booking, from cache when possible.
+        """
+        return (await self.fetch_booking_by_id_versioned(booking_id))[0]
+
+    async def fetch_booking_by_id_versioned(
+        self, booking_id: str
+    ) -> Tuple[Dict, Validators]:
+        """
+        Like `fetch_booking_by_id`, also returning the validators of the payload.
+        """
+        entry = await self._read_through(
+            "booking",
+            self.policy.key("booking", booking_id),
+            lambda: self.client.fetch_booking_by_id(booking_id),
+        )
+        return entry["value"], self.policy.validators(entry)
+
+    async def fetch_bookings_by_ids(
+        self, booking_ids: Sequence[str], max_concurrency: int
+    ) -> Dict[str, Union[Dict, ExternalAPIException]]:
+        """
+        Return many bookings by ID in one pass, fetching cache misses
+        concurrently on the event loop, at most `max_concurrency` at a time.
+        See `CachedPMSClient.fetch_bookings_by_ids`.
+        """
+        keys = [self.policy.key("booking", booking_id) for booking_id in booking_ids]
+        found = self.policy.cached_bookings(
+            booking_ids,
+            await self.cache.aget_many(keys),
+            await self.cache.aget(self.policy.key("bookings")),
+        )
+        missing = [booking_id for booking_id in booking_ids if booking_id not in found]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(booking_id: str) -> Union[Dict, ExternalAPIException]:
+            async with semaphore:
+                try:
+                    return await self.fetch_booking_by_id(booking_id)
+                except ExternalAPIException as e:
+                    return e
+
+        found.update(zip(missing, await asyncio.gather(*map(fetch, missing))))
+        return {booking_id: found[booking_id] for booking_id in booking_ids}
+
+    async def invalidate_bookings(self) -> None:
+        """
+        Drop the cached booking list and every filtered list.
+        """
+        await self.cache.aset(
+            self.policy.generation_key(), self.policy.new_generation(), None
+        )
+        await self.cache.adelete(self.policy.key("bookings"))
+
+    async def invalidate_booking(self, booking_id: str) -> None:
+        """
+        Drop a cached booking and the lists that contain it.
+        """
+        await self.cache.adelete(self.policy.key("booking", booking_id))
+        await self.invalidate_bookings()
+
+    async def _read_through(self, endpoint: str, key: str, fetch: Callable) -> Dict:
+        entry = self.policy.unpack(await self.cache.aget(key))
+        if entry is None and key == self.policy.key("bookings"):
+            entry = self.policy.snapshot_entry()
+        if entry is not None and self.policy.is_fresh(endpoint, entry):
+            if self.policy.needs_refresh(endpoint, entry):
+                await self._refresh_in_background(endpoint, key, fetch)
+            return entry
+
+        try:
+            return await self._store(endpoint, key, await fetch(), entry)
+        except ExternalAPINotFound:
+            await self.cache.adelete(key)
+            raise
+        except ExternalAPIException:
+            if entry is None:
+                raise
+            logger.warning("PMS request failed, serving stale %s", key)
+            return entry
+
+    async def _store(
+        self, endpoint: str, key: str, value: Any, previous: Optional[Dict] = None
+    ) -> Dict:
+        entry = self.policy.entry(value, previous)
+        await self.cache.aset(
+            key, self.policy.pack(entry), self.policy.timeout(endpoint)
+        )
+        return entry
+
+    async def _refresh_in_background(
+        self, endpoint: str, key: str, fetch: Callable
+    ) -> None:
+        lock_key = self.policy.lock_key(key)
+        if not await self.cache.aadd(lock_key, True, self.policy.ttl(endpoint)):
+            return  # Another worker is already refreshing this entry.
+        task = asyncio.create_task(self._refresh(endpoint, key, fetch))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+
+    async def _refresh(self, endpoint: str, key: str, fetch: Callable) -> None:
+        try:
+            await self._store(endpoint, key, await fetch(), await self.cache.aget(key))
+        except ExternalAPINotFound:
+            await self.cache.adelete(key)
+        except ExternalAPIException as e:
+            logger.warning("Background refresh of %s failed: %s", key, e)
+        finally:
+            await self.cache.adelete(self.policy.lock_key(key))
@@ -1,60 +1,219 @@
+import asyncio
 import random
+import re
 import time
-from typing import Dict, List, Union
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from django.conf import settings
-from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_502_BAD_GATEWAY
+from rest_framework.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_502_BAD_GATEWAY,
+)
 
-from integrations.base.clients import BaseAPIClient
-from integrations.base.exceptions import ExternalAPINotFound, ExternalAPIResponseError
+from integrations.base.clients import AsyncBaseAPIClient, BaseAPIClient
+from integrations.base.exceptions import (
+    ExternalAPINotFound,
+    ExternalAPIResponseError,
+    ExternalAPITimeoutError,
+)
 
-from .mock_data import MOCK_PMS_BOOKINGS
+from .datasource import get_booking_datasource
+from .properties import PMSProperty
 
+BOOKING_DETAIL_PATH = re.compile(r"^/bookings/(?P<booking_id>[^/]+)/?$")
 
-class PMSClient(BaseAPIClient):
-    """
-    Client to interact with the Property Management System (PMS) API.
-    This class simulates external requests using mock data.
+
+class PMSSimulationMixin:
     """
+    Mock-data behaviour shared by the sync and async PMS clients.
+
+    Requests are answered from the indexed booking data source, so detail
+    lookups are O(1) however large the dataset is. The list endpoint honours
+    the `room` and `booking_status` query params through the same indexes.
 
-    def __init__(self) -> None:
-        super().__init__(base_url=settings.PMS_API_URL)
+    With `settings.PMS_USE_HTTP` the simulation is skipped and requests go
+    over HTTP to `PMS_API_URL`, e.g. a FakePMSServer, through the real
+    BaseAPIClient transport.
+    """
 
-    def fetch_bookings(self) -> List[Dict]:
+    def _request(
+        self, path: str, params: Optional[Dict] = None
+    ) -> Callable[[Optional[float]], Any]:
         """
-        Simulate fetching all bookings from the PMS API.
+        Return the call answering `path`: an HTTP request when
+        `settings.PMS_USE_HTTP` is set, otherwise the simulation. It takes
+        the time left before the retry deadline; simulated latency past it
+        times out like a real request.
         """
-        return self._simulate_get("/bookings/")
+        if getattr(settings, "PMS_USE_HTTP", False):
+            return partial(self._send, path, params)
+        return partial(self._simulate_get, path, params)
 
-    def fetch_booking_by_id(self, booking_id: str) -> Dict:
+    def _not_found(self, path: str, error: ExternalAPIResponseError):
         """
-        Simulate fetching a specific booking from the PMS API by ID.
+        Return the ExternalAPINotFound matching an upstream 404 on a booking
+        detail path, or `error` itself otherwise.
         """
-        return self._simulate_get(f"/bookings/{booking_id}/")
-
-    def _simulate_get(self, path: str) -> Union[List[Dict], Dict]:
-        self._simulate_network_latency()
-        self._maybe_fail()
+        match = BOOKING_DETAIL_PATH.match(path)
+        if error.status_code != HTTP_404_NOT_FOUND or match is None:
+            return error
+        return ExternalAPINotFound(f"Booking ID '{match['booking_id']}' not found.")
 
+    def _resolve(
+        self, path: str, params: Optional[Dict] = None
+    ) -> Union[List[Dict], Dict]:
+        datasource = get_booking_datasource()
         if path == "/bookings/":
-            return MOCK_PMS_BOOKINGS
+            params = params or {}
+            return datasource.query(
+                room=params.get("room"), booking_status=params.get("booking_status")
+            )
 
-        if path.startswith("/bookings/"):
-            booking_id = path.rstrip("/").split("/")[-1]
-            for booking in MOCK_PMS_BOOKINGS:
-                if booking["id"] == booking_id:
-                    return booking
-            raise ExternalAPINotFound(f"Booking ID '{booking_id}' not found.")
+        match = BOOKING_DETAIL_PATH.match(path)
+        if match:
+            booking_id = match["booking_id"]
+            booking = datasource.get(booking_id)
+            if booking is None:
+                raise ExternalAPINotFound(f"Booking ID '{booking_id}' not found.")
+            return booking
 
         raise ExternalAPIResponseError(
             HTTP_400_BAD_REQUEST, f"Invalid endpoint: {path}"
         )
 
-    def _simulate_network_latency(self) -> None:
-        time.sleep(random.uniform(0.1, 0.3))
-
     def _maybe_fail(self, failure_rate: float = 0.2) -> None:
         if random.random() < failure_rate:
             raise ExternalAPIResponseError(
                 HTTP_502_BAD_GATEWAY, "Simulated PMS API failure."
             )
+
+
+class PMSClient(PMSSimulationMixin, BaseAPIClient):
+    """
+    Client to interact with the Property Management System (PMS) API.
+
+    This class simulates external requests using mock data, unless
+    `settings.PMS_USE_HTTP` is set. Simulated requests go through the same
+    coalescing and retry pipeline as real ones.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 5.0) -> None:
+        """
+        Args:
+            base_url (Optional[str]): PMS base URL, defaults to
+                `settings.PMS_API_URL`.
+            timeout (float): Request timeout in seconds.
+        """
+        super().__init__(base_url=base_url or settings.PMS_API_URL, timeout=timeout)
+
+    @classmethod
+    def for_property(cls, pms_property: PMSProperty):
+        """
+        Build a client for one of the configured PMS properties.
+        """
+        return cls(base_url=pms_property.url, timeout=pms_property.timeout)
+
+    def fetch_bookings(self, params: Optional[Dict] = None) -> List[Dict]:
+        """
+        Simulate fetching all bookings from the PMS API.
+
+        Args:
+            params (Optional[Dict]): Upstream filters, `room` and `booking_status`.
+        """
+        return self._execute("/bookings/", params, self._request("/bookings/", params))
+
+    def fetch_booking_by_id(self, booking_id: str) -> Dict:
+        """
+        Simulate fetching a specific booking from the PMS API by ID.
+        """
+        path = f"/bookings/{booking_id}/"
+        return self._execute(path, None, self._request(path))
+
+    def _send(
+        self, path: str, params: Optional[Dict] = None, timeout: Optional[float] = None
+    ) -> Any:
+        try:
+            return super()._send(path, params, timeout)
+        except ExternalAPIResponseError as e:
+            raise self._not_found(path, e)
+
+    def _simulate_get(
+        self, path: str, params: Optional[Dict] = None, timeout: Optional[float] = None
+    ) -> Union[List[Dict], Dict]:
+        self._simulate_network_latency(timeout)
+        self._maybe_fail()
+        return self._resolve(path, params)
+
+    def _simulate_network_latency(self, timeout: Optional[float] = None) -> None:
+        latency = random.uniform(0.1, 0.3)
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise ExternalAPITimeoutError("Simulated PMS API timeout.")
+        time.sleep(latency)
+
+
+class AsyncPMSClient(PMSSimulationMixin, AsyncBaseAPIClient):
+    """
+    Asyncio counterpart of PMSClient.
+
+    Simulated latency awaits `asyncio.sleep`, so in-flight PMS calls do not
+    hold a worker thread.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 5.0) -> None:
+        """
+        Args:
+            base_url (Optional[str]): PMS base URL, defaults to
+                `settings.PMS_API_URL`.
+            timeout (float): Request timeout in seconds.
+        """
+        super().__init__(base_url=base_url or settings.PMS_API_URL, timeout=timeout)
+
+    @classmethod
+    def for_property(cls, pms_property: PMSProperty):
+        """
+        Build a client for one of the configured PMS properties.
+        """
+        return cls(base_url=pms_property.url, timeout=pms_property.timeout)
+
+    async def fetch_bookings(self, params: Optional[Dict] = None) -> List[Dict]:
+        """
+        Simulate fetching all bookings from the PMS API.
+
+        Args:
+            params (Optional[Dict]): Upstream filters, `room` and `booking_status`.
+        """
+        return await self._execute(
+            "/bookings/", params, self._request("/bookings/", params)
+        )
+
+    async def fetch_booking_by_id(self, booking_id: str) -> Dict:
+        """
+        Simulate fetching a specific booking from the PMS API by ID.
+        """
+        path = f"/bookings/{booking_id}/"
+        return await self._execute(path, None, self._request(path))
+
+    async def _send(
+        self, path: str, params: Optional[Dict] = None, timeout: Optional[float] = None
+    ) -> Any:
+        try:
+            return await super()._send(path, params, timeout)
+        except ExternalAPIResponseError as e:
+            raise self._not_found(path, e)
+
+    async def _simulate_get(
+        self, path: str, params: Optional[Dict] = None, timeout: Optional[float] = None
+    ) -> Union[List[Dict], Dict]:
+        await self._simulate_network_latency(timeout)
+        self._maybe_fail()
+        return self._resolve(path, params)
+
+    async def _simulate_network_latency(self, timeout: Optional[float] = None) -> None:
+        latency = random.uniform(0.1, 0.3)
+        if timeout is not None and latency > timeout:
+            await asyncio.sleep(timeout)
+            raise ExternalAPITimeoutError("Simulated PMS API timeout.")
+        await asyncio.sleep(latency)
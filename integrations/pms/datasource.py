@@ -0,0 +1,398 @@
+import functools
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from django.conf import settings
+
+from integrations.base.conditional import content_etag
+
+from .mock_data import MOCK_PMS_BOOKINGS
+from .snapshot import load_snapshot
+from .store import CompactBookingStore
+
+logger = logging.getLogger(__name__)
+
+
+def iter_fixture(path: Union[str, Path]) -> Iterator[Dict]:
+    """
+    Yield raw PMS bookings from a JSON array or NDJSON fixture file.
+
+    Files ending in `.ndjson` or `.jsonl` are read line by line, so large
+    datasets never need to be held as one JSON document.
+    """
+    path = Path(path)
+    with path.open("rb") as fixture:
+        if path.suffix in (".ndjson", ".jsonl"):
+            for line in fixture:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(fixture)
+
+
+class BookingDataSource:
+    """
+    In-memory PMS booking dataset with lookup indexes.
+
+    Bookings are indexed by id (primary), room and status so that detail
+    lookups and filtered reads cost the same regardless of dataset size.
+    Every change bumps `version`; whole-dataset replacement rebuilds the
+    indexes, single-booking changes update them in place.
+    """
+
+    def __init__(self, bookings: Iterable[Dict] = ()) -> None:
+        self._lock = threading.RLock()
+        self.version = 0
+        self.replace(bookings)
+
+    @classmethod
+    def from_fixture(cls, path: Union[str, Path]) -> "BookingDataSource":
+        """
+        Build a data source from a JSON array or NDJSON fixture file.
+        """
+        return cls(iter_fixture(path))
+
+    def replace(self, bookings: Iterable[Dict]) -> None:
+        """
+        Replace the whole dataset and rebuild every index.
+        """
+        by_id: Dict[str, Dict] = {}
+        by_room: Dict[str, Dict[str, Dict]] = {}
+        by_status: Dict[str, Dict[str, Dict]] = {}
+        for booking in bookings:
+            booking_id = str(booking["id"])
+            by_id[booking_id] = booking
+            by_room.setdefault(booking.get("room"), {})[booking_id] = booking
+            by_status.setdefault(booking.get("booking_status"), {})[booking_id] = (
+                booking
+            )
+
+        with self._lock:
+            self._by_id = by_id
+            self._by_room = by_room
+            self._by_status = by_status
+            self._all: Optional[List[Dict]] = None
+            self.version += 1
+
+    def upsert(self, booking: Dict) -> None:
+        """
+        Insert or update a single booking, updating the indexes in place.
+        """
+        booking_id = str(booking["id"])
+        with self._lock:
+            previous = self._by_id.get(booking_id)
+            if previous is not None:
+                self._unindex_secondary(booking_id, previous)
+            # Assigning in place keeps an updated booking's position.
+            self._by_id[booking_id] = booking
+            self._by_room.setdefault(booking.get("room"), {})[booking_id] = booking
+            self._by_status.setdefault(booking.get("booking_status"), {})[
+                booking_id
+            ] = booking
+            self._all = None
+            self.version += 1
+
+    def remove(self, booking_id: str) -> bool:
+        """
+        Remove a single booking. Returns whether it existed.
+        """
+        with self._lock:
+            previous = self._by_id.pop(str(booking_id), None)
+            if previous is None:
+                return False
+            self._unindex_secondary(str(booking_id), previous)
+            self._all = None
+            self.version += 1
+            return True
+
+    def _unindex_secondary(self, booking_id: str, previous: Dict) -> None:
+        for index, value in (
+            (self._by_room, previous.get("room")),
+            (self._by_status, previous.get("booking_status")),
+        ):
+            bucket = index.get(value, {})
+            bucket.pop(booking_id, None)
+            if not bucket:
+                index.pop(value, None)
+
+    def all(self) -> List[Dict]:
+        """
+        Return every booking. The list is reused until the dataset changes.
+        """
+        with self._lock:
+            if self._all is None:
+                self._all = list(self._by_id.values())
+            return self._all
+
+    def get(self, booking_id: str) -> Optional[Dict]:
+        """
+        Return a booking by id in O(1), or None.
+        """
+        return self._by_id.get(str(booking_id))
+
+    def by_room(self, room: str) -> List[Dict]:
+        """
+        Return the bookings for a room.
+        """
+        with self._lock:
+            return list(self._by_room.get(room, {}).values())
+
+    def by_status(self, status: str) -> List[Dict]:
+        """
+        Return the bookings with a given status.
+        """
+        with self._lock:
+            return list(self._by_status.get(status, {}).values())
+
+    def query(
+        self, room: Optional[str] = None, booking_status: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Return the bookings matching every given criterion, answered from
+        the room and status indexes.
+        """
+        if room is None and booking_status is None:
+            return self.all()
+        with self._lock:
+            buckets = []
+            if room is not None:
+                buckets.append(self._by_room.get(room, {}))
+            if booking_status is not None:
+                buckets.append(self._by_status.get(booking_status, {}))
+            smallest, *others = sorted(buckets, key=len)
+            return [
+                booking
+                for booking_id, booking in smallest.items()
+                if all(booking_id in bucket for bucket in others)
+            ]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+class CompactBookingDataSource:
+    """
+    Booking dataset held in a CompactBookingStore, with the same reads as
+    BookingDataSource at a fraction of its memory.
+
+    List reads return a store rather than a list of dicts: the whole store,
+    or a new one holding the matching rows, which `map_bookings` maps column
+    by column. Detail reads return a new raw dict. Detail lookups bisect the
+    sorted ids and filtered reads compare room and status codes.
+    Single-booking changes rebuild the store, so this suits large datasets
+    that are mostly replaced whole.
+    """
+
+    def __init__(
+        self, bookings: Union[Iterable[Dict], CompactBookingStore] = ()
+    ) -> None:
+        """
+        Args:
+            bookings (Union[Iterable[Dict], CompactBookingStore]): Raw PMS
+                bookings, or a store to serve as is.
+
+        Raises:
+            ValueError: If the bookings do not fit a CompactBookingStore.
+        """
+        self._lock = threading.RLock()
+        self.version = 0
+        self.replace(bookings)
+
+    @classmethod
+    def from_fixture(cls, path: Union[str, Path]) -> "CompactBookingDataSource":
+        """
+        Build a data source from a JSON array or NDJSON fixture file.
+        """
+        return cls(iter_fixture(path))
+
+    @classmethod
+    def from_snapshot(cls, path: Union[str, Path]) -> "CompactBookingDataSource":
+        """
+        Build a data source over a memory-mapped snapshot file (see
+        `integrations.pms.snapshot`), without parsing or copying it.
+        """
+        return cls(load_snapshot(path))
+
+    def replace(self, bookings: Union[Iterable[Dict], CompactBookingStore]) -> None:
+        """
+        Replace the whole dataset.
+        """
+        if isinstance(bookings, CompactBookingStore):
+            store = bookings
+        else:
+            store = CompactBookingStore.from_bookings(bookings)
+        with self._lock:
+            self.store = store
+            self.version += 1
+
+    def upsert(self, booking: Dict) -> None:
+        """
+        Insert or update a single booking, rebuilding the store.
+        """
+        with self._lock:
+            self.replace([*self.store.to_dicts(), booking])
+
+    def remove(self, booking_id: str) -> bool:
+        """
+        Remove a single booking, rebuilding the store. Returns whether it
+        existed.
+        """
+        with self._lock:
+            index = self.store.position(booking_id)
+            if index is None:
+                return False
+            bookings = self.store.to_dicts()
+            del bookings[index]
+            self.replace(bookings)
+            return True
+
+    def all(self) -> CompactBookingStore:
+        """
+        Return every booking, as the store itself.
+        """
+        return self.store
+
+    def get(self, booking_id: str) -> Optional[Dict]:
+        """
+        Return a booking by id in O(log n), or None.
+        """
+        booking = self.store.get(booking_id)
+        return None if booking is None else dict(booking)
+
+    def by_room(self, room: str) -> CompactBookingStore:
+        """
+        Return the bookings for a room.
+        """
+        return self.query(room=room)
+
+    def by_status(self, status: str) -> CompactBookingStore:
+        """
+        Return the bookings with a given status.
+        """
+        return self.query(booking_status=status)
+
+    def query(
+        self, room: Optional[str] = None, booking_status: Optional[str] = None
+    ) -> CompactBookingStore:
+        """
+        Return the bookings matching every given criterion, as a store.
+        """
+        store = self.store
+        if room is None and booking_status is None:
+            return store
+        return store.take(store.rows(room, booking_status))
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+
+def _load_datasource(
+    load: Callable[[], Iterable[Dict]], compact: bool
+) -> Union[BookingDataSource, CompactBookingDataSource]:
+    if compact:
+        try:
+            return CompactBookingDataSource(load())
+        except ValueError as e:
+            logger.warning("Keeping PMS bookings as dicts: %s", e)
+    return BookingDataSource(load())
+
+
+_datasource: Optional[Union[BookingDataSource, CompactBookingDataSource]] = None
+_datasource_lock = threading.Lock()
+
+
+def get_booking_datasource() -> Union[BookingDataSource, CompactBookingDataSource]:
+    """
+    Return the process-wide booking data source.
+
+    Mapped from the snapshot at `settings.PMS_SNAPSHOT_PATH` when set and
+    readable. Otherwise loaded from `settings.PMS_FIXTURE_PATH` when set, or
+    from the bundled mock bookings, and held in a CompactBookingStore when
+    `settings.PMS_COMPACT_STORE` is set and the bookings fit one.
+    """
+    global _datasource
+    if _datasource is None:
+        with _datasource_lock:
+            if _datasource is None:
+                _datasource = _load_snapshot_datasource()
+            if _datasource is None:
+                fixture_path = getattr(settings, "PMS_FIXTURE_PATH", None)
+                if fixture_path:
+                    load = functools.partial(iter_fixture, fixture_path)
+                else:
+                    load = functools.partial(iter, MOCK_PMS_BOOKINGS)
+                _datasource = _load_datasource(
+                    load, getattr(settings, "PMS_COMPACT_STORE", False)
+                )
+    return _datasource
+
+
+def _load_snapshot_datasource() -> Optional[CompactBookingDataSource]:
+    snapshot = get_booking_snapshot()
+    return None if snapshot is None else snapshot.datasource
+
+
+class BookingSnapshot(NamedTuple):
+    """
+    A booking snapshot mapped by this process.
+
+    Attributes:
+        datasource (CompactBookingDataSource): Data source over the mapping.
+        etag (str): Content hash of the bookings, as `content_etag` computes it.
+        modified_at (float): Modification time of the file, in epoch seconds.
+    """
+
+    datasource: CompactBookingDataSource
+    etag: str
+    modified_at: float
+
+
+_snapshot: Optional[BookingSnapshot] = None
+_snapshot_loaded = False
+_snapshot_lock = threading.Lock()
+
+
+def get_booking_snapshot() -> Optional[BookingSnapshot]:
+    """
+    Return the process-wide booking snapshot mapped from
+    `settings.PMS_SNAPSHOT_PATH`, or None when unset or unreadable.
+
+    The file is mapped and hashed once, on first use or by the ASGI lifespan
+    startup, and shared with the simulated PMS data source.
+    """
+    global _snapshot, _snapshot_loaded
+    if not _snapshot_loaded:
+        with _snapshot_lock:
+            if not _snapshot_loaded:
+                _snapshot = _map_snapshot()
+                _snapshot_loaded = True
+    return _snapshot
+
+
+def _map_snapshot() -> Optional[BookingSnapshot]:
+    snapshot_path = getattr(settings, "PMS_SNAPSHOT_PATH", None)
+    if not snapshot_path:
+        return None
+    try:
+        modified_at = os.stat(snapshot_path).st_mtime
+        datasource = CompactBookingDataSource.from_snapshot(snapshot_path)
+    except (OSError, ValueError) as e:
+        logger.warning("Not using the PMS booking snapshot: %s", e)
+        return None
+    return BookingSnapshot(datasource, content_etag(datasource.all()), modified_at)
+
+
+def reset_booking_datasource() -> None:
+    """
+    Drop the process-wide data source and snapshot so they are reloaded on
+    next use.
+    """
+    global _datasource, _snapshot, _snapshot_loaded
+    with _datasource_lock:
+        _datasource = None
+    with _snapshot_lock:
+        _snapshot, _snapshot_loaded = None, False
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from collections.abc import Mapping
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterable, Iterator
+
+from rest_framework.compat import SHORT_SEPARATORS
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+from .serializers import map_booking
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+# Bookings encoded per chunk written to the response.
+EXPORT_CHUNK_SIZE = 500
+
+
+def iter_mapped(raw_bookings: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Map raw PMS bookings one at a time, skipping and logging invalid ones.
+
+    A streamed response has already been sent with a 200 status by the time
+    an invalid booking is reached, so it cannot be reported as a 400.
+    """
+    for raw_booking in raw_bookings:
+        booking = map_booking(raw_booking)
+        if booking is None:
+            logger.warning(
+                "Skipping invalid PMS booking %r in export",
+                raw_booking.get("id") if isinstance(raw_booking, Mapping) else None,
+            )
+            continue
+        yield booking
+
+
+def iter_encoded(bookings: Iterable[Dict]) -> Iterator[str]:
+    """
+    Encode bookings as compact JSON documents, the way DRF's JSONRenderer does.
+    """
+    encoder = encoders.JSONEncoder(
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=SHORT_SEPARATORS,
+    )
+    for booking in bookings:
+        # Escaped like JSONRenderer so the output is a strict JavaScript subset.
+        yield (
+            encoder.encode(booking)
+            .replace("\u2028", "\\u2028")
+            .replace("\u2029", "\\u2029")
+        )
+
+
+def iter_export(
+    raw_bookings: Iterable[Dict],
+    export_format: str = "ndjson",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Yield an export of raw PMS bookings in chunks of `chunk_size` bookings.
+
+    The raw bookings are held whole, as the PMS returns them in one
+    response, but they are mapped and encoded one chunk at a time as the
+    chunks are consumed, so only one chunk of output is held in memory.
+
+    Args:
+        raw_bookings (Iterable[Dict]): Raw PMS bookings.
+        export_format (str): `ndjson` for one booking per line, `json` for a
+            JSON array.
+        chunk_size (int): Bookings per yielded chunk.
+    """
+    encoded = iter_encoded(iter_mapped(raw_bookings))
+    if export_format == "ndjson":
+        while chunk := list(islice(encoded, chunk_size)):
+            yield "\n".join(chunk) + "\n"
+        return
+
+    separator = "["
+    while chunk := list(islice(encoded, chunk_size)):
+        yield separator + ",".join(chunk)
+        separator = ","
+    yield "[]" if separator == "[" else "]"
+
+
+async def aiter_export(
+    raw_bookings: Iterable[Dict],
+    export_format: str = "ndjson",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[str]:
+    """
+    Async iterator over `iter_export`, for streaming responses under ASGI.
+
+    Each chunk is mapped and encoded only when it is requested, and the
+    event loop runs once between chunks, so a long export does not hold it
+    for the whole list.
+    """
+    for chunk in iter_export(raw_bookings, export_format, chunk_size):
+        yield chunk
+        await asyncio.sleep(0)
@@ -0,0 +1,285 @@
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .datasource import BookingDataSource
+from .mock_data import MOCK_PMS_BOOKINGS
+
+BOOKINGS_PATH = re.compile(r"(?:^|/)bookings/(?:(?P<booking_id>[^/]+)/?)?$")
+FAULTS = ("error", "slow_body", "timeout")
+
+
+def generate_bookings(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Generate `count` raw PMS bookings, the same ones for the same `seed`.
+
+    Bookings spread over a year and one room per 25 bookings (at least 10),
+    with the statuses and price range of the bundled mock data.
+    """
+    rng = random.Random(seed)
+    first_day = date(2025, 1, 1)
+    rooms = max(count // 25, 10)
+    bookings = []
+    for index in range(count):
+        check_in = first_day + timedelta(days=rng.randrange(365))
+        nights = rng.randint(1, 7)
+        bookings.append(
+            {
+                "id": str(1001 + index),
+                "guest": f"Guest {index}",
+                "check_in_date": check_in.isoformat(),
+                "check_out_date": (check_in + timedelta(days=nights)).isoformat(),
+                "room": str(101 + rng.randrange(rooms)),
+                "booking_status": rng.choice(["confirmed", "pending", "cancelled"]),
+                "total_price": round(rng.uniform(80, 300) * nights, 2),
+            }
+        )
+    return bookings
+
+
+@dataclass(frozen=True)
+class RequestPlan:
+    """
+    What the fake PMS does with one request.
+
+    Attributes:
+        latency (float): Seconds to wait before answering.
+        fault (Optional[str]): `error`, `slow_body`, `timeout` or None.
+    """
+
+    latency: float
+    fault: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """
+    Seeded latency distribution and fault rates of the fake PMS server.
+
+    Latency is log-normal around `latency_ms` (the median) with shape
+    `latency_sigma`; a sigma of 0 makes it constant. Each request then fails
+    with one of the fault modes, drawn in order with their rates:
+
+    * error: answer `error_status` with a JSON error body.
+    * slow_body: send the headers, then trickle the body over
+      `slow_body_seconds`.
+    * timeout: send nothing for `timeout_seconds`, then drop the connection.
+
+    The plan of request `n` depends only on `seed` and `n`, so a run with
+    the same profile and request order is reproducible.
+    """
+
+    seed: int = 0
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 502
+    slow_body_rate: float = 0.0
+    slow_body_seconds: float = 1.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 30.0
+
+    def plan(self, n: int) -> RequestPlan:
+        """
+        Return the plan of the `n`th request served.
+        """
+        rng = random.Random(f"{self.seed}:{n}")
+        latency = 0.0
+        if self.latency_ms > 0:
+            latency = self.latency_ms / 1000
+            if self.latency_sigma > 0:
+                latency *= math.exp(rng.gauss(0, self.latency_sigma))
+        draw = rng.random()
+        for fault, rate in zip(
+            FAULTS, (self.error_rate, self.slow_body_rate, self.timeout_rate)
+        ):
+            if draw < rate:
+                return RequestPlan(latency, fault)
+            draw -= rate
+        return RequestPlan(latency)
+
+
+class FakePMSRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the PMS booking API of `self.server.fake`.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid delayed-ACK stalls.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        fake: "FakePMSServer" = self.server.fake
+        plan = fake.next_plan()
+        if plan.latency and fake.stopped.wait(plan.latency):
+            return
+        if plan.fault == "timeout":
+            fake.stopped.wait(fake.profile.timeout_seconds)
+            self.close_connection = True
+            return
+        if plan.fault == "error":
+            self._send_json(
+                fake.profile.error_status, {"detail": "Simulated PMS API failure."}
+            )
+            return
+
+        url = urlsplit(self.path)
+        match = BOOKINGS_PATH.search(url.path)
+        if match is None:
+            self._send_json(404, {"detail": f"Invalid endpoint: {url.path}"})
+            return
+        booking_id = match["booking_id"]
+        if booking_id is None:
+            query = parse_qs(url.query)
+            body = fake.datasource.query(
+                room=query.get("room", [None])[0],
+                booking_status=query.get("booking_status", [None])[0],
+            )
+        else:
+            body = fake.datasource.get(booking_id)
+            if body is None:
+                self._send_json(
+                    404, {"detail": f"Booking ID '{booking_id}' not found."}
+                )
+                return
+        self._send_json(200, body, slow=plan.fault == "slow_body")
+
+    def _send_json(self, status: int, payload, slow: bool = False) -> None:
+        fake: "FakePMSServer" = self.server.fake
+        body = json.dumps(payload).encode()
+        etag = None
+        if status == 200 and fake.etags:
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            if etag == self.headers.get("If-None-Match"):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if not slow:
+            self.wfile.write(body)
+            return
+        chunks = 10
+        size = math.ceil(len(body) / chunks) or 1
+        for start in range(0, len(body), size):
+            if fake.stopped.wait(fake.profile.slow_body_seconds / chunks):
+                return
+            self.wfile.write(body[start : start + size])
+            self.wfile.flush()
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.fake.verbose:
+            super().log_message(format, *args)
+
+
+class FakePMSServer:
+    """
+    Stand-in PMS booking API served over real sockets.
+
+    Answers `GET /bookings/` (filtered by `room` and `booking_status`) and
+    `GET /bookings/<id>/` from an indexed dataset, with the latency and
+    faults of its FaultProfile, and sends ETags so clients can revalidate.
+    Any path prefix is accepted, so it can stand in for a `PMS_API_URL`
+    such as `http://127.0.0.1:8100/api`. Use it as a context manager or
+    call `start`/`stop`; `serve_forever` blocks instead.
+
+    Point the PMS clients at it with `PMS_USE_HTTP = True` and `PMS_API_URL`
+    set to its `url`.
+    """
+
+    def __init__(
+        self,
+        bookings: Optional[Iterable[Dict]] = None,
+        profile: Optional[FaultProfile] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        etags: bool = True,
+        verbose: bool = False,
+    ) -> None:
+        """
+        Args:
+            bookings (Optional[Iterable[Dict]]): Raw PMS bookings, defaults to
+                the bundled mock data.
+            profile (Optional[FaultProfile]): Latency and faults, defaults to
+                none of either.
+            host (str): Interface to listen on.
+            port (int): Port to listen on, 0 for any free port.
+            etags (bool): Send ETags and answer `If-None-Match` with 304.
+            verbose (bool): Log every request to stderr.
+        """
+        self.datasource = BookingDataSource(
+            MOCK_PMS_BOOKINGS if bookings is None else bookings
+        )
+        self.profile = profile or FaultProfile()
+        self.etags = etags
+        self.verbose = verbose
+        self.requests = 0
+        self.stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), FakePMSRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_plan(self) -> RequestPlan:
+        with self._lock:
+            n = self.requests
+            self.requests += 1
+        return self.profile.plan(n)
+
+    def start(self) -> "FakePMSServer":
+        """
+        Serve on a background thread and return the server.
+        """
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-pms", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Serve on the calling thread until interrupted, then stop.
+        """
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """
+        Stop serving, release requests still waiting out latency or a
+        timeout, and close the socket.
+        """
+        self.stopped.set()
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakePMSServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,214 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from integrations.base.exceptions import ExternalAPIException
+
+from .clients import AsyncPMSClient, PMSClient
+from .properties import PMSProperty
+from .serializers import BookingSerializer, map_bookings
+
+
+@dataclass
+class PropertyResult:
+    """
+    Outcome of querying one property in a fan-out.
+
+    Attributes:
+        property_id (str): The property queried.
+        status (str): `ok`, `error` or `timeout`.
+        bookings (Optional[List[Dict]]): Raw PMS bookings when `ok`.
+        error (Optional[str]): What went wrong otherwise.
+        elapsed (float): Seconds from the start of the fan-out to the answer.
+    """
+
+    property_id: str
+    status: str
+    bookings: Optional[List[Dict]] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def _answer_result(
+    pms_property: PMSProperty,
+    started: float,
+    bookings: Optional[List[Dict]] = None,
+    error: Optional[str] = None,
+) -> PropertyResult:
+    """
+    Return the result of a property that answered, timed from `started` to
+    now. Called by the property's own task as soon as its call finishes, so
+    slower siblings do not add to its elapsed time.
+    """
+    return PropertyResult(
+        pms_property.property_id,
+        "error" if error else "ok",
+        bookings=bookings,
+        error=error,
+        elapsed=time.monotonic() - started,
+    )
+
+
+def _timeout_result(pms_property: PMSProperty) -> PropertyResult:
+    return PropertyResult(
+        pms_property.property_id,
+        "timeout",
+        error=f"No response within {pms_property.timeout}s.",
+        elapsed=pms_property.timeout,
+    )
+
+
+class MultiPropertyPMSClient:
+    """
+    Query many PMS properties concurrently on a bounded thread pool.
+
+    Every property has its own client, so connection pools, retry budgets
+    and circuit breakers stay per property. Each property must answer within
+    its timeout of the start of the fan-out; slower ones are reported as
+    timeouts instead of holding up the others, so the fan-out takes as long
+    as the slowest property that answers in time.
+    """
+
+    client_class = PMSClient
+
+    def __init__(
+        self,
+        properties: Sequence[PMSProperty],
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            properties (Sequence[PMSProperty]): Properties to query.
+            max_concurrency (Optional[int]): Properties queried at once,
+                defaults to `settings.PMS_FANOUT_CONCURRENCY`.
+        """
+        self.properties = list(properties)
+        self.max_concurrency = max_concurrency or settings.PMS_FANOUT_CONCURRENCY
+
+    def fetch_bookings(self, params: Optional[Dict] = None) -> List[PropertyResult]:
+        """
+        Fetch the bookings of every property, in property order.
+        """
+        if not self.properties:
+            return []
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(self.properties)),
+            thread_name_prefix="pms-fanout",
+        )
+        try:
+            futures = [
+                executor.submit(self._fetch_property, pms_property, params, started)
+                for pms_property in self.properties
+            ]
+            results = []
+            for pms_property, future in zip(self.properties, futures):
+                remaining = started + pms_property.timeout - time.monotonic()
+                try:
+                    results.append(future.result(timeout=max(remaining, 0)))
+                except TimeoutError:
+                    future.cancel()
+                    results.append(_timeout_result(pms_property))
+            return results
+        finally:
+            # Timed-out calls finish in the background.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_property(
+        self, pms_property: PMSProperty, params: Optional[Dict], started: float
+    ) -> PropertyResult:
+        """
+        Fetch one property's bookings on a pool thread.
+        """
+        client = self.client_class.for_property(pms_property)
+        try:
+            bookings = client.fetch_bookings(params)
+        except ExternalAPIException as e:
+            return _answer_result(pms_property, started, error=str(e))
+        return _answer_result(pms_property, started, bookings=bookings)
+
+
+class AsyncMultiPropertyPMSClient(MultiPropertyPMSClient):
+    """
+    Asyncio counterpart of MultiPropertyPMSClient. Properties are awaited
+    concurrently on the event loop, at most `max_concurrency` at a time, and
+    timed-out requests are cancelled.
+    """
+
+    client_class = AsyncPMSClient
+
+    async def fetch_bookings(
+        self, params: Optional[Dict] = None
+    ) -> List[PropertyResult]:
+        """
+        Fetch the bookings of every property, in property order.
+        """
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(pms_property: PMSProperty) -> List[Dict]:
+            async with semaphore:
+                client = self.client_class.for_property(pms_property)
+                return await client.fetch_bookings(params)
+
+        async def fetch_within_timeout(pms_property: PMSProperty) -> PropertyResult:
+            try:
+                bookings = await asyncio.wait_for(
+                    fetch(pms_property), pms_property.timeout
+                )
+            except TimeoutError:
+                return _timeout_result(pms_property)
+            except ExternalAPIException as e:
+                return _answer_result(pms_property, started, error=str(e))
+            return _answer_result(pms_property, started, bookings=bookings)
+
+        return await asyncio.gather(*map(fetch_within_timeout, self.properties))
+
+
+def merge_property_bookings(
+    results: Sequence[PropertyResult],
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Map the bookings of every property that answered, tagged with their
+    `property_id`, and summarize each property.
+
+    A property whose bookings fail validation is reported as `invalid` with
+    the serializer errors instead of failing the merge.
+
+    Returns:
+        Tuple[List[Dict], List[Dict]]: The merged mapped bookings and one
+        summary per property with its status, booking count, elapsed
+        milliseconds and any error.
+    """
+    bookings, summaries = [], []
+    for result in results:
+        summary = {
+            "property_id": result.property_id,
+            "status": result.status,
+            "count": 0,
+            "elapsed_ms": round(result.elapsed * 1000, 1),
+        }
+        summaries.append(summary)
+        if result.status != "ok":
+            summary["error"] = result.error
+            continue
+
+        mapped = map_bookings(result.bookings)
+        if mapped is None:
+            serializer = BookingSerializer(
+                data=BookingSerializer(result.bookings, many=True).data, many=True
+            )
+            if not serializer.is_valid():
+                summary["status"] = "invalid"
+                summary["errors"] = [error for error in serializer.errors if error]
+                continue
+            mapped = serializer.data
+        summary["count"] = len(mapped)
+        bookings.extend(
+            {"property_id": result.property_id, **booking} for booking in mapped
+        )
+    return bookings, summaries
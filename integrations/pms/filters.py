@@ -0,0 +1,237 @@
+import functools
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from rest_framework import serializers
+
+from .choices import BookingStatus
+from .store import CompactBookingStore
+
+ORDERING_FIELDS = (
+    "booking_id",
+    "guest_name",
+    "check_in",
+    "check_out",
+    "room_number",
+    "status",
+    "amount",
+)
+
+# Types of the non-null values of each ordering field in mapped bookings,
+# and so in cursor positions.
+POSITION_TYPES = {
+    "booking_id": (str,),
+    "guest_name": (str,),
+    "check_in": (str,),
+    "check_out": (str,),
+    "room_number": (str,),
+    "status": (str,),
+    "amount": (int, float),
+}
+
+# API filter name -> PMS query param the upstream filters on.
+UPSTREAM_FILTERS = {"status": "booking_status", "room_number": "room"}
+
+# API range filter -> raw PMS key, lower bound and upper bound filter names.
+RANGE_FILTERS = {
+    "check_in": ("check_in_date", "check_in_after", "check_in_before"),
+    "check_out": ("check_out_date", "check_out_after", "check_out_before"),
+    "amount": ("total_price", "amount_min", "amount_max"),
+}
+
+
+def _nulls_last(value) -> Tuple[bool, object]:
+    return value is None, value
+
+
+class BookingOrdering:
+    """
+    Ordering of mapped bookings by one or more API fields.
+
+    Terms follow DRF's `OrderingFilter` syntax, e.g. `-amount,check_in`.
+    `booking_id` is always appended as a tie-breaker, so the order is total
+    and can be resumed from a cursor position. Missing values sort last in
+    ascending order and first in descending order.
+    """
+
+    def __init__(self, terms: Iterable[str]) -> None:
+        self.fields: List[Tuple[str, bool]] = [
+            (term.lstrip("-"), term.startswith("-")) for term in terms
+        ]
+        if not any(name == "booking_id" for name, _ in self.fields):
+            self.fields.append(("booking_id", False))
+
+    @classmethod
+    def parse(cls, value: str) -> "BookingOrdering":
+        """
+        Parse a comma-separated ordering, raising ValueError for unknown fields.
+        """
+        terms = [term.strip() for term in value.split(",") if term.strip()]
+        for term in terms:
+            if term.lstrip("-") not in ORDERING_FIELDS:
+                raise ValueError(f"Unknown ordering field '{term}'.")
+        return cls(terms)
+
+    def sort(self, bookings: Iterable[Dict]) -> List[Dict]:
+        """
+        Return the bookings in this order, using one stable sort per field.
+        """
+        result = list(bookings)
+        for name, descending in reversed(self.fields):
+            result.sort(key=lambda b: _nulls_last(b.get(name)), reverse=descending)
+        return result
+
+    def position(self, booking: Dict) -> List:
+        """
+        Return the values a booking is ordered by.
+        """
+        return [booking.get(name) for name, _ in self.fields]
+
+    def is_position(self, values) -> bool:
+        """
+        Return whether `values` can be compared as a position in this order,
+        e.g. one decoded from a client-supplied cursor.
+        """
+        return (
+            isinstance(values, list)
+            and len(values) == len(self.fields)
+            and all(
+                value is None or type(value) in POSITION_TYPES[name]
+                for (name, _), value in zip(self.fields, values)
+            )
+        )
+
+    def compare(self, a: List, b: List) -> int:
+        """
+        Compare two positions in this order.
+        """
+        for (_, descending), a_value, b_value in zip(self.fields, a, b):
+            a_key, b_key = _nulls_last(a_value), _nulls_last(b_value)
+            if a_key != b_key:
+                result = 1 if a_key > b_key else -1
+                return -result if descending else result
+        return 0
+
+    @functools.cached_property
+    def position_key(self):
+        """
+        Key function turning a position into a comparable object, for bisecting
+        a list sorted by `sort`.
+        """
+        return functools.cmp_to_key(self.compare)
+
+
+class BookingFilterSerializer(serializers.Serializer):
+    """
+    Validates the booking list query params.
+    """
+
+    status = serializers.ChoiceField(choices=BookingStatus.choices, required=False)
+    room_number = serializers.CharField(required=False)
+    check_in_after = serializers.DateField(required=False)
+    check_in_before = serializers.DateField(required=False)
+    check_out_after = serializers.DateField(required=False)
+    check_out_before = serializers.DateField(required=False)
+    amount_min = serializers.FloatField(required=False)
+    amount_max = serializers.FloatField(required=False)
+    ordering = serializers.CharField(
+        required=False,
+        help_text=f"Comma-separated fields, prefix with '-' to reverse: "
+        f"{', '.join(ORDERING_FIELDS)}.",
+    )
+
+    def validate_ordering(self, value: str) -> BookingOrdering:
+        try:
+            return BookingOrdering.parse(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+
+class BookingFilter:
+    """
+    Filters and ordering requested on the booking list.
+
+    `status` and `room_number` are pushed down to the PMS as query params
+    (see `upstream_params`); date ranges and amount bounds are applied to the
+    mapped bookings in memory. Every filter is re-checked in memory, so an
+    upstream that ignores a param still yields correct results. Range bounds
+    are inclusive. Bookings held in a CompactBookingStore are narrowed down
+    to the ranges through its sorted indexes (see `store_rows`) before they
+    are mapped.
+    """
+
+    def __init__(self, query_params) -> None:
+        """
+        Args:
+            query_params (QueryDict): The request's query params.
+
+        Raises:
+            ValidationError: If a filter or the ordering is invalid.
+        """
+        serializer = BookingFilterSerializer(data=query_params)
+        serializer.is_valid(raise_exception=True)
+        self.filters = dict(serializer.validated_data)
+        self.ordering: Optional[BookingOrdering] = self.filters.pop("ordering", None)
+
+    def upstream_params(self) -> Dict[str, str]:
+        """
+        Return the filters the PMS can apply itself, as PMS query params.
+        """
+        return {
+            param: self.filters[name]
+            for name, param in UPSTREAM_FILTERS.items()
+            if name in self.filters
+        }
+
+    def store_rows(self, store: CompactBookingStore) -> Optional[np.ndarray]:
+        """
+        Return the positions of the store's bookings within every date range
+        and amount bound, in row order, by binary search of its sorted
+        indexes; None without range filters.
+        """
+        matches = [
+            store.range_rows(key, self.filters.get(low), self.filters.get(high))
+            for key, low, high in RANGE_FILTERS.values()
+            if low in self.filters or high in self.filters
+        ]
+        if not matches:
+            return None
+        return functools.reduce(
+            functools.partial(np.intersect1d, assume_unique=True), matches
+        )
+
+    def _predicates(self) -> List:
+        filters = self.filters
+        predicates = []
+        for name in ("status", "room_number"):
+            if name in filters:
+                predicates.append(lambda b, n=name, v=filters[name]: b.get(n) == v)
+        for name in ("check_in", "check_out"):
+            if f"{name}_after" in filters:
+                after = filters[f"{name}_after"].isoformat()
+                predicates.append(lambda b, n=name, v=after: b[n] >= v)
+            if f"{name}_before" in filters:
+                before = filters[f"{name}_before"].isoformat()
+                predicates.append(lambda b, n=name, v=before: b[n] <= v)
+        if "amount_min" in filters:
+            amount_min = filters["amount_min"]
+            predicates.append(
+                lambda b: b.get("amount") is not None and b["amount"] >= amount_min
+            )
+        if "amount_max" in filters:
+            amount_max = filters["amount_max"]
+            predicates.append(
+                lambda b: b.get("amount") is not None and b["amount"] <= amount_max
+            )
+        return predicates
+
+    def apply(self, bookings: List[Dict]) -> List[Dict]:
+        """
+        Filter and order mapped bookings.
+        """
+        predicates = self._predicates()
+        if predicates:
+            bookings = [b for b in bookings if all(p(b) for p in predicates)]
+        if self.ordering is not None:
+            bookings = self.ordering.sort(bookings)
+        return bookings
@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand
+
+from integrations.pms.datasource import iter_fixture
+from integrations.pms.fake_server import FakePMSServer, FaultProfile, generate_bookings
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a stand-in PMS booking API over HTTP, with seeded latency and "
+        "faults. Point the app at it with PMS_USE_HTTP=True and PMS_API_URL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8100)
+        dataset = parser.add_mutually_exclusive_group()
+        dataset.add_argument(
+            "--bookings",
+            type=int,
+            help="Serve this many generated bookings (default: the mock data).",
+        )
+        dataset.add_argument(
+            "--fixture", help="Serve the bookings of a JSON or NDJSON file."
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the generated bookings, latencies and faults.",
+        )
+        parser.add_argument(
+            "--latency-ms", type=float, default=0.0, help="Median latency."
+        )
+        parser.add_argument(
+            "--latency-sigma",
+            type=float,
+            default=0.0,
+            help="Log-normal shape of the latency, 0 for constant latency.",
+        )
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--error-status", type=int, default=502)
+        parser.add_argument("--slow-body-rate", type=float, default=0.0)
+        parser.add_argument("--slow-body-seconds", type=float, default=1.0)
+        parser.add_argument("--timeout-rate", type=float, default=0.0)
+        parser.add_argument("--timeout-seconds", type=float, default=30.0)
+        parser.add_argument(
+            "--no-etags", action="store_true", help="Do not send ETags."
+        )
+
+    def handle(self, *args, **options):
+        if options["bookings"] is not None:
+            bookings = generate_bookings(options["bookings"], options["seed"])
+        elif options["fixture"]:
+            bookings = iter_fixture(options["fixture"])
+        else:
+            bookings = None
+
+        profile = FaultProfile(
+            seed=options["seed"],
+            latency_ms=options["latency_ms"],
+            latency_sigma=options["latency_sigma"],
+            error_rate=options["error_rate"],
+            error_status=options["error_status"],
+            slow_body_rate=options["slow_body_rate"],
+            slow_body_seconds=options["slow_body_seconds"],
+            timeout_rate=options["timeout_rate"],
+            timeout_seconds=options["timeout_seconds"],
+        )
+        server = FakePMSServer(
+            bookings,
+            profile,
+            host=options["host"],
+            port=options["port"],
+            etags=not options["no_etags"],
+            verbose=options["verbosity"] > 1,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Fake PMS serving {len(server.datasource)} bookings at "
+                f"{server.url}. Quit with CONTROL-C."
+            )
+        )
+        self.stdout.write(f"Use it with PMS_USE_HTTP=True PMS_API_URL={server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
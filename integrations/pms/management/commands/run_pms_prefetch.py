@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from integrations.pms.prefetch import PrefetchScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Keep the booking list and the most requested bookings cached ahead "
+        "of requests, refreshing them on a jittered interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Seconds between ticks (default: PMS_PREFETCH INTERVAL).",
+        )
+        parser.add_argument(
+            "--hot-bookings",
+            type=int,
+            help="Most requested bookings to keep warm.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, help="PMS requests in flight at once."
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Run a single tick and exit."
+        )
+
+    def handle(self, *args, **options):
+        overrides = {
+            name.upper(): options[name]
+            for name in ("interval", "hot_bookings", "concurrency")
+            if options[name] is not None
+        }
+        scheduler = PrefetchScheduler(**overrides)
+
+        if options["once"]:
+            stats = scheduler.run_once()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Prefetched {stats['refreshed']} entries: "
+                    f"{stats['skipped']} skipped, {stats['failed']} failed."
+                )
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Prefetching every {scheduler.interval:g}s. Quit with CONTROL-C."
+            )
+        )
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations.base.exceptions import ExternalAPIException
+from integrations.pms.clients import PMSClient
+from integrations.pms.datasource import iter_fixture
+from integrations.pms.snapshot import write_snapshot
+from integrations.pms.store import CompactBookingStore
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the PMS booking list to a snapshot file that workers "
+        "memory-map at startup (see PMS_SNAPSHOT_PATH)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="Snapshot file to write (default: settings.PMS_SNAPSHOT_PATH).",
+        )
+        parser.add_argument(
+            "--fixture",
+            help="Snapshot the bookings of a JSON or NDJSON file instead of "
+            "fetching them from the PMS.",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"] or settings.PMS_SNAPSHOT_PATH
+        if not output:
+            raise CommandError("Pass --output or set PMS_SNAPSHOT_PATH.")
+
+        try:
+            if options["fixture"]:
+                bookings = iter_fixture(options["fixture"])
+            else:
+                bookings = PMSClient().fetch_bookings()
+            store = CompactBookingStore.from_bookings(bookings)
+        except ExternalAPIException as e:
+            raise CommandError(f"Fetching bookings failed: {e}")
+        except ValueError as e:
+            raise CommandError(f"Bookings cannot be snapshotted: {e}")
+        size = write_snapshot(store, output)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {len(store)} bookings to {output} ({size / 2**20:.1f} MiB)."
+            )
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations.base.exceptions import ExternalAPIException
+from integrations.pms.sync import sync_bookings
+
+
+class Command(BaseCommand):
+    help = "Sync the local Booking mirror with the PMS booking list."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Rows per bulk upsert (default: settings.PMS_SYNC_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--keep-missing",
+            action="store_true",
+            help="Keep mirrored bookings that the PMS no longer returns.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            run = sync_bookings(
+                batch_size=options["batch_size"],
+                delete_missing=not options["keep_missing"],
+            )
+        except ExternalAPIException as e:
+            raise CommandError(f"Booking sync failed: {e}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synced {run.fetched} bookings: {run.created} created, "
+                f"{run.updated} updated, {run.deleted} deleted, "
+                f"{run.unchanged} unchanged, {run.invalid} invalid."
+            )
+        )
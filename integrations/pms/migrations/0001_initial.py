@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-18 05:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingSyncRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='running', max_length=16)),
+                ('fetched', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('deleted', models.PositiveIntegerField(default=0)),
+                ('unchanged', models.PositiveIntegerField(default=0)),
+                ('invalid', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'get_latest_by': 'started_at',
+            },
+        ),
+        migrations.CreateModel(
+            name='Booking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_id', models.CharField(max_length=64, unique=True)),
+                ('guest_name', models.CharField(max_length=255)),
+                ('check_in', models.DateField()),
+                ('check_out', models.DateField()),
+                ('room_number', models.CharField(blank=True, max_length=32, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], max_length=16)),
+                ('amount', models.FloatField(blank=True, null=True)),
+                ('fingerprint', models.CharField(max_length=32)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['room_number', 'check_in'], name='pms_booking_room_nu_53f1a7_idx'), models.Index(fields=['status'], name='pms_booking_status_30ba23_idx'), models.Index(fields=['check_in', 'check_out'], name='pms_booking_check_i_1034d6_idx'), models.Index(fields=['check_out'], name='pms_booking_check_o_720d22_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,157 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from integrations.base.conditional import Validators
+from integrations.base.exceptions import ExternalAPIException, ExternalAPINotFound
+
+from .models import Booking, BookingSyncRun
+
+MIRROR_FIELDS = (
+    "booking_id",
+    "guest_name",
+    "check_in",
+    "check_out",
+    "room_number",
+    "status",
+    "amount",
+)
+
+
+def pms_booking(row: Dict) -> Dict:
+    """
+    Convert a mirrored booking row back into the raw PMS shape, so it goes
+    through the same mapping as a live PMS response.
+    """
+    booking = {
+        "id": row["booking_id"],
+        "guest": row["guest_name"],
+        "check_in_date": row["check_in"].isoformat(),
+        "check_out_date": row["check_out"].isoformat(),
+        "booking_status": row["status"],
+    }
+    if row["room_number"] is not None:
+        booking["room"] = row["room_number"]
+    if row["amount"] is not None:
+        booking["total_price"] = row["amount"]
+    return booking
+
+
+def mirror_queryset(params: Optional[Dict] = None):
+    """
+    Return the mirrored bookings matching the PMS list `params`, in sync order.
+    """
+    queryset = Booking.objects.order_by("pk")
+    params = params or {}
+    if params.get("room") is not None:
+        queryset = queryset.filter(room_number=params["room"])
+    if params.get("booking_status") is not None:
+        queryset = queryset.filter(status=params["booking_status"])
+    return queryset.values(*MIRROR_FIELDS)
+
+
+def last_change_queryset():
+    """
+    Return the latest sync run that changed the mirror.
+    """
+    return (
+        BookingSyncRun.objects.filter(status=BookingSyncRun.Status.SUCCEEDED)
+        .exclude(created=0, updated=0, deleted=0)
+        .order_by("-finished_at")
+        .values("pk", "finished_at")
+    )
+
+
+def mirror_validators(run: Optional[Dict]) -> Validators:
+    """
+    Validators of the mirror: it only changes through syncs, so the last
+    sync run that changed anything versions every read.
+    """
+    if run is None:
+        return Validators("mirror-empty")
+    return Validators(f"mirror-{run['pk']}", run["finished_at"].timestamp())
+
+
+def mirror_batch(
+    booking_ids: Sequence[str], rows: List[Dict]
+) -> Dict[str, Union[Dict, ExternalAPIException]]:
+    """
+    Pair mirrored rows with the requested IDs, missing ones as not found.
+    """
+    found = {row["booking_id"]: pms_booking(row) for row in rows}
+    return {
+        booking_id: found.get(booking_id)
+        or ExternalAPINotFound(f"Booking ID '{booking_id}' not found.")
+        for booking_id in booking_ids
+    }
+
+
+class BookingMirrorClient:
+    """
+    Drop-in replacement for the cached PMS client that reads the local
+    Booking mirror instead of calling the PMS.
+
+    Data is as fresh as the last `sync_pms_bookings` run.
+    """
+
+    def fetch_bookings(self, params: Optional[Dict] = None) -> List[Dict]:
+        return [pms_booking(row) for row in mirror_queryset(params)]
+
+    def fetch_bookings_versioned(
+        self, params: Optional[Dict] = None
+    ) -> Tuple[List[Dict], Validators]:
+        validators = mirror_validators(last_change_queryset().first())
+        return self.fetch_bookings(params), validators
+
+    def fetch_booking_by_id_versioned(self, booking_id: str) -> Tuple[Dict, Validators]:
+        validators = mirror_validators(last_change_queryset().first())
+        return self.fetch_booking_by_id(booking_id), validators
+
+    def fetch_booking_by_id(self, booking_id: str) -> Dict:
+        row = mirror_queryset().filter(booking_id=str(booking_id)).first()
+        if row is None:
+            raise ExternalAPINotFound(f"Booking ID '{booking_id}' not found.")
+        return pms_booking(row)
+
+    def fetch_bookings_by_ids(
+        self, booking_ids: Sequence[str], max_concurrency: Optional[int] = None
+    ) -> Dict[str, Union[Dict, ExternalAPIException]]:
+        """
+        Return many bookings by ID with a single query. `max_concurrency` is
+        accepted for parity with the cached PMS client.
+        """
+        rows = list(mirror_queryset().filter(booking_id__in=booking_ids))
+        return mirror_batch(booking_ids, rows)
+
+
+class AsyncBookingMirrorClient:
+    """
+    Asyncio counterpart of BookingMirrorClient, using Django's async ORM.
+    """
+
+    async def fetch_bookings(self, params: Optional[Dict] = None) -> List[Dict]:
+        return [pms_booking(row) async for row in mirror_queryset(params)]
+
+    async def fetch_bookings_versioned(
+        self, params: Optional[Dict] = None
+    ) -> Tuple[List[Dict], Validators]:
+        validators = mirror_validators(await last_change_queryset().afirst())
+        return await self.fetch_bookings(params), validators
+
+    async def fetch_booking_by_id_versioned(
+        self, booking_id: str
+    ) -> Tuple[Dict, Validators]:
+        validators = mirror_validators(await last_change_queryset().afirst())
+        return await self.fetch_booking_by_id(booking_id), validators
+
+    async def fetch_booking_by_id(self, booking_id: str) -> Dict:
+        row = await mirror_queryset().filter(booking_id=str(booking_id)).afirst()
+        if row is None:
+            raise ExternalAPINotFound(f"Booking ID '{booking_id}' not found.")
+        return pms_booking(row)
+
+    async def fetch_bookings_by_ids(
+        self, booking_ids: Sequence[str], max_concurrency: Optional[int] = None
+    ) -> Dict[str, Union[Dict, ExternalAPIException]]:
+        rows = [
+            row async for row in mirror_queryset().filter(booking_id__in=booking_ids)
+        ]
+        return mirror_batch(booking_ids, rows)
@@ -0,0 +1,67 @@
+from django.db import models
+
+from .choices import BookingStatus
+
+
+class Booking(models.Model):
+    """
+    Local mirror of a PMS booking, kept up to date by `sync_bookings`.
+
+    Fields follow BookingSerializer. `fingerprint` is a digest of the mapped
+    booking, used to skip unchanged rows when syncing.
+    """
+
+    booking_id = models.CharField(max_length=64, unique=True)
+    guest_name = models.CharField(max_length=255)
+    check_in = models.DateField()
+    check_out = models.DateField()
+    room_number = models.CharField(max_length=32, null=True, blank=True)
+    status = models.CharField(max_length=16, choices=BookingStatus.choices)
+    amount = models.FloatField(null=True, blank=True)
+    fingerprint = models.CharField(max_length=32)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["room_number", "check_in"]),
+            models.Index(fields=["status"]),
+            models.Index(fields=["check_in", "check_out"]),
+            models.Index(fields=["check_out"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Booking {self.booking_id} ({self.guest_name})"
+
+
+class BookingSyncRun(models.Model):
+    """
+    One run of the PMS booking sync and what it changed.
+
+    The `finished_at` of the latest successful run is the sync watermark:
+    the mirror reflects the PMS as of that time.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.RUNNING
+    )
+    fetched = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    deleted = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    invalid = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        get_latest_by = "started_at"
+
+    def __str__(self) -> str:
+        return f"Booking sync {self.started_at:%Y-%m-%d %H:%M:%S} ({self.status})"
@@ -0,0 +1,112 @@
+import base64
+import binascii
+import bisect
+import json
+from typing import Dict, List, Optional
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .filters import BookingOrdering
+
+
+class BookingCursorPagination(BasePagination):
+    """
+    Cursor pagination over an in-memory booking list.
+
+    Bookings are ordered by the view's `booking_ordering` (falling back to
+    `ordering`) and each cursor encodes the position of the last booking on
+    the page rather than an offset, so pages stay stable while bookings are
+    added or removed upstream. Responses mirror DRF's `CursorPagination`:
+    `next`, `previous` and `results`.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    ordering = "booking_id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None) -> Optional[List]:
+        self.request = request
+        self.booking_ordering = getattr(
+            view, "booking_ordering", None
+        ) or BookingOrdering.parse(self.ordering)
+        bookings = self.booking_ordering.sort(queryset)
+        position_key = self.booking_ordering.position_key
+
+        cursor = self.decode_cursor(request)
+        if cursor is None:
+            start = 0
+        else:
+            boundary = position_key(cursor["position"])
+            index = bisect.bisect_right if not cursor["reverse"] else bisect.bisect_left
+            start = index(
+                bookings,
+                boundary,
+                key=lambda b: position_key(self.booking_ordering.position(b)),
+            )
+            if cursor["reverse"]:
+                start = max(start - self.page_size, 0)
+
+        self.page = bookings[start : start + self.page_size]
+        self.has_next = start + self.page_size < len(bookings)
+        self.has_previous = start > 0
+        return self.page
+
+    def decode_cursor(self, request) -> Optional[Dict]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position, reverse = cursor["p"], bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not self.booking_ordering.is_position(position):
+            raise NotFound(self.invalid_cursor_message)
+        return {"position": position, "reverse": reverse}
+
+    def encode_cursor(self, booking: Dict, reverse: bool) -> str:
+        cursor = {"p": self.booking_ordering.position(booking)}
+        if reverse:
+            cursor["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: Dict) -> Dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
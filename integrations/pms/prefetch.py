@@ -0,0 +1,325 @@
+import functools
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+
+from integrations.base.exceptions import ExternalAPIException
+from integrations.base.sketch import CountMinSketch
+
+from .cache import BookingCachePolicy, CachedPMSClient, _refresh_executor
+from .clients import PMSClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFETCH_SETTINGS = {
+    "IN_PROCESS": False,
+    "INTERVAL": 10.0,
+    "JITTER": 0.2,
+    "HOT_BOOKINGS": 50,
+    "CONCURRENCY": 4,
+    "BACKOFF_MAX": 300.0,
+    "SKETCH_WIDTH": 2048,
+    "SKETCH_DEPTH": 4,
+    "SKETCH_RESET_AFTER": 100000,
+    "PUBLISH_INTERVAL": 5.0,
+}
+
+
+def get_prefetch_settings() -> dict:
+    """
+    Return the prefetch settings, with `settings.PMS_PREFETCH` overriding
+    the defaults.
+    """
+    return {**DEFAULT_PREFETCH_SETTINGS, **getattr(settings, "PMS_PREFETCH", {})}
+
+
+class HotBookingTracker:
+    """
+    Tracks which bookings are requested most in this process.
+
+    Requests are counted in a count-min sketch, and the bookings with the
+    highest estimates are kept as candidates, a few times more than the
+    scheduler asks for. Every `PUBLISH_INTERVAL` seconds the candidates are
+    published to the shared cache, so a scheduler running in another
+    process sees the demand of every worker.
+    """
+
+    def __init__(self, cache_alias: Optional[str] = None) -> None:
+        prefetch = get_prefetch_settings()
+        self.policy = BookingCachePolicy(cache_alias)
+        self.cache = self.policy.cache
+        self.sketch = CountMinSketch(
+            prefetch["SKETCH_WIDTH"],
+            prefetch["SKETCH_DEPTH"],
+            prefetch["SKETCH_RESET_AFTER"],
+        )
+        self.in_process = prefetch["IN_PROCESS"]
+        self.capacity = prefetch["HOT_BOOKINGS"] * 4
+        self.publish_interval = prefetch["PUBLISH_INTERVAL"]
+        self.token = f"{socket.gethostname()}:{os.getpid()}"
+        self._candidates: Dict[str, int] = {}
+        self._halvings = 0
+        self._next_publish = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, booking_id: str) -> None:
+        """
+        Count one request for `booking_id`.
+        """
+        estimate = self.sketch.add(booking_id)
+        with self._lock:
+            if self._halvings != self.sketch.halvings:
+                self._halvings = self.sketch.halvings
+                self._candidates = {
+                    key: count >> 1 for key, count in self._candidates.items()
+                }
+            if booking_id in self._candidates or len(self._candidates) < self.capacity:
+                self._candidates[booking_id] = estimate
+            else:
+                coldest = min(self._candidates, key=self._candidates.get)
+                if estimate > self._candidates[coldest]:
+                    del self._candidates[coldest]
+                    self._candidates[booking_id] = estimate
+            publish = time.monotonic() >= self._next_publish
+            if publish:
+                self._next_publish = time.monotonic() + self.publish_interval
+        if publish:
+            # Off the request path, like background cache refreshes.
+            _refresh_executor.submit(self.publish)
+
+    def top(self, count: int) -> List[str]:
+        """
+        Return up to `count` of this process's most requested booking IDs.
+        """
+        with self._lock:
+            candidates = dict(self._candidates)
+        return sorted(candidates, key=candidates.get, reverse=True)[:count]
+
+    def publish(self) -> None:
+        """
+        Share the current candidates with other processes.
+        """
+        with self._lock:
+            candidates = dict(self._candidates)
+        # Snapshots outlive a few missed publishes, then drop out.
+        self.cache.set(
+            self.policy.key("hot", self.token), candidates, self.publish_interval * 3
+        )
+        members_key = self.policy.key("hot", "members")
+        members = self.cache.get(members_key) or []
+        if self.token not in members:
+            self.cache.set(members_key, [*members, self.token], None)
+
+
+def hot_booking_ids(
+    count: int, policy: Optional[BookingCachePolicy] = None
+) -> List[str]:
+    """
+    Return the `count` most requested booking IDs across every process that
+    published its demand recently.
+    """
+    policy = policy or BookingCachePolicy()
+    members_key = policy.key("hot", "members")
+    members = policy.cache.get(members_key) or []
+    keys = {member: policy.key("hot", member) for member in members}
+    snapshots = policy.cache.get_many(list(keys.values()))
+    live = [member for member, key in keys.items() if key in snapshots]
+    if len(live) < len(members):
+        # Forget processes that stopped publishing; live ones re-register.
+        policy.cache.set(members_key, live, None)
+    totals = Counter()
+    for snapshot in snapshots.values():
+        totals.update(snapshot)
+    return [booking_id for booking_id, _ in totals.most_common(count)]
+
+
+_tracker: Optional[HotBookingTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_hot_booking_tracker() -> HotBookingTracker:
+    """
+    Return the process-wide hot booking tracker.
+    """
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = HotBookingTracker()
+    return _tracker
+
+
+def reset_hot_booking_tracker() -> None:
+    """
+    Drop the process-wide tracker so it is rebuilt from settings on next use.
+    """
+    global _tracker
+    with _tracker_lock:
+        _tracker = None
+
+
+class PrefetchScheduler:
+    """
+    Refreshes the booking list and the hottest bookings before they expire,
+    so requests are not the ones paying for the PMS round trip.
+
+    Every tick refreshes the cache entries that are missing or would be due
+    for a refresh before the next tick, at most `CONCURRENCY` at a time.
+    Ticks are `INTERVAL` seconds apart, spread by `JITTER` so workers do not
+    synchronise. While the PMS is failing the interval doubles per failing
+    tick, up to `BACKOFF_MAX` seconds.
+    """
+
+    def __init__(
+        self,
+        client: Optional[CachedPMSClient] = None,
+        rng: Optional[random.Random] = None,
+        **overrides,
+    ) -> None:
+        """
+        Args:
+            client (Optional[CachedPMSClient]): Cache to keep warm, defaults to
+                the cached PMS client the read endpoints use.
+            rng (Optional[random.Random]): Source of the interval jitter.
+            **overrides: Values overriding `settings.PMS_PREFETCH`, e.g.
+                `INTERVAL=5`.
+        """
+        prefetch = {**get_prefetch_settings(), **overrides}
+        self.client = client or CachedPMSClient(PMSClient())
+        self.rng = rng or random.Random()
+        self.interval = prefetch["INTERVAL"]
+        self.jitter = prefetch["JITTER"]
+        self.hot_bookings = prefetch["HOT_BOOKINGS"]
+        self.concurrency = prefetch["CONCURRENCY"]
+        self.backoff_max = prefetch["BACKOFF_MAX"]
+        self.failing_ticks = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def jobs(self) -> List[Callable[[float], bool]]:
+        booking_ids = hot_booking_ids(self.hot_bookings, self.client.policy)
+        return [
+            self.client.prefetch_bookings,
+            *(
+                functools.partial(self.client.prefetch_booking, booking_id)
+                for booking_id in booking_ids
+            ),
+        ]
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        Run one tick.
+
+        Returns:
+            Dict[str, int]: Counts of `refreshed`, `skipped` (still fresh or
+            being refreshed elsewhere) and `failed` entries.
+        """
+        if _tracker is not None:
+            _tracker.publish()
+        horizon = self.interval * (1 + self.jitter)
+
+        def run(job: Callable[[float], bool]) -> str:
+            try:
+                return "refreshed" if job(horizon) else "skipped"
+            except ExternalAPIException as e:
+                logger.warning("Prefetch failed: %s", e)
+                return "failed"
+
+        jobs = self.jobs()
+        with ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(jobs)),
+            thread_name_prefix="pms-prefetch",
+        ) as executor:
+            outcomes = Counter(executor.map(run, jobs))
+        stats = {
+            outcome: outcomes[outcome] for outcome in ("refreshed", "skipped", "failed")
+        }
+        if stats["failed"] and not stats["refreshed"]:
+            self.failing_ticks += 1
+        else:
+            self.failing_ticks = 0
+        logger.debug("Prefetch tick: %s", stats)
+        return stats
+
+    def next_delay(self) -> float:
+        """
+        Return the jittered delay before the next tick, backed off while
+        the PMS is failing.
+        """
+        delay = self.interval
+        if self.failing_ticks:
+            delay = min(self.interval * 2**self.failing_ticks, self.backoff_max)
+        return delay * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run(self) -> None:
+        """
+        Run ticks until `stop` is called.
+        """
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Prefetch tick failed")
+                self.failing_ticks += 1
+            self._stop.wait(self.next_delay())
+
+    def start(self) -> "PrefetchScheduler":
+        """
+        Run the scheduler on a daemon thread.
+        """
+        self._thread = threading.Thread(
+            target=self.run, name="pms-prefetch-scheduler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_scheduler: Optional[PrefetchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def record_booking_access(booking_id: str) -> None:
+    """
+    Count a booking request towards its hotness, and start the in-process
+    scheduler on first use when `PMS_PREFETCH["IN_PROCESS"]` is set.
+    """
+    tracker = get_hot_booking_tracker()
+    tracker.record(str(booking_id))
+    if tracker.in_process and _scheduler is None:
+        start_in_process_scheduler()
+
+
+def start_in_process_scheduler() -> Optional[PrefetchScheduler]:
+    """
+    Start this process's scheduler once, if enabled in settings.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None and get_prefetch_settings()["IN_PROCESS"]:
+            _scheduler = PrefetchScheduler().start()
+    return _scheduler
+
+
+def reset_prefetch() -> None:
+    """
+    Stop the in-process scheduler and drop the hot booking tracker.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.stop()
+        _scheduler = None
+    reset_hot_booking_tracker()
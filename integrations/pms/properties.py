@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class PMSProperty:
+    """
+    A named PMS connection for one hotel property.
+
+    Attributes:
+        property_id (str): Identifier used in API responses and query params.
+        url (str): Base URL of the property's PMS.
+        timeout (float): Seconds a fan-out waits for this property.
+    """
+
+    property_id: str
+    url: str
+    timeout: float
+
+
+def get_pms_properties() -> Dict[str, PMSProperty]:
+    """
+    Return the PMS properties configured in `settings.PMS_PROPERTIES`, in
+    configuration order.
+    """
+    return {
+        property_id: PMSProperty(
+            property_id=property_id,
+            url=config["URL"],
+            timeout=float(config.get("TIMEOUT", settings.PMS_PROPERTY_TIMEOUT)),
+        )
+        for property_id, config in settings.PMS_PROPERTIES.items()
+    }
+
+
+def select_pms_properties(
+    property_ids: Optional[Iterable[str]] = None,
+) -> List[PMSProperty]:
+    """
+    Return the configured properties with the given IDs, or all of them.
+
+    Raises:
+        KeyError: If an ID is not configured.
+    """
+    properties = get_pms_properties()
+    if property_ids is None:
+        return list(properties.values())
+    return [properties[property_id] for property_id in property_ids]
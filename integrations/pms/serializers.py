@@ -1,6 +1,18 @@
-from rest_framework import serializers
+import datetime
+import functools
+import re
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.utils.dateparse import parse_date
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
 from .choices import BookingStatus
+from .store import CompactBookingStore
+
+BOOKING_EVENT_TYPES = ("booking.created", "booking.updated", "booking.cancelled")
 
 
 class BookingSerializer(serializers.Serializer):
@@ -17,3 +29,301 @@ class BookingSerializer(serializers.Serializer):
         source="booking_status", choices=BookingStatus.choices
     )
     amount = serializers.FloatField(source="total_price", required=False)
+
+
+class DateRangeQuerySerializer(serializers.Serializer):
+    """
+    Validates a `[check_in, check_out)` range of nights in query params.
+    """
+
+    MAX_NIGHTS = 366
+
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    room_number = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        nights = (attrs["check_out"] - attrs["check_in"]).days
+        if nights <= 0:
+            raise serializers.ValidationError(
+                {"check_out": "Check-out must be after check-in."}
+            )
+        if nights > self.MAX_NIGHTS:
+            raise serializers.ValidationError(
+                {"check_out": f"Ranges are limited to {self.MAX_NIGHTS} nights."}
+            )
+        return attrs
+
+
+class AnalyticsQuerySerializer(DateRangeQuerySerializer):
+    """
+    Validates the grouping and optional range of nights of the analytics
+    endpoint. Without a range, every night covered by a booking is reported.
+    """
+
+    GROUP_BY_CHOICES = ("day", "week", "room", "status")
+
+    group_by = serializers.ChoiceField(choices=GROUP_BY_CHOICES, default="day")
+    check_in = serializers.DateField(required=False)
+    check_out = serializers.DateField(required=False)
+    room_number = None
+
+    def validate(self, attrs):
+        given = {"check_in", "check_out"} & set(attrs)
+        if not given:
+            return attrs
+        if len(given) == 1:
+            missing = ({"check_in", "check_out"} - given).pop()
+            raise serializers.ValidationError(
+                {missing: "Both check_in and check_out are required for a range."}
+            )
+        return super().validate(attrs)
+
+
+class BookingBatchSerializer(serializers.Serializer):
+    """
+    Validates the booking IDs of a batch lookup, deduplicated in request
+    order and limited to `settings.PMS_BATCH_MAX_IDS`.
+    """
+
+    booking_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=0), allow_empty=False
+    )
+
+    def validate_booking_ids(self, value):
+        if len(value) > settings.PMS_BATCH_MAX_IDS:
+            raise serializers.ValidationError(
+                f"Batches are limited to {settings.PMS_BATCH_MAX_IDS} booking IDs."
+            )
+        return list(dict.fromkeys(str(booking_id) for booking_id in value))
+
+
+class BookingEventSerializer(serializers.Serializer):
+    """
+    Validates one PMS booking webhook event. The raw PMS booking it carries
+    must map like an upstream booking; cancellations force its status to
+    `cancelled`. Adds the mapped booking as `mapped`.
+    """
+
+    id = serializers.CharField(max_length=255)
+    type = serializers.ChoiceField(choices=BOOKING_EVENT_TYPES)
+    booking = serializers.DictField()
+
+    def validate(self, attrs):
+        raw = dict(attrs["booking"])
+        if attrs["type"] == "booking.cancelled":
+            raw["booking_status"] = BookingStatus.CANCELLED.value
+        mapped = map_booking(raw)
+        if mapped is None:
+            try:
+                serializer = BookingSerializer(data=BookingSerializer(raw).data)
+            except (AttributeError, KeyError) as e:
+                raise serializers.ValidationError({"booking": str(e)})
+            if not serializer.is_valid():
+                raise serializers.ValidationError({"booking": serializer.errors})
+            mapped = serializer.data
+        return {**attrs, "booking": raw, "mapped": mapped}
+
+
+class BookingEventBatchSerializer(serializers.Serializer):
+    """
+    Validates the envelope of a webhook delivery: a list of events limited
+    to `settings.PMS_WEBHOOK_MAX_EVENTS`. Events are validated one by one
+    with BookingEventSerializer so one bad event does not fail the batch.
+    """
+
+    events = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+    def validate_events(self, value):
+        if len(value) > settings.PMS_WEBHOOK_MAX_EVENTS:
+            raise serializers.ValidationError(
+                f"Deliveries are limited to {settings.PMS_WEBHOOK_MAX_EVENTS} events."
+            )
+        return value
+
+
+class _SlowPath(Exception):
+    """
+    Raised by a field converter when a value needs the full serializer to be
+    mapped or to produce its validation error.
+    """
+
+
+# Characters rejected by CharField's null and surrogate validators.
+_PROHIBITED_CHARACTERS = re.compile("[\x00\ud800-\udfff]")
+
+
+def _to_string(value) -> str:
+    if value is None:
+        raise _SlowPath
+    value = str(value).strip()
+    if not value or _PROHIBITED_CHARACTERS.search(value):
+        raise _SlowPath
+    return value
+
+
+def _to_date(value) -> str:
+    if isinstance(value, str):
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            raise _SlowPath
+        if parsed is None:
+            raise _SlowPath
+        return parsed.isoformat()
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise _SlowPath
+
+
+def _to_float(value) -> float:
+    if value is None:
+        raise _SlowPath
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        raise _SlowPath
+
+
+def _choice_converter(field: serializers.ChoiceField) -> Callable:
+    choices = field.choice_strings_to_values
+
+    def to_choice(value):
+        if value is None:
+            raise _SlowPath
+        try:
+            return choices[str(value)]
+        except KeyError:
+            raise _SlowPath
+
+    return to_choice
+
+
+def _converter_for(field: serializers.Field) -> Optional[Callable]:
+    """
+    Return a one-pass converter equivalent to representing and then
+    re-validating a value with `field`, or None if the field is not supported.
+    """
+    if isinstance(field, serializers.ChoiceField):
+        return None if field.allow_blank else _choice_converter(field)
+    if type(field) is serializers.CharField:
+        plain = (
+            not field.allow_blank
+            and field.trim_whitespace
+            and field.max_length is None
+            and field.min_length is None
+        )
+        return _to_string if plain else None
+    if type(field) is serializers.DateField:
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        input_formats = getattr(field, "input_formats", api_settings.DATE_INPUT_FORMATS)
+        iso_only = (
+            output_format is not None
+            and output_format.lower() == ISO_8601
+            and [f.lower() for f in input_formats] == [ISO_8601]
+        )
+        return _to_date if iso_only else None
+    if type(field) is serializers.FloatField:
+        bounded = field.max_value is not None or field.min_value is not None
+        return None if bounded else _to_float
+    return None
+
+
+@functools.cache
+def _booking_fields() -> Optional[Tuple[Tuple[str, str, bool, Callable], ...]]:
+    """
+    Compile BookingSerializer into (name, source, required, converter) rows,
+    or None when any field has no fast converter.
+    """
+    compiled = []
+    for name, field in BookingSerializer().fields.items():
+        converter = _converter_for(field)
+        if converter is None or field.allow_null or field.read_only:
+            return None
+        compiled.append((name, field.source, field.required, converter))
+    return tuple(compiled)
+
+
+def _map_booking(raw: Mapping, fields: Tuple) -> Dict:
+    if not isinstance(raw, Mapping):
+        raise _SlowPath
+    mapped = {}
+    for name, source, required, convert in fields:
+        try:
+            value = raw[source]
+        except KeyError:
+            if required:
+                raise _SlowPath
+            continue
+        mapped[name] = convert(value)
+    return mapped
+
+
+def map_booking(raw: Mapping) -> Optional[Dict]:
+    """
+    Map and validate a raw PMS booking in a single pass.
+
+    The result is identical to `BookingSerializer(data=BookingSerializer(raw).data)`
+    after validation. Returns None when the booking is invalid or cannot be
+    mapped without the serializer, so the caller can fall back to it for the
+    exact error response.
+    """
+    fields = _booking_fields()
+    if fields is None:
+        return None
+    try:
+        return _map_booking(raw, fields)
+    except _SlowPath:
+        return None
+
+
+def map_bookings(raw_bookings: Iterable[Mapping]) -> Optional[List[Dict]]:
+    """
+    List counterpart of `map_booking`. Returns None if any booking needs the
+    serializer.
+    """
+    if isinstance(raw_bookings, CompactBookingStore):
+        return map_booking_store(raw_bookings)
+    fields = _booking_fields()
+    if fields is None:
+        return None
+    try:
+        return [_map_booking(raw, fields) for raw in raw_bookings]
+    except _SlowPath:
+        return None
+
+
+def map_booking_store(
+    store: CompactBookingStore, rows: Optional[Sequence[int]] = None
+) -> Optional[List[Dict]]:
+    """
+    `map_bookings` for the bookings of a CompactBookingStore at `rows`
+    (every booking by default), read column by column.
+
+    Each distinct room, status and date is converted once rather than once
+    per booking. Returns None if any booking needs the serializer.
+    """
+    fields = _booking_fields()
+    if fields is None:
+        return None
+    count = len(store) if rows is None else len(rows)
+    mapped: List[Dict] = [{} for _ in range(count)]
+    try:
+        for name, source, required, convert in fields:
+            try:
+                codes, values = store.factorize(source, rows)
+            except KeyError:
+                # Not a column: every booking lacks the value.
+                codes, values = [-1] * count, []
+            converted = {}
+            for booking, code in zip(mapped, codes):
+                if code < 0:
+                    if required:
+                        raise _SlowPath
+                    continue
+                if code not in converted:
+                    converted[code] = convert(values[code])
+                booking[name] = converted[code]
+    except _SlowPath:
+        return None
+    return mapped
@@ -0,0 +1,142 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from .store import CompactBookingStore
+
+MAGIC = b"PMSSNAP\x00"
+FORMAT_VERSION = 2
+# Magic, format version and the length of the JSON metadata that follows.
+HEADER = struct.Struct("<8sII")
+ALIGNMENT = 64
+
+# The columns of a CompactBookingStore, in file order, with their on-disk
+# dtypes. Changing either requires a new FORMAT_VERSION.
+COLUMNS = {
+    "ids": "|u1",
+    "id_offsets": "<i8",
+    "guests": "|u1",
+    "guest_offsets": "<i8",
+    "check_in": "<i4",
+    "check_out": "<i4",
+    "room_codes": "<i4",
+    "status_codes": "|i1",
+    "total_price": "<f8",
+    "id_hashes": "<u4",
+    "id_order": "<i4",
+    "check_in_order": "<i4",
+    "check_out_order": "<i4",
+    "amount_order": "<i4",
+}
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(store: CompactBookingStore, path: Union[str, Path]) -> int:
+    """
+    Write a booking store to a snapshot file, replacing it atomically.
+
+    The file holds a fixed header, JSON metadata (booking count, room and
+    status tables, and the offset and length of every column) and then the
+    raw little-endian columns, each aligned to 64 bytes. Processes that
+    mapped the previous file keep reading it until they reload.
+
+    Returns:
+        int: The size of the file in bytes.
+    """
+    path = Path(path)
+    columns = {
+        name: np.ascontiguousarray(getattr(store, name), dtype=dtype)
+        for name, dtype in COLUMNS.items()
+    }
+    layout, offset = {}, 0
+    for name, column in columns.items():
+        layout[name] = [offset, len(column)]
+        offset = _aligned(offset + column.nbytes)
+    metadata = json.dumps(
+        {
+            "count": len(store),
+            "rooms": list(store.rooms),
+            "statuses": list(store.statuses),
+            "columns": layout,
+        }
+    ).encode()
+    data_start = _aligned(HEADER.size + len(metadata))
+
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as snapshot:
+        try:
+            snapshot.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(metadata)))
+            snapshot.write(metadata)
+            for name, column in columns.items():
+                snapshot.seek(data_start + layout[name][0])
+                snapshot.write(column.tobytes())
+            snapshot.truncate(data_start + offset)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        except BaseException:
+            os.unlink(snapshot.name)
+            raise
+    # Temporary files are private; snapshots are read by every worker.
+    os.chmod(snapshot.name, 0o644)
+    os.replace(snapshot.name, path)
+    return data_start + offset
+
+
+def load_snapshot(path: Union[str, Path]) -> CompactBookingStore:
+    """
+    Map a snapshot file read-only and return a store over it.
+
+    Columns are views of the mapping, so nothing is copied or parsed up
+    front: pages are read on first access and shared through the OS page
+    cache by every process that maps the same file.
+
+    Raises:
+        OSError: If the file cannot be opened or mapped.
+        ValueError: If it is not a snapshot, has another format version or
+            is truncated.
+    """
+    with open(path, "rb") as snapshot:
+        if os.fstat(snapshot.fileno()).st_size < HEADER.size:
+            raise ValueError(f"{path} is not a booking snapshot.")
+        # The mapping outlives the file object.
+        mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, metadata_size = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a booking snapshot.")
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"{path} has snapshot format {version}, expected {FORMAT_VERSION}."
+        )
+    data_start = _aligned(HEADER.size + metadata_size)
+    try:
+        metadata = json.loads(mapped[HEADER.size : HEADER.size + metadata_size])
+        layout = [
+            (name, dtype, *metadata["columns"][name]) for name, dtype in COLUMNS.items()
+        ]
+        rooms = tuple(map(sys.intern, metadata["rooms"]))
+        statuses = tuple(map(sys.intern, metadata["statuses"]))
+        count = metadata["count"]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"{path} has corrupt metadata: {e!r}.")
+
+    columns = {}
+    for name, dtype, offset, length in layout:
+        offset += data_start
+        if offset + length * np.dtype(dtype).itemsize > len(mapped):
+            raise ValueError(f"{path} is truncated.")
+        columns[name] = np.frombuffer(mapped, dtype=dtype, count=length, offset=offset)
+    if any(len(columns[name]) != count for name in ("check_in", "id_order")):
+        raise ValueError(f"{path} has corrupt metadata: column lengths differ.")
+    return CompactBookingStore(**columns, rooms=rooms, statuses=statuses)
@@ -0,0 +1,522 @@
+import bisect
+import hashlib
+import json
+import math
+import sys
+import zlib
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .choices import BookingStatus
+
+# Raw PMS booking keys, in the order the PMS sends them.
+FIELDS = (
+    "id",
+    "guest",
+    "check_in_date",
+    "check_out_date",
+    "room",
+    "booking_status",
+    "total_price",
+)
+_REQUIRED = frozenset(FIELDS[:4])
+_STRING_COLUMNS = {"id": ("ids", "id_offsets"), "guest": ("guests", "guest_offsets")}
+_DATE_COLUMNS = {"check_in_date": "check_in", "check_out_date": "check_out"}
+_CODED_COLUMNS = {
+    "room": ("room_codes", "rooms"),
+    "booking_status": ("status_codes", "statuses"),
+}
+# Array columns holding the bookings, and the id index derived from them.
+_CONTENT_COLUMNS = (
+    "ids",
+    "id_offsets",
+    "guests",
+    "guest_offsets",
+    "check_in",
+    "check_out",
+    "room_codes",
+    "status_codes",
+    "total_price",
+)
+_INDEX_COLUMNS = (
+    "id_hashes",
+    "id_order",
+    "check_in_order",
+    "check_out_order",
+    "amount_order",
+)
+# Raw PMS keys with a sorted index: the column, and the positions of its rows
+# in ascending order of value, missing amounts (NaN) last.
+_SORTED_COLUMNS = {
+    "check_in_date": ("check_in", "check_in_order"),
+    "check_out_date": ("check_out", "check_out_order"),
+    "total_price": ("total_price", "amount_order"),
+}
+
+
+class BookingRecord(Mapping):
+    """
+    Read-only view of one booking in a CompactBookingStore.
+
+    Behaves like the raw PMS dict it was built from, so it can be passed to
+    `map_booking` or `BookingSerializer` as is, and pickles as a plain dict.
+    The typed properties skip the string round trip.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "CompactBookingStore", index: int) -> None:
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str):
+        return self._store.value(self._index, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in FIELDS if key in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"BookingRecord({dict(self)!r})"
+
+    @property
+    def check_in(self) -> date:
+        return date.fromordinal(int(self._store.check_in[self._index]))
+
+    @property
+    def check_out(self) -> date:
+        return date.fromordinal(int(self._store.check_out[self._index]))
+
+    @property
+    def amount(self) -> Optional[float]:
+        amount = float(self._store.total_price[self._index])
+        return None if math.isnan(amount) else amount
+
+
+def _strings(blob: np.ndarray, offsets: np.ndarray, rows: np.ndarray) -> List[str]:
+    data = memoryview(blob)
+    return [
+        str(data[start:end], "utf-8")
+        for start, end in zip(offsets[rows].tolist(), offsets[rows + 1].tolist())
+    ]
+
+
+def _pack_strings(encoded: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _take_strings(
+    blob: np.ndarray, offsets: np.ndarray, rows: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    taken = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=taken[1:])
+    # The byte positions of every taken string, end to end.
+    positions = np.repeat(starts - taken[:-1], lengths) + np.arange(taken[-1])
+    return blob[positions], taken
+
+
+def _sorted_orders(**columns: np.ndarray) -> Dict[str, np.ndarray]:
+    return {
+        order: np.argsort(columns[column], kind="stable").astype(np.int32)
+        for column, order in _SORTED_COLUMNS.values()
+    }
+
+
+def _string(booking: Mapping, key: str) -> str:
+    value = booking[key]
+    if type(value) is not str:
+        raise ValueError(f"{key} must be a string, got {value!r}.")
+    return value
+
+
+def _ordinal(booking: Mapping, key: str) -> int:
+    value = _string(booking, key)
+    parsed = date.fromisoformat(value)
+    if parsed.isoformat() != value:
+        # Only canonical YYYY-MM-DD dates survive the trip through ordinals.
+        raise ValueError(f"{key} must be a YYYY-MM-DD date, got {value!r}.")
+    return parsed.toordinal()
+
+
+def _code(booking: Mapping, key: str, table: Dict[str, int]) -> int:
+    if key not in booking:
+        return -1
+    value = _string(booking, key)
+    code = table.get(value)
+    if code is None:
+        code = table[sys.intern(value)] = len(table)
+    return code
+
+
+def _amount(booking: Mapping) -> float:
+    if "total_price" not in booking:
+        return math.nan
+    value = booking["total_price"]
+    if type(value) not in (int, float) or not math.isfinite(value):
+        raise ValueError(f"total_price must be a finite number, got {value!r}.")
+    return float(value)
+
+
+@dataclass(frozen=True, eq=False)
+class CompactBookingStore(Sequence):
+    """
+    Raw PMS bookings held as columns instead of one dict per booking.
+
+    `id` and `guest` are UTF-8 bytes in one buffer each, sliced by
+    `int64` offsets. Dates are `int32` ordinals and amounts `float64` (NaN
+    when missing). Rooms and statuses are codes into tuples of interned
+    strings (-1 when missing); statuses start with the `BookingStatus`
+    values, so their codes are stable. `id_hashes` holds the sorted CRC32
+    of every id and `id_order` their positions, for lookups by binary search.
+    `check_in_order`, `check_out_order` and `amount_order` hold the positions
+    of the rows sorted by those columns, for range lookups (`range_rows`).
+
+    Indexing returns BookingRecord views; `to_dicts` and `factorize` read
+    whole columns at once. The store is immutable: bookings with the same
+    id are merged on build, the last one winning at the first position,
+    like BookingDataSource does. A pickled store holds its columns, so a
+    cached store costs about `nbytes` rather than a dict per booking.
+    """
+
+    ids: np.ndarray
+    id_offsets: np.ndarray
+    guests: np.ndarray
+    guest_offsets: np.ndarray
+    check_in: np.ndarray
+    check_out: np.ndarray
+    room_codes: np.ndarray
+    rooms: Tuple[str, ...]
+    status_codes: np.ndarray
+    statuses: Tuple[str, ...]
+    total_price: np.ndarray
+    id_hashes: np.ndarray
+    id_order: np.ndarray
+    check_in_order: np.ndarray
+    check_out_order: np.ndarray
+    amount_order: np.ndarray
+
+    @classmethod
+    def from_bookings(cls, bookings: Iterable[Mapping]) -> "CompactBookingStore":
+        """
+        Build a store from raw PMS bookings.
+
+        Raises:
+            ValueError: If a booking does not fit the columns: keys other
+                than `FIELDS`, a missing id, guest or date, a non-string
+                value, a date not in YYYY-MM-DD form, a non-numeric amount,
+                or more than 127 statuses. Such datasets stay as dicts.
+        """
+        positions: Dict[str, int] = {}
+        columns: Tuple[list, ...] = ([], [], [], [], [], [], [])
+        rooms: Dict[str, int] = {}
+        statuses = {
+            sys.intern(str(value)): code
+            for code, value in enumerate(BookingStatus.values)
+        }
+        for booking in bookings:
+            unknown = set(booking).difference(FIELDS)
+            if unknown:
+                raise ValueError(f"Unsupported booking fields: {sorted(unknown)}.")
+            missing = _REQUIRED.difference(booking)
+            if missing:
+                raise ValueError(f"Missing booking fields: {sorted(missing)}.")
+            row = (
+                _string(booking, "id"),
+                _string(booking, "guest"),
+                _ordinal(booking, "check_in_date"),
+                _ordinal(booking, "check_out_date"),
+                _code(booking, "room", rooms),
+                _code(booking, "booking_status", statuses),
+                _amount(booking),
+            )
+            position = positions.setdefault(row[0], len(columns[0]))
+            if position == len(columns[0]):
+                for column, value in zip(columns, row):
+                    column.append(value)
+            else:
+                for column, value in zip(columns, row):
+                    column[position] = value
+        if len(statuses) > 127:
+            raise ValueError(f"Too many booking statuses: {len(statuses)}.")
+
+        ids, guests, check_in, check_out, room_codes, status_codes, amounts = columns
+        encoded_ids = [booking_id.encode() for booking_id in ids]
+        id_hashes = np.fromiter(
+            map(zlib.crc32, encoded_ids), dtype=np.uint32, count=len(ids)
+        )
+        id_order = np.argsort(id_hashes, kind="stable").astype(np.int32)
+        id_blob, id_offsets = _pack_strings(encoded_ids)
+        guest_blob, guest_offsets = _pack_strings([guest.encode() for guest in guests])
+        check_in = np.array(check_in, dtype=np.int32)
+        check_out = np.array(check_out, dtype=np.int32)
+        total_price = np.array(amounts, dtype=np.float64)
+        return cls(
+            ids=id_blob,
+            id_offsets=id_offsets,
+            guests=guest_blob,
+            guest_offsets=guest_offsets,
+            check_in=check_in,
+            check_out=check_out,
+            room_codes=np.array(room_codes, dtype=np.int32),
+            rooms=tuple(rooms),
+            status_codes=np.array(status_codes, dtype=np.int8),
+            statuses=tuple(statuses),
+            total_price=total_price,
+            id_hashes=id_hashes[id_order],
+            id_order=id_order,
+            **_sorted_orders(
+                check_in=check_in, check_out=check_out, total_price=total_price
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.check_in)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[BookingRecord, List[BookingRecord]]:
+        if isinstance(index, slice):
+            return [BookingRecord(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("booking index out of range")
+        return BookingRecord(self, index)
+
+    def __iter__(self) -> Iterator[BookingRecord]:
+        return (BookingRecord(self, i) for i in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the column arrays.
+        """
+        return sum(
+            getattr(self, name).nbytes for name in (*_CONTENT_COLUMNS, *_INDEX_COLUMNS)
+        )
+
+    def content_digest(self) -> str:
+        """
+        Return a hash of the bookings, hashing the column buffers instead of
+        encoding every booking as JSON; used by `content_etag`.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps([self.rooms, self.statuses]).encode())
+        for name in _CONTENT_COLUMNS:
+            digest.update(np.ascontiguousarray(getattr(self, name)).data)
+        return digest.hexdigest()
+
+    @cached_property
+    def _room_index(self) -> Dict[str, int]:
+        return {room: code for code, room in enumerate(self.rooms)}
+
+    @cached_property
+    def _status_index(self) -> Dict[str, int]:
+        return {status: code for code, status in enumerate(self.statuses)}
+
+    def _id(self, index: int) -> bytes:
+        start, end = self.id_offsets[index], self.id_offsets[index + 1]
+        return self.ids[start:end].tobytes()
+
+    def value(self, index: int, key: str):
+        """
+        Return the raw value of `key` for the booking at `index`.
+
+        Raises:
+            KeyError: If the booking has no such value.
+        """
+        if key in _STRING_COLUMNS:
+            blob, offsets = _STRING_COLUMNS[key]
+            start, end = getattr(self, offsets)[index : index + 2]
+            return str(memoryview(getattr(self, blob))[start:end], "utf-8")
+        if key in _DATE_COLUMNS:
+            ordinal = getattr(self, _DATE_COLUMNS[key])[index]
+            return date.fromordinal(int(ordinal)).isoformat()
+        if key in _CODED_COLUMNS:
+            codes, table = _CODED_COLUMNS[key]
+            code = getattr(self, codes)[index]
+            if code < 0:
+                raise KeyError(key)
+            return getattr(self, table)[code]
+        if key == "total_price":
+            amount = float(self.total_price[index])
+            if math.isnan(amount):
+                raise KeyError(key)
+            return amount
+        raise KeyError(key)
+
+    def position(self, booking_id: str) -> Optional[int]:
+        """
+        Return the position of a booking by id in O(log n), or None.
+        """
+        target = str(booking_id).encode()
+        digest = zlib.crc32(target)
+        found = int(np.searchsorted(self.id_hashes, np.uint32(digest)))
+        # Ids sharing a hash are adjacent; compare each of them.
+        while found < len(self) and self.id_hashes[found] == digest:
+            index = int(self.id_order[found])
+            if self._id(index) == target:
+                return index
+            found += 1
+        return None
+
+    def get(self, booking_id: str) -> Optional[BookingRecord]:
+        """
+        Return a booking by id, or None.
+        """
+        index = self.position(booking_id)
+        return None if index is None else BookingRecord(self, index)
+
+    def rows(
+        self, room: Optional[str] = None, booking_status: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Return the positions of the bookings matching every given criterion,
+        compared on codes without decoding a string.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for value, codes, index in (
+            (room, self.room_codes, self._room_index),
+            (booking_status, self.status_codes, self._status_index),
+        ):
+            if value is not None:
+                code = index.get(value)
+                if code is None:
+                    return np.empty(0, dtype=np.intp)
+                mask &= codes == code
+        return np.flatnonzero(mask)
+
+    def range_rows(self, key: str, low=None, high=None) -> np.ndarray:
+        """
+        Return the positions, in row order, of the bookings whose `key` lies
+        within the inclusive bounds, found by binary search of its sorted
+        index instead of a scan. Missing amounts never match.
+
+        Args:
+            key (str): `check_in_date`, `check_out_date` or `total_price`.
+            low (Optional[Union[date, float]]): Lower bound, a date for
+                dates and a number for amounts; None for no bound.
+            high (Optional[Union[date, float]]): Upper bound, likewise.
+        """
+        column_name, order_name = _SORTED_COLUMNS[key]
+        column, order = getattr(self, column_name), getattr(self, order_name)
+        if key in _DATE_COLUMNS:
+            low = None if low is None else low.toordinal()
+            high = None if high is None else high.toordinal()
+        start, end = 0, len(order)
+        if key == "total_price":
+            end = bisect.bisect_left(
+                order, True, key=lambda row: math.isnan(column[row])
+            )
+        if low is not None:
+            start = bisect.bisect_left(order, low, start, end, key=column.__getitem__)
+        if high is not None:
+            end = bisect.bisect_right(order, high, start, end, key=column.__getitem__)
+        return np.sort(order[start:end]).astype(np.intp)
+
+    def take(self, rows: np.ndarray) -> "CompactBookingStore":
+        """
+        Return a new store holding the bookings at `rows`, in that order,
+        sharing the room and status tables of this one.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        row_hashes = np.empty_like(self.id_hashes)
+        row_hashes[self.id_order] = self.id_hashes
+        id_hashes = row_hashes[rows]
+        id_order = np.argsort(id_hashes, kind="stable").astype(np.int32)
+        ids, id_offsets = _take_strings(self.ids, self.id_offsets, rows)
+        guests, guest_offsets = _take_strings(self.guests, self.guest_offsets, rows)
+        check_in = self.check_in[rows]
+        check_out = self.check_out[rows]
+        total_price = self.total_price[rows]
+        return type(self)(
+            ids=ids,
+            id_offsets=id_offsets,
+            guests=guests,
+            guest_offsets=guest_offsets,
+            check_in=check_in,
+            check_out=check_out,
+            room_codes=self.room_codes[rows],
+            rooms=self.rooms,
+            status_codes=self.status_codes[rows],
+            statuses=self.statuses,
+            total_price=total_price,
+            id_hashes=id_hashes[id_order],
+            id_order=id_order,
+            **_sorted_orders(
+                check_in=check_in, check_out=check_out, total_price=total_price
+            ),
+        )
+
+    def query(
+        self, room: Optional[str] = None, booking_status: Optional[str] = None
+    ) -> List[BookingRecord]:
+        """
+        Return views of the bookings matching every given criterion.
+        """
+        return [
+            BookingRecord(self, i) for i in self.rows(room, booking_status).tolist()
+        ]
+
+    def factorize(
+        self, key: str, rows: Optional[np.ndarray] = None
+    ) -> Tuple[List[int], List]:
+        """
+        Return one column as `(codes, values)`: the value of the n-th row is
+        `values[codes[n]]`, and -1 marks a missing value.
+
+        Repeated values (rooms, statuses, dates) appear once in `values`,
+        so callers can convert each of them once.
+
+        Args:
+            key (str): Raw PMS key, one of `FIELDS`.
+            rows (Optional[np.ndarray]): Positions to read, every row by
+                default.
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows, np.intp)
+        if key in _STRING_COLUMNS:
+            blob, offsets = _STRING_COLUMNS[key]
+            values = _strings(getattr(self, blob), getattr(self, offsets), rows)
+            return list(range(len(rows))), values
+        if key in _DATE_COLUMNS:
+            ordinals, codes = np.unique(
+                getattr(self, _DATE_COLUMNS[key])[rows], return_inverse=True
+            )
+            values = [date.fromordinal(o).isoformat() for o in ordinals.tolist()]
+            return codes.tolist(), values
+        if key in _CODED_COLUMNS:
+            codes, table = _CODED_COLUMNS[key]
+            return getattr(self, codes)[rows].tolist(), list(getattr(self, table))
+        if key == "total_price":
+            amounts = self.total_price[rows]
+            codes = np.where(np.isnan(amounts), -1, np.arange(len(rows)))
+            return codes.tolist(), amounts.tolist()
+        raise KeyError(key)
+
+    def to_dicts(self, rows: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Return the bookings at `rows` (every booking by default) as new raw
+        PMS dicts.
+        """
+        count = len(self) if rows is None else len(rows)
+        bookings: List[Dict] = [{} for _ in range(count)]
+        for key in FIELDS:
+            codes, values = self.factorize(key, rows)
+            for booking, code in zip(bookings, codes):
+                if code >= 0:
+                    booking[key] = values[code]
+        return bookings
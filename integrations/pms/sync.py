@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+from collections.abc import Mapping
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from .clients import PMSClient
+from .models import Booking, BookingSyncRun
+from .serializers import map_booking
+
+logger = logging.getLogger(__name__)
+
+# Columns rewritten when an existing booking changed upstream.
+SYNCED_FIELDS = [
+    "guest_name",
+    "check_in",
+    "check_out",
+    "room_number",
+    "status",
+    "amount",
+    "fingerprint",
+    "synced_at",
+]
+
+# Mirrored text columns and their lengths; longer upstream values would fail
+# the whole insert batch on databases that enforce them.
+MAX_LENGTHS = {
+    field.name: field.max_length
+    for field in Booking._meta.concrete_fields
+    if isinstance(field, models.CharField) and field.name != "fingerprint"
+}
+
+
+def fingerprint(booking: Dict) -> str:
+    """
+    Return a stable digest of a mapped booking.
+    """
+    payload = json.dumps(booking, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def booking_from_mapped(booking: Dict) -> Booking:
+    return Booking(
+        booking_id=booking["booking_id"],
+        guest_name=booking["guest_name"],
+        check_in=booking["check_in"],
+        check_out=booking["check_out"],
+        room_number=booking.get("room_number"),
+        status=booking["status"],
+        amount=booking.get("amount"),
+        fingerprint=fingerprint(booking),
+    )
+
+
+def oversized_fields(row: Booking) -> List[str]:
+    """
+    Return the names of the row's text fields longer than their column.
+    """
+    return [
+        name
+        for name, max_length in MAX_LENGTHS.items()
+        if len(getattr(row, name) or "") > max_length
+    ]
+
+
+def sync_watermark():
+    """
+    Return when the latest successful sync finished, or None.
+    """
+    run = (
+        BookingSyncRun.objects.filter(status=BookingSyncRun.Status.SUCCEEDED)
+        .order_by("-finished_at")
+        .first()
+    )
+    return run.finished_at if run else None
+
+
+def sync_bookings(
+    client=None, batch_size: Optional[int] = None, delete_missing: bool = True
+) -> BookingSyncRun:
+    """
+    Mirror the PMS booking list into the Booking table.
+
+    Fetched bookings are mapped and validated like the API does, compared
+    with the mirror by fingerprint, and only new or changed rows are written,
+    with `bulk_create(update_conflicts=True)` in batches of `batch_size`.
+    Bookings that disappeared from the PMS are deleted unless
+    `delete_missing` is False. Invalid bookings, including those with values
+    longer than the mirror's columns, are counted, logged and skipped, and
+    their existing rows are kept. A booking ID listed more than once is
+    synced as its last occurrence. Every run is recorded as a BookingSyncRun.
+
+    Args:
+        client (Optional[PMSClient]): Client to fetch bookings with, a new
+            PMSClient by default.
+        batch_size (Optional[int]): Rows per insert and delete statement,
+            `settings.PMS_SYNC_BATCH_SIZE` by default.
+        delete_missing (bool): Delete mirrored bookings the PMS no longer
+            returns.
+
+    Returns:
+        BookingSyncRun: The finished run with its change counts.
+
+    Raises:
+        ExternalAPIException: If the PMS request fails. The run is recorded
+            as failed.
+    """
+    client = client or PMSClient()
+    batch_size = batch_size or settings.PMS_SYNC_BATCH_SIZE
+    run = BookingSyncRun.objects.create()
+    try:
+        _sync(run, client.fetch_bookings(), batch_size, delete_missing)
+    except Exception as e:
+        run.status = BookingSyncRun.Status.FAILED
+        run.error = str(e)
+        run.finished_at = timezone.now()
+        run.save()
+        raise
+
+    run.status = BookingSyncRun.Status.SUCCEEDED
+    run.finished_at = timezone.now()
+    run.save()
+    logger.info(
+        "Booking sync: %s created, %s updated, %s deleted, %s unchanged, %s invalid",
+        run.created,
+        run.updated,
+        run.deleted,
+        run.unchanged,
+        run.invalid,
+    )
+    return run
+
+
+def _sync(
+    run: BookingSyncRun, raw_bookings: List[Dict], batch_size: int, delete_missing
+) -> None:
+    existing = dict(Booking.objects.values_list("booking_id", "fingerprint"))
+    # The fingerprint of the last occurrence of every booking ID, None when
+    # it was invalid; a booking listed more than once is synced as its last.
+    latest: Dict[str, Optional[str]] = {}
+    changed: Dict[str, Booking] = {}
+
+    def skip(booking_id: str) -> None:
+        run.invalid += 1
+        latest[booking_id] = None
+        changed.pop(booking_id, None)
+
+    for raw_booking in raw_bookings:
+        run.fetched += 1
+        booking = map_booking(raw_booking)
+        if booking is None:
+            if isinstance(raw_booking, Mapping) and "id" in raw_booking:
+                skip(str(raw_booking["id"]).strip())
+            else:
+                run.invalid += 1
+            continue
+
+        booking_id = booking["booking_id"]
+        row = booking_from_mapped(booking)
+        oversized = oversized_fields(row)
+        if oversized:
+            logger.warning(
+                "Skipping PMS booking %r in sync: %s too long for the mirror",
+                booking_id[:64],
+                ", ".join(oversized),
+            )
+            skip(booking_id)
+            continue
+        latest[booking_id] = row.fingerprint
+        if existing.get(booking_id) == row.fingerprint:
+            changed.pop(booking_id, None)
+        else:
+            changed[booking_id] = row
+
+    for booking_id, current in latest.items():
+        if current is None:
+            continue
+        previous = existing.get(booking_id)
+        if previous is None:
+            run.created += 1
+        elif previous != current:
+            run.updated += 1
+        else:
+            run.unchanged += 1
+
+    missing = [booking_id for booking_id in existing if booking_id not in latest]
+    with transaction.atomic():
+        Booking.objects.bulk_create(
+            list(changed.values()),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["booking_id"],
+            update_fields=SYNCED_FIELDS,
+        )
+        if delete_missing:
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start : start + batch_size]
+                run.deleted += Booking.objects.filter(booking_id__in=batch).delete()[0]
@@ -0,0 +1,216 @@
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from integrations.base.exceptions import ExternalAPIResponseError
+from integrations.pms.analytics import (
+    BookingColumns,
+    ColumnarSnapshot,
+    reset_booking_columns,
+)
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.serializers import map_bookings
+
+
+def random_bookings(count, seed=3):
+    rng = random.Random(seed)
+    first_day = date(2025, 1, 1)
+    bookings = []
+    for n in range(count):
+        check_in = first_day + timedelta(days=rng.randrange(40))
+        booking = {
+            "booking_id": str(n),
+            "guest_name": "Guest",
+            "check_in": check_in.isoformat(),
+            "check_out": (check_in + timedelta(days=rng.randrange(0, 8))).isoformat(),
+            "status": rng.choice(["confirmed", "pending", "cancelled"]),
+        }
+        if rng.random() > 0.1:
+            booking["room_number"] = str(rng.randrange(15))
+        if rng.random() > 0.1:
+            booking["amount"] = round(rng.uniform(50, 900), 2)
+        bookings.append(booking)
+    return bookings
+
+
+def naive_nights(bookings, start, end):
+    """Per-night revenue and room nights with a plain loop."""
+    revenue, room_nights = defaultdict(float), defaultdict(int)
+    for b in bookings:
+        check_in = date.fromisoformat(b["check_in"])
+        nights = (date.fromisoformat(b["check_out"]) - check_in).days
+        if b["status"] == "cancelled" or nights <= 0:
+            continue
+        for offset in range(nights):
+            night = check_in + timedelta(days=offset)
+            if start <= night < end:
+                revenue[night] += b.get("amount", 0) / nights
+                room_nights[night] += 1
+    return revenue, room_nights
+
+
+class BookingColumnsTestCase(TestCase):
+    """Test cases for the vectorized booking aggregates"""
+
+    def setUp(self):
+        self.bookings = random_bookings(400)
+        self.columns = BookingColumns.from_bookings(self.bookings)
+        self.start, self.end = date(2025, 1, 5), date(2025, 2, 10)
+
+    def test_categorical_columns(self):
+        """Test status and room codes, and missing rooms and amounts"""
+        self.assertEqual(self.columns.statuses, ("cancelled", "confirmed", "pending"))
+        for index, b in enumerate(self.bookings):
+            self.assertEqual(
+                self.columns.statuses[self.columns.status_codes[index]], b["status"]
+            )
+            code = self.columns.room_codes[index]
+            self.assertEqual(
+                self.columns.rooms[code] if code >= 0 else None, b.get("room_number")
+            )
+
+    def test_by_day_matches_loop(self):
+        """Test nightly revenue, room nights and ADR against a plain loop"""
+        revenue, room_nights = naive_nights(self.bookings, self.start, self.end)
+
+        rows = self.columns.aggregate("day", self.start, self.end)
+
+        self.assertEqual(len(rows), (self.end - self.start).days)
+        for row in rows:
+            night = date.fromisoformat(row["date"])
+            self.assertAlmostEqual(row["revenue"], revenue[night], places=3)
+            self.assertEqual(row["room_nights"], room_nights[night])
+            if room_nights[night]:
+                self.assertAlmostEqual(
+                    row["adr"], revenue[night] / room_nights[night], places=3
+                )
+            self.assertAlmostEqual(
+                row["occupancy"], room_nights[night] / len(self.columns.rooms), 3
+            )
+
+    def test_by_week_totals_days(self):
+        """Test weekly rows start on Mondays and sum the nightly rows"""
+        days = self.columns.aggregate("day", self.start, self.end)
+        weeks = self.columns.aggregate("week", self.start, self.end)
+
+        self.assertEqual(weeks[0]["week"], "2024-12-30")
+        self.assertTrue(
+            all(date.fromisoformat(w["week"]).weekday() == 0 for w in weeks)
+        )
+        self.assertAlmostEqual(
+            sum(w["revenue"] for w in weeks), sum(d["revenue"] for d in days), 2
+        )
+        self.assertEqual(
+            sum(w["room_nights"] for w in weeks), sum(d["room_nights"] for d in days)
+        )
+
+    def test_by_room_and_status(self):
+        """Test room and status breakdowns against a plain loop"""
+        revenue, room_nights, counts = defaultdict(float), defaultdict(int), {}
+        for b in self.bookings:
+            check_in = date.fromisoformat(b["check_in"])
+            check_out = date.fromisoformat(b["check_out"])
+            nights = (check_out - check_in).days
+            inside = (min(check_out, self.end) - max(check_in, self.start)).days
+            if nights <= 0 or inside <= 0:
+                continue
+            counts[b["status"]] = counts.get(b["status"], 0) + 1
+            if b["status"] != "cancelled" and "room_number" in b:
+                revenue[b["room_number"]] += b.get("amount", 0) / nights * inside
+                room_nights[b["room_number"]] += inside
+
+        rooms = self.columns.aggregate("room", self.start, self.end)
+        statuses = self.columns.aggregate("status", self.start, self.end)
+
+        for row in rooms:
+            self.assertAlmostEqual(row["revenue"], revenue[row["room"]], places=3)
+            self.assertEqual(row["room_nights"], room_nights[row["room"]])
+        self.assertEqual({row["status"]: row["bookings"] for row in statuses}, counts)
+
+    def test_empty(self):
+        """Test that an empty snapshot has no span"""
+        columns = BookingColumns.from_bookings([])
+
+        self.assertIsNone(columns.span)
+        self.assertEqual(
+            columns.aggregate("room", date(2025, 1, 1), date(2025, 1, 2)), []
+        )
+
+    def test_snapshot_keeps_columns_on_failure(self):
+        """Test that a failed rebuild serves the previous snapshot"""
+        snapshot = ColumnarSnapshot()
+        columns = snapshot.get(Mock(return_value=MOCK_PMS_BOOKINGS), max_age=60)
+        failing = Mock(
+            side_effect=ExternalAPIResponseError(
+                status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure."
+            )
+        )
+
+        self.assertIs(snapshot.get(failing, max_age=60), columns)
+        failing.assert_not_called()
+        with self.assertLogs("integrations.pms.analytics", level="WARNING"):
+            self.assertIs(snapshot.get(failing, max_age=0), columns)
+        with self.assertRaises(ExternalAPIResponseError):
+            ColumnarSnapshot().get(failing, max_age=0)
+
+
+class BookingAnalyticsAPIViewTestCase(APITestCase):
+    """Test cases for the booking analytics endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        reset_booking_columns()
+
+    def tearDown(self):
+        reset_booking_columns()
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_day_analytics(self, mock_pms_client):
+        """Test nightly analytics over the mock bookings"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        response = self.client.get(
+            reverse("booking_analytics"),
+            {"check_in": "2025-06-01", "check_out": "2025-06-03"},
+        )
+        self.client.get(reverse("booking_analytics"), {"group_by": "status"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total_rooms"], 10)
+        self.assertEqual(
+            [row["room_nights"] for row in response.data["results"]], [2, 3]
+        )
+        self.assertEqual(response.data["results"][1]["occupancy"], 0.3)
+        mock_client_instance.fetch_bookings.assert_called_once()
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_status_analytics_default_span(self, mock_pms_client):
+        """Test that the whole booking span is used without a range"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+        mapped = map_bookings(MOCK_PMS_BOOKINGS)
+
+        response = self.client.get(reverse("booking_analytics"), {"group_by": "status"})
+
+        self.assertEqual(
+            str(response.data["check_in"]), min(b["check_in"] for b in mapped)
+        )
+        self.assertEqual(
+            sum(row["bookings"] for row in response.data["results"]), len(mapped)
+        )
+
+    def test_invalid_query(self):
+        """Test that half ranges and unknown groupings are rejected"""
+        half = self.client.get(reverse("booking_analytics"), {"check_in": "2025-06-01"})
+        grouping = self.client.get(reverse("booking_analytics"), {"group_by": "year"})
+
+        self.assertEqual(half.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("check_out", half.data)
+        self.assertIn("group_by", grouping.data)
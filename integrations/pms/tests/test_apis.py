@@ -1,5 +1,7 @@
 from unittest.mock import patch
 
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -16,6 +18,7 @@ class BookingListAPIViewTestCase(APITestCase):
     """Test cases for BookingListAPIView"""
 
     def setUp(self):
+        cache.clear()
         self.url = reverse("booking_list")
 
     @patch("integrations.pms.views.PMSClient")
@@ -28,10 +31,11 @@ class BookingListAPIViewTestCase(APITestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(response.data["count"], len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(len(response.data["results"]), len(MOCK_PMS_BOOKINGS))
 
         # Check serialized data structure
-        first_booking = response.data[0]
+        first_booking = response.data["results"][0]
         self.assertIn("booking_id", first_booking)
         self.assertIn("guest_name", first_booking)
         self.assertIn("check_in", first_booking)
@@ -46,6 +50,22 @@ class BookingListAPIViewTestCase(APITestCase):
         mock_pms_client.assert_called_once()
         mock_client_instance.fetch_bookings.assert_called_once()
 
+    @patch("integrations.pms.views.PMSClient")
+    def test_get_bookings_invalid_booking(self, mock_pms_client):
+        """Test that invalid upstream bookings are reported per booking"""
+        invalid_booking = {**MOCK_PMS_BOOKINGS[1], "booking_status": "unknown"}
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_bookings.return_value = [
+            MOCK_PMS_BOOKINGS[0],
+            invalid_booking,
+        ]
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data["errors"]), 1)
+        self.assertIn("status", response.data["errors"][0])
+
     @patch("integrations.pms.views.PMSClient")
     def test_get_bookings_external_api_exception(self, mock_pms_client):
         """Test handling of external API exception"""
@@ -83,14 +103,15 @@ class BookingListAPIViewTestCase(APITestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
-        self.assertEqual(response.data, [])
+        self.assertEqual(response.data["count"], 0)
+        self.assertEqual(response.data["results"], [])
 
 
 class BookingDetailAPIViewTestCase(APITestCase):
     """Test cases for BookingDetailAPIView"""
 
     def setUp(self):
+        cache.clear()
         self.booking_id = "1001"
         self.url = reverse("booking_detail", kwargs={"booking_id": self.booking_id})
         self.expected_booking = next(
@@ -195,3 +216,155 @@ class BookingDetailAPIViewTestCase(APITestCase):
             # This might return 404 from Django routing or from our API logic
             # depending on URL pattern configuration
             self.assertIn(response.status_code, [status.HTTP_404_NOT_FOUND])
+
+
+class BookingBatchAPIViewTestCase(APITestCase):
+    """Test cases for BookingBatchAPIView"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("booking_batch")
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_batch_per_id_results(self, mock_pms_client):
+        """Test that each ID gets its own result and status"""
+
+        def fetch_booking_by_id(booking_id):
+            if booking_id == "1002":
+                raise ExternalAPIResponseError(
+                    status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure"
+                )
+            if booking_id == "1003":
+                return {**MOCK_PMS_BOOKINGS[2], "check_in_date": "soon"}
+            if booking_id == "9999":
+                raise ExternalAPINotFound("Booking ID '9999' not found.")
+            return MOCK_PMS_BOOKINGS[0]
+
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_booking_by_id.side_effect = fetch_booking_by_id
+
+        response = self.client.post(
+            self.url, {"booking_ids": [1001, 1002, 1003, 9999, 1001]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(
+            [(item["booking_id"], item["status"]) for item in results],
+            [
+                ("1001", "ok"),
+                ("1002", "error"),
+                ("1003", "invalid"),
+                ("9999", "not_found"),
+            ],
+        )
+        self.assertEqual(results[0]["booking"]["room_number"], "107")
+        self.assertIn("check_in", results[2]["errors"])
+        self.assertEqual(mock_client_instance.fetch_booking_by_id.call_count, 4)
+
+    @override_settings(PMS_BATCH_MAX_IDS=2)
+    def test_batch_invalid_ids(self):
+        """Test that empty, oversized and non-numeric batches are rejected"""
+        for booking_ids in ([], [1001, 1002, 1003], ["abc"]):
+            response = self.client.post(
+                self.url, {"booking_ids": booking_ids}, format="json"
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("booking_ids", response.data)
+
+
+class ConditionalGetTestCase(APITestCase):
+    """Test cases for ETag and Last-Modified on the booking endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("booking_list")
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_list_not_modified(self, mock_pms_client):
+        """Test that a matching If-None-Match gets a 304 without a body"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        first = self.client.get(self.url)
+        etag = first["ETag"]
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        other_page = self.client.get(
+            self.url, {"ordering": "-booking_id"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", first)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], etag)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(other_page.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(other_page["ETag"], etag)
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_list_changes_etag_with_content(self, mock_pms_client):
+        """Test that changed upstream data is served with a new ETag"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+        etag = self.client.get(self.url)["ETag"]
+        cache.clear()
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS[1:]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_detail_if_modified_since(self, mock_pms_client):
+        """Test If-Modified-Since on the detail endpoint"""
+        mock_pms_client.return_value.fetch_booking_by_id.return_value = (
+            MOCK_PMS_BOOKINGS[0]
+        )
+        url = reverse("booking_detail", kwargs={"booking_id": 1001})
+
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_errors_have_no_etag(self, mock_pms_client):
+        """Test that invalid payloads are not given validators"""
+        mock_pms_client.return_value.fetch_bookings.return_value = [
+            {**MOCK_PMS_BOOKINGS[0], "check_in_date": "soon"}
+        ]
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("ETag", response)
+
+
+@patch("integrations.pms.clients.random.random", return_value=0.5)
+@patch("integrations.pms.clients.time.sleep")
+class ServerTimingTestCase(APITestCase):
+    """Test cases for the per-phase timings of the booking endpoints"""
+
+    def setUp(self):
+        cache.clear()
+
+    def phases(self, response):
+        return [part.split(";")[0] for part in response["Server-Timing"].split(", ")]
+
+    def test_list_phases(self, mock_sleep, mock_random):
+        """Test that a cache miss reports upstream, serialize and render"""
+        response = self.client.get(reverse("booking_list"))
+
+        self.assertEqual(
+            self.phases(response),
+            ["upstream", "serialize", "filter", "render", "total"],
+        )
+
+    def test_cached_detail_phases(self, mock_sleep, mock_random):
+        """Test that a cache hit reports no upstream phase"""
+        url = reverse("async_booking_detail", args=[1001])
+        self.client.get(url)
+
+        response = self.client.get(url)
+
+        self.assertEqual(self.phases(response), ["serialize", "render", "total"])
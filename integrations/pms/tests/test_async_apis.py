@@ -0,0 +1,117 @@
+from unittest.mock import AsyncMock, patch
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from integrations.base.exceptions import ExternalAPINotFound, ExternalAPIResponseError
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+
+
+class AsyncBookingListAPIViewTestCase(APITestCase):
+    """Test cases for AsyncBookingListAPIView"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("async_booking_list")
+
+    @patch("integrations.pms.views.AsyncPMSClient")
+    def test_get_bookings_success(self, mock_pms_client):
+        """Test successful retrieval of all bookings"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_bookings = AsyncMock(return_value=MOCK_PMS_BOOKINGS)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(response.data["results"][0]["booking_id"], "1001")
+        self.assertEqual(response.data["results"][0]["guest_name"], "Alice Johnson")
+        mock_client_instance.fetch_bookings.assert_awaited_once()
+
+    @patch("integrations.pms.views.AsyncPMSClient")
+    def test_get_bookings_external_api_response_error(self, mock_pms_client):
+        """Test handling of external API response error"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_bookings = AsyncMock(
+            side_effect=ExternalAPIResponseError(
+                status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure"
+            )
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_502_BAD_GATEWAY)
+        self.assertIn("Simulated PMS API failure", response.data["error"])
+
+
+class AsyncBookingDetailAPIViewTestCase(APITestCase):
+    """Test cases for AsyncBookingDetailAPIView"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("async_booking_detail", kwargs={"booking_id": 1001})
+
+    @patch("integrations.pms.views.AsyncPMSClient")
+    def test_get_booking_by_id_success(self, mock_pms_client):
+        """Test successful retrieval of booking by ID"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_booking_by_id = AsyncMock(
+            return_value=MOCK_PMS_BOOKINGS[0]
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["booking_id"], "1001")
+        self.assertEqual(response.data["room_number"], "107")
+        mock_client_instance.fetch_booking_by_id.assert_awaited_once_with(1001)
+
+    @patch("integrations.pms.views.AsyncPMSClient")
+    def test_get_booking_by_id_not_found(self, mock_pms_client):
+        """Test handling of booking not found"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_booking_by_id = AsyncMock(
+            side_effect=ExternalAPINotFound("Booking ID '1001' not found.")
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn("not found", response.data["error"])
+
+    def test_post_not_allowed(self):
+        """Test that unsupported methods are rejected by the async dispatcher"""
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class AsyncBookingBatchAPIViewTestCase(APITestCase):
+    """Test cases for AsyncBookingBatchAPIView"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("async_booking_batch")
+
+    @patch("integrations.pms.views.AsyncPMSClient")
+    def test_batch_per_id_results(self, mock_pms_client):
+        """Test that cached bookings are reused and misses are fetched"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_bookings = AsyncMock(return_value=MOCK_PMS_BOOKINGS)
+        mock_client_instance.fetch_booking_by_id = AsyncMock(
+            side_effect=ExternalAPINotFound("Booking ID '9999' not found.")
+        )
+        self.client.get(reverse("async_booking_list"))
+
+        response = self.client.post(
+            self.url, {"booking_ids": [1002, 9999]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]], ["ok", "not_found"]
+        )
+        self.assertEqual(response.data["results"][0]["booking"]["booking_id"], "1002")
+        mock_client_instance.fetch_booking_by_id.assert_awaited_once_with("9999")
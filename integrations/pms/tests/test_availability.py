@@ -0,0 +1,240 @@
+import random
+from datetime import date, timedelta
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from integrations.base.exceptions import ExternalAPIResponseError
+from integrations.pms.availability import AvailabilityIndex, reset_availability_index
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.serializers import map_bookings
+
+
+def booking(booking_id, room, check_in, check_out, booking_status="confirmed"):
+    return {
+        "booking_id": booking_id,
+        "guest_name": "Guest",
+        "check_in": check_in,
+        "check_out": check_out,
+        "room_number": room,
+        "status": booking_status,
+    }
+
+
+class AvailabilityIndexTestCase(TestCase):
+    """Test cases for the room interval index"""
+
+    def setUp(self):
+        self.index = AvailabilityIndex()
+        self.index.sync(map_bookings(MOCK_PMS_BOOKINGS))
+
+    def test_overlap_is_half_open(self):
+        """Test that check-out day is free for the next guest"""
+        # 1001 occupies room 107 for the nights 06-01 .. 06-04.
+        self.assertEqual(
+            self.index.overlapping(date(2025, 6, 4), date(2025, 6, 5), "107"),
+            {"107": ["1001"]},
+        )
+        self.assertEqual(
+            self.index.overlapping(date(2025, 6, 5), date(2025, 6, 6), "107"), {}
+        )
+        self.assertEqual(
+            self.index.overlapping(date(2025, 5, 30), date(2025, 6, 1), "107"), {}
+        )
+
+    def test_cancelled_bookings_do_not_occupy(self):
+        """Test that rooms with only cancelled bookings are free"""
+        free_rooms = self.index.free_rooms(date(2025, 6, 3), date(2025, 6, 4))
+
+        # 1003 (room 110) is cancelled.
+        self.assertIn("110", free_rooms)
+        self.assertNotIn("107", free_rooms)
+        self.assertEqual(len(self.index.rooms), 10)
+
+    def test_occupancy_per_night(self):
+        """Test active stays counted per night"""
+        nights = dict(self.index.occupancy(date(2025, 6, 1), date(2025, 6, 3)))
+
+        self.assertEqual(nights[date(2025, 6, 1)], 2)
+        self.assertEqual(nights[date(2025, 6, 2)], 3)
+
+    def test_occupancy_counts_double_booked_rooms_once(self):
+        """Test that overlapping stays in one room occupy it once"""
+        index = AvailabilityIndex()
+        index.sync(
+            [
+                booking("1", "101", "2025-06-01", "2025-06-04"),
+                booking("2", "101", "2025-06-02", "2025-06-03"),
+                booking("3", "101", "2025-06-03", "2025-06-06"),
+                booking("4", "102", "2025-06-05", "2025-06-06"),
+            ]
+        )
+
+        nights = index.occupancy(date(2025, 5, 31), date(2025, 6, 7))
+
+        self.assertEqual([occupied for _, occupied in nights], [0, 1, 1, 1, 1, 2, 0])
+        self.assertTrue(all(occupied <= len(index.rooms) for _, occupied in nights))
+        self.assertEqual(index.occupancy(date(2025, 6, 3), date(2025, 6, 3)), [])
+
+    def test_incremental_changes(self):
+        """Test upsert, remove and sync diffs"""
+        self.assertFalse(self.index.upsert(map_bookings(MOCK_PMS_BOOKINGS[:1])[0]))
+        self.assertTrue(
+            self.index.upsert(booking("2001", "107", "2025-06-05", "2025-06-07"))
+        )
+        self.assertEqual(
+            self.index.overlapping(date(2025, 6, 1), date(2025, 6, 30), "107"),
+            {"107": ["1001", "2001"]},
+        )
+
+        self.assertTrue(self.index.remove("1001"))
+        self.assertFalse(self.index.remove("1001"))
+
+        changes = self.index.sync(
+            [
+                *map_bookings(MOCK_PMS_BOOKINGS[1:9]),
+                booking("1002", "102", "2025-06-02", "2025-06-06", "cancelled"),
+            ]
+        )
+        self.assertEqual(changes, {"added": 0, "updated": 1, "removed": 2})
+        self.assertIn("102", self.index.free_rooms(date(2025, 6, 2), date(2025, 6, 3)))
+
+    def test_matches_brute_force(self):
+        """Test index answers against a linear scan on random bookings"""
+        rng = random.Random(7)
+        first_day = date(2025, 1, 1)
+        bookings = []
+        for n in range(300):
+            check_in = first_day + timedelta(days=rng.randrange(60))
+            bookings.append(
+                booking(
+                    str(n),
+                    str(rng.randrange(20)),
+                    check_in.isoformat(),
+                    (check_in + timedelta(days=rng.randrange(1, 10))).isoformat(),
+                    rng.choice(["confirmed", "pending", "cancelled"]),
+                )
+            )
+        index = AvailabilityIndex()
+        index.sync(bookings)
+
+        for _ in range(50):
+            start = first_day + timedelta(days=rng.randrange(70))
+            end = start + timedelta(days=rng.randrange(1, 7))
+            expected = {}
+            for b in bookings:
+                if (
+                    b["status"] != "cancelled"
+                    and b["check_in"] < end.isoformat()
+                    and b["check_out"] > start.isoformat()
+                ):
+                    expected.setdefault(b["room_number"], set()).add(b["booking_id"])
+
+            found = index.overlapping(start, end)
+            self.assertEqual({room: set(ids) for room, ids in found.items()}, expected)
+            self.assertEqual(
+                set(index.free_rooms(start, end)), set(index.rooms) - set(expected)
+            )
+            self.assertEqual(
+                index.occupancy(start, end),
+                [
+                    (night, len(index.overlapping(night, night + timedelta(days=1))))
+                    for night in (
+                        start + timedelta(days=n) for n in range((end - start).days)
+                    )
+                ],
+            )
+
+    def test_refresh_keeps_contents_on_failure(self):
+        """Test that a failed refresh serves the previous contents"""
+        fetch = Mock(
+            side_effect=ExternalAPIResponseError(
+                status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure."
+            )
+        )
+
+        with self.assertLogs("integrations.pms.availability", level="WARNING"):
+            self.index.refresh(fetch, max_age=0)
+
+        self.assertEqual(len(self.index), len(MOCK_PMS_BOOKINGS))
+        with self.assertRaises(ExternalAPIResponseError):
+            AvailabilityIndex().refresh(fetch, max_age=0)
+
+
+class RoomAvailabilityAPIViewTestCase(APITestCase):
+    """Test cases for the availability and occupancy endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        reset_availability_index()
+
+    def tearDown(self):
+        reset_availability_index()
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_availability(self, mock_pms_client):
+        """Test free and occupied rooms for a range"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        response = self.client.get(
+            reverse("room_availability"),
+            {"check_in": "2025-06-01", "check_out": "2025-06-02"},
+        )
+        self.client.get(
+            reverse("room_availability"),
+            {"check_in": "2025-06-03", "check_out": "2025-06-04"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["occupied_rooms"], {"107": ["1001"], "108": ["1005"]}
+        )
+        self.assertIn("110", response.data["free_rooms"])
+        mock_client_instance.fetch_bookings.assert_called_once()
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_occupancy(self, mock_pms_client):
+        """Test per-night occupancy"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        response = self.client.get(
+            reverse("room_occupancy"),
+            {"check_in": "2025-06-01", "check_out": "2025-06-03"},
+        )
+
+        self.assertEqual(response.data["total_rooms"], 10)
+        self.assertEqual(
+            [night["occupied"] for night in response.data["nights"]], [2, 3]
+        )
+        self.assertEqual(response.data["nights"][1]["rate"], 0.3)
+
+    def test_invalid_range(self):
+        """Test that empty and inverted ranges are rejected"""
+        response = self.client.get(
+            reverse("room_availability"),
+            {"check_in": "2025-06-03", "check_out": "2025-06-03"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("check_out", response.data)
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_upstream_failure_before_first_load(self, mock_pms_client):
+        """Test 502 when the index has never been loaded"""
+        mock_pms_client.return_value.fetch_bookings.side_effect = (
+            ExternalAPIResponseError(
+                status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure."
+            )
+        )
+
+        response = self.client.get(
+            reverse("room_occupancy"),
+            {"check_in": "2025-06-01", "check_out": "2025-06-03"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_502_BAD_GATEWAY)
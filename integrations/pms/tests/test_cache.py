@@ -0,0 +1,237 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from integrations.base.exceptions import (
+    ExternalAPINotFound,
+    ExternalAPIResponseError,
+)
+from integrations.pms.cache import AsyncCachedPMSClient, CachedPMSClient
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+
+PMS_FAILURE = ExternalAPIResponseError(
+    status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure."
+)
+BOOKINGS_BY_ID = {booking["id"]: booking for booking in MOCK_PMS_BOOKINGS}
+
+
+def fetch_by_id(booking_id):
+    """PMS detail lookup where 1005 fails and unknown IDs are not found."""
+    if booking_id == "1005":
+        raise PMS_FAILURE
+    if booking_id not in BOOKINGS_BY_ID:
+        raise ExternalAPINotFound(f"Booking ID '{booking_id}' not found.")
+    return BOOKINGS_BY_ID[booking_id]
+
+
+class CachedPMSClientTestCase(TestCase):
+    """Test cases for the read-through booking cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.pms_client = Mock()
+        self.pms_client.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+        self.pms_client.fetch_booking_by_id.return_value = MOCK_PMS_BOOKINGS[0]
+        self.client = CachedPMSClient(self.pms_client)
+
+    def test_fetch_bookings_read_through(self):
+        """Test that a second read is served from cache"""
+        self.assertEqual(self.client.fetch_bookings(), MOCK_PMS_BOOKINGS)
+        self.assertEqual(self.client.fetch_bookings(), MOCK_PMS_BOOKINGS)
+
+        self.pms_client.fetch_bookings.assert_called_once()
+
+    def test_fetch_booking_by_id_cached_per_id(self):
+        """Test that bookings are cached under their own ID"""
+        self.client.fetch_booking_by_id("1001")
+        self.client.fetch_booking_by_id("1001")
+        self.client.fetch_booking_by_id("1002")
+
+        self.assertEqual(self.pms_client.fetch_booking_by_id.call_count, 2)
+
+    @override_settings(PMS_CACHE={"TTL": {"bookings": 0}})
+    def test_serves_stale_on_error(self):
+        """Test that an expired entry is served when the PMS fails"""
+        client = CachedPMSClient(self.pms_client)
+        client.fetch_bookings()
+        self.pms_client.fetch_bookings.side_effect = PMS_FAILURE
+
+        with self.assertLogs("integrations.pms.cache", level="WARNING") as logs:
+            self.assertEqual(client.fetch_bookings(), MOCK_PMS_BOOKINGS)
+
+        self.assertEqual(self.pms_client.fetch_bookings.call_count, 2)
+        self.assertIn("serving stale pms:bookings", logs.output[0])
+
+    def test_error_without_cached_entry_raises(self):
+        """Test that failures propagate when nothing is cached"""
+        self.pms_client.fetch_bookings.side_effect = PMS_FAILURE
+
+        with self.assertRaises(ExternalAPIResponseError):
+            self.client.fetch_bookings()
+
+    def test_not_found_is_not_cached(self):
+        """Test that not-found responses always go to the PMS"""
+        self.pms_client.fetch_booking_by_id.side_effect = ExternalAPINotFound(
+            "Booking ID '9999' not found."
+        )
+
+        for _ in range(2):
+            with self.assertRaises(ExternalAPINotFound):
+                self.client.fetch_booking_by_id("9999")
+
+        self.assertEqual(self.pms_client.fetch_booking_by_id.call_count, 2)
+
+    @override_settings(PMS_CACHE={"REFRESH_AHEAD": 0})
+    def test_refresh_ahead_runs_in_background(self):
+        """Test that hits past the refresh point schedule one background refresh"""
+        client = CachedPMSClient(self.pms_client)
+        client.fetch_bookings()
+
+        with patch("integrations.pms.cache._refresh_executor") as mock_executor:
+            self.assertEqual(client.fetch_bookings(), MOCK_PMS_BOOKINGS)
+            self.assertEqual(client.fetch_bookings(), MOCK_PMS_BOOKINGS)
+
+        mock_executor.submit.assert_called_once()
+        self.pms_client.fetch_bookings.assert_called_once()
+
+    def test_invalidate_booking_drops_detail_and_list(self):
+        """Test explicit invalidation of a booking"""
+        self.client.fetch_bookings()
+        self.client.fetch_booking_by_id("1001")
+
+        self.client.invalidate_booking("1001")
+        self.client.fetch_bookings()
+        self.client.fetch_booking_by_id("1001")
+
+        self.assertEqual(self.pms_client.fetch_bookings.call_count, 2)
+        self.assertEqual(self.pms_client.fetch_booking_by_id.call_count, 2)
+
+    def test_filtered_lists_cached_per_query(self):
+        """Test that filtered lists are cached under their own query"""
+        params = {"booking_status": "confirmed"}
+        self.client.fetch_bookings(params)
+        self.client.fetch_bookings(params)
+        self.client.fetch_bookings({"booking_status": "pending"})
+        self.client.fetch_bookings()
+
+        self.assertEqual(self.pms_client.fetch_bookings.call_count, 3)
+        self.pms_client.fetch_bookings.assert_any_call(params)
+
+    def test_two_tier_cache_alias(self):
+        """Test that the cache runs on the two-tier backend"""
+        client = CachedPMSClient(self.pms_client, "tiered")
+        counters = client.cache.tier.counters
+        hits = counters["hits"]
+
+        client.fetch_booking_by_id("1001")
+        client.fetch_booking_by_id("1001")
+        client.invalidate_booking("1001")
+        client.fetch_booking_by_id("1001")
+
+        self.assertEqual(counters["hits"] - hits, 1)
+        self.assertEqual(self.pms_client.fetch_booking_by_id.call_count, 2)
+
+    def test_invalidate_bookings_drops_filtered_lists(self):
+        """Test that invalidating the list also drops filtered lists"""
+        params = {"room": "107"}
+        self.client.fetch_bookings(params)
+
+        self.client.invalidate_bookings()
+        self.client.fetch_bookings(params)
+
+        self.assertEqual(self.pms_client.fetch_bookings.call_count, 2)
+
+    @override_settings(PMS_CACHE={"TTL": {"bookings": 0}})
+    def test_validators_track_content_changes(self):
+        """Test that refetching unchanged data keeps its validators"""
+        client = CachedPMSClient(self.pms_client)
+        _, first = client.fetch_bookings_versioned()
+        _, unchanged = client.fetch_bookings_versioned()
+        self.pms_client.fetch_bookings.return_value = MOCK_PMS_BOOKINGS[1:]
+        _, changed = client.fetch_bookings_versioned()
+
+        self.assertEqual(unchanged, first)
+        self.assertNotEqual(changed.etag, first.etag)
+        self.assertGreaterEqual(changed.last_modified, first.last_modified)
+
+    def test_fetch_bookings_by_ids(self):
+        """Test batch lookups with cache hits, misses and per-ID failures"""
+        self.client.fetch_booking_by_id("1001")
+        self.pms_client.fetch_booking_by_id.side_effect = fetch_by_id
+
+        results = self.client.fetch_bookings_by_ids(
+            ["1002", "1001", "9999", "1005"], max_concurrency=2
+        )
+
+        self.assertEqual(list(results), ["1002", "1001", "9999", "1005"])
+        self.assertEqual(results["1001"], MOCK_PMS_BOOKINGS[0])
+        self.assertEqual(results["1002"], MOCK_PMS_BOOKINGS[1])
+        self.assertIsInstance(results["9999"], ExternalAPINotFound)
+        self.assertIs(results["1005"], PMS_FAILURE)
+        # 1001 once for the warm-up, then only the three misses.
+        self.assertEqual(self.pms_client.fetch_booking_by_id.call_count, 4)
+
+    def test_fetch_bookings_by_ids_from_cached_list(self):
+        """Test that IDs in the cached booking list skip the PMS"""
+        self.client.fetch_bookings()
+
+        results = self.client.fetch_bookings_by_ids(["1003", "1004"], 10)
+
+        self.assertEqual(results["1003"], MOCK_PMS_BOOKINGS[2])
+        self.pms_client.fetch_booking_by_id.assert_not_called()
+
+
+class AsyncCachedPMSClientTestCase(TestCase):
+    """Test cases for the async read-through booking cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.pms_client = Mock()
+        self.pms_client.fetch_bookings = AsyncMock(return_value=MOCK_PMS_BOOKINGS)
+        self.client = AsyncCachedPMSClient(self.pms_client)
+
+    def test_fetch_bookings_read_through(self):
+        """Test that a second read is served from cache"""
+        async_to_sync(self.client.fetch_bookings)()
+        bookings = async_to_sync(self.client.fetch_bookings)()
+
+        self.assertEqual(bookings, MOCK_PMS_BOOKINGS)
+        self.pms_client.fetch_bookings.assert_awaited_once()
+
+    @override_settings(PMS_CACHE={"TTL": {"bookings": 0}})
+    def test_serves_stale_on_error(self):
+        """Test that an expired entry is served when the PMS fails"""
+        client = AsyncCachedPMSClient(self.pms_client)
+        async_to_sync(client.fetch_bookings)()
+        self.pms_client.fetch_bookings.side_effect = PMS_FAILURE
+
+        with self.assertLogs("integrations.pms.cache", level="WARNING") as logs:
+            self.assertEqual(async_to_sync(client.fetch_bookings)(), MOCK_PMS_BOOKINGS)
+
+        self.assertIn("serving stale pms:bookings", logs.output[0])
+
+    def test_fetch_bookings_by_ids_bounds_concurrency(self):
+        """Test that misses are fetched concurrently up to the limit"""
+        in_flight, peak = 0, 0
+
+        async def fetch(booking_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return fetch_by_id(booking_id)
+
+        self.pms_client.fetch_booking_by_id = AsyncMock(side_effect=fetch)
+        booking_ids = [*BOOKINGS_BY_ID, "9999"]
+
+        results = async_to_sync(self.client.fetch_bookings_by_ids)(booking_ids, 3)
+
+        self.assertEqual(peak, 3)
+        self.assertEqual(results["1001"], MOCK_PMS_BOOKINGS[0])
+        self.assertIsInstance(results["9999"], ExternalAPINotFound)
+        self.assertIs(results["1005"], PMS_FAILURE)
@@ -0,0 +1,161 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from django.test import override_settings
+
+from integrations.pms.datasource import (
+    BookingDataSource,
+    CompactBookingDataSource,
+    get_booking_datasource,
+    reset_booking_datasource,
+)
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.serializers import map_bookings
+from integrations.pms.store import CompactBookingStore
+
+
+class BookingDataSourceTestCase(TestCase):
+    """Test cases for the indexed booking data source"""
+
+    datasource_class = BookingDataSource
+
+    def setUp(self):
+        self.datasource = self.datasource_class(MOCK_PMS_BOOKINGS)
+
+    def test_all_preserves_order(self):
+        """Test that all bookings are returned in dataset order"""
+        self.assertEqual(list(self.datasource.all()), MOCK_PMS_BOOKINGS)
+        self.assertEqual(len(self.datasource), len(MOCK_PMS_BOOKINGS))
+
+    def test_query_intersects_indexes(self):
+        """Test that room and status criteria are combined"""
+        self.assertEqual(list(self.datasource.query()), MOCK_PMS_BOOKINGS)
+        confirmed = self.datasource.query(booking_status="confirmed")
+        self.assertEqual(
+            [b["id"] for b in confirmed], ["1001", "1004", "1006", "1007", "1010"]
+        )
+        self.assertEqual(
+            list(self.datasource.query(room="107", booking_status="confirmed")),
+            [MOCK_PMS_BOOKINGS[0]],
+        )
+        self.assertEqual(
+            list(self.datasource.query(room="107", booking_status="pending")), []
+        )
+
+    def test_get_by_id(self):
+        """Test primary index lookups with string and int IDs"""
+        self.assertEqual(self.datasource.get("1004")["guest"], "Daniel Garcia")
+        self.assertEqual(self.datasource.get(1004)["guest"], "Daniel Garcia")
+        self.assertIsNone(self.datasource.get("9999"))
+
+    def test_secondary_indexes(self):
+        """Test room and status indexes"""
+        self.assertEqual([b["id"] for b in self.datasource.by_room("107")], ["1001"])
+        cancelled = [b["id"] for b in self.datasource.by_status("cancelled")]
+        self.assertEqual(cancelled, ["1003", "1008"])
+        self.assertEqual(list(self.datasource.by_room("999")), [])
+
+    def test_upsert_updates_indexes(self):
+        """Test that updating a booking moves it between index buckets"""
+        version = self.datasource.version
+        updated = {
+            **self.datasource.get("1001"),
+            "room": "201",
+            "booking_status": "cancelled",
+        }
+
+        self.datasource.upsert(updated)
+
+        self.assertEqual(self.datasource.version, version + 1)
+        self.assertEqual(list(self.datasource.by_room("107")), [])
+        self.assertEqual(list(self.datasource.by_room("201")), [updated])
+        self.assertIn(updated, self.datasource.by_status("cancelled"))
+        self.assertNotIn(updated, self.datasource.by_status("confirmed"))
+        self.assertEqual(self.datasource.all()[0], updated)
+
+    def test_remove(self):
+        """Test removing a booking from every index"""
+        self.assertTrue(self.datasource.remove("1003"))
+        self.assertFalse(self.datasource.remove("1003"))
+
+        self.assertIsNone(self.datasource.get("1003"))
+        self.assertEqual(list(self.datasource.by_room("110")), [])
+        self.assertEqual(len(self.datasource.all()), len(MOCK_PMS_BOOKINGS) - 1)
+
+    def test_replace_rebuilds_indexes(self):
+        """Test that replacing the dataset rebuilds the indexes"""
+        self.datasource.replace(MOCK_PMS_BOOKINGS[:2])
+
+        self.assertEqual(len(self.datasource), 2)
+        self.assertIsNone(self.datasource.get("1003"))
+
+    def test_from_fixture_json_and_ndjson(self):
+        """Test loading JSON array and NDJSON fixture files"""
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "bookings.json"
+            json_path.write_text(json.dumps(MOCK_PMS_BOOKINGS))
+            ndjson_path = Path(directory) / "bookings.ndjson"
+            ndjson_path.write_text(
+                "\n".join(json.dumps(booking) for booking in MOCK_PMS_BOOKINGS) + "\n"
+            )
+
+            for path in (json_path, ndjson_path):
+                with self.subTest(path=path.name):
+                    datasource = self.datasource_class.from_fixture(path)
+                    self.assertEqual(list(datasource.all()), MOCK_PMS_BOOKINGS)
+
+    def test_process_wide_datasource_from_settings(self):
+        """Test that PMS_FIXTURE_PATH selects the served dataset"""
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as fixture:
+            json.dump(MOCK_PMS_BOOKINGS[:3], fixture)
+            fixture.flush()
+
+            reset_booking_datasource()
+            self.addCleanup(reset_booking_datasource)
+            with override_settings(PMS_FIXTURE_PATH=fixture.name):
+                self.assertEqual(len(get_booking_datasource()), 3)
+
+    def test_compact_datasource_from_settings(self):
+        """Test that PMS_COMPACT_STORE holds the bookings as columns"""
+        reset_booking_datasource()
+        self.addCleanup(reset_booking_datasource)
+        with override_settings(PMS_COMPACT_STORE=True):
+            datasource = get_booking_datasource()
+
+        self.assertIsInstance(datasource, CompactBookingDataSource)
+        self.assertEqual(list(datasource.all()), MOCK_PMS_BOOKINGS)
+
+    def test_compact_datasource_falls_back_to_dicts(self):
+        """Test that bookings the columns cannot hold are kept as dicts"""
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as fixture:
+            json.dump([{**MOCK_PMS_BOOKINGS[0], "channel": "web"}], fixture)
+            fixture.flush()
+
+            reset_booking_datasource()
+            self.addCleanup(reset_booking_datasource)
+            with override_settings(
+                PMS_FIXTURE_PATH=fixture.name, PMS_COMPACT_STORE=True
+            ):
+                with self.assertLogs("integrations.pms.datasource", "WARNING"):
+                    datasource = get_booking_datasource()
+
+        self.assertIsInstance(datasource, BookingDataSource)
+        self.assertEqual(datasource.get("1001")["channel"], "web")
+
+
+class CompactBookingDataSourceTestCase(BookingDataSourceTestCase):
+    """Test cases for the data source backed by a compact booking store"""
+
+    datasource_class = CompactBookingDataSource
+
+    def test_list_reads_return_stores(self):
+        """Test that list reads skip building a dict per booking"""
+        cancelled = self.datasource.query(booking_status="cancelled")
+
+        self.assertIs(self.datasource.all(), self.datasource.store)
+        self.assertIsInstance(cancelled, CompactBookingStore)
+        self.assertEqual(
+            map_bookings(cancelled), map_bookings(MOCK_PMS_BOOKINGS[2:8:5])
+        )
@@ -0,0 +1,135 @@
+import json
+from unittest import TestCase
+from unittest.mock import AsyncMock, patch
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from integrations.base.exceptions import ExternalAPIResponseError
+from integrations.pms.export import aiter_export, iter_export
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.serializers import map_bookings
+
+
+class IterExportTestCase(TestCase):
+    """Test cases for the export generator pipeline"""
+
+    def test_ndjson_chunks(self):
+        """Test one booking per line, split into chunks"""
+        chunks = list(iter_export(MOCK_PMS_BOOKINGS, "ndjson", chunk_size=4))
+
+        self.assertEqual(len(chunks), 3)
+        lines = "".join(chunks).splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines], map_bookings(MOCK_PMS_BOOKINGS)
+        )
+
+    def test_json_array(self):
+        """Test that chunks join into one JSON array"""
+        chunks = list(iter_export(MOCK_PMS_BOOKINGS, "json", chunk_size=3))
+
+        self.assertEqual(json.loads("".join(chunks)), map_bookings(MOCK_PMS_BOOKINGS))
+        self.assertEqual(json.loads("".join(iter_export([], "json"))), [])
+
+    def test_chunks_are_mapped_as_they_are_consumed(self):
+        """Test that only the bookings of the chunks read so far are mapped"""
+        consumed = []
+
+        def raw_bookings():
+            for raw_booking in MOCK_PMS_BOOKINGS:
+                consumed.append(raw_booking["id"])
+                yield raw_booking
+
+        async def first_chunk():
+            return await anext(aiter_export(raw_bookings(), chunk_size=4))
+
+        next(iter_export(raw_bookings(), chunk_size=4))
+        self.assertEqual(len(consumed), 4)
+        consumed.clear()
+        chunk = async_to_sync(first_chunk)()
+
+        self.assertEqual(len(consumed), 4)
+        self.assertEqual(len(chunk.splitlines()), 4)
+
+    def test_invalid_bookings_are_skipped(self):
+        """Test that invalid bookings are left out of the export"""
+        invalid_booking = {**MOCK_PMS_BOOKINGS[1], "booking_status": "unknown"}
+
+        with self.assertLogs("integrations.pms.export", level="WARNING"):
+            lines = "".join(
+                iter_export([MOCK_PMS_BOOKINGS[0], invalid_booking])
+            ).splitlines()
+
+        self.assertEqual(len(lines), 1)
+
+
+class BookingExportAPIViewTestCase(APITestCase):
+    """Test cases for BookingExportAPIView"""
+
+    def setUp(self):
+        self.url = reverse("booking_export")
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_export_ndjson(self, mock_pms_client):
+        """Test streaming the bookings as NDJSON"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(json.loads(lines[0])["booking_id"], "1001")
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_export_json(self, mock_pms_client):
+        """Test streaming the bookings as a JSON array"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        response = self.client.get(self.url, {"type": "json"})
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        bookings = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(bookings, map_bookings(MOCK_PMS_BOOKINGS))
+
+    def test_unsupported_type(self):
+        """Test that unknown export types are rejected"""
+        response = self.client.get(self.url, {"type": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_export_upstream_failure(self, mock_pms_client):
+        """Test that PMS failures before streaming return 502"""
+        mock_pms_client.return_value.fetch_bookings.side_effect = (
+            ExternalAPIResponseError(
+                status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure"
+            )
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_502_BAD_GATEWAY)
+
+
+class AsyncBookingExportAPIViewTestCase(APITestCase):
+    """Test cases for AsyncBookingExportAPIView"""
+
+    @patch("integrations.pms.views.AsyncPMSClient")
+    async def test_export_ndjson(self, mock_pms_client):
+        """Test streaming the bookings through an async iterator"""
+        mock_pms_client.return_value.fetch_bookings = AsyncMock(
+            return_value=MOCK_PMS_BOOKINGS
+        )
+
+        response = await AsyncClient().get(reverse("async_booking_export"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.splitlines()), len(MOCK_PMS_BOOKINGS))
@@ -0,0 +1,154 @@
+import time
+from unittest import TestCase
+
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+
+from integrations.base.circuit_breaker import reset_circuit_breakers
+from integrations.base.conditional import upstream_etags
+from integrations.base.exceptions import (
+    ExternalAPINotFound,
+    ExternalAPIResponseError,
+    ExternalAPITimeoutError,
+)
+from integrations.base.retry import reset_retry_budgets
+from integrations.pms.clients import AsyncPMSClient, PMSClient
+from integrations.pms.fake_server import (
+    FakePMSServer,
+    FaultProfile,
+    RequestPlan,
+    generate_bookings,
+)
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.serializers import map_bookings
+
+NO_RETRY = {"MAX_ATTEMPTS": 1}
+
+
+class FaultProfileTestCase(TestCase):
+    """Test cases for the fake PMS latency and fault plans"""
+
+    def test_plans_are_reproducible(self):
+        """Test that a seed fixes every request's plan"""
+        profile = FaultProfile(seed=7, latency_ms=100, latency_sigma=0.5)
+
+        plans = [profile.plan(n) for n in range(50)]
+
+        self.assertEqual(plans, [profile.plan(n) for n in range(50)])
+        self.assertNotEqual(plans, [FaultProfile(seed=8).plan(n) for n in range(50)])
+
+    def test_fault_rates(self):
+        """Test fault frequencies and constant latency without sigma"""
+        profile = FaultProfile(
+            latency_ms=20, error_rate=0.2, slow_body_rate=0.1, timeout_rate=0.1
+        )
+
+        plans = [profile.plan(n) for n in range(2000)]
+
+        self.assertTrue(all(plan.latency == 0.02 for plan in plans))
+        for fault, rate in (("error", 0.2), ("slow_body", 0.1), ("timeout", 0.1)):
+            share = sum(plan.fault == fault for plan in plans) / len(plans)
+            self.assertAlmostEqual(share, rate, delta=0.03)
+        self.assertEqual(FaultProfile().plan(0), RequestPlan(0.0))
+
+    def test_generated_bookings(self):
+        """Test that generated datasets are seeded and valid"""
+        bookings = generate_bookings(500, seed=1)
+
+        self.assertEqual(bookings, generate_bookings(500, seed=1))
+        self.assertEqual(len({b["id"] for b in bookings}), 500)
+        self.assertIsNotNone(map_bookings(bookings))
+
+
+class FakePMSServerTestCase(TestCase):
+    """Test cases for the PMS clients over HTTP against the fake PMS"""
+
+    def setUp(self):
+        reset_circuit_breakers()
+        reset_retry_budgets()
+        upstream_etags.clear()
+
+    def serve(self, profile=None, **kwargs):
+        server = FakePMSServer(profile=profile, **kwargs).start()
+        self.addCleanup(server.stop)
+        settings = override_settings(
+            PMS_USE_HTTP=True, PMS_API_URL=f"{server.url}/api", HTTP_RETRY=NO_RETRY
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        return server
+
+    def test_list_and_detail(self):
+        """Test list filters, detail lookups and not found over HTTP"""
+        server = self.serve()
+        client = PMSClient()
+
+        self.assertEqual(client.fetch_bookings(), MOCK_PMS_BOOKINGS)
+        self.assertEqual(
+            client.fetch_bookings({"room": "107"}),
+            [b for b in MOCK_PMS_BOOKINGS if b["room"] == "107"],
+        )
+        self.assertEqual(client.fetch_booking_by_id("1002"), MOCK_PMS_BOOKINGS[1])
+        with self.assertRaisesRegex(ExternalAPINotFound, "'9999' not found"):
+            client.fetch_booking_by_id("9999")
+        self.assertEqual(server.requests, 4)
+
+    def test_etag_revalidation(self):
+        """Test that unchanged responses are revalidated with a 304"""
+        self.serve()
+        client = PMSClient()
+
+        first = client.fetch_bookings()
+
+        self.assertEqual(client.fetch_bookings(), first)
+        self.assertEqual(upstream_etags.stats()["hits"], 1)
+
+    def test_async_client(self):
+        """Test the async client over HTTP"""
+        self.serve(bookings=generate_bookings(30))
+
+        booking = async_to_sync(AsyncPMSClient().fetch_booking_by_id)("1010")
+
+        self.assertEqual(booking["id"], "1010")
+
+    def test_error_mode(self):
+        """Test that error responses map to ExternalAPIResponseError"""
+        self.serve(FaultProfile(error_rate=1.0, error_status=503))
+
+        with self.assertRaises(ExternalAPIResponseError) as context:
+            PMSClient().fetch_bookings()
+
+        self.assertEqual(context.exception.status_code, 503)
+
+    def test_timeout_mode(self):
+        """Test that a hanging PMS hits the client timeout"""
+        self.serve(FaultProfile(timeout_rate=1.0, timeout_seconds=5.0))
+
+        started = time.monotonic()
+        with self.assertRaises(ExternalAPITimeoutError):
+            PMSClient(timeout=0.2).fetch_bookings()
+
+        self.assertLess(time.monotonic() - started, 2.0)
+
+    def test_retry_deadline_caps_attempt_timeout(self):
+        """Test that a hanging PMS fails at the retry deadline, not the timeout"""
+        self.serve(FaultProfile(timeout_rate=1.0, timeout_seconds=5.0))
+
+        started = time.monotonic()
+        with override_settings(HTTP_RETRY={"MAX_ATTEMPTS": 3, "DEADLINE": 0.3}):
+            with self.assertRaises(ExternalAPITimeoutError):
+                PMSClient(timeout=3.0).fetch_bookings()
+
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_slow_body_and_latency(self):
+        """Test that latency and a trickled body delay a complete answer"""
+        self.serve(
+            FaultProfile(latency_ms=100, slow_body_rate=1.0, slow_body_seconds=0.2)
+        )
+
+        started = time.monotonic()
+        bookings = PMSClient().fetch_bookings()
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+        self.assertEqual(bookings, MOCK_PMS_BOOKINGS)
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from integrations.base.exceptions import ExternalAPIResponseError
+from integrations.pms.fanout import (
+    AsyncMultiPropertyPMSClient,
+    MultiPropertyPMSClient,
+    PropertyResult,
+    merge_property_bookings,
+)
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.properties import PMSProperty
+
+PROPERTIES = {
+    "paris": {"URL": "https://paris.pms.test"},
+    "rome": {"URL": "https://rome.pms.test"},
+    "oslo": {"URL": "https://oslo.pms.test", "TIMEOUT": 0.05},
+}
+
+# Simulated latency (seconds) and failures per property URL.
+LATENCY = {
+    "https://paris.pms.test": 0.2,
+    "https://rome.pms.test": 0.2,
+    "https://oslo.pms.test": 1.0,
+    "https://lyon.pms.test": 0.02,
+}
+FAILING = {"https://rome.pms.test"}
+
+
+def outcome(url):
+    if url in FAILING:
+        raise ExternalAPIResponseError(
+            status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure."
+        )
+    return MOCK_PMS_BOOKINGS[:2]
+
+
+class FakePMSClient:
+    def __init__(self, url):
+        self.url = url
+
+    @classmethod
+    def for_property(cls, pms_property):
+        return cls(pms_property.url)
+
+    def fetch_bookings(self, params=None):
+        time.sleep(LATENCY[self.url])
+        return outcome(self.url)
+
+
+class FakeAsyncPMSClient(FakePMSClient):
+    async def fetch_bookings(self, params=None):
+        await asyncio.sleep(LATENCY[self.url])
+        return outcome(self.url)
+
+
+def pms_properties():
+    return [
+        PMSProperty(property_id, config["URL"], config.get("TIMEOUT", 5.0))
+        for property_id, config in PROPERTIES.items()
+    ]
+
+
+class MultiPropertyPMSClientTestCase(TestCase):
+    """Test cases for the multi-property fan-out clients"""
+
+    def assert_partial_results(self, results, elapsed):
+        self.assertEqual(
+            [(r.property_id, r.status) for r in results],
+            [("paris", "ok"), ("rome", "error"), ("oslo", "timeout")],
+        )
+        self.assertIn("Simulated PMS API failure", results[1].error)
+        # Concurrent: about the slowest healthy property, not the sum.
+        self.assertLess(elapsed, 0.35)
+
+    @patch.object(MultiPropertyPMSClient, "client_class", FakePMSClient)
+    def test_threaded_fan_out(self):
+        """Test partial results and latency of the thread pool fan-out"""
+        started = time.monotonic()
+        results = MultiPropertyPMSClient(pms_properties()).fetch_bookings()
+
+        self.assert_partial_results(results, time.monotonic() - started)
+
+    @patch.object(AsyncMultiPropertyPMSClient, "client_class", FakeAsyncPMSClient)
+    def test_async_fan_out(self):
+        """Test partial results and latency of the asyncio fan-out"""
+        client = AsyncMultiPropertyPMSClient(pms_properties())
+
+        started = time.monotonic()
+        results = async_to_sync(client.fetch_bookings)()
+
+        self.assert_partial_results(results, time.monotonic() - started)
+
+    @patch.object(AsyncMultiPropertyPMSClient, "client_class", FakeAsyncPMSClient)
+    def test_concurrency_is_bounded(self):
+        """Test that at most max_concurrency properties are queried at once"""
+        healthy = [p for p in pms_properties() if p.property_id == "paris"] * 3
+        client = AsyncMultiPropertyPMSClient(healthy, max_concurrency=1)
+
+        started = time.monotonic()
+        async_to_sync(client.fetch_bookings)()
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.6)
+
+    def test_elapsed_is_timed_per_property(self):
+        """Test that a fast property is not timed by a slower one before it"""
+        properties = [
+            *pms_properties()[:1],
+            PMSProperty("lyon", "https://lyon.pms.test", 5.0),
+        ]
+
+        with patch.object(MultiPropertyPMSClient, "client_class", FakePMSClient):
+            threaded = MultiPropertyPMSClient(properties).fetch_bookings()
+        with patch.object(
+            AsyncMultiPropertyPMSClient, "client_class", FakeAsyncPMSClient
+        ):
+            awaited = async_to_sync(
+                AsyncMultiPropertyPMSClient(properties).fetch_bookings
+            )()
+
+        for paris, lyon in (threaded, awaited):
+            self.assertGreaterEqual(paris.elapsed, 0.2)
+            self.assertLess(lyon.elapsed, 0.15)
+
+    def test_merge_tags_and_reports_invalid(self):
+        """Test property tags and per-property validation errors"""
+        bookings, summaries = merge_property_bookings(
+            [
+                PropertyResult("paris", "ok", bookings=MOCK_PMS_BOOKINGS[:2]),
+                PropertyResult(
+                    "rome",
+                    "ok",
+                    bookings=[{**MOCK_PMS_BOOKINGS[0], "check_in_date": "soon"}],
+                ),
+            ]
+        )
+
+        self.assertEqual([b["property_id"] for b in bookings], ["paris", "paris"])
+        self.assertEqual(summaries[0]["count"], 2)
+        self.assertEqual(summaries[1]["status"], "invalid")
+        self.assertIn("check_in", summaries[1]["errors"][0])
+
+
+@override_settings(PMS_PROPERTIES=PROPERTIES)
+class PropertyBookingsAPIViewTestCase(APITestCase):
+    """Test cases for the multi-property booking endpoints"""
+
+    def setUp(self):
+        cache.clear()
+
+    @patch.object(MultiPropertyPMSClient, "client_class", FakePMSClient)
+    def test_partial_results(self):
+        """Test that failing properties do not fail the response"""
+        response = self.client.get(
+            reverse("property_bookings"), {"ordering": "-booking_id"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [b["booking_id"] for b in response.data["bookings"]], ["1002", "1001"]
+        )
+        self.assertEqual(
+            [p["status"] for p in response.data["properties"]],
+            ["ok", "error", "timeout"],
+        )
+
+    @patch.object(AsyncMultiPropertyPMSClient, "client_class", FakeAsyncPMSClient)
+    def test_async_all_failed(self):
+        """Test 502 when no selected property answers"""
+        response = self.client.get(
+            reverse("async_property_bookings"), {"properties": "rome,oslo"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_502_BAD_GATEWAY)
+        self.assertEqual(len(response.data["properties"]), 2)
+
+    def test_unknown_property(self):
+        """Test that unknown property IDs are rejected"""
+        response = self.client.get(
+            reverse("property_bookings"), {"properties": "paris,lisbon"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("lisbon", response.data["properties"][0])
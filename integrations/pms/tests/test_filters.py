@@ -0,0 +1,217 @@
+import base64
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+
+from integrations.pms.filters import BookingFilter, BookingOrdering
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.serializers import map_booking_store, map_bookings
+from integrations.pms.store import CompactBookingStore
+
+CURSOR_PAGINATION = "integrations.pms.pagination.BookingCursorPagination"
+
+
+def booking_ids(bookings):
+    return [booking["booking_id"] for booking in bookings]
+
+
+class BookingFilterTestCase(TestCase):
+    """Test cases for BookingFilter and BookingOrdering"""
+
+    def setUp(self):
+        self.bookings = map_bookings(MOCK_PMS_BOOKINGS)
+
+    def apply(self, query):
+        return BookingFilter(QueryDict(query)).apply(self.bookings)
+
+    def test_upstream_params(self):
+        """Test that status and room are pushed down as PMS params"""
+        booking_filter = BookingFilter(
+            QueryDict("status=confirmed&room_number=107&amount_min=100")
+        )
+
+        self.assertEqual(
+            booking_filter.upstream_params(),
+            {"booking_status": "confirmed", "room": "107"},
+        )
+
+    def test_date_ranges_are_inclusive(self):
+        """Test check-in and check-out ranges"""
+        self.assertEqual(
+            booking_ids(
+                self.apply("check_in_after=2025-06-05&check_in_before=2025-06-08")
+            ),
+            ["1004", "1007", "1008"],
+        )
+        self.assertEqual(
+            booking_ids(self.apply("check_out_before=2025-06-04")), ["1003", "1005"]
+        )
+
+    def test_amount_range(self):
+        """Test amount bounds"""
+        self.assertEqual(
+            booking_ids(self.apply("amount_min=700&amount_max=900")),
+            ["1001", "1002", "1006"],
+        )
+
+    def test_store_rows_match_in_memory_filters(self):
+        """Test that stores are narrowed to exactly the filtered bookings"""
+        store = CompactBookingStore.from_bookings(MOCK_PMS_BOOKINGS)
+        for query in (
+            "check_in_after=2025-06-05&check_in_before=2025-06-08",
+            "check_out_before=2025-06-04&amount_min=500",
+            "amount_min=700&amount_max=900",
+            "amount_max=0",
+        ):
+            with self.subTest(query=query):
+                booking_filter = BookingFilter(QueryDict(query))
+                rows = booking_filter.store_rows(store)
+
+                self.assertEqual(
+                    map_booking_store(store, rows), booking_filter.apply(self.bookings)
+                )
+        self.assertIsNone(BookingFilter(QueryDict("status=pending")).store_rows(store))
+
+    def test_filters_are_rechecked_in_memory(self):
+        """Test that pushed-down filters also apply to the upstream result"""
+        self.assertEqual(booking_ids(self.apply("status=cancelled")), ["1003", "1008"])
+
+    def test_ordering(self):
+        """Test single and multi-field ordering"""
+        self.assertEqual(
+            booking_ids(self.apply("ordering=-amount"))[:2], ["1007", "1004"]
+        )
+        self.assertEqual(
+            booking_ids(self.apply("ordering=check_in,-amount"))[:3],
+            ["1001", "1005", "1002"],
+        )
+
+    def test_invalid_params_raise(self):
+        """Test that invalid filters and ordering are rejected"""
+        for query in ("status=unknown", "check_in_after=tomorrow", "ordering=guest"):
+            with self.subTest(query=query):
+                with self.assertRaises(ValidationError):
+                    BookingFilter(QueryDict(query))
+
+    def test_ordering_position_compare(self):
+        """Test that positions compare in the sort order, missing values last"""
+        ordering = BookingOrdering.parse("-amount")
+        key = ordering.position_key
+
+        self.assertLess(key([900.0, "1"]), key([100.0, "2"]))
+        self.assertLess(key([None, "1"]), key([100.0, "2"]))
+        self.assertLess(key([100.0, "1"]), key([100.0, "2"]))
+
+
+class BookingListFilteringAPITestCase(APITestCase):
+    """Test cases for filtering, ordering and pagination on the list views"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("booking_list")
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_filters_pushed_down_to_pms(self, mock_pms_client):
+        """Test that the PMS is asked for the filtered list only"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_bookings.return_value = [
+            b for b in MOCK_PMS_BOOKINGS if b["booking_status"] == "pending"
+        ]
+
+        response = self.client.get(
+            self.url, {"status": "pending", "ordering": "-amount"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_client_instance.fetch_bookings.assert_called_once_with(
+            {"booking_status": "pending"}
+        )
+        self.assertEqual(
+            booking_ids(response.data["results"]), ["1002", "1009", "1005"]
+        )
+
+    def test_invalid_filter_returns_400(self):
+        """Test that invalid query params are reported"""
+        response = self.client.get(self.url, {"amount_min": "cheap"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("amount_min", response.data)
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_page_number_pagination(self, mock_pms_client):
+        """Test page-number pagination with the configured page size"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        with patch("rest_framework.pagination.PageNumberPagination.page_size", 4):
+            response = self.client.get(self.url, {"page": 3})
+
+        self.assertEqual(response.data["count"], len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(booking_ids(response.data["results"]), ["1009", "1010"])
+        self.assertIsNone(response.data["next"])
+
+    @override_settings(PMS_PAGINATION_CLASS=CURSOR_PAGINATION)
+    @patch("integrations.pms.pagination.BookingCursorPagination.page_size", 4)
+    @patch("integrations.pms.views.PMSClient")
+    def test_cursor_pagination(self, mock_pms_client):
+        """Test walking forwards and back through cursor pages"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        pages = []
+        url = f"{self.url}?ordering=-amount"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(booking_ids(response.data["results"]))
+            url = response.data["next"]
+
+        expected = booking_ids(
+            BookingOrdering.parse("-amount").sort(map_bookings(MOCK_PMS_BOOKINGS))
+        )
+        self.assertEqual(pages, [expected[0:4], expected[4:8], expected[8:]])
+
+        previous = self.client.get(response.data["previous"])
+        self.assertEqual(booking_ids(previous.data["results"]), expected[4:8])
+
+    @override_settings(PMS_PAGINATION_CLASS=CURSOR_PAGINATION)
+    @patch("integrations.pms.views.PMSClient")
+    def test_invalid_cursor_returns_404(self, mock_pms_client):
+        """Test that a malformed cursor is rejected"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(PMS_PAGINATION_CLASS=CURSOR_PAGINATION)
+    @patch("integrations.pms.views.PMSClient")
+    def test_mistyped_cursor_position_returns_404(self, mock_pms_client):
+        """Test that cursor values of the wrong type are rejected, not compared"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        for ordering, position in (
+            ("booking_id", [1001]),
+            ("-amount", ["cheap", "1001"]),
+            ("-amount", [True, "1001"]),
+            ("room_number", [["107"], "1001"]),
+        ):
+            with self.subTest(ordering=ordering, position=position):
+                cursor = base64.urlsafe_b64encode(json.dumps({"p": position}).encode())
+                response = self.client.get(
+                    self.url, {"ordering": ordering, "cursor": cursor.decode()}
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        cursor = base64.urlsafe_b64encode(json.dumps({"p": [None, "1001"]}).encode())
+        response = self.client.get(
+            self.url, {"ordering": "-amount", "cursor": cursor.decode()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
@@ -33,6 +34,7 @@ class IntegrationTestCase(APITestCase):
     """Integration tests that test the full flow without mocking"""
 
     def setUp(self):
+        cache.clear()
         self.list_url = reverse("booking_list")
         self.detail_url = reverse("booking_detail", kwargs={"booking_id": "1001"})
 
@@ -53,7 +55,7 @@ class IntegrationTestCase(APITestCase):
                 )
 
                 if response.status_code == status.HTTP_200_OK:
-                    self.assertEqual(len(response.data), len(MOCK_PMS_BOOKINGS))
+                    self.assertEqual(response.data["count"], len(MOCK_PMS_BOOKINGS))
                 else:
                     self.assertIn("error", response.data)
 
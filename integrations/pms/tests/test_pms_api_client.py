@@ -1,13 +1,16 @@
 from unittest.mock import patch
 
+from asgiref.sync import async_to_sync
 from django.test import TestCase
 from rest_framework import status
 
+from integrations.base.circuit_breaker import reset_circuit_breakers
 from integrations.base.exceptions import (
     ExternalAPINotFound,
     ExternalAPIResponseError,
 )
-from integrations.pms.clients import PMSClient
+from integrations.base.retry import reset_retry_budgets
+from integrations.pms.clients import AsyncPMSClient, PMSClient
 from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
 
 
@@ -15,6 +18,8 @@ class PMSClientTestCase(TestCase):
     """Test cases for PMSClient class"""
 
     def setUp(self):
+        reset_circuit_breakers()
+        reset_retry_budgets()
         self.client = PMSClient()
 
     @patch("integrations.pms.clients.time.sleep")
@@ -43,6 +48,17 @@ class PMSClientTestCase(TestCase):
         self.assertEqual(context.exception.status_code, status.HTTP_502_BAD_GATEWAY)
         self.assertIn("Simulated PMS API failure", str(context.exception))
 
+    @patch("integrations.pms.clients.time.sleep")
+    @patch("integrations.pms.clients.random.random")
+    def test_fetch_bookings_retried_after_failure(self, mock_random, mock_sleep):
+        """Test that a simulated failure is retried transparently"""
+        mock_random.side_effect = [0.1, 0.5]  # Fail once, then succeed
+
+        bookings = self.client.fetch_bookings()
+
+        self.assertEqual(bookings, MOCK_PMS_BOOKINGS)
+        self.assertEqual(mock_random.call_count, 2)
+
     @patch("integrations.pms.clients.time.sleep")
     @patch("integrations.pms.clients.random.random")
     def test_fetch_booking_by_id_success(self, mock_random, mock_sleep):
@@ -108,3 +124,43 @@ class PMSClientTestCase(TestCase):
         with patch("integrations.pms.clients.random.random", return_value=0.5):
             # Should not raise an exception
             self.client._maybe_fail(failure_rate=0.2)
+
+
+class AsyncPMSClientTestCase(TestCase):
+    """Test cases for AsyncPMSClient class"""
+
+    def setUp(self):
+        reset_circuit_breakers()
+        reset_retry_budgets()
+        self.client = AsyncPMSClient()
+
+    @patch("integrations.pms.clients.asyncio.sleep")
+    @patch("integrations.pms.clients.random.random")
+    def test_fetch_bookings_success(self, mock_random, mock_sleep):
+        """Test successful fetching of all bookings"""
+        mock_random.return_value = 0.5  # Above failure rate of 0.2
+
+        bookings = async_to_sync(self.client.fetch_bookings)()
+
+        self.assertEqual(bookings, MOCK_PMS_BOOKINGS)
+        mock_sleep.assert_awaited_once()
+
+    @patch("integrations.pms.clients.asyncio.sleep")
+    @patch("integrations.pms.clients.random.random")
+    def test_fetch_booking_by_id_not_found(self, mock_random, mock_sleep):
+        """Test fetching non-existent booking by ID"""
+        mock_random.return_value = 0.5  # Above failure rate
+
+        with self.assertRaises(ExternalAPINotFound):
+            async_to_sync(self.client.fetch_booking_by_id)("9999")
+
+    @patch("integrations.pms.clients.asyncio.sleep")
+    @patch("integrations.pms.clients.random.random")
+    def test_fetch_booking_by_id_simulated_failure(self, mock_random, mock_sleep):
+        """Test simulated API failure when fetching booking by ID"""
+        mock_random.return_value = 0.1  # Below failure rate
+
+        with self.assertRaises(ExternalAPIResponseError) as context:
+            async_to_sync(self.client.fetch_booking_by_id)("1001")
+
+        self.assertEqual(context.exception.status_code, status.HTTP_502_BAD_GATEWAY)
@@ -0,0 +1,182 @@
+import random
+import time
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from integrations.base.exceptions import ExternalAPIResponseError
+from integrations.pms import prefetch
+from integrations.pms.cache import CachedPMSClient
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.prefetch import (
+    PrefetchScheduler,
+    get_hot_booking_tracker,
+    hot_booking_ids,
+    reset_prefetch,
+)
+
+PMS_FAILURE = ExternalAPIResponseError(
+    status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure."
+)
+BOOKINGS_BY_ID = {booking["id"]: booking for booking in MOCK_PMS_BOOKINGS}
+
+
+class HotBookingTrackerTestCase(TestCase):
+    """Test cases for booking hotness tracking"""
+
+    def setUp(self):
+        cache.clear()
+        reset_prefetch()
+        self.addCleanup(reset_prefetch)
+
+    @override_settings(PMS_PREFETCH={"HOT_BOOKINGS": 2})
+    def test_top_bookings(self):
+        """Test that the most requested bookings rank first"""
+        tracker = get_hot_booking_tracker()
+        for booking_id, requests in (("1001", 5), ("1002", 1), ("1003", 9)):
+            for _ in range(requests):
+                tracker.record(booking_id)
+
+        tracker.publish()
+
+        self.assertEqual(tracker.top(2), ["1003", "1001"])
+        self.assertEqual(hot_booking_ids(2), ["1003", "1001"])
+
+    @override_settings(PMS_PREFETCH={"HOT_BOOKINGS": 1})
+    def test_candidates_are_bounded(self):
+        """Test that cold bookings are evicted by hotter ones"""
+        tracker = get_hot_booking_tracker()
+        for n in range(10):
+            tracker.record(str(n))
+        for _ in range(3):
+            tracker.record("hot")
+
+        self.assertEqual(len(tracker.top(100)), tracker.capacity)
+        self.assertEqual(tracker.top(1), ["hot"])
+
+    def test_stale_publishers_are_forgotten(self):
+        """Test that snapshots of stopped processes drop out"""
+        tracker = get_hot_booking_tracker()
+        tracker.record("1001")
+        tracker.publish()
+        cache.set("pms:hot:members", ["gone:1", tracker.token], None)
+
+        self.assertEqual(hot_booking_ids(10), ["1001"])
+        self.assertEqual(cache.get("pms:hot:members"), [tracker.token])
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_detail_view_records_found_bookings(self, mock_pms_client):
+        """Test that only bookings that were found count"""
+        mock_pms_client.return_value.fetch_booking_by_id.return_value = (
+            MOCK_PMS_BOOKINGS[0]
+        )
+        self.client.get(reverse("booking_detail", args=[1001]))
+        self.client.get(reverse("booking_detail", args=[1001]))
+        mock_pms_client.return_value.fetch_booking_by_id.side_effect = PMS_FAILURE
+        self.client.get(reverse("booking_detail", args=[1002]))
+
+        self.assertEqual(get_hot_booking_tracker().top(10), ["1001"])
+
+
+class PrefetchSchedulerTestCase(TestCase):
+    """Test cases for the prefetch scheduler"""
+
+    def setUp(self):
+        cache.clear()
+        reset_prefetch()
+        self.addCleanup(reset_prefetch)
+        self.pms_client = Mock()
+        self.pms_client.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+        self.pms_client.fetch_booking_by_id.side_effect = BOOKINGS_BY_ID.get
+        self.scheduler = PrefetchScheduler(
+            CachedPMSClient(self.pms_client), random.Random(0), INTERVAL=10.0
+        )
+        tracker = get_hot_booking_tracker()
+        for booking_id in ("1001", "1002", "1002"):
+            tracker.record(booking_id)
+
+    def test_warms_list_and_hot_bookings(self):
+        """Test that a tick caches the list and hot bookings, once"""
+        first = self.scheduler.run_once()
+        second = self.scheduler.run_once()
+
+        self.assertEqual(first, {"refreshed": 3, "skipped": 0, "failed": 0})
+        self.assertEqual(second, {"refreshed": 0, "skipped": 3, "failed": 0})
+        self.assertEqual(cache.get("pms:booking:1002")["value"], MOCK_PMS_BOOKINGS[1])
+        self.assertEqual(self.pms_client.fetch_bookings.call_count, 1)
+
+    def test_refreshes_entries_due_before_next_tick(self):
+        """Test that entries are refreshed ahead of the refresh threshold"""
+        self.scheduler.run_once()
+
+        # Due at 80% of the 30s list TTL, so within the next 12s tick at 12s.
+        entry = cache.get("pms:bookings")
+        cache.set("pms:bookings", {**entry, "fetched_at": entry["fetched_at"] - 12.5})
+        stats = self.scheduler.run_once()
+
+        self.assertEqual(stats["refreshed"], 1)
+        self.assertEqual(self.pms_client.fetch_bookings.call_count, 2)
+
+    def test_backoff_while_pms_fails(self):
+        """Test jittered intervals that back off while the PMS fails"""
+        self.pms_client.fetch_bookings.side_effect = PMS_FAILURE
+        self.pms_client.fetch_booking_by_id.side_effect = PMS_FAILURE
+        delays = [self.scheduler.next_delay()]
+
+        with self.assertLogs("integrations.pms.prefetch", "WARNING") as logs:
+            for _ in range(8):
+                self.assertEqual(self.scheduler.run_once()["failed"], 3)
+                delays.append(self.scheduler.next_delay())
+        self.pms_client.fetch_bookings.side_effect = None
+        self.pms_client.fetch_booking_by_id.side_effect = BOOKINGS_BY_ID.get
+        self.scheduler.run_once()
+
+        self.assertEqual(len(logs.records), 24)
+        self.assertTrue(8 <= delays[0] <= 12)
+        self.assertTrue(16 <= delays[1] <= 24)
+        self.assertTrue(240 <= delays[-1] <= 360)
+        self.assertEqual(self.scheduler.failing_ticks, 0)
+
+    def test_management_command(self):
+        """Test a single tick from the management command"""
+        out = StringIO()
+        with patch("integrations.pms.prefetch.PMSClient", return_value=self.pms_client):
+            call_command("run_pms_prefetch", "--once", stdout=out)
+
+        self.assertIn("Prefetched 3 entries", out.getvalue())
+
+
+@override_settings(PMS_PREFETCH={"IN_PROCESS": True, "INTERVAL": 60.0})
+class InProcessPrefetchTestCase(APITestCase):
+    """Test cases for the scheduler started by web workers"""
+
+    def setUp(self):
+        cache.clear()
+        reset_prefetch()
+        self.addCleanup(reset_prefetch)
+
+    @patch("integrations.pms.prefetch.PrefetchScheduler.run_once")
+    @patch("integrations.pms.views.PMSClient")
+    def test_started_on_first_detail_request(self, mock_pms_client, run_once):
+        """Test that the first recorded request starts the scheduler"""
+        mock_pms_client.return_value.fetch_booking_by_id.return_value = (
+            MOCK_PMS_BOOKINGS[0]
+        )
+
+        response = self.client.get(reverse("booking_detail", args=[1001]))
+
+        scheduler = prefetch.start_in_process_scheduler()
+        for _ in range(100):
+            if run_once.called:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(scheduler)
+        run_once.assert_called_once()
@@ -46,3 +46,86 @@ class SerializerTestCase(TestCase):
 
             serializer = BookingSerializer(sample_booking)
             self.assertEqual(serializer.data["status"], status_value)
+
+
+def serializer_round_trip(raw_booking):
+    """Map and validate a booking the way the views did before map_booking."""
+    from integrations.pms.serializers import BookingSerializer
+
+    serializer = BookingSerializer(data=BookingSerializer(raw_booking).data)
+    if not serializer.is_valid():
+        return None
+    return serializer.data
+
+
+class MapBookingTestCase(TestCase):
+    """Test cases for the one-pass booking mapping"""
+
+    def assertMatchesSerializer(self, raw_booking):
+        from integrations.pms.serializers import map_booking
+
+        expected = serializer_round_trip(raw_booking)
+        mapped = map_booking(raw_booking)
+        self.assertEqual(mapped, expected)
+        if expected is not None:
+            self.assertEqual(list(mapped), list(expected))
+
+    def test_mock_bookings_match_serializer(self):
+        """Test that every mock booking maps exactly like the serializer"""
+        for raw_booking in MOCK_PMS_BOOKINGS:
+            self.assertMatchesSerializer(raw_booking)
+
+    def test_coerced_values_match_serializer(self):
+        """Test whitespace, numeric ids, date objects and numeric strings"""
+        import datetime
+
+        sample_booking = MOCK_PMS_BOOKINGS[0]
+        for overrides in (
+            {"id": 1001},
+            {"guest": "  Alice Johnson  "},
+            {"check_in_date": datetime.date(2025, 6, 1)},
+            {"check_out_date": "20250605"},
+            {"total_price": "450.50"},
+            {"total_price": 450},
+            {"room": 101},
+        ):
+            with self.subTest(overrides=overrides):
+                self.assertMatchesSerializer({**sample_booking, **overrides})
+
+    def test_missing_optional_fields_are_omitted(self):
+        """Test that optional fields missing upstream are left out"""
+        from integrations.pms.serializers import map_booking
+
+        raw_booking = {
+            k: v
+            for k, v in MOCK_PMS_BOOKINGS[0].items()
+            if k not in ("room", "total_price")
+        }
+        mapped = map_booking(raw_booking)
+
+        self.assertNotIn("room_number", mapped)
+        self.assertNotIn("amount", mapped)
+        self.assertMatchesSerializer(raw_booking)
+
+    def test_invalid_bookings_need_serializer(self):
+        """Test that invalid bookings are left to the serializer"""
+        sample_booking = MOCK_PMS_BOOKINGS[0]
+        for overrides in (
+            {"guest": "   "},
+            {"guest": "Ali\x00ce"},
+            {"guest": None},
+            {"check_in_date": "2025-13-01"},
+            {"check_in_date": "not a date"},
+            {"booking_status": "unknown"},
+            {"room": None},
+        ):
+            with self.subTest(overrides=overrides):
+                self.assertMatchesSerializer({**sample_booking, **overrides})
+
+    def test_map_bookings_falls_back_on_any_invalid_booking(self):
+        """Test that one invalid booking sends the whole list to the serializer"""
+        from integrations.pms.serializers import map_bookings
+
+        self.assertEqual(len(map_bookings(MOCK_PMS_BOOKINGS)), len(MOCK_PMS_BOOKINGS))
+        invalid_booking = {**MOCK_PMS_BOOKINGS[1], "booking_status": "unknown"}
+        self.assertIsNone(map_bookings([MOCK_PMS_BOOKINGS[0], invalid_booking]))
@@ -0,0 +1,248 @@
+import json
+import mmap
+import os
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+
+from integrations.base.asgi import LifespanMiddleware
+from integrations.pms.cache import CachedPMSClient
+from integrations.pms.datasource import (
+    BookingDataSource,
+    CompactBookingDataSource,
+    get_booking_datasource,
+    get_booking_snapshot,
+    reset_booking_datasource,
+)
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.serializers import map_bookings
+from integrations.pms.snapshot import (
+    FORMAT_VERSION,
+    HEADER,
+    MAGIC,
+    load_snapshot,
+    write_snapshot,
+)
+from integrations.pms.store import CompactBookingStore
+
+
+class BookingSnapshotTestCase(TestCase):
+    """Test cases for memory-mapped booking snapshots"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "bookings.snapshot"
+        self.store = CompactBookingStore.from_bookings(MOCK_PMS_BOOKINGS)
+
+    def test_round_trip(self):
+        """Test that a loaded snapshot reads like the store it was written from"""
+        size = write_snapshot(self.store, self.path)
+        loaded = load_snapshot(self.path)
+
+        self.assertEqual(size, self.path.stat().st_size)
+        self.assertEqual(loaded.to_dicts(), MOCK_PMS_BOOKINGS)
+        self.assertEqual(loaded.get("1004"), MOCK_PMS_BOOKINGS[3])
+        self.assertEqual(
+            loaded.query(booking_status="cancelled"),
+            self.store.query(booking_status="cancelled"),
+        )
+        self.assertEqual(map_bookings(loaded), map_bookings(MOCK_PMS_BOOKINGS))
+
+    def test_columns_are_read_only_views_of_the_mapping(self):
+        """Test that columns are not copied out of the file"""
+        write_snapshot(self.store, self.path)
+        loaded = load_snapshot(self.path)
+
+        for column in (loaded.ids, loaded.check_in, loaded.total_price):
+            self.assertFalse(column.flags.writeable)
+            self.assertIsInstance(column.base.obj, mmap.mmap)
+
+    def test_rewrite_keeps_mapped_snapshot_readable(self):
+        """Test that replacing the file does not disturb earlier mappings"""
+        write_snapshot(self.store, self.path)
+        loaded = load_snapshot(self.path)
+
+        write_snapshot(
+            CompactBookingStore.from_bookings(MOCK_PMS_BOOKINGS[:2]), self.path
+        )
+
+        self.assertEqual(len(loaded), len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(len(load_snapshot(self.path)), 2)
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_rejects_invalid_files(self):
+        """Test that foreign, newer and truncated files are refused"""
+        write_snapshot(self.store, self.path)
+        content = self.path.read_bytes()
+        newer = HEADER.pack(MAGIC, FORMAT_VERSION + 1, 0)
+        count = f'"count": {len(MOCK_PMS_BOOKINGS)}, '.encode()
+        uncounted = content.replace(count, b" " * len(count), 1)
+
+        for name, invalid in (
+            ("empty", b""),
+            ("foreign", b"x" * 100),
+            ("newer", newer + content[HEADER.size :]),
+            ("truncated", content[:-64]),
+            ("uncounted", uncounted),
+        ):
+            with self.subTest(name):
+                self.path.write_bytes(invalid)
+                with self.assertRaises(ValueError):
+                    load_snapshot(self.path)
+
+
+class SnapshotDataSourceTestCase(TestCase):
+    """Test cases for serving bookings from a snapshot"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.path = self.directory / "bookings.snapshot"
+        reset_booking_datasource()
+        self.addCleanup(reset_booking_datasource)
+
+    def test_datasource_maps_snapshot_from_settings(self):
+        """Test that PMS_SNAPSHOT_PATH takes precedence over the fixture"""
+        write_snapshot(CompactBookingStore.from_bookings(MOCK_PMS_BOOKINGS), self.path)
+
+        with override_settings(PMS_SNAPSHOT_PATH=str(self.path)):
+            datasource = get_booking_datasource()
+
+        self.assertIsInstance(datasource, CompactBookingDataSource)
+        self.assertEqual(list(datasource.query(room="107")), MOCK_PMS_BOOKINGS[:1])
+
+    def test_missing_snapshot_falls_back(self):
+        """Test that workers still start without a snapshot"""
+        with override_settings(PMS_SNAPSHOT_PATH=str(self.path)):
+            with self.assertLogs("integrations.pms.datasource", "WARNING"):
+                datasource = get_booking_datasource()
+
+        self.assertIsInstance(datasource, BookingDataSource)
+        self.assertEqual(len(datasource), len(MOCK_PMS_BOOKINGS))
+
+    @patch("integrations.pms.management.commands.snapshot_pms_bookings.PMSClient")
+    def test_management_command_fetches_from_pms(self, mock_pms_client):
+        """Test snapshotting the booking list fetched from the PMS"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+        out = StringIO()
+
+        with override_settings(PMS_SNAPSHOT_PATH=str(self.path)):
+            call_command("snapshot_pms_bookings", stdout=out)
+
+        self.assertIn(f"Wrote {len(MOCK_PMS_BOOKINGS)} bookings", out.getvalue())
+        self.assertEqual(load_snapshot(self.path).to_dicts(), MOCK_PMS_BOOKINGS)
+
+    def test_management_command_from_fixture(self):
+        """Test snapshotting a fixture file, and unsupported bookings"""
+        fixture = self.directory / "bookings.json"
+        fixture.write_text(json.dumps(MOCK_PMS_BOOKINGS[:3]))
+
+        call_command(
+            "snapshot_pms_bookings",
+            "--fixture",
+            str(fixture),
+            "--output",
+            str(self.path),
+            stdout=StringIO(),
+        )
+        self.assertEqual(len(load_snapshot(self.path)), 3)
+
+        fixture.write_text(json.dumps([{**MOCK_PMS_BOOKINGS[0], "channel": "web"}]))
+        with self.assertRaises(CommandError):
+            call_command(
+                "snapshot_pms_bookings", "--fixture", str(fixture), "--output", "x"
+            )
+        with override_settings(PMS_SNAPSHOT_PATH=None):
+            with self.assertRaises(CommandError):
+                call_command("snapshot_pms_bookings")
+
+
+class SnapshotCacheTestCase(TestCase):
+    """Test cases for serving booking lists from a snapshot"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "bookings.snapshot"
+        write_snapshot(CompactBookingStore.from_bookings(MOCK_PMS_BOOKINGS), self.path)
+        settings_override = override_settings(PMS_SNAPSHOT_PATH=str(self.path))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        reset_booking_datasource()
+        self.addCleanup(reset_booking_datasource)
+
+    def test_cold_list_is_read_from_the_mapping(self):
+        """Test that a cold cache answers list reads from the snapshot"""
+        client = CachedPMSClient(Mock())
+        bookings, validators = client.fetch_bookings_versioned()
+
+        client.client.fetch_bookings.assert_not_called()
+        self.assertIs(bookings, get_booking_snapshot().datasource.all())
+        self.assertEqual(validators.last_modified, self.path.stat().st_mtime)
+        self.assertIsNone(cache.get(client.policy.key("bookings")))
+
+    def test_expired_snapshot_is_not_served(self):
+        """Test that snapshots older than the stale TTL are ignored"""
+        expired = time.time() - 3600
+        os.utime(self.path, (expired, expired))
+        client = CachedPMSClient(Mock())
+        client.client.fetch_bookings.return_value = MOCK_PMS_BOOKINGS[:1]
+
+        self.assertEqual(client.fetch_bookings(), MOCK_PMS_BOOKINGS[:1])
+
+    def test_cached_snapshot_lists_are_not_pickled(self):
+        """Test that the cache only points at bookings fetched from the mapping"""
+        expired = time.time() - 3600
+        os.utime(self.path, (expired, expired))
+        client = CachedPMSClient(Mock())
+        client.client.fetch_bookings.return_value = get_booking_datasource().all()
+
+        first = client.fetch_bookings()
+        second = client.fetch_bookings()
+
+        client.client.fetch_bookings.assert_called_once()
+        self.assertIs(second, first)
+        self.assertIsNone(cache.get(client.policy.key("bookings"))["value"])
+        self.assertEqual(
+            client.fetch_bookings_by_ids(["1002"], 1)["1002"], MOCK_PMS_BOOKINGS[1]
+        )
+
+    def test_lifespan_startup_maps_the_snapshot(self):
+        """Test that the ASGI lifespan maps the snapshot before serving"""
+        hook = Mock(wraps=get_booking_snapshot)
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            pass
+
+        async_to_sync(LifespanMiddleware(app=None, startup=[hook]))(
+            {"type": "lifespan"}, receive, send
+        )
+
+        hook.assert_called_once_with()
+        self.assertEqual(len(get_booking_snapshot().datasource), len(MOCK_PMS_BOOKINGS))
+
+    def test_missing_snapshot_is_not_served(self):
+        """Test that workers start and read the PMS without a snapshot"""
+        self.path.unlink()
+        client = CachedPMSClient(Mock())
+        client.client.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+
+        with self.assertLogs("integrations.pms.datasource", "WARNING"):
+            self.assertEqual(client.fetch_bookings(), MOCK_PMS_BOOKINGS)
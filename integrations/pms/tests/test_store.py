@@ -0,0 +1,179 @@
+import pickle
+from datetime import date, timedelta
+from unittest import TestCase
+
+from integrations.base.conditional import content_etag
+from integrations.pms.fake_server import generate_bookings
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.serializers import BookingSerializer, map_booking, map_bookings
+from integrations.pms.store import CompactBookingStore
+
+BOOKINGS = [
+    *MOCK_PMS_BOOKINGS,
+    {
+        "id": "2001",
+        "guest": "Zoë Ünal",
+        "check_in_date": "2025-07-01",
+        "check_out_date": "2025-07-02",
+        "booking_status": "pending",
+    },
+]
+
+
+def str_or(bound):
+    return bound.isoformat() if isinstance(bound, date) else bound
+
+
+class CompactBookingStoreTestCase(TestCase):
+    """Test cases for the columnar booking store"""
+
+    def setUp(self):
+        self.store = CompactBookingStore.from_bookings(BOOKINGS)
+
+    def test_round_trip(self):
+        """Test that records and dicts read back the raw bookings"""
+        self.assertEqual(len(self.store), len(BOOKINGS))
+        self.assertEqual(self.store.to_dicts(), BOOKINGS)
+        self.assertEqual(list(self.store), BOOKINGS)
+        self.assertEqual(self.store[-1], BOOKINGS[-1])
+        self.assertNotIn("room", self.store[-1])
+        with self.assertRaises(IndexError):
+            self.store[len(BOOKINGS)]
+
+    def test_repeated_strings_are_shared(self):
+        """Test that rooms and statuses are stored once"""
+        self.assertEqual(self.store.statuses, ("pending", "confirmed", "cancelled"))
+        self.assertIs(self.store[0]["booking_status"], self.store[3]["booking_status"])
+        self.assertEqual(len(self.store.rooms), len({b["room"] for b in BOOKINGS[:-1]}))
+
+    def test_typed_fields(self):
+        """Test date and amount accessors on records"""
+        record = self.store[0]
+        self.assertEqual(record.check_in.isoformat(), "2025-06-01")
+        self.assertEqual(record.amount, 850.0)
+        self.assertIsNone(self.store[-1].amount)
+
+    def test_get_by_id(self):
+        """Test lookups by string and int IDs"""
+        self.assertEqual(self.store.get("1004"), MOCK_PMS_BOOKINGS[3])
+        self.assertEqual(self.store.get(2001)["guest"], "Zoë Ünal")
+        self.assertIsNone(self.store.get("9999"))
+
+    def test_query_on_codes(self):
+        """Test room and status criteria"""
+        self.assertEqual(self.store.query(booking_status="cancelled"), BOOKINGS[2:8:5])
+        self.assertEqual(
+            self.store.query(room="107", booking_status="confirmed"), BOOKINGS[:1]
+        )
+        self.assertEqual(self.store.query(room="999"), [])
+
+    def test_duplicate_ids_keep_first_position(self):
+        """Test that the last of several bookings with one id wins"""
+        updated = {**BOOKINGS[0], "guest": "Alice Smith"}
+        store = CompactBookingStore.from_bookings([*BOOKINGS, updated])
+
+        self.assertEqual(len(store), len(BOOKINGS))
+        self.assertEqual(store[0], updated)
+        self.assertEqual(store.get("1001"), updated)
+
+    def test_unsupported_bookings(self):
+        """Test that bookings the columns cannot hold are rejected"""
+        booking = MOCK_PMS_BOOKINGS[0]
+        for unsupported in (
+            {**booking, "channel": "web"},
+            {**booking, "id": 1001},
+            {**booking, "room": None},
+            {**booking, "check_in_date": "20250601"},
+            {**booking, "total_price": "850"},
+            {key: value for key, value in booking.items() if key != "guest"},
+        ):
+            with self.subTest(booking=unsupported):
+                with self.assertRaises(ValueError):
+                    CompactBookingStore.from_bookings([unsupported])
+
+    def test_records_pickle_as_dicts(self):
+        """Test that cached records do not carry the store along"""
+        restored = pickle.loads(pickle.dumps([self.store[0]]))
+
+        self.assertIs(type(restored[0]), dict)
+        self.assertEqual(restored[0], MOCK_PMS_BOOKINGS[0])
+
+    def test_take(self):
+        """Test that taking rows builds a store of those bookings"""
+        taken = self.store.take(self.store.rows(booking_status="cancelled")[::-1])
+
+        self.assertEqual(list(taken), [BOOKINGS[7], BOOKINGS[2]])
+        self.assertEqual(taken.get("1008"), BOOKINGS[7])
+        self.assertIsNone(taken.get("1001"))
+        self.assertEqual(list(self.store.take([])), [])
+
+    def test_range_rows_match_a_scan(self):
+        """Test that range lookups on the sorted indexes match a linear scan"""
+        bookings = generate_bookings(300, seed=3)
+        for booking in bookings[::7]:
+            del booking["total_price"]
+        store = CompactBookingStore.from_bookings(bookings)
+        taken = store.take(store.rows(booking_status="confirmed"))
+        first_day = date(2025, 3, 1)
+
+        for candidate in (store, taken):
+            raw = candidate.to_dicts()
+            for n in range(20):
+                low = first_day + timedelta(days=9 * n)
+                high = low + timedelta(days=n)
+                for key, bounds in (
+                    ("check_in_date", (low, high)),
+                    ("check_out_date", (None, high)),
+                    ("total_price", (100.0 * n, None)),
+                    ("total_price", (300.0, 300.0 + 50 * n)),
+                ):
+                    expected = [
+                        row
+                        for row, booking in enumerate(raw)
+                        if key in booking
+                        and (bounds[0] is None or booking[key] >= str_or(bounds[0]))
+                        and (bounds[1] is None or booking[key] <= str_or(bounds[1]))
+                    ]
+                    self.assertEqual(
+                        candidate.range_rows(key, *bounds).tolist(), expected
+                    )
+
+    def test_content_digest(self):
+        """Test that stores are hashed by content, also once pickled"""
+        restored = pickle.loads(pickle.dumps(self.store))
+        changed = CompactBookingStore.from_bookings(
+            [*BOOKINGS[:-1], {**BOOKINGS[-1], "guest": "Zoe Unal"}]
+        )
+
+        self.assertEqual(list(restored), BOOKINGS)
+        self.assertEqual(content_etag(self.store), restored.content_digest())
+        self.assertEqual(
+            content_etag(CompactBookingStore.from_bookings(BOOKINGS)),
+            content_etag(self.store),
+        )
+        self.assertNotEqual(content_etag(changed), content_etag(self.store))
+        self.assertEqual(content_etag(self.store[:2]), content_etag(BOOKINGS[:2]))
+
+    def test_nbytes(self):
+        """Test that the columns are smaller than the raw values"""
+        self.assertLess(self.store.nbytes / len(self.store), 80)
+
+
+class CompactBookingStoreMappingTestCase(TestCase):
+    """Test cases for mapping bookings straight from the store"""
+
+    def test_map_bookings_matches_dicts(self):
+        """Test that column-wise mapping equals mapping each dict"""
+        store = CompactBookingStore.from_bookings(BOOKINGS)
+
+        self.assertEqual(map_bookings(store), map_bookings(BOOKINGS))
+        self.assertEqual(map_booking(store[0]), map_booking(BOOKINGS[0]))
+        self.assertEqual(BookingSerializer(store[-1]).data["guest_name"], "Zoë Ünal")
+
+    def test_invalid_bookings_need_serializer(self):
+        """Test that any invalid booking sends the list to the serializer"""
+        store = CompactBookingStore.from_bookings(
+            [*BOOKINGS, {**BOOKINGS[0], "id": "3001", "booking_status": "no-show"}]
+        )
+
+        self.assertIsNone(map_bookings(store))
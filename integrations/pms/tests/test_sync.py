@@ -0,0 +1,208 @@
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from integrations.base.exceptions import ExternalAPINotFound, ExternalAPIResponseError
+from integrations.pms.mirror import AsyncBookingMirrorClient, BookingMirrorClient
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.models import Booking, BookingSyncRun
+from integrations.pms.serializers import map_bookings
+from integrations.pms.sync import sync_bookings, sync_watermark
+
+
+def pms_client(bookings):
+    client = Mock()
+    client.fetch_bookings.return_value = bookings
+    return client
+
+
+class SyncBookingsTestCase(TestCase):
+    """Test cases for the PMS booking sync"""
+
+    def test_initial_sync_creates_bookings(self):
+        """Test that every booking is mirrored on the first run"""
+        run = sync_bookings(pms_client(MOCK_PMS_BOOKINGS), batch_size=3)
+
+        self.assertEqual(run.status, BookingSyncRun.Status.SUCCEEDED)
+        self.assertEqual(run.created, len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(Booking.objects.count(), len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(sync_watermark(), run.finished_at)
+
+    def test_resync_reports_changes(self):
+        """Test that only changed, new and removed bookings are reported"""
+        sync_bookings(pms_client(MOCK_PMS_BOOKINGS))
+        bookings = [
+            {**MOCK_PMS_BOOKINGS[0], "booking_status": "cancelled"},
+            *MOCK_PMS_BOOKINGS[1:9],
+            {**MOCK_PMS_BOOKINGS[9], "id": "2001"},
+        ]
+
+        run = sync_bookings(pms_client(bookings))
+
+        self.assertEqual(
+            (run.created, run.updated, run.deleted, run.unchanged), (1, 1, 1, 8)
+        )
+        self.assertEqual(Booking.objects.get(booking_id="1001").status, "cancelled")
+        self.assertFalse(Booking.objects.filter(booking_id="1010").exists())
+
+    def test_keep_missing(self):
+        """Test that missing bookings can be kept"""
+        sync_bookings(pms_client(MOCK_PMS_BOOKINGS))
+
+        run = sync_bookings(pms_client(MOCK_PMS_BOOKINGS[:5]), delete_missing=False)
+
+        self.assertEqual(run.deleted, 0)
+        self.assertEqual(Booking.objects.count(), len(MOCK_PMS_BOOKINGS))
+
+    def test_invalid_bookings_are_skipped_and_kept(self):
+        """Test that an invalid upstream booking keeps its mirrored row"""
+        sync_bookings(pms_client(MOCK_PMS_BOOKINGS))
+        bookings = [{**MOCK_PMS_BOOKINGS[0], "check_in_date": "soon"}]
+
+        run = sync_bookings(pms_client(bookings))
+
+        self.assertEqual(run.invalid, 1)
+        self.assertTrue(Booking.objects.filter(booking_id="1001").exists())
+
+    def test_oversized_bookings_are_skipped_and_logged(self):
+        """Test that values longer than the mirror's columns skip the row"""
+        sync_bookings(pms_client(MOCK_PMS_BOOKINGS))
+        bookings = [
+            {**MOCK_PMS_BOOKINGS[0], "guest": "A" * 256},
+            {**MOCK_PMS_BOOKINGS[1], "room": "1" * 33},
+            {**MOCK_PMS_BOOKINGS[2], "id": "9" * 65},
+            {**MOCK_PMS_BOOKINGS[3], "guest": "Alice Smith"},
+        ]
+
+        with self.assertLogs("integrations.pms.sync", level="WARNING") as logs:
+            run = sync_bookings(pms_client(bookings), delete_missing=False)
+
+        self.assertEqual((run.invalid, run.updated), (3, 1))
+        self.assertEqual(len(logs.records), 3)
+        self.assertIn("guest_name", logs.output[0])
+        self.assertEqual(
+            Booking.objects.get(booking_id="1001").guest_name,
+            MOCK_PMS_BOOKINGS[0]["guest"],
+        )
+        self.assertEqual(Booking.objects.count(), len(MOCK_PMS_BOOKINGS))
+
+    def test_repeated_bookings_keep_last_occurrence(self):
+        """Test that a booking listed twice is written and counted once"""
+        sync_bookings(pms_client(MOCK_PMS_BOOKINGS[1:]))
+        bookings = [
+            MOCK_PMS_BOOKINGS[0],
+            {**MOCK_PMS_BOOKINGS[0], "guest": "Alice Smith"},
+            {**MOCK_PMS_BOOKINGS[1], "booking_status": "cancelled"},
+            MOCK_PMS_BOOKINGS[1],
+        ]
+
+        run = sync_bookings(pms_client(bookings), batch_size=1, delete_missing=False)
+
+        self.assertEqual(
+            (run.fetched, run.created, run.updated, run.unchanged), (4, 1, 0, 1)
+        )
+        self.assertEqual(
+            Booking.objects.get(booking_id="1001").guest_name, "Alice Smith"
+        )
+        self.assertEqual(Booking.objects.get(booking_id="1002").status, "pending")
+
+    def test_failed_sync_is_recorded(self):
+        """Test that PMS failures are recorded on the run"""
+        client = Mock()
+        client.fetch_bookings.side_effect = ExternalAPIResponseError(
+            status.HTTP_502_BAD_GATEWAY, "Simulated PMS API failure."
+        )
+
+        with self.assertRaises(ExternalAPIResponseError):
+            sync_bookings(client)
+
+        run = BookingSyncRun.objects.latest()
+        self.assertEqual(run.status, BookingSyncRun.Status.FAILED)
+        self.assertIn("Simulated PMS API failure", run.error)
+        self.assertIsNone(sync_watermark())
+
+    @patch("integrations.pms.sync.PMSClient")
+    def test_management_command(self, mock_pms_client):
+        """Test the sync_pms_bookings command"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+        out = StringIO()
+
+        call_command("sync_pms_bookings", stdout=out)
+
+        self.assertIn("10 created", out.getvalue())
+
+
+class BookingMirrorClientTestCase(TestCase):
+    """Test cases for reading bookings from the mirror"""
+
+    def setUp(self):
+        sync_bookings(pms_client(MOCK_PMS_BOOKINGS))
+
+    def test_fetch_bookings_round_trips(self):
+        """Test that mirrored bookings map exactly like PMS bookings"""
+        client = BookingMirrorClient()
+
+        self.assertEqual(
+            map_bookings(client.fetch_bookings()), map_bookings(MOCK_PMS_BOOKINGS)
+        )
+        self.assertEqual(
+            [b["id"] for b in client.fetch_bookings({"booking_status": "cancelled"})],
+            ["1003", "1008"],
+        )
+
+    def test_fetch_booking_by_id(self):
+        """Test detail lookups and not found"""
+        client = BookingMirrorClient()
+
+        self.assertEqual(client.fetch_booking_by_id("1001"), MOCK_PMS_BOOKINGS[0])
+        with self.assertRaises(ExternalAPINotFound):
+            client.fetch_booking_by_id("9999")
+
+    def test_fetch_bookings_by_ids(self):
+        """Test batch lookups with a single query"""
+        client = BookingMirrorClient()
+
+        with self.assertNumQueries(1):
+            results = client.fetch_bookings_by_ids(["1002", "9999"])
+
+        self.assertEqual(results["1002"], MOCK_PMS_BOOKINGS[1])
+        self.assertIsInstance(results["9999"], ExternalAPINotFound)
+
+    def test_async_fetch_bookings(self):
+        """Test the async mirror client"""
+        client = AsyncBookingMirrorClient()
+
+        bookings = async_to_sync(client.fetch_bookings)({"room": "107"})
+
+        self.assertEqual(bookings, [MOCK_PMS_BOOKINGS[0]])
+
+    @override_settings(PMS_READ_FROM_MIRROR=True)
+    @patch("integrations.pms.views.PMSClient")
+    def test_views_read_from_mirror(self, mock_pms_client):
+        """Test that the read endpoints skip the PMS when reading the mirror"""
+        list_response = self.client.get(reverse("booking_list"))
+        detail_response = self.client.get(
+            reverse("booking_detail", kwargs={"booking_id": 1001})
+        )
+
+        self.assertEqual(list_response.data["count"], len(MOCK_PMS_BOOKINGS))
+        self.assertEqual(detail_response.data["guest_name"], "Alice Johnson")
+        mock_pms_client.assert_not_called()
+
+    @override_settings(PMS_READ_FROM_MIRROR=True)
+    def test_mirror_etag_follows_changing_syncs(self):
+        """Test that only syncs that change the mirror change the ETag"""
+        etag = self.client.get(reverse("booking_list"))["ETag"]
+
+        sync_bookings(pms_client(MOCK_PMS_BOOKINGS))
+        unchanged = self.client.get(reverse("booking_list"), HTTP_IF_NONE_MATCH=etag)
+        sync_bookings(pms_client(MOCK_PMS_BOOKINGS[1:]))
+        changed = self.client.get(reverse("booking_list"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(unchanged.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
@@ -0,0 +1,154 @@
+import json
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from integrations.pms.availability import reset_availability_index
+from integrations.pms.mock_data import MOCK_PMS_BOOKINGS
+from integrations.pms.webhooks import sign_payload, verify_signature
+
+SECRET = "webhook-secret"
+
+
+def event(event_id, event_type, **changes):
+    """Webhook event for booking 1001 with `changes` applied."""
+    return {
+        "id": event_id,
+        "type": event_type,
+        "booking": {**MOCK_PMS_BOOKINGS[0], **changes},
+    }
+
+
+@override_settings(PMS_WEBHOOK_SECRET=SECRET)
+class BookingWebhookAPIViewTestCase(APITestCase):
+    """Test cases for the booking webhook endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        reset_availability_index()
+
+    def tearDown(self):
+        reset_availability_index()
+
+    def deliver(self, payload, secret=SECRET):
+        body = json.dumps(payload).encode()
+        return self.client.post(
+            reverse("booking_webhook"),
+            body,
+            content_type="application/json",
+            HTTP_X_PMS_SIGNATURE=sign_payload(body, secret),
+        )
+
+    def test_signature(self):
+        """Test that unsigned and wrongly signed deliveries are refused"""
+        body = json.dumps(event("evt-1", "booking.updated")).encode()
+
+        self.assertTrue(verify_signature(body, sign_payload(body, SECRET), SECRET))
+        self.assertFalse(verify_signature(body, None, SECRET))
+        self.assertEqual(
+            self.deliver(event("evt-1", "booking.updated"), "other").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        response = self.client.post(
+            reverse("booking_webhook"), body, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(PMS_WEBHOOK_SECRET="")
+    def test_not_configured(self):
+        """Test that webhooks are refused without a secret"""
+        response = self.deliver(event("evt-1", "booking.updated"), "")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_malformed_delivery(self):
+        """Test that bad JSON and empty batches are rejected"""
+        body = b"{not json"
+        response = self.client.post(
+            reverse("booking_webhook"),
+            body,
+            content_type="application/json",
+            HTTP_X_PMS_SIGNATURE=sign_payload(body, SECRET),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.deliver({"events": []}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_batch_with_duplicates_and_invalid_events(self):
+        """Test per-event statuses in one delivery"""
+        response = self.deliver(
+            {
+                "events": [
+                    event("evt-1", "booking.updated", guest="Alice Brown"),
+                    event("evt-1", "booking.updated", guest="Alice Brown"),
+                    event("evt-2", "booking.updated", check_in_date="June 1st"),
+                    {"id": "evt-3", "type": "booking.deleted", "booking": {}},
+                ]
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["applied", "duplicate", "invalid", "invalid"],
+        )
+        self.assertIn("booking", response.data["results"][2]["errors"])
+        self.assertIn("type", response.data["results"][3]["errors"])
+        redelivered = self.deliver(event("evt-1", "booking.updated"))
+        self.assertEqual(redelivered.data["results"][0]["status"], "duplicate")
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_updates_cached_list_and_detail(self, mock_pms_client):
+        """Test that reads see pushed changes without calling the PMS again"""
+        mock_client_instance = mock_pms_client.return_value
+        mock_client_instance.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+        mock_client_instance.fetch_booking_by_id.return_value = MOCK_PMS_BOOKINGS[0]
+        self.client.get(reverse("booking_list"), {"page_size": 100})
+        self.client.get(reverse("booking_detail", args=[1001]))
+        self.client.get(reverse("booking_list"), {"room_number": "107"})
+        created = {**MOCK_PMS_BOOKINGS[1], "id": "2001"}
+
+        self.deliver(
+            {
+                "events": [
+                    event("evt-1", "booking.updated", guest="Alice Brown"),
+                    {"id": "evt-2", "type": "booking.created", "booking": created},
+                ]
+            }
+        )
+        bookings = self.client.get(reverse("booking_list"), {"page_size": 100})
+        detail = self.client.get(reverse("booking_detail", args=[1001]))
+        filtered = self.client.get(reverse("booking_list"), {"room_number": "107"})
+
+        self.assertEqual(detail.data["guest_name"], "Alice Brown")
+        self.assertEqual(bookings.data["results"][0]["guest_name"], "Alice Brown")
+        self.assertEqual(bookings.data["results"][-1]["booking_id"], "2001")
+        self.assertEqual(bookings.data["count"], len(MOCK_PMS_BOOKINGS) + 1)
+        # Filtered lists are fetched again, the full list and detail are not.
+        self.assertEqual(filtered.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_client_instance.fetch_bookings.call_count, 3)
+        mock_client_instance.fetch_booking_by_id.assert_called_once()
+
+    @patch("integrations.pms.views.PMSClient")
+    def test_cancellation_frees_room(self, mock_pms_client):
+        """Test that a cancellation frees its room in the availability index"""
+        mock_pms_client.return_value.fetch_bookings.return_value = MOCK_PMS_BOOKINGS
+        dates = {"check_in": "2025-06-01", "check_out": "2025-06-02"}
+        before = self.client.get(reverse("room_availability"), dates)
+
+        self.deliver(event("evt-1", "booking.cancelled"))
+        after = self.client.get(reverse("room_availability"), dates)
+
+        self.assertIn("107", before.data["occupied_rooms"])
+        self.assertNotIn("107", after.data["occupied_rooms"])
+        self.assertIn("107", after.data["free_rooms"])
+        self.assertEqual(
+            cache.get("pms:booking:1001")["value"]["booking_status"], "cancelled"
+        )
+        mock_pms_client.return_value.fetch_bookings.assert_called_once()
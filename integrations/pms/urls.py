@@ -1,12 +1,65 @@
 from django.urls import path
 
-from .views import BookingDetailAPIView, BookingListAPIView
+from .views import (
+    AsyncBookingBatchAPIView,
+    AsyncBookingDetailAPIView,
+    AsyncBookingExportAPIView,
+    AsyncBookingListAPIView,
+    AsyncPropertyBookingsAPIView,
+    BookingAnalyticsAPIView,
+    BookingBatchAPIView,
+    BookingDetailAPIView,
+    BookingExportAPIView,
+    BookingListAPIView,
+    BookingWebhookAPIView,
+    PropertyBookingsAPIView,
+    RoomAvailabilityAPIView,
+    RoomOccupancyAPIView,
+)
 
 urlpatterns = [
+    path("availability/", RoomAvailabilityAPIView.as_view(), name="room_availability"),
+    path("occupancy/", RoomOccupancyAPIView.as_view(), name="room_occupancy"),
+    path("analytics/", BookingAnalyticsAPIView.as_view(), name="booking_analytics"),
     path("bookings/", BookingListAPIView.as_view(), name="booking_list"),
+    path("bookings/batch/", BookingBatchAPIView.as_view(), name="booking_batch"),
+    path("bookings/export/", BookingExportAPIView.as_view(), name="booking_export"),
     path(
         "bookings/<int:booking_id>/",
         BookingDetailAPIView.as_view(),
         name="booking_detail",
     ),
+    path(
+        "webhooks/bookings/",
+        BookingWebhookAPIView.as_view(),
+        name="booking_webhook",
+    ),
+    path(
+        "properties/bookings/",
+        PropertyBookingsAPIView.as_view(),
+        name="property_bookings",
+    ),
+    path(
+        "async/bookings/", AsyncBookingListAPIView.as_view(), name="async_booking_list"
+    ),
+    path(
+        "async/bookings/batch/",
+        AsyncBookingBatchAPIView.as_view(),
+        name="async_booking_batch",
+    ),
+    path(
+        "async/bookings/export/",
+        AsyncBookingExportAPIView.as_view(),
+        name="async_booking_export",
+    ),
+    path(
+        "async/bookings/<int:booking_id>/",
+        AsyncBookingDetailAPIView.as_view(),
+        name="async_booking_detail",
+    ),
+    path(
+        "async/properties/bookings/",
+        AsyncPropertyBookingsAPIView.as_view(),
+        name="async_property_bookings",
+    ),
 ]
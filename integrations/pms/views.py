@@ -1,59 +1,297 @@
-from drf_spectacular.utils import extend_schema
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.module_loading import import_string
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.status import (
     HTTP_200_OK,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
     HTTP_404_NOT_FOUND,
     HTTP_502_BAD_GATEWAY,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 from rest_framework.views import APIView
 
+from integrations.base.codecs import get_json_codec
+from integrations.base.conditional import conditional_response
 from integrations.base.exceptions import ExternalAPIException, ExternalAPINotFound
-from integrations.pms.clients import PMSClient
-from integrations.pms.serializers import BookingSerializer
+from integrations.base.instrumentation import phase
+from integrations.base.views import AsyncAPIView
+from integrations.pms.analytics import get_booking_columns
+from integrations.pms.availability import refreshed_availability_index
+from integrations.pms.cache import AsyncCachedPMSClient, CachedPMSClient
+from integrations.pms.clients import AsyncPMSClient, PMSClient
+from integrations.pms.export import EXPORT_CONTENT_TYPES, aiter_export, iter_export
+from integrations.pms.fanout import (
+    AsyncMultiPropertyPMSClient,
+    MultiPropertyPMSClient,
+    merge_property_bookings,
+)
+from integrations.pms.filters import BookingFilter, BookingFilterSerializer
+from integrations.pms.mirror import AsyncBookingMirrorClient, BookingMirrorClient
+from integrations.pms.prefetch import record_booking_access
+from integrations.pms.properties import select_pms_properties
+from integrations.pms.serializers import (
+    AnalyticsQuerySerializer,
+    BookingBatchSerializer,
+    BookingEventBatchSerializer,
+    BookingSerializer,
+    DateRangeQuerySerializer,
+    map_booking,
+    map_booking_store,
+    map_bookings,
+)
+from integrations.pms.store import CompactBookingStore
+from integrations.pms.webhooks import (
+    SIGNATURE_HEADER,
+    BookingEventApplier,
+    verify_signature,
+)
+
+
+def booking_client():
+    """
+    Return the client the sync read endpoints use: the local Booking mirror
+    when `settings.PMS_READ_FROM_MIRROR` is set, otherwise the cached PMS.
+    """
+    if settings.PMS_READ_FROM_MIRROR:
+        return BookingMirrorClient()
+    return CachedPMSClient(PMSClient())
+
+
+def async_booking_client():
+    """
+    Async counterpart of `booking_client`.
+    """
+    if settings.PMS_READ_FROM_MIRROR:
+        return AsyncBookingMirrorClient()
+    return AsyncCachedPMSClient(AsyncPMSClient())
+
+
+def bookings_response(raw_data, view=None, booking_filter=None) -> Response:
+    """
+    Map and validate a raw PMS booking list into an API response.
+
+    Valid payloads take the one-pass `map_bookings` path; anything else goes
+    through the serializers so the error response is unchanged. Given a
+    `booking_filter`, the mapped bookings are filtered and ordered, and given
+    a `view`, the response is paginated with the view's paginator. Booking
+    stores are narrowed to the filter's ranges before mapping.
+    """
+    rows = None
+    if booking_filter is not None and isinstance(raw_data, CompactBookingStore):
+        with phase("filter"):
+            rows = booking_filter.store_rows(raw_data)
+    with phase("serialize"):
+        if rows is None:
+            bookings = map_bookings(raw_data)
+        else:
+            bookings = map_booking_store(raw_data, rows)
+        if bookings is None:
+            mapped_serializer = BookingSerializer(raw_data, many=True)
+            serializer = BookingSerializer(data=mapped_serializer.data, many=True)
+
+            # Validate input
+            if not serializer.is_valid():
+                # Filter only the entries that have actual errors
+                errors = [error for error in serializer.errors if error]
+                return Response({"errors": errors}, status=HTTP_400_BAD_REQUEST)
+            bookings = serializer.data
+
+    with phase("filter"):
+        if booking_filter is not None:
+            bookings = booking_filter.apply(bookings)
+        if view is not None:
+            page = view.paginator.paginate_queryset(bookings, view.request, view=view)
+            if page is not None:
+                return view.paginator.get_paginated_response(page)
+    return Response(bookings, status=HTTP_200_OK)
+
+
+def booking_response(raw_data) -> Response:
+    """
+    Map and validate a single raw PMS booking into an API response.
+    """
+    with phase("serialize"):
+        mapped = map_booking(raw_data)
+        if mapped is not None:
+            return Response(mapped, status=HTTP_200_OK)
+
+        mapped_serializer = BookingSerializer(raw_data)
+        serializer = BookingSerializer(data=mapped_serializer.data)
+
+        # Validate input
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.data, status=HTTP_200_OK)
+
+
+def batch_item(booking_id: str, outcome) -> dict:
+    """
+    Map one outcome of a batch lookup (a raw booking or the exception raised
+    while fetching it) into its result item.
+    """
+    if isinstance(outcome, ExternalAPINotFound):
+        return {"booking_id": booking_id, "status": "not_found", "error": str(outcome)}
+    if isinstance(outcome, ExternalAPIException):
+        return {"booking_id": booking_id, "status": "error", "error": str(outcome)}
+
+    mapped = map_booking(outcome)
+    if mapped is None:
+        serializer = BookingSerializer(data=BookingSerializer(outcome).data)
+        if not serializer.is_valid():
+            return {
+                "booking_id": booking_id,
+                "status": "invalid",
+                "errors": serializer.errors,
+            }
+        mapped = serializer.data
+    return {"booking_id": booking_id, "status": "ok", "booking": mapped}
+
+
+def batch_response(outcomes: dict) -> Response:
+    """
+    Build the batch lookup response, one result per requested ID in request
+    order. Per-item failures never fail the batch.
+    """
+    with phase("serialize"):
+        results = [
+            batch_item(booking_id, outcome) for booking_id, outcome in outcomes.items()
+        ]
+    return Response({"results": results}, status=HTTP_200_OK)
+
+
+def batch_schema(operation_id: str):
+    """
+    Return the schema shared by the sync and async batch lookup views.
+    """
+    return extend_schema(
+        operation_id=operation_id,
+        request=BookingBatchSerializer,
+        responses={
+            HTTP_200_OK: "Per-ID results with status ok, not_found, error or invalid",
+            HTTP_400_BAD_REQUEST: "Invalid booking IDs",
+        },
+        tags=["PMS Bookings"],
+    )
+
+
+def export_format(request):
+    """
+    Return the requested export format, or None if it is not supported.
+    """
+    export_format = request.query_params.get("type", "ndjson")
+    return export_format if export_format in EXPORT_CONTENT_TYPES else None
 
 
-class BookingListAPIView(APIView):
+def export_response(chunks, export_format: str) -> StreamingHttpResponse:
+    """
+    Wrap an iterator or async iterator of export chunks in a streaming
+    response.
+    """
+    response = StreamingHttpResponse(
+        chunks, content_type=EXPORT_CONTENT_TYPES[export_format]
+    )
+    response["Content-Disposition"] = f'attachment; filename="bookings.{export_format}"'
+    # Ask buffering proxies to pass chunks through as they are produced.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def export_schema(operation_id: str):
+    """
+    OpenAPI schema shared by the sync and async export views.
+    """
+    return extend_schema(
+        operation_id=operation_id,
+        parameters=[
+            OpenApiParameter(
+                "type",
+                str,
+                enum=list(EXPORT_CONTENT_TYPES),
+                default="ndjson",
+                description="`ndjson` for one booking per line, `json` for a JSON array.",
+            )
+        ],
+        responses={
+            HTTP_200_OK: BookingSerializer(many=True),
+            HTTP_400_BAD_REQUEST: "Unsupported export type",
+            HTTP_502_BAD_GATEWAY: "Bad Gateway - External API failure",
+        },
+        tags=["PMS Bookings"],
+    )
+
+
+class BookingListMixin:
+    """
+    Pagination shared by the sync and async booking list views.
+
+    The paginator class is `settings.PMS_PAGINATION_CLASS`. The requested
+    ordering is exposed as `booking_ordering` for cursor pagination.
+    """
+
+    booking_ordering = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            self._paginator = import_string(settings.PMS_PAGINATION_CLASS)()
+        return self._paginator
+
+    def get_booking_filter(self, request) -> BookingFilter:
+        booking_filter = BookingFilter(request.query_params)
+        self.booking_ordering = booking_filter.ordering
+        return booking_filter
+
+
+class BookingListAPIView(BookingListMixin, APIView):
     """
     GET /api/integrations/pms/bookings/
 
-    Fetch all bookings from the external PMS API.
+    Fetch bookings from the external PMS API, through the booking cache or
+    the local mirror, filtered, ordered and paginated. Responses carry a
+    strong ETag and Last-Modified, and conditional requests for unchanged
+    data get a 304 without mapping the bookings.
     """
 
     permission_classes = [AllowAny]
 
     @extend_schema(
         operation_id="Get Bookings List",
+        parameters=[BookingFilterSerializer],
         responses={
             HTTP_200_OK: BookingSerializer(many=True),
+            HTTP_304_NOT_MODIFIED: "Not Modified - matches If-None-Match",
             HTTP_502_BAD_GATEWAY: "Bad Gateway - External API failure",
         },
         tags=["PMS Bookings"],
     )
     def get(self, request):
-        client = PMSClient()
+        booking_filter = self.get_booking_filter(request)
+        client = booking_client()
         try:
-            raw_data = client.fetch_bookings()
-            mapped_serializer = BookingSerializer(raw_data, many=True)
-            serializer = BookingSerializer(data=mapped_serializer.data, many=True)
-
-            # Validate input
-            if not serializer.is_valid():
-                # Filter only the entries that have actual errors
-                errors = [error for error in serializer.errors if error]
-                return Response({"errors": errors}, status=HTTP_400_BAD_REQUEST)
-
-            return Response(serializer.data, status=HTTP_200_OK)
+            raw_data, validators = client.fetch_bookings_versioned(
+                booking_filter.upstream_params()
+            )
         except ExternalAPIException as e:
             return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+        return conditional_response(
+            request,
+            validators,
+            lambda: bookings_response(raw_data, self, booking_filter),
+        )
 
 
 class BookingDetailAPIView(APIView):
     """
     GET /api/integrations/pms/bookings/{booking_id}/
 
-    Fetch a specific booking from the external PMS API.
+    Fetch a specific booking from the external PMS API, through the booking
+    cache or the local mirror. Supports conditional requests like the list.
+    Found bookings count towards the hotness the prefetch scheduler uses.
     """
 
     permission_classes = [AllowAny]
@@ -62,23 +300,487 @@ class BookingDetailAPIView(APIView):
         operation_id="Get Booking by ID",
         responses={
             HTTP_200_OK: BookingSerializer,
+            HTTP_304_NOT_MODIFIED: "Not Modified - matches If-None-Match",
             HTTP_404_NOT_FOUND: "Booking not found",
             HTTP_502_BAD_GATEWAY: "External API failure",
         },
         tags=["PMS Bookings"],
     )
     def get(self, request, booking_id):
-        client = PMSClient()
+        client = booking_client()
         try:
-            raw_data = client.fetch_booking_by_id(booking_id)
-            mapped_serializer = BookingSerializer(raw_data)
-            serializer = BookingSerializer(data=mapped_serializer.data)
+            raw_data, validators = client.fetch_booking_by_id_versioned(booking_id)
+        except ExternalAPINotFound as e:
+            return Response({"error": str(e)}, status=HTTP_404_NOT_FOUND)
+        except ExternalAPIException as e:
+            return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+        record_booking_access(booking_id)
+        return conditional_response(
+            request, validators, lambda: booking_response(raw_data)
+        )
 
-            # Validate input
-            serializer.is_valid(raise_exception=True)
 
-            return Response(serializer.data, status=HTTP_200_OK)
+class BookingBatchAPIView(APIView):
+    """
+    POST /api/integrations/pms/bookings/batch/
+
+    Fetch many bookings by ID in one call. IDs are served from the booking
+    cache or the local mirror where possible; the rest are fetched from the
+    PMS concurrently, at most `settings.PMS_BATCH_CONCURRENCY` at a time.
+    Each ID gets its own result, so one bad ID does not fail the batch.
+    """
+
+    permission_classes = [AllowAny]
+
+    @batch_schema("Get Bookings by IDs")
+    def post(self, request):
+        serializer = BookingBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        outcomes = booking_client().fetch_bookings_by_ids(
+            serializer.validated_data["booking_ids"], settings.PMS_BATCH_CONCURRENCY
+        )
+        return batch_response(outcomes)
+
+
+class AsyncBookingListAPIView(BookingListMixin, AsyncAPIView):
+    """
+    GET /api/integrations/pms/async/bookings/
+
+    Fetch bookings from the external PMS API without blocking a worker
+    thread, filtered, ordered and paginated like the sync list. Served
+    natively on the ASGI event loop.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Bookings List (async)",
+        parameters=[BookingFilterSerializer],
+        responses={
+            HTTP_200_OK: BookingSerializer(many=True),
+            HTTP_304_NOT_MODIFIED: "Not Modified - matches If-None-Match",
+            HTTP_502_BAD_GATEWAY: "Bad Gateway - External API failure",
+        },
+        tags=["PMS Bookings"],
+    )
+    async def get(self, request):
+        booking_filter = self.get_booking_filter(request)
+        client = async_booking_client()
+        try:
+            raw_data, validators = await client.fetch_bookings_versioned(
+                booking_filter.upstream_params()
+            )
+        except ExternalAPIException as e:
+            return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+        return conditional_response(
+            request,
+            validators,
+            lambda: bookings_response(raw_data, self, booking_filter),
+        )
+
+
+class AsyncBookingDetailAPIView(AsyncAPIView):
+    """
+    GET /api/integrations/pms/async/bookings/{booking_id}/
+
+    Fetch a specific booking from the external PMS API without blocking a
+    worker thread. Served natively on the ASGI event loop.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Booking by ID (async)",
+        responses={
+            HTTP_200_OK: BookingSerializer,
+            HTTP_304_NOT_MODIFIED: "Not Modified - matches If-None-Match",
+            HTTP_404_NOT_FOUND: "Booking not found",
+            HTTP_502_BAD_GATEWAY: "External API failure",
+        },
+        tags=["PMS Bookings"],
+    )
+    async def get(self, request, booking_id):
+        client = async_booking_client()
+        try:
+            raw_data, validators = await client.fetch_booking_by_id_versioned(
+                booking_id
+            )
         except ExternalAPINotFound as e:
             return Response({"error": str(e)}, status=HTTP_404_NOT_FOUND)
         except ExternalAPIException as e:
             return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+        record_booking_access(booking_id)
+        return conditional_response(
+            request, validators, lambda: booking_response(raw_data)
+        )
+
+
+class AsyncBookingBatchAPIView(AsyncAPIView):
+    """
+    POST /api/integrations/pms/async/bookings/batch/
+
+    Fetch many bookings by ID in one call, fanning out to the PMS on the
+    event loop. Served natively on the ASGI event loop.
+    """
+
+    permission_classes = [AllowAny]
+
+    @batch_schema("Get Bookings by IDs (async)")
+    async def post(self, request):
+        serializer = BookingBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        outcomes = await async_booking_client().fetch_bookings_by_ids(
+            serializer.validated_data["booking_ids"], settings.PMS_BATCH_CONCURRENCY
+        )
+        return batch_response(outcomes)
+
+
+class BookingExportAPIView(APIView):
+    """
+    GET /api/integrations/pms/bookings/export/
+
+    Stream every booking from the external PMS API as NDJSON or a JSON array.
+
+    The export reads the PMS directly rather than through the booking cache.
+    The raw bookings are fetched whole, then mapped and encoded chunk by
+    chunk as the response is written, so the encoded response is never held
+    in memory. Invalid bookings are logged and skipped.
+    """
+
+    permission_classes = [AllowAny]
+
+    @export_schema("Export Bookings")
+    def get(self, request):
+        requested_format = export_format(request)
+        if requested_format is None:
+            return Response(
+                {"error": "Unsupported export type."}, status=HTTP_400_BAD_REQUEST
+            )
+        try:
+            raw_data = PMSClient().fetch_bookings()
+        except ExternalAPIException as e:
+            return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+        return export_response(
+            iter_export(raw_data, requested_format), requested_format
+        )
+
+
+class AsyncBookingExportAPIView(AsyncAPIView):
+    """
+    GET /api/integrations/pms/async/bookings/export/
+
+    Asyncio counterpart of BookingExportAPIView. The response body is an
+    async iterator, so ASGI servers stream it without a worker thread.
+    """
+
+    permission_classes = [AllowAny]
+
+    @export_schema("Export Bookings (async)")
+    async def get(self, request):
+        requested_format = export_format(request)
+        if requested_format is None:
+            return Response(
+                {"error": "Unsupported export type."}, status=HTTP_400_BAD_REQUEST
+            )
+        try:
+            raw_data = await AsyncPMSClient().fetch_bookings()
+        except ExternalAPIException as e:
+            return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+        return export_response(
+            aiter_export(raw_data, requested_format), requested_format
+        )
+
+
+class BookingWebhookAPIView(APIView):
+    """
+    POST /api/integrations/pms/webhooks/bookings/
+
+    Receive booking events pushed by the PMS, one event or
+    `{"events": [...]}`, signed with `settings.PMS_WEBHOOK_SECRET` in the
+    `X-PMS-Signature` header. Changes are applied to the booking cache and
+    the availability index, so reads do not wait for the TTL to expire.
+    Redelivered events are acknowledged without being applied again.
+    """
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    @extend_schema(
+        operation_id="Receive Booking Events",
+        request={"application/json": {"type": "object"}},
+        responses={
+            HTTP_200_OK: "Status of each event: applied, duplicate or invalid",
+            HTTP_400_BAD_REQUEST: "Bad Request - Malformed delivery",
+            HTTP_401_UNAUTHORIZED: "Unauthorized - Invalid signature",
+            HTTP_503_SERVICE_UNAVAILABLE: "Webhooks are not configured",
+        },
+        tags=["PMS Bookings"],
+    )
+    def post(self, request):
+        secret = settings.PMS_WEBHOOK_SECRET
+        if not secret:
+            return Response(
+                {"error": "Webhooks are not configured."},
+                status=HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        # The signature covers the raw body, so read it before parsing.
+        body = request.body
+        if not verify_signature(body, request.headers.get(SIGNATURE_HEADER), secret):
+            return Response(
+                {"error": "Invalid signature."}, status=HTTP_401_UNAUTHORIZED
+            )
+
+        try:
+            payload = get_json_codec().loads(body)
+        except ValueError:
+            return Response(
+                {"error": "Malformed JSON body."}, status=HTTP_400_BAD_REQUEST
+            )
+        if isinstance(payload, dict) and "events" not in payload:
+            payload = {"events": [payload]}
+        serializer = BookingEventBatchSerializer(data=payload)
+        serializer.is_valid(raise_exception=True)
+
+        results = BookingEventApplier().apply(serializer.validated_data["events"])
+        return Response({"results": results}, status=HTTP_200_OK)
+
+
+class RoomAvailabilityAPIView(APIView):
+    """
+    GET /api/integrations/pms/availability/?check_in=...&check_out=...
+
+    List the rooms that are free for every night in `[check_in, check_out)`
+    and the bookings occupying the others. Cancelled bookings never occupy
+    a room. Answered from the availability index, which is re-synced with
+    the bookings every `settings.PMS_AVAILABILITY_MAX_AGE` seconds.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Room Availability",
+        parameters=[DateRangeQuerySerializer],
+        responses={
+            HTTP_200_OK: "Free rooms and occupied rooms with their bookings",
+            HTTP_502_BAD_GATEWAY: "Bad Gateway - External API failure",
+        },
+        tags=["PMS Bookings"],
+    )
+    def get(self, request):
+        query = DateRangeQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        check_in = query.validated_data["check_in"]
+        check_out = query.validated_data["check_out"]
+        room_number = query.validated_data.get("room_number")
+
+        try:
+            index = refreshed_availability_index(booking_client().fetch_bookings)
+        except ExternalAPIException as e:
+            return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+
+        occupied = index.overlapping(check_in, check_out, room_number)
+        free_rooms = index.free_rooms(check_in, check_out)
+        if room_number is not None:
+            free_rooms = [room for room in free_rooms if room == room_number]
+        return Response(
+            {
+                "check_in": check_in,
+                "check_out": check_out,
+                "free_rooms": free_rooms,
+                "occupied_rooms": dict(sorted(occupied.items())),
+            },
+            status=HTTP_200_OK,
+        )
+
+
+class RoomOccupancyAPIView(APIView):
+    """
+    GET /api/integrations/pms/occupancy/?check_in=...&check_out=...
+
+    Report how many rooms are occupied on every night in
+    `[check_in, check_out)`, out of the rooms known from bookings.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Room Occupancy",
+        parameters=[DateRangeQuerySerializer],
+        responses={
+            HTTP_200_OK: "Occupied rooms and occupancy rate per night",
+            HTTP_502_BAD_GATEWAY: "Bad Gateway - External API failure",
+        },
+        tags=["PMS Bookings"],
+    )
+    def get(self, request):
+        query = DateRangeQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        try:
+            index = refreshed_availability_index(booking_client().fetch_bookings)
+        except ExternalAPIException as e:
+            return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+
+        total_rooms = len(index.rooms)
+        nights = index.occupancy(
+            query.validated_data["check_in"], query.validated_data["check_out"]
+        )
+        return Response(
+            {
+                "total_rooms": total_rooms,
+                "nights": [
+                    {
+                        "date": night,
+                        "occupied": occupied,
+                        "rate": round(occupied / total_rooms, 4) if total_rooms else 0,
+                    }
+                    for night, occupied in nights
+                ],
+            },
+            status=HTTP_200_OK,
+        )
+
+
+class BookingAnalyticsAPIView(APIView):
+    """
+    GET /api/integrations/pms/analytics/?group_by=day&check_in=...&check_out=...
+
+    Report revenue, room nights, ADR (revenue per room night) and occupancy
+    by night, ISO week or room, or booking counts and revenue by status.
+    Revenue is spread evenly over the nights of a stay and cancelled bookings
+    only count in the status breakdown. Computed with vectorized NumPy
+    aggregates over a columnar snapshot of the bookings, rebuilt every
+    `settings.PMS_ANALYTICS_MAX_AGE` seconds.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="Get Booking Analytics",
+        parameters=[AnalyticsQuerySerializer],
+        responses={
+            HTTP_200_OK: "Aggregated booking analytics rows",
+            HTTP_502_BAD_GATEWAY: "Bad Gateway - External API failure",
+        },
+        tags=["PMS Bookings"],
+    )
+    def get(self, request):
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        group_by = query.validated_data["group_by"]
+
+        try:
+            columns = get_booking_columns(booking_client().fetch_bookings)
+        except ExternalAPIException as e:
+            return Response({"error": str(e)}, status=HTTP_502_BAD_GATEWAY)
+
+        if "check_in" in query.validated_data:
+            span = (query.validated_data["check_in"], query.validated_data["check_out"])
+        else:
+            span = columns.span
+        return Response(
+            {
+                "group_by": group_by,
+                "check_in": span[0] if span else None,
+                "check_out": span[1] if span else None,
+                "total_rooms": len(columns.rooms),
+                "results": columns.aggregate(group_by, *span) if span else [],
+            },
+            status=HTTP_200_OK,
+        )
+
+
+class PropertyBookingsMixin(BookingListMixin):
+    """
+    Property selection and merging shared by the multi-property views.
+    """
+
+    def get_properties(self, request):
+        """
+        Return the properties named in `?properties=a,b`, or all of them.
+        """
+        value = request.query_params.get("properties")
+        property_ids = None
+        if value:
+            property_ids = list(
+                dict.fromkeys(p.strip() for p in value.split(",") if p.strip())
+            )
+        try:
+            return select_pms_properties(property_ids)
+        except KeyError as e:
+            raise ValidationError({"properties": [f"Unknown property {e}."]})
+
+    def properties_response(self, results, booking_filter) -> Response:
+        """
+        Merge the per-property results into one filtered, ordered list.
+        Partial failures are reported per property; only a fan-out where no
+        property answered is a 502.
+        """
+        bookings, properties = merge_property_bookings(results)
+        answered = any(summary["status"] == "ok" for summary in properties)
+        return Response(
+            {"bookings": booking_filter.apply(bookings), "properties": properties},
+            status=HTTP_200_OK if answered or not results else HTTP_502_BAD_GATEWAY,
+        )
+
+
+def properties_schema(operation_id: str):
+    """
+    Return the schema shared by the sync and async multi-property views.
+    """
+    return extend_schema(
+        operation_id=operation_id,
+        parameters=[
+            BookingFilterSerializer,
+            OpenApiParameter(
+                "properties",
+                str,
+                description="Comma-separated property IDs, defaults to all",
+            ),
+        ],
+        responses={
+            HTTP_200_OK: "Merged bookings tagged with property_id, and a "
+            "status per property",
+            HTTP_400_BAD_REQUEST: "Unknown property or invalid filters",
+            HTTP_502_BAD_GATEWAY: "Bad Gateway - no property answered",
+        },
+        tags=["PMS Bookings"],
+    )
+
+
+class PropertyBookingsAPIView(PropertyBookingsMixin, APIView):
+    """
+    GET /api/integrations/pms/properties/bookings/?properties=a,b
+
+    Fetch the bookings of many PMS properties concurrently and merge them,
+    each tagged with its `property_id`. Properties that fail or exceed their
+    timeout are reported in `properties` while the others are still served.
+    Accepts the booking list filters and ordering; results are not paginated.
+    """
+
+    permission_classes = [AllowAny]
+
+    @properties_schema("Get Bookings Across Properties")
+    def get(self, request):
+        booking_filter = self.get_booking_filter(request)
+        client = MultiPropertyPMSClient(self.get_properties(request))
+        results = client.fetch_bookings(booking_filter.upstream_params())
+        return self.properties_response(results, booking_filter)
+
+
+class AsyncPropertyBookingsAPIView(PropertyBookingsMixin, AsyncAPIView):
+    """
+    GET /api/integrations/pms/async/properties/bookings/?properties=a,b
+
+    Async counterpart of PropertyBookingsAPIView, fanning out on the event
+    loop. Served natively on the ASGI event loop.
+    """
+
+    permission_classes = [AllowAny]
+
+    @properties_schema("Get Bookings Across Properties (async)")
+    async def get(self, request):
+        booking_filter = self.get_booking_filter(request)
+        client = AsyncMultiPropertyPMSClient(self.get_properties(request))
+        results = await client.fetch_bookings(booking_filter.upstream_params())
+        return self.properties_response(results, booking_filter)
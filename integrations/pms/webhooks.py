@@ -0,0 +1,147 @@
+import hashlib
+import hmac
+import logging
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+from .availability import get_availability_index
+from .cache import BookingCachePolicy
+from .serializers import BookingEventSerializer
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-PMS-Signature"
+
+
+def sign_payload(body: bytes, secret: str) -> str:
+    """
+    Return the `X-PMS-Signature` value of a webhook body: `sha256=` and the
+    hex HMAC-SHA256 of the raw body under the shared secret.
+    """
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Return whether `signature` signs `body` under `secret`, compared in
+    constant time.
+    """
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(sign_payload(body, secret), signature)
+
+
+class BookingEventApplier:
+    """
+    Apply PMS booking webhook events to the booking cache and the room
+    availability index, so reads stay current without refetching the list.
+
+    Events are deduplicated by ID across workers with an atomic cache `add`
+    kept for `settings.PMS_WEBHOOK_DEDUPE_TTL` seconds. For each delivery:
+
+    * every changed booking's detail entry is replaced with a fresh one;
+    * the cached booking list is patched in place, once per delivery, under
+      a short lock, and keeps its fetch time so the TTL still reconciles
+      any missed events (it is dropped instead if the lock is busy);
+    * filtered lists are invalidated, as their membership may change;
+    * the availability index is updated booking by booking.
+    """
+
+    def __init__(self, cache_alias: Optional[str] = None) -> None:
+        self.policy = BookingCachePolicy(cache_alias)
+        self.cache = self.policy.cache
+
+    def apply(self, events: Sequence[Dict]) -> List[Dict]:
+        """
+        Validate, deduplicate and apply raw events in delivery order.
+
+        Returns:
+            List[Dict]: One result per event with its `id` and a status of
+            `applied`, `duplicate` or `invalid` (with `errors`).
+        """
+        results, changed = [], {}
+        for event in events:
+            serializer = BookingEventSerializer(data=event)
+            if not serializer.is_valid():
+                event_id = event.get("id") if isinstance(event, dict) else None
+                results.append(
+                    {"id": event_id, "status": "invalid", "errors": serializer.errors}
+                )
+                continue
+            event = serializer.validated_data
+            if not self.cache.add(
+                self.policy.key("event", event["id"]),
+                True,
+                settings.PMS_WEBHOOK_DEDUPE_TTL,
+            ):
+                results.append({"id": event["id"], "status": "duplicate"})
+                continue
+            # Later events for the same booking win.
+            changed[event["mapped"]["booking_id"]] = event
+            results.append({"id": event["id"], "status": "applied"})
+
+        if changed:
+            try:
+                self._apply_changes(list(changed.values()))
+            except Exception:
+                # Let the PMS redeliver the events.
+                self.cache.delete_many(
+                    [
+                        self.policy.key("event", event["id"])
+                        for event in changed.values()
+                    ]
+                )
+                raise
+            logger.info("Applied %d booking webhook events", len(changed))
+        return results
+
+    def _apply_changes(self, events: List[Dict]) -> None:
+        entries = {}
+        for event in events:
+            key = self.policy.key("booking", event["mapped"]["booking_id"])
+            entries[key] = self.policy.entry(event["booking"], self.cache.get(key))
+        self.cache.set_many(entries, self.policy.timeout("booking"))
+
+        self._patch_list(
+            {str(event["booking"]["id"]): event["booking"] for event in events}
+        )
+        self.cache.set(self.policy.generation_key(), self.policy.new_generation(), None)
+
+        index = get_availability_index()
+        for event in events:
+            index.upsert(event["mapped"])
+
+    def _patch_list(self, bookings: Dict[str, Dict]) -> None:
+        key = self.policy.key("bookings")
+        # The refresh lock: a list being refreshed is dropped, not patched.
+        lock_key = self.policy.lock_key(key)
+        if not self.cache.add(lock_key, True, 5):
+            self.cache.delete(key)
+            return
+        try:
+            entry = self.cache.get(key)
+            if entry is None:
+                return
+            if "snapshot" in entry:
+                # Patching would copy the mapped snapshot into the cache.
+                self.cache.delete(key)
+                return
+            pending = dict(bookings)
+            value = [
+                pending.pop(str(booking.get("id")), booking)
+                if isinstance(booking, Mapping)
+                else booking
+                for booking in entry["value"]
+            ]
+            value.extend(pending.values())
+            patched = {
+                **self.policy.entry(value, entry),
+                "fetched_at": entry["fetched_at"],
+            }
+            remaining = self.policy.timeout("bookings") - self.policy.age(entry)
+            self.cache.set(key, patched, max(remaining, 1))
+        finally:
+            self.cache.delete(lock_key)